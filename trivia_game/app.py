@@ -1,15 +1,37 @@
 from flask import Flask
 from dotenv import load_dotenv
-from flask import Flask, jsonify, make_response, Response, request
+from flask import Flask, g, jsonify, make_response, Response, request
+import csv
+import hmac
+import json
+import logging
 import sqlite3
+import time
+import redis
 from werkzeug.exceptions import BadRequest, Unauthorized
 
 
 from config import ProductionConfig
+from trivia_game.clients.http_client import get_http_client
+from trivia_game.clients.dog_client import MASCOT_REFILL_INTERVAL, mascot_pool
+from trivia_game.clients.opentdb_client import opentdb_limiter
+from trivia_game.clients.redis_client import redis_client
+from trivia_game.models.auth_session_model import SESSION_TTL, SessionStore
 from trivia_game.models.password_model import *
 from trivia_game.models.team_model import *
-from trivia_game.models.game_model import GameModel
-from trivia_game.utils.sql_utils import check_database_connection, check_table_exists
+from trivia_game.models.category_model import category_catalog
+from trivia_game.models.team_cache import team_cache
+from trivia_game.models.mongo_session_model import login_user, logout_user, session_writer
+from trivia_game.models.game_registry import DEFAULT_GAME_ID, GAME_IDLE_TIMEOUT, GAME_STORE, MAX_GAMES, create_game_registry
+from trivia_game.models.tournament_model import FORMATS, TOURNAMENT_STORE, create_tournament_manager
+from trivia_game.models.question_bank_model import PREFETCH_STORE, count_questions, create_prefetch_jobs, load_questions
+from trivia_game.utils.metrics import METRICS_DIR, WorkerMetrics, metrics
+from trivia_game.utils.profiler import PROFILE_INTERVAL, PROFILER_ENABLED, profile_cpu, profile_memory
+from trivia_game.utils.tracing import SERVER_TIMING, TRACE_EXPORT_PATH, TRACING_ENABLED, JsonlExporter, end_trace, span, start_trace
+from trivia_game.utils.logger import LOG_FORMAT, configure_logger, set_log_format, set_log_levels
+from trivia_game.utils.password_hashing import hashing_pool
+from trivia_game.utils.prefork import after_fork, on_worker_exit, on_worker_start
+from trivia_game.utils.sql_utils import check_database_connection, check_table_exists, get_pool
 
 load_dotenv()
 
@@ -17,15 +39,145 @@ def create_app(config_class=ProductionConfig):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    # Route app.logger through the shared pipeline before Flask gives it a handler of its own
+    set_log_levels(app.config.get('LOG_LEVEL'), app.config.get('LOG_LEVELS'))
+    set_log_format(app.config.get('LOG_FORMAT', LOG_FORMAT))
+    configure_logger(logging.getLogger(app.name))
+
     db.init_app(app)
     with app.app_context():
         db.create_all()
 
-    
-    game_model = GameModel()
+    def dispose_engines():
+        # Connections opened by create_all belong to the master process; drop them without closing them
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+    after_fork(dispose_engines)
+
+    game_registry = create_game_registry(
+        app.config.get('GAME_STORE', GAME_STORE),
+        redis_client,
+        max_games=app.config.get('MAX_GAMES', MAX_GAMES),
+        idle_timeout=app.config.get('GAME_IDLE_TIMEOUT', GAME_IDLE_TIMEOUT)
+    )
+
+    tournament_manager = create_tournament_manager(app.config.get('TOURNAMENT_STORE', TOURNAMENT_STORE), redis_client)
+    app.extensions['tournament_manager'] = tournament_manager
+    prefetch_jobs = create_prefetch_jobs(app.config.get('PREFETCH_STORE', PREFETCH_STORE), redis_client)
+
+    session_store = SessionStore(redis_client, app.config['SECRET_KEY'], app.config.get('SESSION_TTL', SESSION_TTL))
+    app.extensions['session_store'] = session_store
+
+    # Background threads start in each worker, never in a pre-fork master (see utils/prefork.py)
+    if app.config.get('CATEGORY_REFRESH_INTERVAL'):
+        on_worker_start(lambda: category_catalog.start_background_refresh(app.config['CATEGORY_REFRESH_INTERVAL']))
+
+    if app.config.get('MASCOT_PREFETCH'):
+        on_worker_start(lambda: mascot_pool.start_background_refill(
+            app.config.get('MASCOT_REFILL_INTERVAL', MASCOT_REFILL_INTERVAL)))
+
+    on_worker_exit(session_writer.flush)
     
     
 
+    request_seconds = metrics.histogram(
+        "http_request_seconds", "Seconds spent serving a request", ["method", "route", "status"])
+
+    def _collect_app_metrics():
+        """
+        Reports the state this app instance owns: its games and its SQLAlchemy pool.
+        """
+        families = [("games_in_progress", "gauge", "Games held in the registry", [({}, len(game_registry))])]
+        with app.app_context():
+            pool = db.engine.pool
+        for field in ("size", "checkedout", "overflow"):
+            value = getattr(pool, field, None)
+            if callable(value):
+                families.append((f"sqlalchemy_pool_{field}", "gauge", f"SQLAlchemy pool {field}",
+                                 [({}, value())]))
+        return families
+
+    # Under a pre-fork server, a scrape of any worker reports every worker's metrics
+    metrics_dir = app.config.get('METRICS_DIR', METRICS_DIR)
+    worker_metrics = WorkerMetrics(metrics, metrics_dir, extra_collectors=[_collect_app_metrics]) if metrics_dir else None
+    if worker_metrics is not None:
+        on_worker_start(worker_metrics.start)
+        on_worker_exit(worker_metrics.stop)
+
+    tracing_enabled = app.config.get('TRACING_ENABLED', TRACING_ENABLED)
+    trace_export_path = app.config.get('TRACE_EXPORT_PATH', TRACE_EXPORT_PATH)
+    trace_exporter = JsonlExporter(trace_export_path) if trace_export_path else None
+    if trace_exporter is not None:
+        app.extensions['trace_exporter'] = trace_exporter
+        on_worker_exit(trace_exporter.flush)
+    server_timing = app.config.get('SERVER_TIMING', SERVER_TIMING)
+
+    def _trusted_caller() -> bool:
+        admin_token = app.config.get('ADMIN_TOKEN')
+        return bool(admin_token) and hmac.compare_digest(request.headers.get('X-Admin-Token', ''), admin_token)
+
+    @app.before_request
+    def start_timer():
+        g.request_start = time.perf_counter()
+        # Span names reveal internals (hosts, model functions, SQL), so the breakdown goes to trusted callers only
+        g.send_server_timing = server_timing or _trusted_caller()
+        if tracing_enabled and (trace_exporter is not None or g.send_server_timing):
+            # Reuse the caller's request ID when it is a plain token, so logs on both sides line up
+            request_id = request.headers.get('X-Request-ID', '')
+            trace_id = request_id if request_id.isalnum() and len(request_id) <= 64 else None
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            start_trace(f"{request.method} {route}", trace_id)
+
+    @app.after_request
+    def record_request(response: Response) -> Response:
+        """
+        Records the request's latency under its route pattern, so /api/games/<id> is one series and not one per game.
+        """
+        start = g.get('request_start')
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            request_seconds.observe(time.perf_counter() - start, method=request.method, route=route,
+                                    status=response.status_code)
+        trace = end_trace()
+        if trace is not None:
+            if g.get('send_server_timing'):
+                response.headers['Server-Timing'] = trace.server_timing()
+            response.headers['X-Trace-Id'] = trace.trace_id
+            if trace_exporter is not None:
+                trace_exporter.export(trace)
+        return response
+
+    @app.teardown_request
+    def discard_trace(exc):
+        # A request that failed before after_request must not leave its trace to the next one on this thread
+        end_trace()
+
+    def _bearer_token():
+        header = request.headers.get('Authorization', '')
+        scheme, _, token = header.partition(' ')
+        return token.strip() if scheme.lower() == 'bearer' else None
+
+    @app.before_request
+    def load_session():
+        """
+        Resolves the request's session token, if any, to g.user.
+
+        Requests without a token cost nothing; a token costs one Redis GETEX.
+        """
+        g.user = None
+        token = _bearer_token()
+        if not token:
+            return None
+        try:
+            with span("session"):
+                g.user = session_store.validate(token)
+        except redis.exceptions.RedisError as e:
+            app.logger.error("Session store unavailable: %s", str(e))
+            return make_response(jsonify({'error': 'Session store unavailable'}), 503)
+        return None
+
+
     @app.route('/api/health', methods=['GET'])
     def healthcheck() -> Response:
         """
@@ -38,6 +190,150 @@ def create_app(config_class=ProductionConfig):
         return make_response(jsonify({'status': 'healthy'}), 200)
 
 
+    @app.route('/api/rate-limit-stats', methods=['GET'])
+    def rate_limit_stats() -> Response:
+        """
+        Route to report how long OpenTDB calls have waited on the shared rate limiter.
+
+        Returns:
+            JSON response with the limiter's acquisition and wait-time counters.
+        """
+        return make_response(jsonify({'status': 'success', 'opentdb': opentdb_limiter.stats()}), 200)
+
+
+    @app.route('/api/cache-stats', methods=['GET'])
+    def cache_stats() -> Response:
+        """
+        Route to report the in-process caches' metrics.
+
+        Returns:
+            JSON response with the size, hit rate and evictions of the team and user ID caches.
+        """
+        return make_response(jsonify({
+            'status': 'success',
+            'caches': [local_team_cache.stats(), user_id_cache.stats()]
+        }), 200)
+
+
+    @app.route('/api/team-cache-stats', methods=['GET'])
+    def team_cache_stats() -> Response:
+        """
+        Route to report the Redis team cache's hit rate.
+
+        Returns:
+            JSON response with cache hits, misses and Redis errors.
+        """
+        return make_response(jsonify({'status': 'success', 'cache': team_cache.stats()}), 200)
+
+
+    @app.route('/api/session-writer-stats', methods=['GET'])
+    def session_writer_stats() -> Response:
+        """
+        Route to report how many game saves have been coalesced into MongoDB bulk writes.
+
+        Returns:
+            JSON response with saves, sessions written, bulk writes and pending saves.
+        """
+        return make_response(jsonify({'status': 'success', 'writer': session_writer.stats()}), 200)
+
+
+    @app.route('/api/password-hashing-stats', methods=['GET'])
+    def password_hashing_stats() -> Response:
+        """
+        Route to report the password hashing pool's queue depth and timings.
+
+        Returns:
+            JSON response with running and queued hashes, rejections and average times.
+        """
+        return make_response(jsonify({'status': 'success', 'pool': hashing_pool.stats()}), 200)
+
+
+    @app.route('/api/mascot-pool-stats', methods=['GET'])
+    def mascot_pool_stats() -> Response:
+        """
+        Route to report the mascot pool's metrics.
+
+        Returns:
+            JSON response with the pool size, refills and the Dog CEO circuit state.
+        """
+        return make_response(jsonify({'status': 'success', 'pool': mascot_pool.stats()}), 200)
+
+    @app.route('/api/http-client-stats', methods=['GET'])
+    def http_client_stats() -> Response:
+        """
+        Route to report outbound HTTP metrics per upstream host.
+
+        Returns:
+            JSON response with request, error and retry counts and latency histograms per host.
+        """
+        return make_response(jsonify({'status': 'success', 'hosts': get_http_client().stats()}), 200)
+
+
+    @app.route('/api/metrics', methods=['GET'])
+    def metrics_endpoint() -> Response:
+        """
+        Route to expose every metric in the Prometheus text format.
+
+        Returns:
+            Plain text response with request latencies, upstream calls, pools and caches.
+        """
+        if worker_metrics is not None:
+            text = worker_metrics.render()
+        else:
+            text = metrics.render(extra_collectors=[_collect_app_metrics])
+        return Response(text, mimetype='text/plain; version=0.0.4')
+
+
+    # Stack dumps expose the code's layout and tie up a worker thread, so the profiler is never left open
+    profiler_enabled = app.config.get('PROFILER_ENABLED', PROFILER_ENABLED)
+    if profiler_enabled and not app.config.get('ADMIN_TOKEN'):
+        raise ValueError("PROFILER_ENABLED requires ADMIN_TOKEN to be set")
+
+    @app.route('/api/admin/profile', methods=['POST'])
+    def admin_profile() -> Response:
+        """
+        Route to profile the running process for a few seconds.
+
+        Expected JSON Input:
+            - seconds (float, optional): how long to profile (default 5)
+            - mode (str, optional): 'cpu' for sampled stacks, 'memory' for a tracemalloc diff (default 'cpu')
+            - interval (float, optional): seconds between stack samples
+            - include_idle (bool, optional): also sample threads waiting on a lock, queue or socket
+            - top (int, optional): memory growths to return (default 25)
+
+        Returns:
+            Plain text collapsed stacks (cpu) or a JSON list of memory growths (memory).
+        Raises:
+            404 error if the profiler is not enabled.
+            401 error if the admin token is missing or wrong.
+            400 error if the input is invalid.
+            503 error if another profile is already running.
+        """
+        if not profiler_enabled:
+            return make_response(jsonify({'error': 'Not found'}), 404)
+        if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), app.config['ADMIN_TOKEN']):
+            return make_response(jsonify({'error': 'Invalid admin token'}), 401)
+
+        data = request.get_json(silent=True) or {}
+        try:
+            seconds = float(data.get('seconds', 5))
+            mode = data.get('mode', 'cpu')
+            if mode == 'cpu':
+                profiler = profile_cpu(seconds, float(data.get('interval', PROFILE_INTERVAL)),
+                                       bool(data.get('include_idle', False)))
+                response = Response(profiler.collapsed(), mimetype='text/plain')
+                response.headers['X-Profile-Samples'] = str(profiler.samples)
+                return response
+            if mode == 'memory':
+                growth = profile_memory(seconds, int(data.get('top', 25)))
+                return make_response(jsonify({'status': 'success', 'growth': growth}), 200)
+            raise ValueError(f"Unknown profile mode: {mode}")
+        except (TypeError, ValueError) as e:
+            return make_response(jsonify({'error': str(e)}), 400)
+        except RuntimeError as e:
+            return make_response(jsonify({'error': str(e)}), 503)
+
+
     @app.route('/api/db-check', methods=['GET'])
     def db_check() -> Response:
         """
@@ -59,6 +355,16 @@ def create_app(config_class=ProductionConfig):
         except Exception as e:
             return make_response(jsonify({'error': str(e)}), 404)
         
+    @app.route('/api/db-pool-stats', methods=['GET'])
+    def db_pool_stats() -> Response:
+        """
+        Route to report the sqlite connection pool's metrics.
+
+        Returns:
+            JSON response with checkouts, waits and the hit rate of pooled connections.
+        """
+        return make_response(jsonify({'status': 'success', 'pool': get_pool().stats()}), 200)
+
     @app.route('/api/init-db', methods=['POST'])
     def init_db():
         """
@@ -158,17 +464,22 @@ def create_app(config_class=ProductionConfig):
                 app.logger.error("Failed to delete user: %s", str(e))
                 return make_response(jsonify({'error': str(e)}), 500)
 
+    def _user_game_id(user_id: int) -> str:
+        return f"user-{user_id}"
+
     @app.route('/api/login', methods=['POST'])
     def login():
             """
-            Route to log in a user and load their combatants.
+            Route to log in a user and start a session.
 
             Expected JSON Input:
                 - username (str): The username of the user.
                 - password (str): The user's password.
 
             Returns:
-                JSON response indicating the success of the login.
+                JSON response indicating the success of the login, with the session token
+                to send as 'Authorization: Bearer <token>', its inactivity timeout and the
+                ID of the user's game, restored from their last logout.
 
             Raises:
                 400 error if input validation fails.
@@ -184,20 +495,39 @@ def create_app(config_class=ProductionConfig):
             password = data['password']
 
             try:
-                # Validate user credentials
-                if not Users.check_password(username, password):
+                # Validate user credentials; the user record comes back from the same query
+                user = Users.authenticate(username, password)
+                if user is None:
                     app.logger.warning("Login failed for username: %s", username)
                     raise Unauthorized("Invalid username or password.")
-
-                # Get user ID
-                user_id = Users.get_id_by_username(username)
-
+                user_id = user.id
+                token = session_store.create(user_id, username)
+
+                # Resume the game the user saved at logout, if there is one
+                game_id = _user_game_id(user_id)
+                try:
+                    with game_registry.game_session(game_id, create=True) as game_model:
+                        if not game_model.opponents:
+                            login_user(user_id, game_model)
+                except Exception as e:
+                    app.logger.warning("Could not restore the saved game for username %s: %s", username, str(e))
 
                 app.logger.info("User %s logged in successfully.", username)
-                return jsonify({"message": f"User {username} logged in successfully."}), 200
+                return jsonify({
+                    "message": f"User {username} logged in successfully.",
+                    "token": token,
+                    "expires_in": session_store.ttl,
+                    "game_id": game_id
+                }), 200
 
             except Unauthorized as e:
                 return jsonify({"error": str(e)}), 401
+            except RuntimeError as e:
+                app.logger.warning("Login rejected for username %s: %s", username, str(e))
+                return jsonify({"error": str(e)}), 503
+            except redis.exceptions.RedisError as e:
+                app.logger.error("Session store unavailable during login for username %s: %s", username, str(e))
+                return jsonify({"error": "Session store unavailable"}), 503
             except Exception as e:
                 app.logger.error("Error during login for username %s: %s", username, str(e))
                 return jsonify({"error": "An unexpected error occurred."}), 500
@@ -206,43 +536,63 @@ def create_app(config_class=ProductionConfig):
     @app.route('/api/logout', methods=['POST'])
     def logout():
             """
-            Route to log out a user and save their combatants to MongoDB.
+            Route to log out the user a session token belongs to, end the session and save the user's game.
 
-            Expected JSON Input:
-                - username (str): The username of the user.
+            Expected Header:
+                - Authorization: Bearer <token> from /api/login.
 
             Returns:
                 JSON response indicating the success of the logout.
 
             Raises:
-                400 error if input validation fails or user is not found in MongoDB.
+                401 error if there is no valid session token.
                 500 error for any unexpected server-side issues.
             """
-            data = request.get_json()
-            if not data or 'username' not in data:
-                app.logger.error("Invalid request payload for logout.")
-                raise BadRequest("Invalid request payload. 'username' is required.")
-
-            username = data['username']
+            if g.user is None:
+                app.logger.warning("Logout without a valid session token.")
+                return jsonify({"error": "A valid session token is required."}), 401
 
+            username = g.user['username']
             try:
-                # Get user ID
-                user_id = Users.get_id_by_username(username)
+                session_store.revoke(_bearer_token())
 
-            
+                # Save the user's game so the next login can resume it
+                game_id = _user_game_id(g.user['user_id'])
+                try:
+                    with game_registry.game_session(game_id) as game_model:
+                        logout_user(g.user['user_id'], game_model)
+                    game_registry.delete_game(game_id)
+                except ValueError:
+                    pass
 
                 app.logger.info("User %s logged out successfully.", username)
                 return jsonify({"message": f"User {username} logged out successfully."}), 200
 
-            except ValueError as e:
-                app.logger.warning("Logout failed for username %s: %s", username, str(e))
-                return jsonify({"error": str(e)}), 400
             except Exception as e:
                 app.logger.error("Error during logout for username %s: %s", username, str(e))
                 return jsonify({"error": "An unexpected error occurred."}), 500
-            
 
-        
+
+    @app.route('/api/session', methods=['GET'])
+    def current_session():
+            """
+            Route to return the user a session token belongs to.
+
+            Expected Header:
+                - Authorization: Bearer <token> from /api/login.
+
+            Returns:
+                JSON response with the user's ID and username.
+
+            Raises:
+                401 error if there is no valid session token.
+            """
+            if g.user is None:
+                return jsonify({"error": "A valid session token is required."}), 401
+            return jsonify({"status": "success", "user": g.user}), 200
+
+
+
         ##########################################################
         #
         # Teams
@@ -250,6 +600,31 @@ def create_app(config_class=ProductionConfig):
         ##########################################################
 
 
+    @app.route('/api/categories', methods=['GET'])
+    def get_categories_route() -> Response:
+        """
+        Route to list the trivia categories from the cached catalog.
+
+        Supports conditional requests: a client sending the ETag it already has in
+        If-None-Match gets an empty 304 response while the catalog is unchanged.
+
+        Returns:
+            JSON response with the list of categories.
+        Raises:
+            500 error if the categories cannot be loaded.
+        """
+        try:
+            categories = category_catalog.get_categories()
+            response = make_response(jsonify({'status': 'success', 'categories': categories}), 200)
+            response.set_etag(category_catalog.etag())
+            response.cache_control.public = True
+            response.cache_control.max_age = int(category_catalog.ttl)
+            return response.make_conditional(request)
+        except Exception as e:
+            app.logger.error("Error retrieving categories: %s", str(e))
+            return make_response(jsonify({'error': 'Failed to retrieve categories'}), 500)
+
+
     @app.route('/api/random-dog')
     def random_dog():
             try:
@@ -322,15 +697,15 @@ def create_app(config_class=ProductionConfig):
         """
         
         try:
-            app.logger.info(f"Deleting team by ID: {id}")
+            app.logger.info("Deleting team by ID: %s", id)
             # Call the delete_team function to mark the team as deleted in the database
             delete_team(id)
 
-            app.logger.info(f"Team with ID {id} marked as deleted.")
+            app.logger.info("Team with ID %s marked as deleted.", id)
             return make_response(jsonify({'status': 'success'}), 200)
 
         except Exception as e:
-            app.logger.error(f"Failed to delete team with ID {id}: {str(e)}")
+            app.logger.error("Failed to delete team with ID %s: %s", id, str(e))
             return make_response(jsonify({'error': 'Internal server error'}), 500)
 
 
@@ -347,7 +722,7 @@ def create_app(config_class=ProductionConfig):
             clear_teams()
             return make_response(jsonify({'status': 'success'}), 200)
         except Exception as e:
-            app.logger.error(f"Error clearing catalog: {e}")
+            app.logger.error("Error clearing catalog: %s", e)
             return make_response(jsonify({'error': str(e)}), 500)    
 
     @app.route('/api/get-team-by-id/<int:team_id>', methods=['GET'])
@@ -362,17 +737,17 @@ def create_app(config_class=ProductionConfig):
                 JSON response with the team details or error message.
             """
             try:
-                app.logger.info(f"Retrieving team by ID: {team_id}")
+                app.logger.info("Retrieving team by ID: %s", team_id)
 
                 team = get_team_by_id(team_id)  # Fetch team by ID
                 return make_response(jsonify({'status': 'success', 'meal': team}), 200)
             
             except ValueError as e:
-                app.logger.error(f"Error retrieving team by ID: {e}")
+                app.logger.error("Error retrieving team by ID: %s", e)
                 return make_response(jsonify({'error': str(e)}), 400)
             
             except Exception as e:
-                app.logger.error(f"Error retrieving team by ID: {e}")
+                app.logger.error("Error retrieving team by ID: %s", e)
                 return make_response(jsonify({'error': 'Internal server error'}), 500)
 
 
@@ -389,7 +764,7 @@ def create_app(config_class=ProductionConfig):
                 JSON response with the team details or error message.
             """
             try:
-                app.logger.info(f"Retrieving team by name: {team}")
+                app.logger.info("Retrieving team by name: %s", team)
 
                 if not team:
                     return make_response(jsonify({'error': 'Team name is required'}), 400)
@@ -398,11 +773,11 @@ def create_app(config_class=ProductionConfig):
                 return make_response(jsonify({'status': 'success', 'meal': team}), 200)
             
             except ValueError as e:
-                app.logger.error(f"Error retrieving team by name: {e}")
+                app.logger.error("Error retrieving team by name: %s", e)
                 return make_response(jsonify({'error': str(e)}), 400)
             
             except Exception as e:
-                app.logger.error(f"Error retrieving team by name: {e}")
+                app.logger.error("Error retrieving team by name: %s", e)
                 return make_response(jsonify({'error': 'Internal server error'}), 500)
 
 
@@ -432,21 +807,240 @@ def create_app(config_class=ProductionConfig):
                 if result not in ['win', 'loss']:
                     return make_response(jsonify({'error': "Invalid result. Must be 'win' or 'loss'."}), 400)
 
-                app.logger.info(f"Updating stats for team ID: {team_id} with result: {result}")
+                app.logger.info("Updating stats for team ID: %s with result: %s", team_id, result)
 
                 # Call the update_team_stats function to update the stats
                 update_team_stats(team_id, result)
                 return make_response(jsonify({'status': 'success', 'team_id': team_id, 'result': result}), 200)
 
             except ValueError as e:
-                app.logger.error(f"Error updating team stats: {e}")
+                app.logger.error("Error updating team stats: %s", e)
                 return make_response(jsonify({'error': str(e)}), 400)
 
             except Exception as e:
-                app.logger.error(f"Error updating team stats: {e}")
+                app.logger.error("Error updating team stats: %s", e)
                 return make_response(jsonify({'error': 'Internal server error'}), 500)
 
             
+    def _read_team_rows():
+        """
+        Yields the rows of a streamed team upload, decoding it line by line.
+
+        CSV is read when the request is sent as text/csv; otherwise each line is a JSON object.
+        """
+        lines = (line.decode('utf-8') for line in request.stream)
+        if request.mimetype == 'text/csv':
+            yield from csv.DictReader(lines)
+            return
+        for line in lines:
+            if line.strip():
+                row = json.loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError('Each line must be a JSON object')
+                yield row
+
+
+    @app.route('/api/teams/bulk', methods=['POST'])
+    def bulk_create_teams() -> Response:
+        """
+        Route to add many teams in one streamed upload.
+
+        Expected Input:
+            - JSON lines (one object per line), or CSV with a header row when sent as text/csv.
+              Each row has a team, a favorite_category and optionally a mascot URL.
+
+        Returns:
+            JSON response with the number of teams created and skipped as duplicates.
+        Raises:
+            400 error if a row is invalid (rows in earlier chunks are kept).
+            500 error if there is an issue adding the teams to the database.
+        """
+        try:
+            counts = create_teams_bulk(_read_team_rows())
+            return make_response(jsonify({'status': 'success', **counts}), 201)
+        except (ValueError, csv.Error) as e:
+            app.logger.error("Failed bulk team import: %s", str(e))
+            return make_response(jsonify({'error': str(e)}), 400)
+        except Exception as e:
+            app.logger.error("Failed bulk team import: %s", str(e))
+            return make_response(jsonify({'error': 'Internal server error'}), 500)
+
+
+    @app.route('/api/teams/bulk', methods=['GET'])
+    def bulk_export_teams() -> Response:
+        """
+        Route to stream every team out as JSON lines.
+
+        Returns:
+            A JSON lines response, one team per line, in ID order.
+        """
+        def generate():
+            for team in export_teams():
+                yield json.dumps(team.to_dict()) + "\n"
+
+        return Response(generate(), mimetype='application/x-ndjson')
+
+
+    @app.route('/api/teams/stats/batch', methods=['POST'])
+    def batch_update_team_stats() -> Response:
+        """
+        Route to record many game results at once.
+
+        Expected JSON Input:
+            - results (list): Objects with a team_id (int) and a result ('win' or 'loss').
+
+        Returns:
+            JSON response with the number of teams updated.
+        Raises:
+            400 error if a result is invalid or a team does not exist; nothing is written then.
+            500 error if there is an issue updating the database.
+        """
+        try:
+            data = request.get_json()
+            results = data.get('results') if isinstance(data, dict) else None
+            if not isinstance(results, list) or not all(
+                isinstance(item, dict) and isinstance(item.get('team_id'), int) for item in results
+            ):
+                return make_response(jsonify({'error': 'Expected a list of results with a team_id and result'}), 400)
+
+            updated = update_team_stats_batch((item['team_id'], item.get('result')) for item in results)
+            return make_response(jsonify({'status': 'success', 'teams_updated': updated}), 200)
+        except ValueError as e:
+            app.logger.error("Error updating team stats: %s", str(e))
+            return make_response(jsonify({'error': str(e)}), 400)
+        except Exception as e:
+            app.logger.error("Error updating team stats: %s", str(e))
+            return make_response(jsonify({'error': 'Internal server error'}), 500)
+
+
+    @app.route('/api/tournaments', methods=['POST'])
+    def create_tournament() -> Response:
+        """
+        Route to start a tournament between existing teams.
+
+        The matches are played in the background; poll the tournament for progress.
+
+        Expected JSON Input:
+            - team_ids (list[int]): The teams, in seed order.
+            - format (str, optional): round_robin (default), single_elimination, double_elimination or swiss.
+            - seed (str, optional): Makes the matches reproducible.
+
+        Returns:
+            JSON response with the ID of the tournament.
+        Raises:
+            400 error if the input is invalid or a team does not exist.
+            503 error if too many tournaments are in progress.
+            500 error if there is an issue reading the teams.
+        """
+        try:
+            data = request.get_json()
+            team_ids = data.get('team_ids') if isinstance(data, dict) else None
+            if not isinstance(team_ids, list) or not all(isinstance(team_id, int) for team_id in team_ids):
+                return make_response(jsonify({'error': 'Expected a list of team_ids'}), 400)
+            tournament_format = data.get('format', FORMATS[0])
+            seed = data.get('seed')
+
+            tournament = tournament_manager.create(team_ids, tournament_format, None if seed is None else str(seed))
+            return make_response(jsonify({'status': 'success', 'tournament_id': tournament.id}), 202)
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 400)
+        except RuntimeError as e:
+            return make_response(jsonify({'error': str(e)}), 503)
+        except Exception as e:
+            app.logger.error("Error creating tournament: %s", str(e))
+            return make_response(jsonify({'error': 'Internal server error'}), 500)
+
+
+    @app.route('/api/tournaments', methods=['GET'])
+    def list_tournaments() -> Response:
+        """Route to list the tournaments, oldest first."""
+        return make_response(jsonify({'status': 'success', 'tournaments': tournament_manager.list()}), 200)
+
+
+    @app.route('/api/tournaments/<string:tournament_id>', methods=['GET'])
+    def get_tournament(tournament_id: str) -> Response:
+        """
+        Route to report a tournament's progress.
+
+        Returns:
+            JSON response with the state, rounds and matches played and the standings.
+        Raises:
+            400 error if there is no tournament with the given ID.
+        """
+        try:
+            progress = tournament_manager.progress(tournament_id)
+            return make_response(jsonify({'status': 'success', 'tournament': progress}), 200)
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 400)
+
+
+    @app.route('/api/tournaments/<string:tournament_id>/matches', methods=['GET'])
+    def get_tournament_matches(tournament_id: str) -> Response:
+        """Route to list every match of a tournament played so far."""
+        try:
+            matches = tournament_manager.matches(tournament_id)
+            return make_response(jsonify({'status': 'success', 'matches': matches}), 200)
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 400)
+
+
+    @app.route('/api/leaderboard', methods=['GET'])
+    def leaderboard() -> Response:
+        """
+        Route to get a page of the leaderboard.
+
+        Pages are chained with cursors: pass a page's next_cursor to get the page after it.
+
+        Query Parameters:
+            - per_page (int, optional): Teams per page, at most 100 (default 10).
+            - cursor (str, optional): The next_cursor of the previous page; omitted for the first page.
+
+        Returns:
+            JSON response with the ranked teams on the page, and the next page's cursor
+            (null on the last page).
+        Raises:
+            400 error if per_page or the cursor is invalid.
+            500 error if there is an issue reading the database.
+        """
+        try:
+            per_page = request.args.get('per_page', 10, type=int)
+            if not 1 <= per_page <= 100:
+                return make_response(jsonify({'error': 'per_page must be between 1 and 100'}), 400)
+
+            teams = get_leaderboard(limit=per_page, after=request.args.get('cursor'))
+            next_cursor = leaderboard_cursor(teams[-1]) if len(teams) == per_page else None
+            return make_response(jsonify({'status': 'success', 'per_page': per_page, 'leaderboard': teams,
+                                          'next_cursor': next_cursor}), 200)
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 400)
+        except Exception as e:
+            app.logger.error("Error retrieving leaderboard: %s", e)
+            return make_response(jsonify({'error': 'Internal server error'}), 500)
+
+
+    @app.route('/api/leaderboard/<int:team_id>', methods=['GET'])
+    def leaderboard_rank(team_id: int) -> Response:
+        """
+        Route to get a team's rank on the leaderboard.
+
+        Path Parameter:
+            - team_id (int): The ID of the team.
+
+        Returns:
+            JSON response with the team's rank and stats.
+        Raises:
+            400 error if the team does not exist or has been deleted.
+            500 error if there is an issue reading the database.
+        """
+        try:
+            return make_response(jsonify({'status': 'success', 'team': get_team_rank(team_id)}), 200)
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 400)
+        except Exception as e:
+            app.logger.error("Error retrieving team rank: %s", e)
+            return make_response(jsonify({'error': 'Internal server error'}), 500)
+
+            
 ##########################################################
 #
 # Game
@@ -455,9 +1049,7 @@ def create_app(config_class=ProductionConfig):
 
 
 
-    @app.route('/api/add-opponent', methods=['POST'])
-    def add_opponent():
-        """Route to add an opponent to the game."""
+    def _add_opponent(game_id: str, create: bool = False) -> Response:
         try:
             data = request.get_json()
             team_id = data.get('team_id')
@@ -466,53 +1058,298 @@ def create_app(config_class=ProductionConfig):
                 return make_response(jsonify({'error': 'Team ID is required'}), 400)
 
             team = get_team_by_id(team_id)
-            game_model.prep_opponent(team)
+            with game_registry.game_session(game_id, create=create) as game_model:
+                game_model.prep_opponent(team)
 
-            return make_response(jsonify({'status': 'success', 'team': team.team}), 200)
+            return make_response(jsonify({'status': 'success', 'game_id': game_id, 'team': team.team}), 200)
         except ValueError as e:
             return make_response(jsonify({'error': str(e)}), 400)
+        except RuntimeError as e:
+            return make_response(jsonify({'error': str(e)}), 503)
         except Exception as e:
-            app.logger.error(f"Error adding opponent: {e}")
+            app.logger.error("Error adding opponent: %s", e)
             return make_response(jsonify({'error': 'Failed to add opponent'}), 500)
 
+    def _start_game(game_id: str, create: bool = False) -> Response:
+        try:
+            with game_registry.game_session(game_id, create=create) as game_model:
+                game_state = game_model.game()
+            return make_response(jsonify({'status': 'success', 'game_id': game_id, 'game': game_state}), 200)
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 400)
+        except RuntimeError as e:
+            return make_response(jsonify({'error': str(e)}), 503)
+        except Exception as e:
+            app.logger.error("Error starting game: %s", e)
+            return make_response(jsonify({'error': 'Failed to start game'}), 500)
 
+    def _get_opponents(game_id: str, create: bool = False) -> Response:
+        try:
+            with game_registry.game_session(game_id, create=create) as game_model:
+                opponents_list = [opponent.to_dict() for opponent in game_model.get_opponents()]
+            return make_response(jsonify({'status': 'success', 'game_id': game_id, 'opponents': opponents_list}), 200)
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 400)
+        except RuntimeError as e:
+            return make_response(jsonify({'error': str(e)}), 503)
+        except Exception as e:
+            app.logger.error("Error retrieving opponents: %s", e)
+            return make_response(jsonify({'error': 'Failed to retrieve opponents'}), 500)
 
+    def _clear_opponents(game_id: str, create: bool = False) -> Response:
+        try:
+            with game_registry.game_session(game_id, create=create) as game_model:
+                game_model.clear_opponents()
+            return make_response(jsonify({'status': 'success', 'game_id': game_id, 'message': 'Opponents cleared'}), 200)
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 400)
+        except RuntimeError as e:
+            return make_response(jsonify({'error': str(e)}), 503)
+        except Exception as e:
+            app.logger.error("Error clearing opponents: %s", e)
+            return make_response(jsonify({'error': 'Failed to clear opponents'}), 500)
 
 
-    @app.route('/api/start-game', methods=['POST'])
-    def start_game():
+    @app.route('/api/games', methods=['POST'])
+    def create_game() -> Response:
+        """
+        Route to create a new game.
+
+        Expected JSON Input (optional):
+            - seed (str): makes the game's questions and answer order replayable
+
+        Returns:
+            JSON response with the ID of the new game.
+        Raises:
+            503 error if the maximum number of games is already in progress.
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            seed = data.get('seed')
+            game_id = game_registry.create_game(None if seed is None else str(seed))
+            return make_response(jsonify({'status': 'success', 'game_id': game_id}), 201)
+        except RuntimeError as e:
+            return make_response(jsonify({'error': str(e)}), 503)
+
+
+    @app.route('/api/games', methods=['GET'])
+    def list_games() -> Response:
+        """Route to list the IDs of the games in progress."""
+        return make_response(jsonify({'status': 'success', 'games': game_registry.list_games()}), 200)
+
+
+    @app.route('/api/games/<string:game_id>', methods=['DELETE'])
+    def delete_game(game_id: str) -> Response:
+        """Route to end a game and free its state."""
+        try:
+            game_registry.delete_game(game_id)
+            return make_response(jsonify({'status': 'success', 'game_id': game_id}), 200)
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 400)
+
+
+    @app.route('/api/games/<string:game_id>/opponents', methods=['POST'])
+    def add_game_opponent(game_id: str) -> Response:
+        """Route to add an opponent to a game."""
+        return _add_opponent(game_id)
+
+
+    @app.route('/api/games/<string:game_id>/opponents', methods=['GET'])
+    def get_game_opponents(game_id: str) -> Response:
+        """Route to retrieve the list of opponents of a game."""
+        return _get_opponents(game_id)
+
+
+    @app.route('/api/games/<string:game_id>/opponents', methods=['DELETE'])
+    def clear_game_opponents(game_id: str) -> Response:
+        """Route to clear the list of opponents of a game."""
+        return _clear_opponents(game_id)
+
+
+    @app.route('/api/games/<string:game_id>/start', methods=['POST'])
+    def start_game_by_id(game_id: str) -> Response:
         """Route to start a game."""
+        return _start_game(game_id)
+
+
+    @app.route('/api/games/<string:game_id>', methods=['GET'])
+    def get_game_state(game_id: str) -> Response:
+        """
+        Route to poll a game: its state, scores and the current question (without its answer).
+
+        Returns:
+            JSON response with the state of the game.
+        Raises:
+            400 error if the game does not exist.
+        """
         try:
-            result = game_model.game()
-            return make_response(jsonify({'status': 'success', 'result': 'Game completed successfully'}), 200)
+            with game_registry.game_session(game_id) as game_model:
+                game_state = game_model.get_state()
+            return make_response(jsonify({'status': 'success', 'game_id': game_id, 'game': game_state}), 200)
         except ValueError as e:
             return make_response(jsonify({'error': str(e)}), 400)
+        except RuntimeError as e:
+            return make_response(jsonify({'error': str(e)}), 503)
         except Exception as e:
-            app.logger.error(f"Error starting game: {e}")
-            return make_response(jsonify({'error': 'Failed to start game'}), 500)
+            app.logger.error("Error retrieving game: %s", e)
+            return make_response(jsonify({'error': 'Failed to retrieve game'}), 500)
+
+
+    @app.route('/api/games/<string:game_id>/answer', methods=['POST'])
+    def submit_answer(game_id: str) -> Response:
+        """
+        Route to record a team's answer to the current question of a game.
+
+        The round is scored once both teams have answered or its deadline passes, and
+        the next question (if any) is returned in the game state.
+
+        Expected JSON Input:
+            - team_id (int): The ID of the answering team.
+            - answer (str): The team's answer.
+
+        Returns:
+            JSON response with the state of the game after the answer.
+        Raises:
+            400 error if input validation fails, the game does not exist, no round is
+            open or the team cannot answer.
+        """
+        try:
+            data = request.get_json()
+            team_id = data.get('team_id')
+            answer = data.get('answer')
+
+            if not isinstance(team_id, int) or not isinstance(answer, str):
+                return make_response(jsonify({'error': 'Invalid input, team_id and answer are required'}), 400)
+
+            with game_registry.game_session(game_id) as game_model:
+                game_state = game_model.submit_answer(team_id, answer)
+            return make_response(jsonify({'status': 'success', 'game_id': game_id, 'game': game_state}), 200)
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 400)
+        except RuntimeError as e:
+            return make_response(jsonify({'error': str(e)}), 503)
+        except Exception as e:
+            app.logger.error("Error submitting answer: %s", e)
+            return make_response(jsonify({'error': 'Failed to submit answer'}), 500)
+
+
+    # The original single-game routes play the default game
+
+    @app.route('/api/add-opponent', methods=['POST'])
+    def add_opponent():
+        """Route to add an opponent to the game."""
+        return _add_opponent(DEFAULT_GAME_ID, create=True)
+
+
+    @app.route('/api/start-game', methods=['POST'])
+    def start_game():
+        """Route to start a game."""
+        return _start_game(DEFAULT_GAME_ID, create=True)
 
 
     @app.route('/api/get-opponents', methods=['GET'])
     def get_opponents():
         """Route to retrieve the list of opponents."""
-        try:
-            opponents = game_model.get_opponents()
-            opponents_list = [opponent.to_dict() for opponent in opponents]
-            return make_response(jsonify({'status': 'success', 'opponents': opponents_list}), 200)
-        except Exception as e:
-            app.logger.error(f"Error retrieving opponents: {e}")
-            return make_response(jsonify({'error': 'Failed to retrieve opponents'}), 500)
+        return _get_opponents(DEFAULT_GAME_ID, create=True)
 
 
     @app.route('/api/clear-opponents', methods=['POST'])
     def clear_opponents():
         """Route to clear the list of opponents."""
+        return _clear_opponents(DEFAULT_GAME_ID, create=True)
+
+
+##########################################################
+#
+# Question bank
+#
+##########################################################
+
+
+    @app.route('/api/load-questions', methods=['POST'])
+    def load_questions_route() -> Response:
+        """
+        Route to fill the local question bank from a JSON dump, without touching OpenTDB.
+
+        Expected JSON Input:
+            - results (list): Questions in the OpenTDB result format (a saved OpenTDB
+              response can be posted as-is). A plain list of questions is accepted too.
+
+        Returns:
+            JSON response with the number of questions added.
+        Raises:
+            400 error if the payload is not a list of questions.
+            500 error if there is an issue adding the questions to the database.
+        """
         try:
-            game_model.clear_opponents()
-            return make_response(jsonify({'status': 'success', 'message': 'Opponents cleared'}), 200)
+            data = request.get_json()
+            questions = data.get('results') if isinstance(data, dict) else data
+            if not isinstance(questions, list):
+                return make_response(jsonify({'error': 'Expected a list of trivia questions'}), 400)
+
+            added = load_questions(questions)
+            return make_response(jsonify({'status': 'success', 'added': added, 'total': count_questions()}), 200)
+        except (KeyError, TypeError) as e:
+            app.logger.error("Invalid question in payload: %s", str(e))
+            return make_response(jsonify({'error': 'Invalid question in payload'}), 400)
         except Exception as e:
-            app.logger.error(f"Error clearing opponents: {e}")
-            return make_response(jsonify({'error': 'Failed to clear opponents'}), 500)
+            app.logger.error("Error loading questions: %s", str(e))
+            return make_response(jsonify({'error': 'Failed to load questions'}), 500)
+
+
+    @app.route('/api/prefetch-questions', methods=['POST'])
+    def prefetch_questions_route() -> Response:
+        """
+        Route to start bulk-filling the local question bank from OpenTDB in batches of 50.
+
+        OpenTDB allows one request every 5 seconds, so the questions are fetched in the
+        background; poll the job for progress.
+
+        Expected JSON Input:
+            - categories (list[int]): The category IDs to fetch.
+            - batches (int, optional): Batches of 50 questions per category/type/difficulty (default 1).
+
+        Returns:
+            JSON response with the ID of the prefetch job.
+        Raises:
+            400 error if input validation fails or the job would make too many requests.
+            503 error if a prefetch is already running.
+            500 error if the job cannot be started.
+        """
+        try:
+            data = request.get_json()
+            categories = data.get('categories')
+            batches = data.get('batches', 1)
+
+            if not categories or not all(isinstance(category, int) for category in categories) or not isinstance(batches, int):
+                return make_response(jsonify({'error': 'Invalid input, categories must be a list of category IDs'}), 400)
+
+            job = prefetch_jobs.start(categories, batches)
+            return make_response(jsonify({'status': 'success', 'job_id': job.id, 'buckets': job.buckets}), 202)
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 400)
+        except RuntimeError as e:
+            return make_response(jsonify({'error': str(e)}), 503)
+        except Exception as e:
+            app.logger.error("Error prefetching questions: %s", str(e))
+            return make_response(jsonify({'error': 'Failed to prefetch questions'}), 500)
+
+
+    @app.route('/api/prefetch-questions/<string:job_id>', methods=['GET'])
+    def prefetch_progress(job_id: str) -> Response:
+        """
+        Route to report a prefetch job's progress.
+
+        Returns:
+            JSON response with the job's state, buckets done and questions added, and the bank's size.
+        Raises:
+            400 error if there is no prefetch job with the given ID.
+        """
+        try:
+            progress = prefetch_jobs.progress(job_id)
+            return make_response(jsonify({'status': 'success', 'job': progress, 'total': count_questions()}), 200)
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 400)
 
     return app
 
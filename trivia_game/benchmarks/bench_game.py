@@ -0,0 +1,136 @@
+"""
+Benchmarks for GameModel, run headless through the simulation harness.
+
+Usage (from the trivia_game directory):
+    python -m benchmarks.bench_game --games 5000
+    python -m benchmarks.bench_game --save baseline.json
+    python -m benchmarks.bench_game --baseline baseline.json --tolerance 0.2
+
+With --baseline the run fails (exit code 1) if games/sec dropped, or the memory
+a game allocates while it runs grew, by more than the tolerance, or if games
+started leaking memory blocks.
+"""
+import argparse
+import json
+import statistics
+import sys
+import tracemalloc
+
+from trivia_game.models.simulation import (
+    InMemoryQuestionSource, accuracy, random_guess, simulate_games, simulate_rounds_batch
+)
+
+
+# Memory blocks a game may leave behind, on average, before it counts as a leak
+RETAINED_BLOCKS_SLACK = 0.5
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def bench_games(games: int, seed: str) -> dict:
+    """Plays games through GameModel and reports throughput and per-round latency."""
+    simulate_games(min(games, 100), seed=seed)  # warm up
+    result = simulate_games(games, strategies=(accuracy(0.8), random_guess), seed=seed, record_latency=True)
+    latencies = result.round_latencies
+    return {
+        "games_per_second": round(result.games_per_second, 1),
+        "round_latency_us": {
+            "mean": round(statistics.mean(latencies) * 1e6, 2),
+            "p50": round(percentile(latencies, 0.50) * 1e6, 2),
+            "p95": round(percentile(latencies, 0.95) * 1e6, 2),
+            "p99": round(percentile(latencies, 0.99) * 1e6, 2)
+        }
+    }
+
+
+def bench_allocations(games: int, seed: str) -> dict:
+    """
+    Measures the memory each simulated game allocates while it runs, and what the games leave behind.
+
+    tracemalloc only sees live blocks, so a game's allocations are measured as the
+    peak of traced memory above its starting point, one game at a time. Blocks
+    still alive after every game has finished are counted as retained.
+    """
+    source = InMemoryQuestionSource.generate(categories=(9, 11))
+    simulate_games(10, source=source, seed=seed)  # warm up
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    allocated = []
+    for i in range(games):
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        simulate_games(1, source=source, seed=f"{seed}:{i}")
+        _, peak = tracemalloc.get_traced_memory()
+        allocated.append(peak - start)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    # Leave out the measurements kept by this loop
+    ours = [tracemalloc.Filter(False, __file__)]
+    stats = after.filter_traces(ours).compare_to(before.filter_traces(ours), "filename")
+    blocks = sum(max(stat.count_diff, 0) for stat in stats)
+    return {
+        "bytes_allocated_per_game": {
+            "p50": percentile(allocated, 0.50),
+            "p95": percentile(allocated, 0.95)
+        },
+        "blocks_retained_per_game": round(blocks / games, 2)
+    }
+
+
+def bench_batch(games: int, seed: int) -> dict:
+    """Scores games with the batched (NumPy when available) path."""
+    result = simulate_rounds_batch(games, seed=seed)
+    return {"games_per_second": round(result.games_per_second, 1), "games": result.games}
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    now, then = report["games"]["games_per_second"], baseline["games"]["games_per_second"]
+    if now < then * (1 - tolerance):
+        regressions.append(f"games/sec fell from {then} to {now}")
+    now = report["allocations"]["bytes_allocated_per_game"]["p50"]
+    then = baseline["allocations"]["bytes_allocated_per_game"]["p50"]
+    if now > then * (1 + tolerance):
+        regressions.append(f"bytes allocated per game grew from {then} to {now}")
+    now, then = report["allocations"]["blocks_retained_per_game"], baseline["allocations"]["blocks_retained_per_game"]
+    if now > then + RETAINED_BLOCKS_SLACK:
+        regressions.append(f"blocks retained per game grew from {then} to {now}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark headless GameModel games.")
+    parser.add_argument("--games", type=int, default=2000, help="games played through GameModel")
+    parser.add_argument("--batch-games", type=int, default=1_000_000, help="games scored by the batched path")
+    parser.add_argument("--seed", default="bench", help="seed for reproducible runs")
+    parser.add_argument("--save", help="write the report to this JSON file")
+    parser.add_argument("--baseline", help="compare against a report saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+
+    report = {
+        "games": bench_games(args.games, args.seed),
+        "allocations": bench_allocations(min(args.games, 500), args.seed),
+        "batch": bench_batch(args.batch_games, seed=0)
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.save:
+        with open(args.save, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare(report, json.load(fh), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
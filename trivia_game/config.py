@@ -7,9 +7,32 @@ class ProductionConfig():
                                            # But we are doing unnecessarily complicated Redis
                                            # write-throughs
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///app.db')
+    # Signs session tokens and must be the same for every worker. The random fallback
+    # only suits a single process (or workers forked from a preloaded app), and every
+    # restart ends all sessions.
+    SECRET_KEY = os.getenv('SECRET_KEY') or os.urandom(32).hex()
+    SESSION_TTL = int(os.getenv('SESSION_TTL', 60 * 60))  # seconds of inactivity before a session expires
+    CATEGORY_REFRESH_INTERVAL = int(os.getenv('CATEGORY_REFRESH_INTERVAL', 24 * 60 * 60))  # seconds, 0 disables
+    MAX_GAMES = int(os.getenv('MAX_GAMES', 1000))
+    GAME_IDLE_TIMEOUT = int(os.getenv('GAME_IDLE_TIMEOUT', 30 * 60))  # seconds
+    GAME_STORE = os.getenv('GAME_STORE', 'memory')  # 'redis' to share games between worker processes
+    TOURNAMENT_STORE = os.getenv('TOURNAMENT_STORE', 'memory')  # 'redis' to report tournaments from every worker process
+    PREFETCH_STORE = os.getenv('PREFETCH_STORE', 'memory')  # 'redis' to report prefetch jobs from every worker process
+    MASCOT_PREFETCH = os.getenv('MASCOT_PREFETCH', 'true').lower() == 'true'  # refill the mascot pool in the background
+    MASCOT_REFILL_INTERVAL = int(os.getenv('MASCOT_REFILL_INTERVAL', 300))  # seconds
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_LEVELS = os.getenv('LOG_LEVELS', 'trivia_game.utils.sql_utils=WARNING')  # per-module levels, module=LEVEL,...
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # one JSON object per line, for log shippers
+    PROFILER_ENABLED = os.getenv('PROFILER_ENABLED', 'false').lower() == 'true'  # serve /api/admin/profile
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')  # required in the X-Admin-Token header of admin routes
+    SERVER_TIMING = os.getenv('SERVER_TIMING', 'false').lower() == 'true'  # Server-Timing for every caller, not just admins
+    METRICS_DIR = os.getenv('METRICS_DIR', '')  # where each worker process writes its metrics, so every scrape sees all of them
 
 class TestConfig():
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///app.db')  # Use in-memory database for tests
\ No newline at end of file
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///app.db')  # Use in-memory database for tests
+    SECRET_KEY = 'test-secret-key'
+    CATEGORY_REFRESH_INTERVAL = 0
+    MASCOT_PREFETCH = False
\ No newline at end of file
@@ -15,5 +15,10 @@ fi
 
 
 
-# Start the Python application
-exec python3 app.py
\ No newline at end of file
+# Start the application: gunicorn (one worker per core when REDIS_HOST is set, one
+# worker otherwise), or SERVER=flask for the single-process development server
+if [ "$SERVER" = "flask" ]; then
+    exec python3 app.py
+else
+    exec gunicorn -c gunicorn.conf.py wsgi:app
+fi
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Gunicorn settings: one pre-forked worker process per core, each with a few threads.
+
+The app is built once in the master (preload_app) and the workers are forked from
+it, sharing its imported code. Games, tournaments and OpenTDB's rate limit live
+in Redis, so any worker can serve any request; see trivia_game/utils/prefork.py
+for what each worker sets up again. Without REDIS_HOST (e.g. the standalone
+container of run_docker.sh) a single worker keeps everything in memory, as the
+development server does.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+import glob
+import multiprocessing
+import os
+import sys
+import tempfile
+
+# The config is loaded before gunicorn puts the app's directory on the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from trivia_game.utils import prefork  # noqa: E402
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+# Workers can only share state through Redis
+redis_configured = bool(os.getenv("REDIS_HOST"))
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() if redis_configured else 1))
+# Requests mostly wait on sqlite, Redis and OpenTDB, so each worker also serves a few at once
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+preload_app = True
+# Longer than the longest /api/admin/profile run
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 90))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+accesslog = "-" if os.getenv("GUNICORN_ACCESS_LOG", "false").lower() == "true" else None
+
+# State every worker must share, which an in-memory store per process cannot give:
+# the games, the progress of tournaments and prefetch jobs (run by one worker,
+# polled through any), and OpenTDB's rate limit and session token (otherwise each
+# worker would spend the whole request budget on its own and get rate limited)
+SHARED_STORES = ("GAME_STORE", "TOURNAMENT_STORE", "PREFETCH_STORE", "RATE_LIMIT_BACKEND",
+                 "SESSION_TOKEN_BACKEND")
+for setting in SHARED_STORES:
+    os.environ.setdefault(setting, "redis" if redis_configured else "memory")
+    if workers > 1 and os.environ[setting] != "redis":
+        raise RuntimeError(f"{setting} must be 'redis' when serving with more than one worker: "
+                           "set REDIS_HOST, or WEB_CONCURRENCY=1 to serve from one worker without Redis")
+
+# A team changed through one worker would be served stale from the others' in-process caches
+os.environ.setdefault("TEAM_LOCAL_CACHE", "true" if workers == 1 else "false")
+
+# Each worker writes its metrics here, so /api/metrics reports every worker (see utils/metrics.py)
+os.environ.setdefault("METRICS_DIR", os.path.join(tempfile.gettempdir(), "trivia-metrics"))
+
+# Config is read before the app is preloaded: keep the master free of threads and network calls
+prefork.defer_worker_start()
+
+
+def on_starting(server):
+    # Counts left by the workers of a previous run would be added to this run's
+    for path in glob.glob(os.path.join(os.environ["METRICS_DIR"], "*.json")):
+        os.remove(path)
+
+
+def post_fork(server, worker):
+    prefork.start_worker()
+
+
+def worker_exit(server, worker):
+    prefork.stop_worker()
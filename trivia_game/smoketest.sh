@@ -95,6 +95,7 @@ login_user() {
     -d '{"username":"testuser", "password":"password123"}')
   if echo "$response" | grep -q '"message": "User testuser logged in successfully."'; then
     echo "User logged in successfully."
+    SESSION_TOKEN=$(echo "$response" | sed -n 's/.*"token": *"\([^"]*\)".*/\1/p')
     if [ "$ECHO_JSON" = true ]; then
       echo "Login Response JSON:"
       echo "$response" | jq .
@@ -112,8 +113,7 @@ login_user() {
 # Function to log out a user
 logout_user() {
   echo "Logging out user..."
-  response=$(curl -s -X POST "$BASE_URL/logout" -H "Content-Type: application/json" \
-    -d '{"username":"testuser"}')
+  response=$(curl -s -X POST "$BASE_URL/logout" -H "Authorization: Bearer $SESSION_TOKEN")
   if echo "$response" | grep -q '"message": "User testuser logged out successfully."'; then
     echo "User logged out successfully."
     if [ "$ECHO_JSON" = true ]; then
@@ -317,6 +317,30 @@ clear_opponents() {
 
 
 
+# Function to fill the question bank for both rounds (games never fetch from OpenTDB themselves)
+load_questions() {
+  echo "Loading questions into the question bank..."
+  response=$(curl -s -X POST "$BASE_URL/load-questions" -H "Content-Type: application/json" \
+    -d '{"results": [
+      {"category": 17, "type": "boolean", "difficulty": "easy", "question": "The sun is a star.",
+       "correct_answer": "True", "incorrect_answers": ["False"]},
+      {"category": 11, "type": "multiple", "difficulty": "easy", "question": "Who directed Jaws?",
+       "correct_answer": "Steven Spielberg", "incorrect_answers": ["George Lucas", "Ridley Scott", "James Cameron"]}
+    ]}')
+
+  if echo "$response" | grep -q '"status": "success"'; then
+    echo "Questions loaded successfully."
+    if [ "$ECHO_JSON" = true ]; then
+      echo "Load Questions Response JSON:"
+      echo "$response" | jq .
+    fi
+  else
+    echo "Failed to load questions."
+    echo "Response: $response"
+    exit 1
+  fi
+}
+
 # Function to perform a smoke test for the /api/start-game route
 start_game() {
   echo "Testing /api/start-game..."
@@ -338,6 +362,28 @@ start_game() {
   fi
 }
 
+# Function to perform a smoke test for the /api/games/<game_id>/answer route
+submit_answer() {
+  team_id=$1
+  answer=$2
+
+  echo "Testing /api/games/default/answer with team_id ($team_id)..."
+
+  json_payload="{\"team_id\":$team_id, \"answer\":\"$answer\"}"
+  response=$(curl -s -X POST "$BASE_URL/games/default/answer" -H "Content-Type: application/json" -d "$json_payload")
+
+  if echo "$response" | grep -q '"status": "success"'; then
+    echo "Answer recorded for team ID ($team_id)."
+    if [ "$ECHO_JSON" = true ]; then
+      echo "Submit Answer Response JSON:"
+      echo "$response" | jq .
+    fi
+  else
+    echo "Failed to record answer for team ID ($team_id)."
+    echo "Response: $response"
+    exit 1
+  fi
+}
 
 
 check_health
@@ -346,17 +392,19 @@ init_db
 random_dog_smoke_test
 create_user
 login_user
-create_team "peebo" 1
+create_team "peebo" 9
 delete_team 1
 clear_teams
-create_team "gorp" 3
-create_team "boing" 7
+create_team "gorp" 17
+create_team "boing" 11
 get_team_by_name "gorp"
 get_team_by_id 1
 update_team_stats 1 "win"
 clear_opponents
 add_opponent 1
 add_opponent 2
+load_questions
 start_game
-
-
+submit_answer 1 "True"
+submit_answer 2 "False"
+logout_user
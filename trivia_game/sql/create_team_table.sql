@@ -1,6 +1,7 @@
 PRAGMA foreign_keys = ON;
 
 DROP TABLE IF EXISTS teams;
+DROP TABLE IF EXISTS leaderboard_counts;
 DROP TABLE IF EXISTS categories;
 
 
@@ -48,4 +49,57 @@ CREATE TABLE teams (
     FOREIGN KEY (favorite_category) REFERENCES categories(id)
 );
 
+-- Covers the leaderboard queries: rows come out of the index already in ranking
+-- order (team is included so no table lookup is needed).
+CREATE INDEX idx_teams_leaderboard ON teams (deleted, total_score DESC, games_played, team);
 
+-- The number of live teams with each (total_score, games_played), kept up to date
+-- by the triggers below whatever writes to teams. A team's rank sums the groups
+-- above it instead of counting every team above it.
+CREATE TABLE leaderboard_counts (
+    total_score INTEGER NOT NULL,
+    games_played INTEGER NOT NULL,
+    teams INTEGER NOT NULL,
+    PRIMARY KEY (total_score, games_played)
+) WITHOUT ROWID;
+
+CREATE TRIGGER teams_leaderboard_insert AFTER INSERT ON teams WHEN NOT NEW.deleted
+BEGIN
+    INSERT INTO leaderboard_counts (total_score, games_played, teams)
+    VALUES (NEW.total_score, NEW.games_played, 1)
+    ON CONFLICT (total_score, games_played) DO UPDATE SET teams = teams + 1;
+END;
+
+CREATE TRIGGER teams_leaderboard_update AFTER UPDATE OF deleted, total_score, games_played ON teams
+BEGIN
+    UPDATE leaderboard_counts SET teams = teams - 1
+    WHERE NOT OLD.deleted AND total_score = OLD.total_score AND games_played = OLD.games_played;
+    INSERT INTO leaderboard_counts (total_score, games_played, teams)
+    SELECT NEW.total_score, NEW.games_played, 1 WHERE NOT NEW.deleted
+    ON CONFLICT (total_score, games_played) DO UPDATE SET teams = teams + 1;
+    DELETE FROM leaderboard_counts
+    WHERE teams = 0 AND total_score = OLD.total_score AND games_played = OLD.games_played;
+END;
+
+CREATE TRIGGER teams_leaderboard_delete AFTER DELETE ON teams WHEN NOT OLD.deleted
+BEGIN
+    UPDATE leaderboard_counts SET teams = teams - 1
+    WHERE total_score = OLD.total_score AND games_played = OLD.games_played;
+    DELETE FROM leaderboard_counts
+    WHERE teams = 0 AND total_score = OLD.total_score AND games_played = OLD.games_played;
+END;
+
+-- The question bank is not dropped with the teams so that a prefetched or
+-- offline-loaded bank survives a call to clear_teams().
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    question TEXT NOT NULL,
+    correct_answer TEXT NOT NULL,
+    incorrect_answers TEXT NOT NULL DEFAULT '[]',
+    UNIQUE (category, type, question)
+);
+
+CREATE INDEX IF NOT EXISTS idx_questions_bucket ON questions (category, type, difficulty);
@@ -1,12 +1,74 @@
+import inspect
+import os
+import sqlite3
+
+import fakeredis
+import mongomock
+from mongomock.collection import BulkOperationBuilder
 import pytest
 
 from ..app import create_app
 from config import TestConfig
+from trivia_game.clients import http_client, opentdb_client
+from trivia_game.models import mongo_session_model
+from trivia_game.models.password_model import user_id_cache
+from trivia_game.models.team_model import local_team_cache
 from trivia_game.utils.db import db
+from trivia_game.utils.sql_utils import close_pools
+
+@pytest.fixture(autouse=True)
+def no_opentdb_rate_limit(mocker):
+    """Keep the shared OpenTDB limiter from sleeping between mocked requests."""
+    return mocker.patch.object(opentdb_client.opentdb_limiter, "acquire", return_value=0.0)
+
+@pytest.fixture(autouse=True)
+def no_http_retries(monkeypatch):
+    """Give each test an HTTP client that fails fast, so mocked errors are seen once (see test_http_client for retries)."""
+    client = http_client.HttpClient(policies={}, default_policy=http_client.HostPolicy(retries=0))
+    monkeypatch.setitem(http_client._clients, os.getpid(), client)
+    monkeypatch.setattr(opentdb_client, "OPENTDB_RETRIES", 0)
+    yield client
+    client.close()
+
+@pytest.fixture(autouse=True)
+def fresh_session_token():
+    """Make every test start without a cached OpenTDB session token."""
+    opentdb_client.session_tokens.clear()
+    yield
+    opentdb_client.session_tokens.clear()
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    """Every test gets its own tables, so cached users and teams must not leak between tests."""
+    user_id_cache.clear()
+    local_team_cache.clear()
+    yield
+    user_id_cache.clear()
+    local_team_cache.clear()
+
+# pymongo 4.11+ passes a sort option to bulk updates, which mongomock does not accept yet
+if "sort" not in inspect.signature(BulkOperationBuilder.add_update).parameters:
+    _add_update = BulkOperationBuilder.add_update
+
+    def _add_update_without_sort(self, *args, sort=None, **kwargs):
+        return _add_update(self, *args, **kwargs)
+
+    BulkOperationBuilder.add_update = _add_update_without_sort
+
+@pytest.fixture(autouse=True)
+def mongo_sessions(monkeypatch):
+    """Back game-session persistence with an in-memory MongoDB."""
+    collection = mongomock.MongoClient()["trivia_game"]["sessions"]
+    monkeypatch.setattr(mongo_session_model, "sessions_collection", collection)
+    # Tests flush explicitly instead of waiting on the debounce timer
+    monkeypatch.setattr(mongo_session_model.session_writer, "flush_interval", 3600)
+    monkeypatch.setattr(mongo_session_model.session_writer, "_pending", {})
+    return collection
 
 @pytest.fixture
 def app():
     app = create_app(TestConfig)
+    app.extensions['session_store']._redis = fakeredis.FakeStrictRedis()
     with app.app_context():
         db.create_all()
         yield app
@@ -20,4 +82,17 @@ def client(app):
 @pytest.fixture
 def session(app):
     with app.app_context():
-        yield db.session
\ No newline at end of file
+        yield db.session
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """Point the sqlite layer at a fresh database created from the schema script."""
+    db_path = tmp_path / "trivia_game.db"
+    with open("sql/create_team_table.sql", "r") as fh:
+        script = fh.read()
+    conn = sqlite3.connect(db_path)
+    conn.executescript(script)
+    conn.close()
+
+    monkeypatch.setattr("trivia_game.utils.sql_utils.DB_PATH", str(db_path))
+    yield db_path
+    close_pools()
@@ -0,0 +1,100 @@
+import fakeredis
+import pytest
+import redis
+
+from trivia_game.models.auth_session_model import SessionStore
+from trivia_game.models.password_model import Users
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeStrictRedis()
+
+
+@pytest.fixture
+def store(redis_client):
+    return SessionStore(redis_client, "secret", ttl=60)
+
+
+def test_create_and_validate(store):
+    """Test a session token resolves to its user."""
+    token = store.create(7, "testuser")
+
+    assert store.validate(token) == {"user_id": 7, "username": "testuser"}
+
+
+def test_validate_slides_expiry(store, redis_client):
+    """Test using a session pushes its expiry back."""
+    token = store.create(7, "testuser")
+    key = SessionStore.KEY_PREFIX + token.split(".")[0]
+    redis_client.expire(key, 5)
+
+    store.validate(token)
+
+    assert redis_client.ttl(key) > 5
+
+
+def test_validate_rejects_forged_token(store, redis_client, mocker):
+    """Test a token with a bad signature is rejected without asking Redis."""
+    token = store.create(7, "testuser")
+    spy = mocker.spy(redis_client, "getex")
+
+    assert store.validate(token[:-2] + "xx") is None
+    assert store.validate("garbage") is None
+    assert SessionStore(redis_client, "other-secret").validate(token) is None
+    spy.assert_not_called()
+
+
+def test_validate_expired(store, redis_client):
+    """Test an expired session is rejected."""
+    token = store.create(7, "testuser")
+    redis_client.flushall()
+
+    assert store.validate(token) is None
+
+
+def test_revoke(store):
+    """Test a revoked session can no longer be used."""
+    token = store.create(7, "testuser")
+
+    assert store.revoke(token) is True
+    assert store.validate(token) is None
+    assert store.revoke(token) is False
+
+
+def test_secret_key_required(redis_client):
+    """Test a store cannot be created without a secret key."""
+    with pytest.raises(ValueError):
+        SessionStore(redis_client, "")
+
+
+def test_login_session_logout(client, session):
+    """Test logging in issues a token that authenticates requests until logout."""
+    Users.create_user("testuser", "password123")
+
+    response = client.post("/api/login", json={"username": "testuser", "password": "password123"})
+    assert response.status_code == 200
+    headers = {"Authorization": f"Bearer {response.json['token']}"}
+
+    response = client.get("/api/session", headers=headers)
+    assert response.status_code == 200
+    assert response.json["user"]["username"] == "testuser"
+
+    assert client.post("/api/logout", headers=headers).status_code == 200
+    assert client.get("/api/session", headers=headers).status_code == 401
+
+
+def test_logout_requires_token(client, session):
+    """Test logout no longer trusts a username in the body."""
+    response = client.post("/api/logout", json={"username": "testuser"})
+
+    assert response.status_code == 401
+
+
+def test_session_store_unavailable(client, app, mocker):
+    """Test requests carrying a token fail closed when Redis is down."""
+    mocker.patch.object(app.extensions["session_store"]._redis, "getex", side_effect=redis.exceptions.ConnectionError("down"))
+    token = app.extensions["session_store"]._signer.sign("abc").decode()
+
+    assert client.get("/api/session", headers={"Authorization": f"Bearer {token}"}).status_code == 503
+    assert client.get("/api/health").status_code == 200
@@ -0,0 +1,84 @@
+import sqlite3
+
+import pytest
+
+from trivia_game.models.category_model import CategoryCatalog, category_catalog
+
+
+@pytest.fixture
+def catalog(sqlite_db):
+    """Fixture to create a catalog over a freshly seeded categories table."""
+    return CategoryCatalog(ttl=60)
+
+
+def test_get_categories(catalog):
+    """Test the catalog reads the seeded categories."""
+    categories = catalog.get_categories()
+
+    assert len(categories) == 24
+    assert categories[0] == {"id": 9, "name": "General Knowledge"}
+    assert catalog.get_name(18) == "Science: Computers"
+
+
+def test_get_categories_is_cached(catalog, mocker):
+    """Test repeat reads within the TTL do not touch the database."""
+    catalog.get_categories()
+    mock_connection = mocker.patch("trivia_game.models.category_model.get_db_connection")
+
+    catalog.get_categories()
+    mock_connection.assert_not_called()
+
+
+def test_get_categories_reloads_after_ttl(catalog, sqlite_db, mocker):
+    """Test the catalog re-reads the table once the TTL has passed."""
+    mock_clock = mocker.patch("trivia_game.models.category_model.time.monotonic", return_value=0.0)
+    catalog.get_categories()
+
+    conn = sqlite3.connect(sqlite_db)
+    conn.execute("UPDATE categories SET name = 'Trivia' WHERE id = 9")
+    conn.commit()
+    conn.close()
+
+    assert catalog.get_name(9) == "General Knowledge"
+    mock_clock.return_value = 61.0
+    assert catalog.get_name(9) == "Trivia"
+
+
+def test_get_name_unknown(catalog):
+    """Test looking up an unknown category raises a ValueError."""
+    with pytest.raises(ValueError, match="Category with ID 99 not found"):
+        catalog.get_name(99)
+
+
+def test_stale_categories_served_on_database_error(catalog, mocker):
+    """Test the last good catalog is served when the database fails."""
+    mocker.patch("trivia_game.models.category_model.time.monotonic", side_effect=[0.0, 1000.0])
+    categories = catalog.get_categories()
+    mocker.patch("trivia_game.models.category_model.get_db_connection", side_effect=sqlite3.Error("locked"))
+
+    assert catalog.get_categories() == categories
+
+
+def test_etag_changes_with_catalog(catalog, mocker):
+    """Test the ETag follows the content of the catalog."""
+    etag = catalog.etag()
+    mocker.patch("requests.Session.get").return_value.json.return_value = {
+        "trivia_categories": [{"id": 9, "name": "General Trivia"}]
+    }
+
+    assert catalog.refresh_from_opentdb() == 1
+    assert catalog.get_name(9) == "General Trivia"
+    assert catalog.etag() != etag
+
+
+def test_categories_route_etag(client, sqlite_db, mocker):
+    """Test the categories endpoint answers a matching If-None-Match with 304."""
+    mocker.patch.object(category_catalog, "_categories", None)
+
+    response = client.get("/api/categories")
+    assert response.status_code == 200
+    assert len(response.get_json()["categories"]) == 24
+
+    etag = response.headers["ETag"]
+    response = client.get("/api/categories", headers={"If-None-Match": etag})
+    assert response.status_code == 304
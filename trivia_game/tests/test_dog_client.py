@@ -0,0 +1,158 @@
+import threading
+
+import fakeredis
+import pytest
+import requests
+
+from trivia_game.clients.dog_client import DEFAULT_MASCOT_URL, MascotPool, fetch_dog_images, load_seed
+from trivia_game.utils.circuit_breaker import CircuitBreaker
+
+
+@pytest.fixture
+def mock_dog_api(mocker):
+    mock_get = mocker.patch("requests.Session.get")
+    mock_get.return_value.json.return_value = {
+        "status": "success",
+        "message": ["https://dog.ceo/a.jpg", "https://dog.ceo/b.jpg"]
+    }
+    return mock_get
+
+
+def test_fetch_dog_images(mock_dog_api):
+    """Test a batch is requested with a timeout."""
+    assert fetch_dog_images(2) == ["https://dog.ceo/a.jpg", "https://dog.ceo/b.jpg"]
+
+    args, kwargs = mock_dog_api.call_args
+    assert args[0].endswith("/breeds/image/random/2")
+    assert kwargs["timeout"] > 0
+
+
+def test_fetch_dog_images_bad_response(mock_dog_api):
+    """Test an error response from the API raises a ValueError."""
+    mock_dog_api.return_value.json.return_value = {"status": "error", "message": "Breed not found"}
+
+    with pytest.raises(ValueError):
+        fetch_dog_images()
+
+
+def test_load_seed(tmp_path):
+    """Test the seed file skips comments and blank lines."""
+    seed = tmp_path / "seed.txt"
+    seed.write_text("# comment\nhttps://dog.ceo/a.jpg\n\nhttps://dog.ceo/b.jpg\n")
+
+    assert load_seed(str(seed)) == ["https://dog.ceo/a.jpg", "https://dog.ceo/b.jpg"]
+    assert load_seed(str(tmp_path / "missing.txt")) == []
+
+
+def test_pool_serves_seed_without_network(mocker):
+    """Test the pool cycles through its seed and never calls the API from get()."""
+    mock_get = mocker.patch("requests.Session.get")
+    pool = MascotPool(seed=["https://dog.ceo/a.jpg", "https://dog.ceo/b.jpg"])
+
+    served = {pool.get() for _ in range(4)}
+
+    assert served == {"https://dog.ceo/a.jpg", "https://dog.ceo/b.jpg"}
+    mock_get.assert_not_called()
+
+
+def test_pool_without_seed():
+    """Test an empty seed falls back to the default mascot."""
+    assert MascotPool(seed=[]).get() == DEFAULT_MASCOT_URL
+
+
+def test_refill_serves_fresh_urls_first(mock_dog_api):
+    """Test refilled URLs are handed out before the older ones."""
+    pool = MascotPool(capacity=3, batch_size=2, seed=["https://dog.ceo/seed.jpg"])
+
+    assert pool.refill() == 2
+    assert {pool.get(), pool.get()} == {"https://dog.ceo/a.jpg", "https://dog.ceo/b.jpg"}
+    assert pool.stats()["refills"] == 1
+
+
+def test_ring_is_bounded(mock_dog_api):
+    """Test the ring drops the most recently served URLs when full."""
+    pool = MascotPool(capacity=2, seed=["https://dog.ceo/seed.jpg"])
+    pool.refill()
+
+    assert pool.stats()["size"] == 2
+    assert "https://dog.ceo/seed.jpg" not in {pool.get() for _ in range(4)}
+
+
+def test_get_wakes_refill_after_a_batch():
+    """Test serving a batch worth of URLs signals the background worker."""
+    pool = MascotPool(batch_size=2)
+
+    pool.get()
+    assert not pool._wakeup.is_set()
+    pool.get()
+    assert pool._wakeup.is_set()
+
+
+def test_wakeup_during_refill_is_not_lost(mocker):
+    """Test a batch served while a refill runs triggers another refill, not a wait for the interval."""
+    pool = MascotPool(batch_size=2)
+    refilled = threading.Event()
+    calls = []
+
+    def refill():
+        calls.append(1)
+        if len(calls) == 1:
+            pool._wakeup.set()
+        else:
+            refilled.set()
+        return 0
+
+    mocker.patch.object(pool, "refill", side_effect=refill)
+    pool.start_background_refill(interval=60)
+    try:
+        assert refilled.wait(2)
+    finally:
+        pool.stop_background_refill()
+
+
+def test_circuit_breaker_stops_refills(mock_dog_api):
+    """Test refills stop after repeated failures and the seed keeps being served."""
+    mock_dog_api.side_effect = requests.exceptions.Timeout("timed out")
+    pool = MascotPool(seed=["https://dog.ceo/seed.jpg"], breaker=CircuitBreaker("dog.ceo", failure_threshold=2, cooldown=60))
+
+    for _ in range(4):
+        assert pool.refill() == 0
+
+    assert mock_dog_api.call_count == 2
+    assert pool.stats()["circuit"] == CircuitBreaker.OPEN
+    assert pool.get() == "https://dog.ceo/seed.jpg"
+
+
+def test_circuit_breaker_half_open():
+    """Test the breaker lets one call through after the cooldown."""
+    now = [0.0]
+    breaker = CircuitBreaker("test", failure_threshold=1, cooldown=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] = 10.0
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_redis_ring_is_shared(mock_dog_api):
+    """Test pools backed by the same Redis share one ring."""
+    redis_client = fakeredis.FakeStrictRedis()
+    first = MascotPool(capacity=3, seed=["https://dog.ceo/seed.jpg"], redis_client=redis_client)
+    second = MascotPool(capacity=3, seed=["https://dog.ceo/seed.jpg"], redis_client=redis_client)
+
+    first.refill()
+
+    assert {second.get(), second.get()} == {"https://dog.ceo/a.jpg", "https://dog.ceo/b.jpg"}
+    assert redis_client.llen(MascotPool.REDIS_KEY) == 2
+
+
+def test_redis_ring_falls_back_to_memory(mocker):
+    """Test the local ring is used when Redis is unavailable."""
+    redis_client = mocker.Mock()
+    redis_client.rpoplpush.side_effect = ConnectionError("down")
+
+    assert MascotPool(seed=["https://dog.ceo/seed.jpg"], redis_client=redis_client).get() == "https://dog.ceo/seed.jpg"
@@ -1,7 +1,8 @@
 import pytest
 from unittest.mock import MagicMock, patch
 from trivia_game.models.team_model import Team
-from trivia_game.models.game_model import GameModel
+from trivia_game.models.game_model import GAME_WAITING, GameModel
+from trivia_game.models.question_bank_model import Question
 
 
 @pytest.fixture
@@ -27,18 +28,21 @@ def game_model():
 @pytest.fixture
 def mock_requests_get(mocker):
     """Mock the requests.get function."""
-    return mocker.patch("requests.get")
+    return mocker.patch("requests.Session.get")
 
 
 def test_game_model_initialization(mock_requests_get):
-    """Test initialization of GameModel with successful session token retrieval."""
+    """Test GameModel fetches the session token lazily, on first use."""
     mock_requests_get.return_value.json.return_value = {
         "response_code": 0,
         "token": "test_token"
     }
 
     game = GameModel()
+    mock_requests_get.assert_not_called()
     assert game.session_token == "test_token", "Session token was not set correctly."
+    assert game.session_token == "test_token", "Session token should be cached."
+    assert mock_requests_get.call_count == 1, "Session token should only be requested once."
 
 
 def test_game_model_failed_token(mock_requests_get):
@@ -75,13 +79,12 @@ def test_clear_opponents(game_model, mock_team):
     assert len(game_model.opponents) == 0, "Opponents list was not cleared."
 
 
-def test_display_score(game_model, mock_team, mock_requests_get):
-    """Test display_score logs scores and fetches trivia stats."""
-    mock_requests_get.return_value.json.return_value = {
-        "trivia_categories": [
-            {"id": 9, "name": "General Knowledge"},
-        ]
-    }
+def test_display_score(mocker, game_model, mock_team, mock_requests_get):
+    """Test display_score logs scores and category names without calling OpenTDB."""
+    mocker.patch(
+        "trivia_game.models.game_model.category_catalog.get_categories",
+        return_value=[{"id": 9, "name": "General Knowledge"}]
+    )
 
     mock_team.current_score = 5
     game_model.rounds = 10
@@ -91,6 +94,7 @@ def test_display_score(game_model, mock_team, mock_requests_get):
     with patch("logging.Logger.info") as mock_logger_info:
         game_model.display_score()
         assert mock_logger_info.call_count > 0, "Logger.info was not called."
+    mock_requests_get.assert_not_called()
 
 
 def test_display_score_no_categories(mock_requests_get, game_model, mock_team):
@@ -106,10 +110,9 @@ def test_game_not_enough_opponents(game_model):
         game_model.game()
 
 
-def test_game_success(mock_requests_get, game_model, mock_team):
-    """Test successful game execution."""
-    game_model.prep_opponent(mock_team)
-    opponent_2 = Team(
+@pytest.fixture
+def opponent_2():
+    return Team(
         id=2,
         team="Team B",
         favorite_category=11,
@@ -118,18 +121,147 @@ def test_game_success(mock_requests_get, game_model, mock_team):
         current_score=0,
         mascot="https://example.com/mascot2.png"
     )
+
+
+@pytest.fixture
+def mock_questions(mocker):
+    """Mock the question bank with one question per round."""
+    questions = iter([
+        Question(id=1, category=9, type="boolean", difficulty="easy", question="2+2 is 4?",
+                 correct_answer="True", incorrect_answers=["False"]),
+        Question(id=2, category=11, type="multiple", difficulty="easy", question="What is 2+2?",
+                 correct_answer="4", incorrect_answers=["3", "5", "22"]),
+    ])
+    return mocker.patch("trivia_game.models.game_model.draw_question", side_effect=lambda *args, **kwargs: next(questions))
+
+
+def test_game_success(mock_questions, game_model, mock_team, opponent_2):
+    """Test a game is played through answer submissions without blocking."""
+    game_model.prep_opponent(mock_team)
     game_model.prep_opponent(opponent_2)
 
-    mock_requests_get.return_value.json.return_value = {
-        "response_code": 0,
-        "results": [
-            {
-                "question": "What is 2+2?",
-                "correct_answer": "4"
-            }
-        ]
-    }
+    with patch("builtins.input") as mock_input:
+        state = game_model.game()
+        mock_input.assert_not_called()
+
+    assert state["state"] == "in_progress"
+    assert state["round"] == 1
+    assert state["question"]["question"] == "2+2 is 4?"
+    assert sorted(state["question"]["choices"]) == ["False", "True"]
+    assert "correct_answer" not in state["question"], "The answer must not be revealed."
+
+    state = game_model.submit_answer(1, "True")
+    assert state["answered"] == [1]
+    state = game_model.submit_answer(2, "False")
+    assert state["round"] == 2
+    assert state["question"]["question"] == "What is 2+2?"
+
+    game_model.submit_answer(2, "4")
+    state = game_model.submit_answer(1, "4")
+
+    assert state["state"] == "finished"
+    assert [score["score"] for score in state["scores"]] == [2, 1]
+    assert state["winner"] == "Team A"
+    assert mock_questions.call_count == 2, "Each round should draw one question from the bank."
+    assert game_model.asked_questions == {1, 2}, "Asked questions were not recorded."
+    assert mock_team.games_played == 1
+
+
+def test_submit_answer_twice(mock_questions, game_model, mock_team, opponent_2):
+    """Test a team cannot answer the same round twice."""
+    game_model.prep_opponent(mock_team)
+    game_model.prep_opponent(opponent_2)
+    game_model.game()
+    game_model.submit_answer(1, "True")
+
+    with pytest.raises(ValueError, match="has already answered this round"):
+        game_model.submit_answer(1, "False")
+
+
+def test_submit_answer_unknown_team(mock_questions, game_model, mock_team, opponent_2):
+    """Test a team that is not playing cannot answer."""
+    game_model.prep_opponent(mock_team)
+    game_model.prep_opponent(opponent_2)
+    game_model.game()
+
+    with pytest.raises(ValueError, match="is not playing in this game"):
+        game_model.submit_answer(3, "True")
+
+
+def test_submit_answer_without_game(game_model):
+    """Test answering when no game has started raises a ValueError."""
+    with pytest.raises(ValueError, match="No game is in progress."):
+        game_model.submit_answer(1, "True")
+
+
+def test_round_deadline(mocker, mock_questions, game_model, mock_team, opponent_2):
+    """Test a round is scored with missing answers counted wrong once its deadline passes."""
+    mock_time = mocker.patch("trivia_game.models.game_model.time.time", return_value=1000.0)
+    game_model.prep_opponent(mock_team)
+    game_model.prep_opponent(opponent_2)
+    game_model.game()
+    game_model.submit_answer(1, "True")
+
+    mock_time.return_value = 1000.0 + game_model.answer_timeout
+    with pytest.raises(ValueError, match="deadline for this round has passed"):
+        game_model.submit_answer(2, "True")
+
+    state = game_model.get_state()
+    assert state["round"] == 2
+    assert state["results"][0]["answers"] == ["True", None]
+    assert [score["score"] for score in state["scores"]] == [1, 0]
+
+
+def test_get_result():
+    """Test answers are compared ignoring case and surrounding whitespace."""
+    game = GameModel()
+    assert game.get_result(" true ", "True") is True
+    assert game.get_result("False", "True") is False
+    assert game.get_result(None, "True") is False
+
+
+def test_game_already_in_progress(mock_questions, game_model, mock_team, opponent_2):
+    """Test a second start while a game is running raises a ValueError."""
+    game_model.prep_opponent(mock_team)
+    game_model.prep_opponent(opponent_2)
+    game_model.game()
+
+    with pytest.raises(ValueError, match="A game is already in progress."):
+        game_model.game()
+
+
+def test_game_with_empty_bank_is_unavailable(mocker, game_model, mock_team, opponent_2):
+    """Test an empty bucket fails the start right away instead of fetching from OpenTDB."""
+    mocker.patch("trivia_game.models.game_model.draw_question", side_effect=ValueError("empty"))
+    game_model.prep_opponent(mock_team)
+    game_model.prep_opponent(opponent_2)
+
+    with pytest.raises(RuntimeError, match="No questions left"):
+        game_model.game()
+    assert game_model.state == GAME_WAITING
+
+
+def test_seeded_games_replay(mocker, mock_team, opponent_2):
+    """Test two games with the same seed ask the same choices in the same order."""
+    def question(*args, **kwargs):
+        return Question(id=2, category=11, type="multiple", difficulty="easy", question="What is 2+2?",
+                        correct_answer="4", incorrect_answers=["3", "5", "22", "44"])
+    mock_draw = mocker.patch("trivia_game.models.game_model.draw_question", side_effect=question)
+
+    choices = []
+    for _ in range(2):
+        game = GameModel(seed="replay")
+        game.prep_opponent(mock_team)
+        game.prep_opponent(opponent_2)
+        choices.append(game.game()["question"]["choices"])
+
+    assert choices[0] == choices[1]
+    assert mock_draw.call_args[1]["rng"] is not None
+
 
-    with patch("builtins.input", return_value="4"), patch("logging.Logger.info"):
-        result = game_model.game()
-        assert result is True, "Game did not complete successfully."
+def test_seed_survives_restore(mock_questions, mock_team, opponent_2):
+    """Test a restored seeded game keeps its seed."""
+    game = GameModel(seed="replay")
+    restored = GameModel()
+    restored.restore(game.to_dict())
+    assert restored.seed == "replay"
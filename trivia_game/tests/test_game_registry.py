@@ -0,0 +1,233 @@
+import sqlite3
+import threading
+import time
+
+import fakeredis
+import pytest
+
+from ..app import create_app
+from config import TestConfig
+from trivia_game.models.game_model import GameModel
+from trivia_game.models.game_registry import GameRegistry, RedisGameRegistry, create_game_registry
+from trivia_game.models.team_model import Team
+
+
+@pytest.fixture(params=["memory", "redis"])
+def registry(request):
+    if request.param == "redis":
+        return RedisGameRegistry(fakeredis.FakeStrictRedis(), max_games=3, idle_timeout=60)
+    return GameRegistry(max_games=3, idle_timeout=60)
+
+
+@pytest.fixture
+def mock_team():
+    return Team(id=1, team="Team A", favorite_category=9, games_played=0, total_score=0, current_score=0, mascot="")
+
+
+def test_create_game(registry):
+    """Test creating a game returns a new ID for a fresh game."""
+    game_id = registry.create_game()
+
+    assert isinstance(registry.get_game(game_id), GameModel)
+    assert registry.list_games() == [game_id]
+
+
+def test_games_are_independent(registry, mock_team):
+    """Test opponents added to one game do not show up in another."""
+    game_1 = registry.create_game()
+    game_2 = registry.create_game()
+
+    with registry.game_session(game_1) as game:
+        game.prep_opponent(mock_team)
+
+    assert len(registry.get_game(game_1).opponents) == 1
+    assert registry.get_game(game_2).opponents == []
+
+
+def test_get_missing_game(registry):
+    """Test looking up an unknown game raises a ValueError."""
+    with pytest.raises(ValueError, match="Game missing not found"):
+        registry.get_game("missing")
+
+
+def test_game_session_create(registry):
+    """Test game_session can create a game under a fixed ID."""
+    with registry.game_session("default", create=True) as game:
+        assert isinstance(game, GameModel)
+    assert registry.list_games() == ["default"]
+
+
+def test_delete_game(registry):
+    """Test deleting a game frees it."""
+    game_id = registry.create_game()
+    registry.delete_game(game_id)
+
+    with pytest.raises(ValueError):
+        registry.get_game(game_id)
+    with pytest.raises(ValueError):
+        registry.delete_game(game_id)
+
+
+def test_max_games(registry):
+    """Test the registry refuses new games once it is full."""
+    for _ in range(3):
+        registry.create_game()
+
+    with pytest.raises(RuntimeError, match="Too many games in progress"):
+        registry.create_game()
+
+
+def test_idle_games_are_evicted(registry, mocker):
+    """Test idle games are evicted, making room for new ones."""
+    clock = "time.time" if isinstance(registry, RedisGameRegistry) else "time.monotonic"
+    mock_clock = mocker.patch(f"trivia_game.models.game_registry.{clock}", return_value=0.0)
+    old_games = [registry.create_game() for _ in range(3)]
+
+    mock_clock.return_value = 61.0
+    new_game = registry.create_game()
+
+    assert registry.list_games() == [new_game]
+    with pytest.raises(ValueError):
+        registry.get_game(old_games[0])
+
+
+def test_game_session_serializes_access(registry, mock_team):
+    """Test concurrent requests for one game do not interleave."""
+    game_id = registry.create_game()
+    inside = []
+
+    def worker():
+        for _ in range(50):
+            with registry.game_session(game_id) as game:
+                inside.append(1)
+                assert len(inside) == 1
+                game.rounds += 1
+                inside.pop()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert registry.get_game(game_id).rounds == 200
+
+
+def test_game_routes(client, sqlite_db):
+    """Test games created through the API keep their own opponents."""
+    conn = sqlite3.connect(sqlite_db)
+    conn.execute("INSERT INTO teams (team, favorite_category, mascot) VALUES ('Team A', 9, '')")
+    conn.commit()
+    conn.close()
+
+    game_id = client.post("/api/games").get_json()["game_id"]
+
+    response = client.post(f"/api/games/{game_id}/opponents", json={"team_id": 1})
+    assert response.status_code == 200
+
+    opponents = client.get(f"/api/games/{game_id}/opponents").get_json()["opponents"]
+    assert [opponent["team"] for opponent in opponents] == ["Team A"]
+    assert client.get("/api/get-opponents").get_json()["opponents"] == []
+
+    assert client.get("/api/games/unknown/opponents").status_code == 400
+
+
+def test_start_route_with_empty_bank(client, sqlite_db):
+    """Test starting a game whose questions have not been prefetched answers 503."""
+    conn = sqlite3.connect(sqlite_db)
+    conn.execute("INSERT INTO teams (team, favorite_category, mascot) VALUES ('Team A', 9, ''), ('Team B', 11, '')")
+    conn.commit()
+    conn.close()
+    game_id = client.post("/api/games").get_json()["game_id"]
+    client.post(f"/api/games/{game_id}/opponents", json={"team_id": 1})
+    client.post(f"/api/games/{game_id}/opponents", json={"team_id": 2})
+
+    response = client.post(f"/api/games/{game_id}/start")
+
+    assert response.status_code == 503
+    assert "No questions left" in response.get_json()["error"]
+
+
+def test_redis_games_are_shared_between_workers(mock_team):
+    """Test a game changed through one worker's registry is seen by another's."""
+    server = fakeredis.FakeServer()
+    worker_1 = RedisGameRegistry(fakeredis.FakeStrictRedis(server=server))
+    worker_2 = RedisGameRegistry(fakeredis.FakeStrictRedis(server=server))
+
+    game_id = worker_1.create_game(seed="replay")
+    with worker_2.game_session(game_id) as game:
+        game.prep_opponent(mock_team)
+
+    game = worker_1.get_game(game_id)
+    assert [opponent.team for opponent in game.opponents] == ["Team A"]
+    assert game.seed == "replay"
+    assert worker_2.list_games() == [game_id]
+
+
+def test_redis_game_lock_times_out():
+    """Test a game locked by another worker for too long is reported as busy."""
+    registry = RedisGameRegistry(fakeredis.FakeStrictRedis(), lock_timeout=0.05)
+    game_id = registry.create_game()
+
+    with registry.game_session(game_id):
+        with pytest.raises(RuntimeError, match="is busy"):
+            with registry.game_session(game_id):
+                pass
+
+
+def test_redis_game_lock_is_extended_while_in_use(mock_team):
+    """Test a request running longer than the lock timeout keeps the game locked and saves it."""
+    registry = RedisGameRegistry(fakeredis.FakeStrictRedis(), lock_timeout=0.1)
+    game_id = registry.create_game()
+
+    with registry.game_session(game_id) as game:
+        time.sleep(0.3)
+        with pytest.raises(RuntimeError, match="is busy"):
+            with registry.game_session(game_id):
+                pass
+        game.prep_opponent(mock_team)
+
+    assert [opponent.team for opponent in registry.get_game(game_id).opponents] == ["Team A"]
+
+
+def test_redis_game_lost_lock_is_not_saved(mock_team):
+    """Test a request whose lock expired fails instead of overwriting the game."""
+    redis_client = fakeredis.FakeStrictRedis()
+    registry = RedisGameRegistry(redis_client, lock_timeout=10)
+    game_id = registry.create_game()
+
+    with pytest.raises(RuntimeError, match="changed by another request"):
+        with registry.game_session(game_id) as game:
+            game.prep_opponent(mock_team)
+            redis_client.delete(f"trivia:game:{game_id}:lock")
+
+    assert registry.get_game(game_id).opponents == []
+
+
+def test_unknown_game_store():
+    """Test an unknown store, or the Redis store without a client, is refused."""
+    with pytest.raises(ValueError):
+        create_game_registry("disk")
+    with pytest.raises(ValueError):
+        create_game_registry("redis")
+
+
+def test_game_routes_with_redis_store(sqlite_db, monkeypatch):
+    """Test the game routes work when games are kept in Redis."""
+    monkeypatch.setitem(create_app.__globals__, "redis_client", fakeredis.FakeStrictRedis())
+
+    class RedisStoreConfig(TestConfig):
+        GAME_STORE = "redis"
+
+    client = create_app(RedisStoreConfig).test_client()
+    conn = sqlite3.connect(sqlite_db)
+    conn.execute("INSERT INTO teams (team, favorite_category, mascot) VALUES ('Team A', 9, '')")
+    conn.commit()
+    conn.close()
+
+    game_id = client.post("/api/games").get_json()["game_id"]
+    assert client.post(f"/api/games/{game_id}/opponents", json={"team_id": 1}).status_code == 200
+
+    opponents = client.get(f"/api/games/{game_id}/opponents").get_json()["opponents"]
+    assert [opponent["team"] for opponent in opponents] == ["Team A"]
+    assert client.get("/api/games").get_json()["games"] == [game_id]
@@ -0,0 +1,138 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+
+import pytest
+import requests
+
+from trivia_game.clients.http_client import HostPolicy, HttpClient, LatencyHistogram
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves canned responses; the test sets the server's `responses` queue."""
+    protocol_version = "HTTP/1.1"  # keep connections alive between requests
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.peers.add(self.client_address)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            status, delay = server.responses.pop(0) if server.responses else (200, 0)
+        time.sleep(delay)
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with server.lock:
+            server.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.peers = set()
+    server.responses = []
+    server.active = 0
+    server.max_active = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/api"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(**policy) -> HttpClient:
+    return HttpClient(policies={"127.0.0.1": HostPolicy(**policy)}, sleep=lambda seconds: None)
+
+
+def test_connections_are_reused(stub_server):
+    """Test sequential requests to one host share a keep-alive connection."""
+    client = make_client()
+    for _ in range(5):
+        assert client.get(stub_server.url).json() == {"ok": True}
+    client.close()
+
+    assert len(stub_server.peers) == 1
+    assert client.stats()["127.0.0.1"]["requests"] == 5
+
+
+def test_retryable_status_is_retried(stub_server):
+    """Test a 503 is retried and the later success returned."""
+    stub_server.responses = [(503, 0), (200, 0)]
+    client = make_client(retries=2)
+
+    assert client.get(stub_server.url).status_code == 200
+    assert client.stats()["127.0.0.1"]["retries"] == 1
+
+
+def test_retries_run_out(stub_server):
+    """Test the last retryable response is returned once retries are used up."""
+    stub_server.responses = [(503, 0), (502, 0)]
+    client = make_client(retries=1)
+
+    assert client.get(stub_server.url).status_code == 502
+
+
+def test_client_errors_are_not_retried(stub_server):
+    """Test a 429 is handed back at once, so upstream rate limits are respected."""
+    stub_server.responses = [(429, 0), (200, 0)]
+    client = make_client(retries=2)
+
+    assert client.get(stub_server.url).status_code == 429
+    assert client.stats()["127.0.0.1"]["retries"] == 0
+
+
+def test_timeout_is_retried_then_raised(stub_server):
+    """Test a slow host times out on every attempt and the timeout is raised."""
+    stub_server.responses = [(200, 0.5), (200, 0.5)]
+    client = make_client(timeout=0.1, retries=1)
+
+    with pytest.raises(requests.exceptions.Timeout):
+        client.get(stub_server.url)
+    stats = client.stats()["127.0.0.1"]
+    assert stats["errors"] == 2
+    assert stats["retries"] == 1
+
+
+def test_concurrency_limit(stub_server):
+    """Test no more than max_concurrency requests reach a host at once."""
+    stub_server.responses = [(200, 0.05)] * 8
+    client = make_client(max_concurrency=2)
+
+    threads = [threading.Thread(target=client.get, args=(stub_server.url,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stub_server.max_active <= 2
+    assert client.stats()["127.0.0.1"]["requests"] == 8
+    assert client.stats()["127.0.0.1"]["in_flight"] == 0
+
+
+def test_backoff_is_jittered_and_capped():
+    """Test the backoff stays between zero and the capped exponential delay."""
+    client = HttpClient(backoff_base=0.5, backoff_cap=2)
+    for attempt in range(6):
+        assert 0 <= client.backoff(attempt) <= min(2, 0.5 * 2 ** attempt)
+
+
+def test_latency_histogram():
+    """Test latencies land in cumulative buckets."""
+    histogram = LatencyHistogram(buckets=(0.1, 1))
+    for seconds in (0.05, 0.5, 5):
+        histogram.observe(seconds)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.1": 1, "1": 2, "+Inf": 3}
+    assert snapshot["count"] == 3
+    assert snapshot["sum"] == pytest.approx(5.55)
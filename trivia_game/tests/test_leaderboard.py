@@ -0,0 +1,152 @@
+import pytest
+
+from trivia_game.models.team_model import (
+    delete_team,
+    get_leaderboard,
+    get_team_rank,
+    leaderboard_cursor,
+    update_team_stats,
+    update_team_stats_batch
+)
+from trivia_game.utils.sql_utils import get_db_connection
+
+
+@pytest.fixture
+def teams_db(sqlite_db):
+    """Fixture with five teams; 'Delta' is deleted."""
+    with get_db_connection() as conn:
+        conn.executemany(
+            "INSERT INTO teams (team, favorite_category, mascot, games_played, total_score) VALUES (?, 9, '', ?, ?)",
+            [("Alpha", 4, 3), ("Bravo", 2, 3), ("Charlie", 5, 1), ("Delta", 1, 9), ("Echo", 2, 3)]
+        )
+        conn.commit()
+    delete_team(4)
+    yield sqlite_db
+
+
+def test_get_leaderboard(teams_db):
+    """Test teams are ranked by score, then fewest games played, then name."""
+    leaderboard = get_leaderboard()
+
+    assert [team["team"] for team in leaderboard] == ["Bravo", "Echo", "Alpha", "Charlie"]
+    assert [team["rank"] for team in leaderboard] == [1, 2, 3, 4]
+    assert leaderboard[0] == {"rank": 1, "id": 2, "team": "Bravo", "total_score": 3, "games_played": 2}
+
+
+def test_get_leaderboard_page(teams_db):
+    """Test a later page carries on the ranking of the earlier ones."""
+    first = get_leaderboard(limit=2)
+    leaderboard = get_leaderboard(limit=2, after=leaderboard_cursor(first[-1]))
+
+    assert [(team["rank"], team["team"]) for team in leaderboard] == [(3, "Alpha"), (4, "Charlie")]
+    assert get_leaderboard(limit=2, after=leaderboard_cursor(leaderboard[-1])) == []
+
+
+def test_get_leaderboard_pages_cover_every_tie(teams_db):
+    """Test one-team pages walk the whole ranking, across ties in score and games played."""
+    walked = get_leaderboard(limit=1)
+    while True:
+        page = get_leaderboard(limit=1, after=leaderboard_cursor(walked[-1]))
+        if not page:
+            break
+        walked.extend(page)
+
+    assert walked == get_leaderboard()
+
+
+def test_get_leaderboard_invalid_cursor(teams_db):
+    """Test a cursor that was not made by leaderboard_cursor is rejected."""
+    with pytest.raises(ValueError, match="Invalid leaderboard cursor"):
+        get_leaderboard(after="not-a-cursor")
+
+
+@pytest.mark.parametrize("condition", [
+    "total_score = 3 AND games_played = 2 AND team > 'Bravo'",
+    "total_score = 3 AND games_played > 2",
+    "total_score < 3"
+])
+def test_get_leaderboard_uses_index(teams_db, condition):
+    """Test every range of a keyset page is read from the covering index without a sort."""
+    with get_db_connection() as conn:
+        plan = " ".join(row[-1] for row in conn.execute(f"""
+            EXPLAIN QUERY PLAN
+            SELECT id, team, total_score, games_played FROM teams
+            WHERE deleted = FALSE AND {condition}
+            ORDER BY total_score DESC, games_played, team
+            LIMIT 10
+        """))
+
+    assert "COVERING INDEX idx_teams_leaderboard" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_get_team_rank(teams_db):
+    """Test a team's rank matches its position on the leaderboard."""
+    for team in get_leaderboard():
+        assert get_team_rank(team["id"]) == team
+
+
+def test_get_team_rank_follows_updates(teams_db):
+    """Test the ranking is maintained as team stats change."""
+    for _ in range(3):
+        update_team_stats(3, "win")
+
+    assert get_team_rank(3)["rank"] == 1
+    assert get_team_rank(2)["rank"] == 2
+
+
+def test_leaderboard_counts_follow_every_write(teams_db):
+    """Test the per-group counts the rank is summed from stay in step with the teams table."""
+    update_team_stats(3, "win")
+    update_team_stats_batch([(1, "win"), (2, "loss"), (5, "loss")])
+    delete_team(1)
+
+    with get_db_connection() as conn:
+        counts = conn.execute("SELECT total_score, games_played, teams FROM leaderboard_counts").fetchall()
+        groups = conn.execute("""
+            SELECT total_score, games_played, COUNT(*) FROM teams WHERE deleted = FALSE
+            GROUP BY total_score, games_played
+        """).fetchall()
+
+    assert sorted(counts) == sorted(groups)
+    for team in get_leaderboard():
+        assert get_team_rank(team["id"]) == team
+
+
+def test_get_team_rank_deleted(teams_db):
+    """Test a deleted team has no rank."""
+    with pytest.raises(ValueError, match="Team with ID 4 has been deleted"):
+        get_team_rank(4)
+
+
+def test_get_team_rank_not_found(teams_db):
+    """Test an unknown team has no rank."""
+    with pytest.raises(ValueError, match="Team with ID 99 not found"):
+        get_team_rank(99)
+
+
+def test_leaderboard_route(teams_db, client):
+    """Test the leaderboard route pages through the ranking with cursors."""
+    first = client.get("/api/leaderboard?per_page=3").json
+    response = client.get(f"/api/leaderboard?per_page=3&cursor={first['next_cursor']}")
+
+    assert response.status_code == 200
+    assert [team["team"] for team in first["leaderboard"]] == ["Bravo", "Echo", "Alpha"]
+    assert [team["team"] for team in response.json["leaderboard"]] == ["Charlie"]
+    assert response.json["next_cursor"] is None
+
+
+def test_leaderboard_route_invalid_page(teams_db, client):
+    """Test the leaderboard route rejects invalid pagination."""
+    assert client.get("/api/leaderboard?per_page=0").status_code == 400
+    assert client.get("/api/leaderboard?per_page=101").status_code == 400
+    assert client.get("/api/leaderboard?cursor=oops").status_code == 400
+
+
+def test_leaderboard_rank_route(teams_db, client):
+    """Test the rank route returns a team's position."""
+    response = client.get("/api/leaderboard/1")
+
+    assert response.status_code == 200
+    assert response.json["team"]["rank"] == 3
+    assert client.get("/api/leaderboard/4").status_code == 400
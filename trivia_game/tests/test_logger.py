@@ -0,0 +1,103 @@
+import json
+import logging
+import sys
+
+import pytest
+
+from trivia_game.utils import logger as logger_module
+from trivia_game.utils.logger import JsonFormatter, RateLimitFilter, configure_logger, level_for, set_log_levels
+
+
+def make_record(msg="Hello %s", args=("world",), level=logging.INFO, name="trivia_game.test"):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+@pytest.fixture
+def restore_levels():
+    default, levels = logger_module._default_level, dict(logger_module._module_levels)
+    yield
+    logger_module._default_level, logger_module._module_levels = default, levels
+
+
+def test_configure_logger_is_idempotent():
+    """Test configuring a logger twice does not attach a second handler."""
+    log = logging.getLogger("trivia_game.test_idempotent")
+    configure_logger(log)
+    configure_logger(log)
+
+    assert log.handlers == [logger_module._queue_handler]
+
+
+def test_per_module_levels(restore_levels):
+    """Test a logger takes the level of its closest configured package."""
+    log = logging.getLogger("trivia_game.models.test_levels")
+    configure_logger(log)
+
+    set_log_levels("INFO", "trivia_game.models=WARNING,trivia_game.models.test_levels=ERROR")
+    assert log.level == logging.ERROR
+    assert level_for("trivia_game.models.other") == logging.WARNING
+    assert level_for("trivia_game.utils.other") == logging.INFO
+
+
+def test_rate_limit_filter():
+    """Test a repeated message is throttled per message, and the drop count reported."""
+    now = [0.0]
+    rate_limit = RateLimitFilter(rate=1, burst=2, clock=lambda: now[0])
+
+    assert [rate_limit.filter(make_record()) for _ in range(4)] == [True, True, False, False]
+    assert rate_limit.filter(make_record(msg="Another message"))
+    assert rate_limit.filter(make_record(level=logging.WARNING)), "Warnings must never be throttled."
+
+    now[0] = 1.0
+    record = make_record()
+    assert rate_limit.filter(record)
+    assert record.getMessage() == "Hello world (2 similar messages suppressed)"
+
+
+def test_json_formatter():
+    """Test records are written as one JSON object with the rendered message and exception."""
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord("trivia_game.test", logging.ERROR, __file__, 1, "Failed %d", (3,), sys.exc_info())
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Failed 3"
+    assert entry["level"] == "ERROR"
+    assert "ValueError: boom" in entry["exception"]
+
+
+def test_queue_handler_renders_before_enqueueing():
+    """Test queued records no longer reference their arguments or traceback."""
+    record = make_record(args=({"mutable": "state"},))
+    prepared = logger_module._queue_handler.prepare(record)
+
+    assert prepared.msg == "Hello {'mutable': 'state'}"
+    assert prepared.args is None
+
+
+def test_held_writer_logs_inline(monkeypatch, mocker):
+    """Test a pre-fork master writes its records itself instead of starting the writer thread."""
+    monkeypatch.setattr(logger_module, "_listener_pid", None)
+    monkeypatch.setattr(logger_module, "_inline", False)
+    start = mocker.patch.object(logger_module, "start_listener")
+    write = mocker.patch.object(logger_module._stream_handler, "handle")
+    logger_module.hold_listener()
+
+    logger_module._queue_handler.emit(make_record())
+
+    start.assert_not_called()
+    write.assert_called_once()
+
+
+def test_writer_starts_on_first_record(monkeypatch, mocker):
+    """Test configuring a logger starts no thread; the first record logged in a process does."""
+    monkeypatch.setattr(logger_module, "_listener_pid", None)
+    monkeypatch.setattr(logger_module, "_inline", False)
+    start = mocker.patch.object(logger_module, "start_listener")
+
+    configure_logger(logging.getLogger("trivia_game.test_lazy"))
+    start.assert_not_called()
+
+    logger_module._queue_handler.emit(make_record())
+    start.assert_called_once()
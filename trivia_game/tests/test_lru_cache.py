@@ -0,0 +1,154 @@
+import threading
+
+import pytest
+
+from trivia_game.models.team_model import create_team, get_team_by_id, get_team_by_name, update_team_stats
+from trivia_game.utils.lru_cache import LRUCache
+from trivia_game.utils.sql_utils import get_db_connection
+
+
+@pytest.fixture
+def clock():
+    now = [0.0]
+    return now
+
+
+@pytest.fixture
+def cache(clock):
+    return LRUCache("test", max_entries=2, ttl=10, clock=lambda: clock[0])
+
+
+def test_get_and_set(cache):
+    """Test values, including None, are cached."""
+    cache.set("a", 1)
+    cache.set("missing", None)
+
+    assert cache.get("a") == (True, 1)
+    assert cache.get("missing") == (True, None)
+    assert cache.get("b") == (False, None)
+
+
+def test_evicts_least_recently_used(cache):
+    """Test the least recently used entry goes when the cache is full."""
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.stats()["evictions"] == 1
+    assert len(cache) == 2
+
+
+def test_entries_expire(cache, clock):
+    """Test entries expire after the cache's TTL or their own."""
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=2)
+
+    clock[0] = 5.0
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    clock[0] = 10.0
+    assert cache.get("a") == (False, None)
+    assert cache.stats()["expirations"] == 2
+
+
+def test_invalidate_and_clear(cache):
+    """Test entries can be dropped explicitly."""
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.invalidate("a", "unknown")
+    assert cache.get("a") == (False, None)
+    cache.clear()
+    assert cache.get("b") == (False, None)
+
+
+def test_stats(cache):
+    """Test hits and misses are counted."""
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_thread_safety():
+    """Test concurrent use keeps the cache within bounds."""
+    cache = LRUCache("test", max_entries=50, ttl=10)
+
+    def work(offset):
+        for i in range(1000):
+            cache.set(offset + i % 100, i)
+            cache.get(offset + (i * 7) % 100)
+
+    threads = [threading.Thread(target=work, args=(n * 100,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) == 50
+
+
+def test_invalid_size():
+    """Test the cache must be able to hold something."""
+    with pytest.raises(ValueError):
+        LRUCache("test", max_entries=0)
+
+
+def test_repeat_team_lookups_skip_the_database(sqlite_db, mocker):
+    """Test a team looked up again during a game is served without a query."""
+    mocker.patch("trivia_game.models.team_model.get_random_dog_image", return_value="dog.jpg")
+    create_team("Alpha", 9)
+    team = get_team_by_id(1)
+    spy = mocker.patch("trivia_game.models.team_model.get_db_connection")
+
+    assert get_team_by_id(1) == team
+    assert get_team_by_name("Alpha") == team
+    spy.assert_not_called()
+
+
+def test_local_team_cache_can_be_turned_off(sqlite_db, mocker):
+    """Test teams are always read again with several workers."""
+    mocker.patch("trivia_game.models.team_model.get_random_dog_image", return_value="dog.jpg")
+    mocker.patch("trivia_game.models.team_model.TEAM_LOCAL_CACHE", False)
+    create_team("Alpha", 9)
+    get_team_by_id(1)
+    spy = mocker.patch("trivia_game.models.team_model.get_db_connection", wraps=get_db_connection)
+
+    get_team_by_id(1)
+
+    spy.assert_called_once()
+
+
+def test_cached_team_is_a_copy(sqlite_db, mocker):
+    """Test changing a returned team does not change the cached one."""
+    mocker.patch("trivia_game.models.team_model.get_random_dog_image", return_value="dog.jpg")
+    create_team("Alpha", 9)
+
+    get_team_by_id(1).current_score = 5
+
+    assert get_team_by_id(1).current_score == 0
+
+
+def test_team_updates_invalidate(sqlite_db, mocker):
+    """Test a stats update is visible through the cache."""
+    mocker.patch("trivia_game.models.team_model.get_random_dog_image", return_value="dog.jpg")
+    create_team("Alpha", 9)
+    get_team_by_name("Alpha")
+
+    update_team_stats(1, "win")
+
+    assert get_team_by_id(1).total_score == 1
+    assert get_team_by_name("Alpha").total_score == 1
+
+
+def test_cache_stats_route(client):
+    """Test the cache stats are exported."""
+    response = client.get("/api/cache-stats")
+
+    assert response.status_code == 200
+    assert [cache["name"] for cache in response.json["caches"]] == ["teams", "user_ids"]
@@ -0,0 +1,131 @@
+import json
+import os
+
+import pytest
+
+from trivia_game.clients import http_client
+from trivia_game.utils import sql_utils
+from trivia_game.utils.metrics import MetricsRegistry, WorkerMetrics
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry(namespace="test")
+
+
+def test_counter_renders_labels(registry):
+    """Test a labelled counter renders one sample per label set, with HELP and TYPE."""
+    counter = registry.counter("calls_total", "Calls made", ["host"])
+    counter.inc(host="a")
+    counter.inc(2, host="b")
+    text = registry.render()
+    assert "# HELP test_calls_total Calls made" in text
+    assert "# TYPE test_calls_total counter" in text
+    assert 'test_calls_total{host="a"} 1' in text
+    assert 'test_calls_total{host="b"} 2' in text
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    """Test histogram buckets count every observation at or below their bound."""
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value)
+    text = registry.render()
+    assert 'test_latency_seconds_bucket{le="0.1"} 2' in text
+    assert 'test_latency_seconds_bucket{le="1"} 3' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "test_latency_seconds_count 4" in text
+    assert "test_latency_seconds_sum 3.65" in text
+
+
+def test_metrics_are_idempotent_by_name(registry):
+    """Test asking twice for a metric returns the same one, so modules can share it."""
+    assert registry.counter("x_total", "X") is registry.counter("x_total", "X")
+
+
+def test_register_stats_exposes_numeric_fields(registry):
+    """Test a component's stats become gauges, skipping fields that are not numbers."""
+    registry.register_stats("pool", lambda: {"size": 3, "hit_rate": 0.5, "open": True, "state": "closed"},
+                            labels={"cache": "teams"})
+    text = registry.render()
+    assert 'test_pool_size{cache="teams"} 3' in text
+    assert 'test_pool_hit_rate{cache="teams"} 0.5' in text
+    assert "test_pool_open" not in text
+    assert "test_pool_state" not in text
+
+
+def test_failing_collector_is_skipped(registry):
+    """Test a broken collector does not break the scrape."""
+    def broken():
+        raise RuntimeError("boom")
+    registry.register_collector(broken)
+    registry.counter("ok_total", "OK").inc()
+    assert "test_ok_total 1" in registry.render()
+
+
+def worker_registry(requests, in_use):
+    worker = MetricsRegistry(namespace="test")
+    worker.counter("requests_total", "Requests").inc(requests)
+    worker.histogram("seconds", "Seconds", buckets=(1,)).observe(0.5)
+    worker.register_stats("pool", lambda: {"in_use": in_use})
+    return worker
+
+
+def test_worker_metrics_merge_every_worker(tmp_path):
+    """Test a scrape sums the workers' counters and reports their gauges per pid."""
+    (tmp_path / "101.json").write_text(json.dumps({"alive": True, "families": worker_registry(3, 7).collect()}))
+    (tmp_path / "102.json").write_text(json.dumps({"alive": False, "families": worker_registry(4, 9).collect()}))
+
+    text = WorkerMetrics(worker_registry(2, 5), str(tmp_path)).render()
+
+    assert "test_requests_total 9" in text
+    assert 'test_seconds_bucket{le="1"} 3' in text
+    assert "test_seconds_count 3" in text
+    assert f'test_pool_in_use{{pid="{os.getpid()}"}} 5' in text
+    assert 'test_pool_in_use{pid="101"} 7' in text
+    # An exited worker's requests still count, but its gauges are gone
+    assert 'pid="102"' not in text
+    assert text.count("# TYPE test_requests_total counter") == 1
+
+
+def test_worker_metrics_write_on_start_and_exit(tmp_path):
+    """Test a worker writes its metrics when it starts and marks them as exited when it stops."""
+    worker = WorkerMetrics(worker_registry(1, 1), str(tmp_path / "metrics"), interval=3600)
+
+    worker.start()
+    path = tmp_path / "metrics" / f"{os.getpid()}.json"
+    assert json.loads(path.read_text())["alive"] is True
+    worker.stop()
+    assert json.loads(path.read_text())["alive"] is False
+
+
+def test_metrics_route_records_route_latency(client):
+    """Test requests are recorded under their route pattern and exposed in the text format."""
+    client.get("/api/health")
+    client.get("/api/games/abc")
+    response = client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    text = response.get_data(as_text=True)
+    assert "# TYPE trivia_http_request_seconds histogram" in text
+    assert 'trivia_http_request_seconds_count{method="GET",route="/api/health",status="200"}' in text
+    assert 'route="/api/games/<string:game_id>"' in text
+    assert "trivia_games_in_progress 0" in text
+
+
+def test_metrics_route_reports_db_and_upstream_metrics(client, sqlite_db, no_http_retries, mocker):
+    """Test database checkouts and outbound HTTP calls show up in the scrape."""
+    before = sql_utils.DB_CONNECTION_SECONDS.count()
+    with sql_utils.get_db_connection():
+        pass
+    assert sql_utils.DB_CONNECTION_SECONDS.count() == before + 1
+
+    mocker.patch("requests.Session.get", return_value=mocker.Mock(status_code=200))
+    http_client.http_get("https://opentdb.com/api.php")
+
+    text = client.get("/api/metrics").get_data(as_text=True)
+    assert "trivia_db_connection_seconds_count" in text
+    assert 'trivia_http_client_requests_total{host="opentdb.com"} 1' in text
+    assert 'trivia_http_client_latency_seconds_bucket{host="opentdb.com",le="+Inf"} 1' in text
+    assert "trivia_db_pool_" in text
@@ -1,6 +1,21 @@
+import threading
+
 import pytest
+from pymongo.errors import DuplicateKeyError
+
+from trivia_game.models import mongo_session_model
+from trivia_game.models.game_model import GAME_IN_PROGRESS, GameModel
+from trivia_game.models.mongo_session_model import (
+    SessionWriter,
+    ensure_indexes,
+    load_game,
+    login_user,
+    logout_user,
+    session_writer
+)
+from trivia_game.models.question_bank_model import Question
+from trivia_game.models.team_model import Team
 
-from trivia_game.models.mongo_session_model import login_user, logout_user
 
 @pytest.fixture
 def sample_user_id():
@@ -8,63 +23,165 @@ def sample_user_id():
 
 
 @pytest.fixture
-def sample_combatants():
-    return [{"id": 1}, {"id": 2}]  # Sample combatant data
-
-
-def test_login_user_creates_session_if_not_exists(mocker, sample_user_id):
-    """Test login_user creates a session with no combatants if it does not exist."""
-    mock_find = mocker.patch("trivia_game.clients.mongo_client.sessions_collection.find_one", return_value=None)
-    mock_insert = mocker.patch("trivia_game.clients.mongo_client.sessions_collection.insert_one")
-    mock_battle_model = mocker.Mock()
-
-    login_user(sample_user_id, mock_battle_model)
-
-    mock_find.assert_called_once_with({"user_id": sample_user_id})
-    mock_insert.assert_called_once_with({"user_id": sample_user_id, "combatants": []})
-    mock_battle_model.clear_combatants.assert_not_called()
-    mock_battle_model.prep_combatant.assert_not_called()
-
-def test_login_user_loads_combatants_if_session_exists(mocker, sample_user_id, sample_combatants):
-    """Test login_user loads combatants if session exists."""
-    mock_find = mocker.patch(
-        "trivia_game.clients.mongo_client.sessions_collection.find_one",
-        return_value={"user_id": sample_user_id, "combatants": sample_combatants}
-    )
-    mock_battle_model = mocker.Mock()
-
-    login_user(sample_user_id, mock_battle_model)
-
-    mock_find.assert_called_once_with({"user_id": sample_user_id})
-    mock_battle_model.clear_combatants.assert_called_once()
-    mock_battle_model.prep_combatant.assert_has_calls([mocker.call(combatant) for combatant in sample_combatants])
-
-def test_logout_user_updates_combatants(mocker, sample_user_id, sample_combatants):
-    """Test logout_user updates the combatants list in the session."""
-    mock_update = mocker.patch("trivia_game.clients.mongo_client.sessions_collection.update_one", return_value=mocker.Mock(matched_count=1))
-    mock_battle_model = mocker.Mock()
-    mock_battle_model.get_combatants.return_value = sample_combatants
-
-    logout_user(sample_user_id, mock_battle_model)
-
-    mock_update.assert_called_once_with(
-        {"user_id": sample_user_id},
-        {"$set": {"combatants": sample_combatants}},
-        upsert=False
-    )
-    mock_battle_model.clear_combatants.assert_called_once()
-
-def test_logout_user_raises_value_error_if_no_user(mocker, sample_user_id, sample_combatants):
-    """Test logout_user raises ValueError if no session document exists."""
-    mock_update = mocker.patch("trivia_game.clients.mongo_client.sessions_collection.update_one", return_value=mocker.Mock(matched_count=0))
-    mock_battle_model = mocker.Mock()
-    mock_battle_model.get_combatants.return_value = sample_combatants
-
-    with pytest.raises(ValueError, match=f"User with ID {sample_user_id} not found for logout."):
-        logout_user(sample_user_id, mock_battle_model)
-
-    mock_update.assert_called_once_with(
-        {"user_id": sample_user_id},
-        {"$set": {"combatants": sample_combatants}},
-        upsert=False
-    )
\ No newline at end of file
+def game_in_progress():
+    """Fixture providing a game halfway through its first round."""
+    game = GameModel()
+    game.prep_opponent(Team(1, "Alpha", 9, 3, 2, 0, "alpha.jpg"))
+    game.prep_opponent(Team(2, "Bravo", 11, 1, 1, 0, "bravo.jpg"))
+    game.state = GAME_IN_PROGRESS
+    game.categories = [9, 11]
+    game.current_question = Question(5, 9, "boolean", "easy", "Is the sky blue?", "True", ["False"])
+    game.choices = ["False", "True"]
+    game.answers = ["True", None]
+    game.asked_questions = {5}
+    game.round_deadline = 4102444800.0  # far in the future
+    return game
+
+
+def test_game_round_trip(game_in_progress):
+    """Test a game survives being serialized and restored."""
+    restored = GameModel()
+    restored.restore(game_in_progress.to_dict())
+
+    assert restored.to_dict() == game_in_progress.to_dict()
+    state = restored.get_state()
+    assert state["question"]["question"] == "Is the sky blue?"
+    assert state["answered"] == [1]
+
+
+def test_logout_then_login_resumes_game(mongo_sessions, sample_user_id, game_in_progress):
+    """Test a game saved at logout is restored at the next login."""
+    saved = game_in_progress.to_dict()
+    logout_user(sample_user_id, game_in_progress)
+    assert game_in_progress.opponents == []
+
+    session_writer.flush()
+    game = GameModel()
+
+    assert login_user(sample_user_id, game) is True
+    assert game.to_dict() == saved
+    assert mongo_sessions.count_documents({"user_id": sample_user_id}) == 1
+
+
+def test_login_without_saved_game(sample_user_id):
+    """Test login leaves the game alone when nothing was saved."""
+    game = GameModel()
+
+    assert login_user(sample_user_id, game) is False
+    assert game.opponents == []
+
+
+def test_load_game_reads_pending_save(mongo_sessions, sample_user_id, game_in_progress):
+    """Test a save that has not been written yet is still visible."""
+    logout_user(sample_user_id, game_in_progress)
+
+    assert mongo_sessions.count_documents({}) == 0
+    assert load_game(sample_user_id)["opponents"][0]["team"] == "Alpha"
+
+
+def test_load_game_uses_projection(mocker, sample_user_id):
+    """Test only the game field is read from MongoDB."""
+    collection = mocker.Mock()
+    collection.find_one.return_value = {"game": {"rounds": 1}}
+
+    assert load_game(sample_user_id, collection) == {"rounds": 1}
+    collection.find_one.assert_called_once_with({"user_id": sample_user_id}, projection={"_id": False, "game": True})
+
+
+def test_writer_coalesces_saves(mongo_sessions, mocker):
+    """Test repeated saves are written once, in a single bulk write."""
+    writer = SessionWriter(mongo_sessions, flush_interval=3600)
+    spy = mocker.spy(mongo_sessions, "bulk_write")
+
+    for rounds in range(5):
+        writer.save(1, {"rounds": rounds})
+    writer.save(2, {"rounds": 0})
+
+    assert writer.flush() == 2
+    assert spy.call_count == 1
+    assert mongo_sessions.find_one({"user_id": 1})["game"] == {"rounds": 4}
+    assert writer.stats() == {"saves": 6, "writes": 2, "flushes": 1, "pending": 0}
+
+
+def test_writer_flushes_when_full(mongo_sessions, mocker):
+    """Test reaching max_pending writes right away, but not on the saving thread."""
+    writer = SessionWriter(mongo_sessions, flush_interval=3600, max_pending=2)
+    written = threading.Event()
+    callers = []
+
+    def bulk_write(*args, **kwargs):
+        callers.append(threading.current_thread())
+        written.set()
+    mocker.patch.object(mongo_sessions, "bulk_write", side_effect=bulk_write)
+
+    writer.save(1, {"rounds": 0})
+    writer.save(2, {"rounds": 0})
+
+    assert written.wait(5)
+    assert callers[0] is not threading.current_thread()
+
+
+def test_writer_keeps_saves_when_write_fails(mocker):
+    """Test a failed bulk write keeps the saves for the next flush."""
+    collection = mocker.Mock()
+    collection.bulk_write.side_effect = [RuntimeError("down"), None]
+    writer = SessionWriter(collection, flush_interval=3600)
+    writer.save(1, {"rounds": 1})
+
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    assert writer.pending(1) == {"rounds": 1}
+    assert writer.flush() == 1
+
+
+def test_writer_retries_failed_background_write(mocker):
+    """Test a timed write that fails is retried, with a growing wait, until it succeeds."""
+    collection = mocker.Mock()
+    written = threading.Event()
+    outcomes = [RuntimeError("down"), RuntimeError("down")]
+
+    def bulk_write(*args, **kwargs):
+        if outcomes:
+            raise outcomes.pop(0)
+        written.set()
+    collection.bulk_write.side_effect = bulk_write
+    writer = SessionWriter(collection, flush_interval=0.01, retry_max=0.05)
+    schedule = mocker.spy(writer, "_schedule")
+
+    writer.save(1, {"rounds": 1})
+
+    assert written.wait(5)
+    assert collection.bulk_write.call_count == 3
+    assert [c.args[0] for c in schedule.call_args_list] == [0.01, 0.02, 0.04]
+    assert writer.stats()["pending"] == 0
+
+
+def test_unique_user_index(mongo_sessions):
+    """Test the sessions collection allows one document per user."""
+    ensure_indexes(mongo_sessions)
+    mongo_sessions.insert_one({"user_id": 1})
+
+    with pytest.raises(DuplicateKeyError):
+        mongo_sessions.insert_one({"user_id": 1})
+
+
+def test_login_restores_game_through_routes(client, session, mongo_sessions):
+    """Test the game a user leaves at logout is back after the next login."""
+    from trivia_game.models.password_model import Users
+
+    Users.create_user("testuser", "password123")
+    user_id = Users.get_id_by_username("testuser")
+    mongo_sessions.insert_one({"user_id": user_id, "game": {"opponents": [
+        {"id": 1, "team": "Alpha", "favorite_category": 9, "games_played": 0,
+         "total_score": 0, "current_score": 0, "mascot": "alpha.jpg"}
+    ]}})
+
+    response = client.post("/api/login", json={"username": "testuser", "password": "password123"})
+    game_id = response.json["game_id"]
+    headers = {"Authorization": f"Bearer {response.json['token']}"}
+
+    assert client.get(f"/api/games/{game_id}/opponents").json["opponents"][0]["team"] == "Alpha"
+
+    assert client.post("/api/logout", headers=headers).status_code == 200
+    assert mongo_session_model.session_writer.pending(user_id)["opponents"][0]["team"] == "Alpha"
+    assert client.get(f"/api/games/{game_id}/opponents").status_code == 400
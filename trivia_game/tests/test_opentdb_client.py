@@ -0,0 +1,110 @@
+import fakeredis
+import pytest
+import requests
+
+from trivia_game.clients import opentdb_client
+from trivia_game.clients.opentdb_client import SessionTokenManager, opentdb_get
+
+
+@pytest.fixture
+def mock_requests_get(mocker):
+    """Mock the requests.get function."""
+    return mocker.patch("requests.Session.get")
+
+
+def test_get_token_is_lazy_and_cached(mock_requests_get):
+    """Test the token is requested on first use only."""
+    mock_requests_get.return_value.json.return_value = {"response_code": 0, "token": "abc"}
+    manager = SessionTokenManager()
+    mock_requests_get.assert_not_called()
+
+    assert manager.get_token() == "abc"
+    assert manager.get_token() == "abc"
+    assert mock_requests_get.call_count == 1
+
+
+def test_get_token_failure_is_not_retried_immediately(mock_requests_get):
+    """Test a failed token request is not repeated on every call."""
+    mock_requests_get.side_effect = requests.exceptions.ConnectionError("offline")
+    manager = SessionTokenManager(retry_after=60)
+
+    assert manager.get_token() == ""
+    assert manager.get_token() == ""
+    assert mock_requests_get.call_count == 1
+
+
+def test_each_retry_waits_for_the_rate_limiter(mock_requests_get, no_opentdb_rate_limit, monkeypatch, mocker):
+    """Test a retried OpenTDB request takes a rate limit token for every attempt."""
+    monkeypatch.setattr(opentdb_client, "OPENTDB_RETRIES", 2)
+    failed = mocker.Mock(status_code=503)
+    mock_requests_get.side_effect = [requests.exceptions.Timeout("slow"), failed, mock_requests_get.return_value]
+    mock_requests_get.return_value.status_code = 200
+    mock_requests_get.return_value.json.return_value = {"response_code": 0}
+
+    assert opentdb_get("api.php") == {"response_code": 0}
+    assert mock_requests_get.call_count == 3
+    assert no_opentdb_rate_limit.call_count == 3
+
+
+def test_get_token_expires(mock_requests_get, mocker):
+    """Test a token is requested again once it has expired."""
+    mock_requests_get.return_value.json.side_effect = [
+        {"response_code": 0, "token": "first"},
+        {"response_code": 0, "token": "second"}
+    ]
+    mock_clock = mocker.patch("trivia_game.clients.opentdb_client.time.monotonic", return_value=0.0)
+    manager = SessionTokenManager(ttl=100)
+
+    assert manager.get_token() == "first"
+    mock_clock.return_value = 150.0
+    assert manager.get_token() == "second"
+
+
+def test_handle_token_not_found(mock_requests_get):
+    """Test response code 3 drops the token so a new one is requested."""
+    mock_requests_get.return_value.json.side_effect = [
+        {"response_code": 0, "token": "first"},
+        {"response_code": 0, "token": "second"}
+    ]
+    manager = SessionTokenManager()
+    manager.get_token()
+
+    assert manager.handle_response_code(3) is True
+    assert manager.get_token() == "second"
+
+
+def test_handle_token_empty_resets_token(mock_requests_get):
+    """Test response code 4 resets the token upstream."""
+    mock_requests_get.return_value.json.side_effect = [
+        {"response_code": 0, "token": "abc"},
+        {"response_code": 0, "token": "abc"}
+    ]
+    manager = SessionTokenManager()
+
+    assert manager.handle_response_code(4) is True
+    assert mock_requests_get.call_args[1]["params"] == {"command": "reset", "token": "abc"}
+
+
+def test_handle_other_codes(mock_requests_get):
+    """Test other response codes are not treated as token problems."""
+    assert SessionTokenManager().handle_response_code(1) is False
+    mock_requests_get.assert_not_called()
+
+
+def test_token_shared_through_redis(mock_requests_get):
+    """Test a second worker adopts the token stored in Redis instead of requesting its own."""
+    mock_requests_get.return_value.json.return_value = {"response_code": 0, "token": "shared"}
+    redis_client = fakeredis.FakeStrictRedis()
+
+    assert SessionTokenManager(redis_client).get_token() == "shared"
+    assert SessionTokenManager(redis_client).get_token() == "shared"
+    assert mock_requests_get.call_count == 1
+    assert redis_client.ttl(SessionTokenManager.REDIS_KEY) > 0
+
+
+def test_get_token_when_rate_limit_busy(mocker):
+    """Test a token request that would wait too long for the rate limiter goes without a token."""
+    mocker.patch.object(opentdb_client.opentdb_limiter, "acquire", side_effect=RuntimeError("Rate limit busy, retry in 30s."))
+    manager = SessionTokenManager()
+
+    assert manager.get_token() == ""
@@ -0,0 +1,48 @@
+import pytest
+
+from trivia_game.utils import prefork
+
+
+@pytest.fixture(autouse=True)
+def fresh_hooks(monkeypatch):
+    monkeypatch.setattr(prefork, "_after_fork_hooks", [])
+    monkeypatch.setattr(prefork, "_worker_start_hooks", [])
+    monkeypatch.setattr(prefork, "_worker_exit_hooks", [])
+    monkeypatch.setattr(prefork, "_deferred", False)
+    # The test process keeps its log writer
+    monkeypatch.setattr(prefork, "hold_listener", lambda: None)
+    monkeypatch.setattr(prefork, "stop_listener", lambda: None)
+
+
+def test_worker_start_hooks_run_at_once_without_a_prefork_server():
+    """Test background work starts right away when the process serves requests itself."""
+    calls = []
+    prefork.on_worker_start(lambda: calls.append("start"))
+    assert calls == ["start"]
+
+
+def test_deferred_hooks_run_in_each_worker():
+    """Test a pre-fork master starts nothing, and each worker resets its state before starting its threads."""
+    calls = []
+    prefork.defer_worker_start()
+    prefork.on_worker_start(lambda: calls.append("start"))
+    prefork.after_fork(lambda: calls.append("reset"))
+    assert calls == []
+
+    prefork.start_worker()
+    prefork.start_worker()
+    assert calls == ["reset", "start", "reset", "start"]
+
+
+def test_failing_hook_does_not_stop_the_others():
+    """Test one broken hook neither kills the worker nor skips the other hooks."""
+    calls = []
+
+    def broken():
+        raise RuntimeError("boom")
+
+    prefork.on_worker_exit(broken)
+    prefork.on_worker_exit(lambda: calls.append("flushed"))
+    prefork.stop_worker()
+
+    assert calls == ["flushed"]
@@ -0,0 +1,146 @@
+import threading
+import time
+
+import pytest
+
+from ..app import create_app
+from config import TestConfig
+from trivia_game.utils import profiler
+from trivia_game.utils.profiler import SamplingProfiler, profile_cpu, profile_memory
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_loop, args=(stop,), name="busy-worker")
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+class ProfilerConfig(TestConfig):
+    PROFILER_ENABLED = True
+    ADMIN_TOKEN = "admin-secret"
+
+
+@pytest.fixture
+def admin_client():
+    return create_app(ProfilerConfig).test_client()
+
+
+def test_samples_are_collapsed_stacks(busy_thread):
+    """Test a sampled thread shows up as a root-to-leaf stack with a count."""
+    sampler = SamplingProfiler()
+    for _ in range(5):
+        sampler.sample()
+
+    lines = sampler.collapsed().splitlines()
+    busy = [line for line in lines if line.startswith("busy-worker;")]
+    assert busy
+    stack, count = busy[0].rsplit(" ", 1)
+    assert int(count) >= 1
+    assert stack.split(";")[-1].endswith("test_profiler:busy_loop")
+
+
+def test_idle_threads_are_skipped():
+    """Test threads parked on a lock are counted as idle rather than sampled."""
+    event = threading.Event()
+    waiter = threading.Thread(target=event.wait, name="idle-worker")
+    waiter.start()
+    try:
+        time.sleep(0.05)
+        sampler = SamplingProfiler()
+        sampler.sample()
+        assert not any(stack.startswith("idle-worker;") for stack in sampler.stacks)
+        assert sampler.idle_samples >= 1
+
+        sampler = SamplingProfiler(include_idle=True)
+        sampler.sample()
+        assert any(stack.startswith("idle-worker;") for stack in sampler.stacks)
+    finally:
+        event.set()
+        waiter.join()
+
+
+def test_profile_cpu_samples_in_background(busy_thread):
+    """Test a timed profile takes samples from its own thread and skips it."""
+    result = profile_cpu(0.1, interval=0.005)
+    assert result.samples > 0
+    assert not any(stack.startswith("sampling-profiler;") for stack in result.stacks)
+
+
+def test_profile_duration_is_bounded():
+    """Test a profile longer than the limit is rejected."""
+    with pytest.raises(ValueError):
+        profile_cpu(profiler.PROFILE_MAX_SECONDS + 1)
+    with pytest.raises(ValueError):
+        profile_memory(0)
+
+
+def test_only_one_profile_runs_at_a_time():
+    """Test a second profile is refused while one is running."""
+    with profiler._profile_lock:
+        with pytest.raises(RuntimeError):
+            profile_cpu(0.01, interval=0.005)
+
+
+def test_profile_memory_reports_growth():
+    """Test memory allocated during the window is reported with its traceback."""
+    hoard = []
+
+    def grow():
+        time.sleep(0.02)
+        hoard.extend(bytearray(1024) for _ in range(200))
+
+    thread = threading.Thread(target=grow)
+    thread.start()
+    growth = profile_memory(0.1)
+    thread.join()
+
+    assert growth
+    assert growth[0]["size_diff"] > 0
+    assert any("test_profiler.py" in frame for entry in growth for frame in entry["traceback"])
+
+
+def test_profile_route_is_disabled_by_default(client):
+    """Test the profiler is opt-in."""
+    assert client.post("/api/admin/profile", json={"seconds": 0.01}).status_code == 404
+
+
+def test_profiler_cannot_be_enabled_without_admin_token():
+    """Test the app refuses to expose the profiler without an admin token."""
+    class OpenProfilerConfig(TestConfig):
+        PROFILER_ENABLED = True
+
+    with pytest.raises(ValueError, match="ADMIN_TOKEN"):
+        create_app(OpenProfilerConfig)
+
+
+def test_profile_route_requires_admin_token(admin_client):
+    """Test the profiler refuses requests without the admin token."""
+    response = admin_client.post("/api/admin/profile", json={"seconds": 0.01})
+    assert response.status_code == 401
+
+
+def test_profile_route_returns_collapsed_stacks(admin_client, busy_thread):
+    """Test the route returns flamegraph-ready text."""
+    response = admin_client.post("/api/admin/profile", json={"seconds": 0.1, "interval": 0.005},
+                                 headers={"X-Admin-Token": "admin-secret"})
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert int(response.headers["X-Profile-Samples"]) > 0
+    assert "busy-worker;" in response.get_data(as_text=True)
+
+
+def test_profile_route_rejects_unknown_mode(admin_client):
+    """Test an unknown mode is a bad request."""
+    response = admin_client.post("/api/admin/profile", json={"seconds": 0.01, "mode": "gpu"},
+                                 headers={"X-Admin-Token": "admin-secret"})
+    assert response.status_code == 400
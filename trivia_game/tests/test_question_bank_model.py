@@ -0,0 +1,209 @@
+import json
+import time
+
+import fakeredis
+import pytest
+
+from trivia_game.models import question_bank_model
+from trivia_game.models.question_bank_model import (
+    PrefetchJobs,
+    Question,
+    count_questions,
+    create_prefetch_jobs,
+    draw_question,
+    load_questions,
+    load_questions_from_file,
+    prefetch_questions
+)
+
+
+@pytest.fixture
+def bank_db(sqlite_db):
+    """Fixture giving each test an empty question bank."""
+    question_bank_model._invalidate_buckets()
+    yield sqlite_db
+    question_bank_model._invalidate_buckets()
+
+
+@pytest.fixture
+def sample_questions():
+    return [
+        {
+            "type": "boolean",
+            "difficulty": "easy",
+            "category": "General Knowledge",
+            "question": "The sky is &quot;blue&quot;.",
+            "correct_answer": "True",
+            "incorrect_answers": ["False"]
+        },
+        {
+            "type": "multiple",
+            "difficulty": "medium",
+            "category": "Entertainment: Film",
+            "question": "Which film won Best Picture in 1998?",
+            "correct_answer": "Titanic",
+            "incorrect_answers": ["Good Will Hunting", "L.A. Confidential", "As Good as It Gets"]
+        }
+    ]
+
+
+def test_load_questions(bank_db, sample_questions):
+    """Test loading questions resolves category names and unescapes the text."""
+    assert load_questions(sample_questions) == 2
+    assert count_questions() == 2
+    assert count_questions(category=9) == 1
+
+    question = draw_question(9, "boolean")
+    assert question.question == 'The sky is "blue".'
+    assert question.incorrect_answers == ["False"]
+
+
+def test_load_questions_skips_duplicates(bank_db, sample_questions):
+    """Test loading the same dump twice does not duplicate questions."""
+    load_questions(sample_questions)
+    assert load_questions(sample_questions) == 0
+    assert count_questions() == 2
+
+
+def test_load_questions_from_file(bank_db, sample_questions, tmp_path):
+    """Test filling the bank offline from a saved OpenTDB response."""
+    dump_path = tmp_path / "dump.json"
+    dump_path.write_text(json.dumps({"response_code": 0, "results": sample_questions}))
+
+    assert load_questions_from_file(str(dump_path)) == 2
+
+
+def test_load_questions_from_file_invalid(bank_db, tmp_path):
+    """Test a dump without a question list raises a ValueError."""
+    dump_path = tmp_path / "dump.json"
+    dump_path.write_text(json.dumps({"response_code": 0}))
+
+    with pytest.raises(ValueError, match="does not contain a list of trivia questions"):
+        load_questions_from_file(str(dump_path))
+
+
+def test_draw_question(bank_db, sample_questions):
+    """Test drawing a question from a bucket."""
+    load_questions(sample_questions)
+
+    question = draw_question(11, "multiple")
+    assert isinstance(question, Question)
+    assert question.correct_answer == "Titanic"
+    assert question.difficulty == "medium"
+
+
+def test_draw_question_excludes_asked(bank_db, sample_questions):
+    """Test drawing skips already asked questions and raises once the bucket is used up."""
+    load_questions(sample_questions)
+    question = draw_question(9, "boolean")
+
+    with pytest.raises(ValueError, match="No trivia questions available"):
+        draw_question(9, "boolean", exclude={question.id})
+
+
+def test_draw_question_empty_bucket(bank_db):
+    """Test drawing from an empty bucket raises a ValueError."""
+    with pytest.raises(ValueError, match="No trivia questions available"):
+        draw_question(9, "boolean")
+
+
+def test_bucket_sees_questions_loaded_by_another_worker(bank_db, sample_questions, mocker, monkeypatch):
+    """Test empty buckets are not cached and loaded ones expire, so another worker's questions are drawn."""
+    with pytest.raises(ValueError):
+        draw_question(9, "boolean")
+    # Another worker's load does not reach this process's index
+    mocker.patch.object(question_bank_model, "_invalidate_buckets")
+    monkeypatch.setattr(question_bank_model, "QUESTION_BUCKET_TTL", 0)
+
+    load_questions(sample_questions[:1])
+    first = draw_question(9, "boolean")
+    load_questions([dict(sample_questions[0], question="The grass is green.")])
+
+    assert draw_question(9, "boolean", exclude={first.id}).question == "The grass is green."
+
+
+def test_prefetch_questions(bank_db, sample_questions, mocker):
+    """Test prefetching requests batches of 50 and stores the results."""
+    mocker.patch("trivia_game.models.question_bank_model.session_tokens.get_token", return_value="token")
+    mock_get = mocker.patch("requests.Session.get")
+    mock_get.return_value.json.return_value = {"response_code": 0, "results": sample_questions[:1]}
+
+    assert prefetch_questions(9, "boolean", "easy") == 1
+
+    params = mock_get.call_args[1]["params"]
+    assert params == {"amount": 50, "category": 9, "type": "boolean", "difficulty": "easy", "token": "token"}
+    assert count_questions(category=9) == 1
+
+
+def test_prefetch_questions_stops_on_response_code(bank_db, mocker):
+    """Test prefetching stops when OpenTDB has no more questions for the bucket."""
+    mocker.patch("trivia_game.models.question_bank_model.session_tokens.get_token", return_value="")
+    mock_get = mocker.patch("requests.Session.get")
+    mock_get.return_value.json.return_value = {"response_code": 1, "results": []}
+
+    assert prefetch_questions(9, "boolean", batches=3) == 0
+    assert mock_get.call_count == 1
+
+
+def test_prefetch_questions_repairs_token(bank_db, sample_questions, mocker):
+    """Test an expired session token is replaced and the batch retried."""
+    mock_tokens = mocker.patch("trivia_game.models.question_bank_model.session_tokens")
+    mock_tokens.get_token.side_effect = ["expired", "fresh"]
+    mock_tokens.handle_response_code.side_effect = lambda code: code == 3
+    mock_get = mocker.patch("requests.Session.get")
+    mock_get.return_value.json.side_effect = [
+        {"response_code": 3, "results": []},
+        {"response_code": 0, "results": sample_questions[:1]}
+    ]
+
+    assert prefetch_questions(9, "boolean") == 1
+    assert mock_get.call_args[1]["params"]["token"] == "fresh"
+
+
+def test_prefetch_job_reports_progress(bank_db, mocker):
+    """Test a prefetch job counts the buckets done, the failures and the questions added."""
+    mocker.patch.object(question_bank_model, "prefetch_questions",
+                        side_effect=[2, ValueError("down")] + [1] * 10)
+
+    job = PrefetchJobs().start([9, 10], background=False)
+
+    progress = job.progress()
+    assert progress["state"] == "finished"
+    assert (progress["buckets"], progress["buckets_done"], progress["failed"], progress["added"]) == (12, 12, 1, 12)
+
+
+def test_prefetch_job_is_capped(bank_db):
+    """Test a prefetch that would outlast its request budget is refused before it starts."""
+    with pytest.raises(ValueError, match="at most 12 OpenTDB requests"):
+        PrefetchJobs(max_requests=12).start([9, 10, 11], background=False)
+
+
+def test_redis_prefetch_job_is_reported_by_every_worker(bank_db, mocker):
+    """Test a job run by one worker process can be polled through another."""
+    mocker.patch.object(question_bank_model, "prefetch_questions", return_value=1)
+    shared = fakeredis.FakeStrictRedis()
+
+    job = create_prefetch_jobs("redis", shared).start([9], background=False)
+
+    assert create_prefetch_jobs("redis", shared).progress(job.id)["added"] == 6
+    with pytest.raises(ValueError, match="not found"):
+        create_prefetch_jobs("redis", shared).progress("missing")
+
+
+def test_prefetch_route_runs_in_background(client, bank_db, mocker):
+    """Test the prefetch route answers at once and the job is polled to completion."""
+    mocker.patch.object(question_bank_model, "prefetch_questions", return_value=1)
+
+    response = client.post("/api/prefetch-questions", json={"categories": [9]})
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+
+    deadline = time.monotonic() + 10
+    while True:
+        progress = client.get(f"/api/prefetch-questions/{job_id}").get_json()["job"]
+        if progress["state"] == "finished" or time.monotonic() > deadline:
+            break
+        time.sleep(0.01)
+    assert progress["added"] == 6
+    assert client.post("/api/prefetch-questions", json={"categories": [9], "batches": 1000}).status_code == 400
+    assert client.get("/api/prefetch-questions/missing").status_code == 400
@@ -0,0 +1,62 @@
+import pytest
+
+from trivia_game.utils import random_utils
+from trivia_game.utils.random_utils import RandomOrgRandom, create_random_provider, get_random, seeded
+
+
+def test_get_random_is_local(mocker):
+    """Test drawing a number never touches the network."""
+    mock_get = mocker.patch("requests.Session.get")
+    assert 0 <= get_random() < 1
+    mock_get.assert_not_called()
+
+
+def test_seeded_is_deterministic():
+    """Test the same seed replays the same draws."""
+    first, second = seeded("game-1"), seeded("game-1")
+    assert [first.random() for _ in range(5)] == [second.random() for _ in range(5)]
+
+
+def test_create_random_provider_unknown():
+    """Test an unknown provider name raises a ValueError."""
+    with pytest.raises(ValueError, match="Unknown random provider"):
+        create_random_provider("dice")
+
+
+def test_random_org_buffer(mocker):
+    """Test draws come from a bulk random.org batch once it has been fetched."""
+    mock_get = mocker.patch("requests.Session.get")
+    mock_get.return_value.text = "0.25\n0.5\n0.75\n"
+    provider = RandomOrgRandom(batch_size=3, low_water=1, background=False)
+
+    provider.refill()
+    assert [provider.random() for _ in range(3)] == [0.25, 0.5, 0.75]
+    assert mock_get.call_args[1]["params"]["num"] == 3
+
+
+def test_random_org_falls_back_when_empty(mocker):
+    """Test an empty buffer falls back to local randomness instead of waiting."""
+    mocker.patch("requests.Session.get", side_effect=random_utils.requests.exceptions.ConnectionError("offline"))
+    provider = RandomOrgRandom(batch_size=10, low_water=5, background=False)
+
+    assert 0 <= provider.random() < 1
+    assert provider.choice(["a", "b", "c"]) in ["a", "b", "c"]
+    stats = provider.stats()
+    assert stats["fallbacks"] == 2
+    assert stats["refill_failures"] == 1
+
+
+def test_random_org_backs_off_after_failure(mocker):
+    """Test a failed refill is not retried on every draw, only after the retry window."""
+    mock_get = mocker.patch("requests.Session.get",
+                            side_effect=random_utils.requests.exceptions.ConnectionError("offline"))
+    now = [0.0]
+    provider = RandomOrgRandom(batch_size=10, low_water=5, background=False, retry_after=60, clock=lambda: now[0])
+
+    for _ in range(5):
+        provider.random()
+    assert mock_get.call_count == 1
+
+    now[0] = 61.0
+    provider.random()
+    assert mock_get.call_count == 2
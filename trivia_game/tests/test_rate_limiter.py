@@ -0,0 +1,138 @@
+import threading
+
+import fakeredis
+import pytest
+
+from trivia_game.utils.rate_limiter import RedisTokenBucket, TokenBucket
+
+
+class FakeClock:
+    """A manually advanced clock whose sleep just moves time forward."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_acquire_within_budget_does_not_sleep(clock):
+    """Test that a call within the burst budget returns immediately."""
+    bucket = TokenBucket(rate=0.2, capacity=2, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert clock.slept == []
+
+
+def test_acquire_sleeps_only_when_budget_used_up(clock):
+    """Test that an exhausted bucket waits exactly until the next token is due."""
+    bucket = TokenBucket(rate=0.2, capacity=1, clock=clock, sleep=clock.sleep)
+
+    bucket.acquire()
+    assert bucket.acquire() == pytest.approx(5.0)
+    assert clock.slept == [pytest.approx(5.0)]
+
+
+def test_acquire_refills_over_time(clock):
+    """Test that tokens come back after an idle period, so spaced-out calls never wait."""
+    bucket = TokenBucket(rate=0.2, capacity=1, clock=clock, sleep=clock.sleep)
+
+    bucket.acquire()
+    clock.now += 6
+    assert bucket.acquire() == 0
+
+
+def test_concurrent_waiters_queue_up(clock):
+    """Test that callers arriving together reserve consecutive slots."""
+    bucket = TokenBucket(rate=0.2, capacity=1, clock=clock, sleep=lambda seconds: None)
+
+    waits = [bucket.acquire() for _ in range(3)]
+    assert waits == [0, pytest.approx(5.0), pytest.approx(10.0)]
+
+
+def test_stats(clock):
+    """Test the wait-time metrics."""
+    bucket = TokenBucket(rate=0.2, capacity=1, clock=clock, sleep=clock.sleep)
+    bucket.acquire()
+    bucket.acquire()
+
+    assert bucket.stats() == {"acquired": 2, "rejected": 0, "waits": 1, "wait_seconds_total": 5.0, "wait_seconds_max": 5.0}
+
+
+def test_acquire_gives_up_past_max_wait(clock):
+    """Test a caller that would wait too long takes no token, so later callers do not queue behind it."""
+    bucket = TokenBucket(rate=0.2, capacity=1, clock=clock, sleep=clock.sleep)
+    bucket.acquire()
+
+    with pytest.raises(RuntimeError, match="Rate limit busy"):
+        bucket.acquire(max_wait=4)
+    assert bucket.acquire(max_wait=5) == pytest.approx(5.0)
+    assert bucket.stats()["rejected"] == 1
+
+
+def test_thread_safety():
+    """Test that tokens are not handed out twice under concurrent access."""
+    bucket = TokenBucket(rate=0.001, capacity=50, sleep=lambda seconds: None)
+    waits = []
+
+    def worker():
+        for _ in range(10):
+            waits.append(bucket.acquire())
+
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(1 for wait in waits if wait == 0) == 50
+
+
+def test_invalid_rate():
+    """Test that a non-positive rate is rejected."""
+    with pytest.raises(ValueError, match="Rate and capacity must be positive."):
+        TokenBucket(rate=0)
+
+
+def test_redis_bucket_is_shared():
+    """Test that two limiters on the same Redis key share one budget."""
+    redis_client = fakeredis.FakeStrictRedis()
+    slept = []
+    worker_1 = RedisTokenBucket(redis_client, "ratelimit:test", rate=0.2, capacity=1, sleep=slept.append)
+    worker_2 = RedisTokenBucket(redis_client, "ratelimit:test", rate=0.2, capacity=1, sleep=slept.append)
+
+    assert worker_1.acquire() == 0
+    assert worker_2.acquire() == pytest.approx(5.0, abs=0.1)
+    assert len(slept) == 1
+
+
+def test_redis_bucket_falls_back_to_local(mocker):
+    """Test that the limiter keeps working locally when Redis is down."""
+    redis_client = fakeredis.FakeStrictRedis()
+    bucket = RedisTokenBucket(redis_client, "ratelimit:test", rate=0.2, capacity=1, sleep=lambda seconds: None)
+    bucket._script = mocker.Mock(side_effect=ConnectionError("redis down"))
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(5.0, abs=0.1)
+
+
+def test_redis_bucket_gives_up_past_max_wait():
+    """Test a rejected caller leaves the shared bucket untouched."""
+    redis_client = fakeredis.FakeStrictRedis()
+    bucket = RedisTokenBucket(redis_client, "ratelimit:test", rate=0.2, capacity=1, sleep=lambda seconds: None)
+    bucket.acquire()
+
+    with pytest.raises(RuntimeError):
+        bucket.acquire(max_wait=1)
+    assert bucket.acquire() == pytest.approx(5.0, abs=0.1)
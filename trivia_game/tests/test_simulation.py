@@ -0,0 +1,87 @@
+import logging
+
+import pytest
+
+from trivia_game.models import game_model, simulation
+from trivia_game.models.game_model import GameModel
+from trivia_game.models.simulation import (
+    InMemoryQuestionSource,
+    accuracy,
+    always_correct,
+    never_answers,
+    random_guess,
+    simulate_games,
+    simulate_rounds_batch
+)
+
+
+def test_in_memory_question_source():
+    """Test the source serves questions for its buckets only."""
+    source = InMemoryQuestionSource.generate(categories=(9,), per_bucket=2)
+
+    assert source(9, "multiple").type == "multiple"
+    with pytest.raises(ValueError, match="No trivia questions available"):
+        source(11, "boolean")
+
+
+def test_game_model_uses_question_source(mocker):
+    """Test a game with a question source never touches the question bank."""
+    mock_draw = mocker.patch("trivia_game.models.game_model.draw_question")
+    game = GameModel(question_source=InMemoryQuestionSource.generate(categories=(9,)))
+
+    assert game._draw_question(9, "boolean").category == 9
+    mock_draw.assert_not_called()
+
+
+def test_simulate_games(mocker):
+    """Test simulated games are played headless and tallied."""
+    mock_get = mocker.patch("requests.Session.get")
+    mock_input = mocker.patch("builtins.input")
+
+    result = simulate_games(50, strategies=(always_correct, never_answers), record_latency=True)
+
+    assert result.games == 50
+    assert result.rounds == 100
+    assert result.wins == [50, 0]
+    assert len(result.round_latencies) == 100
+    mock_get.assert_not_called()
+    mock_input.assert_not_called()
+
+
+def test_simulation_leaves_shared_logging_alone():
+    """Test simulated games log quietly without silencing real games played meanwhile."""
+    enabled = []
+
+    def checking(question, choices, rng):
+        enabled.append(game_model.logger.isEnabledFor(logging.INFO))
+        return choices[0]
+
+    simulate_games(1, strategies=(checking, checking))
+
+    assert enabled and all(enabled)
+    assert not game_model.simulated_logger.isEnabledFor(logging.INFO)
+
+
+def test_simulate_games_is_reproducible():
+    """Test the same seed gives the same tally."""
+    strategies = (accuracy(0.7), random_guess)
+    first = simulate_games(100, strategies=strategies, seed="replay")
+    second = simulate_games(100, strategies=strategies, seed="replay")
+    assert (first.wins, first.ties) == (second.wins, second.ties)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_simulate_rounds_batch(monkeypatch, use_numpy):
+    """Test batched scoring matches the expected outcome with and without NumPy."""
+    if use_numpy and simulation.np is None:
+        pytest.skip("NumPy is not installed")
+    if not use_numpy:
+        monkeypatch.setattr(simulation, "np", None)
+
+    result = simulate_rounds_batch(1000, accuracies=(1.0, 0.0), seed=1)
+    assert result.wins == [1000, 0]
+    assert result.rounds == 2000
+
+    result = simulate_rounds_batch(10000, accuracies=(0.5, 0.5), seed=1)
+    assert result.wins[0] + result.wins[1] + result.ties == 10000
+    assert abs(result.wins[0] - result.wins[1]) < 500
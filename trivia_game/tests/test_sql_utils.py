@@ -0,0 +1,90 @@
+import sqlite3
+import threading
+
+import pytest
+
+from trivia_game.utils.sql_utils import ConnectionPool, get_db_connection, get_pool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.db"), max_size=2, timeout=0.1)
+    yield pool
+    pool.close()
+
+
+def test_connection_uses_wal_and_pragmas(pool):
+    """Test new connections are opened in WAL mode with the tuned pragmas."""
+    conn = pool.acquire()
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] < 0
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    finally:
+        pool.release(conn)
+
+
+def test_connections_are_reused(pool):
+    """Test a returned connection is handed out again instead of opening a new one."""
+    conn = pool.acquire()
+    pool.release(conn)
+
+    assert pool.acquire() is conn
+    stats = pool.stats()
+    assert stats["size"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["hits"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_pool_is_bounded(pool):
+    """Test callers time out once every connection is checked out."""
+    pool.acquire()
+    pool.acquire()
+
+    with pytest.raises(sqlite3.OperationalError, match="Timed out"):
+        pool.acquire()
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_waiting_caller_gets_released_connection(pool):
+    """Test a caller blocked on a full pool receives the next released connection."""
+    pool.timeout = 5
+    first = pool.acquire()
+    pool.acquire()
+    received = []
+
+    waiter = threading.Thread(target=lambda: received.append(pool.acquire()))
+    waiter.start()
+    pool.release(first)
+    waiter.join(timeout=5)
+
+    assert received == [first]
+    assert pool.stats()["waits"] == 1
+
+
+def test_release_rolls_back_uncommitted_work(pool):
+    """Test uncommitted changes do not leak to the next user of a connection."""
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    conn.execute("INSERT INTO t VALUES (1)")
+    pool.release(conn)
+
+    conn = pool.acquire()
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    pool.release(conn)
+
+
+def test_get_db_connection_uses_pool(sqlite_db):
+    """Test get_db_connection checks connections out of the pool for DB_PATH."""
+    with get_db_connection() as conn:
+        conn.execute("SELECT 1")
+    with get_db_connection() as conn:
+        conn.execute("SELECT 1")
+
+    stats = get_pool().stats()
+    assert stats["db_path"] == str(sqlite_db)
+    assert stats["size"] == 1
+    assert stats["hits"] == 1
@@ -0,0 +1,143 @@
+import json
+
+import pytest
+
+from trivia_game.models.team_model import (
+    clear_teams,
+    create_team,
+    create_teams_bulk,
+    delete_team,
+    export_teams,
+    get_team_by_id,
+    get_team_by_name,
+    update_team_stats_batch
+)
+
+
+@pytest.fixture
+def no_dog_api(mocker):
+    return mocker.patch("trivia_game.models.team_model.get_random_dog_image", return_value="dog.jpg")
+
+
+def test_create_teams_bulk(sqlite_db, no_dog_api):
+    """Test bulk import writes every row in chunks, drawing mascots from the pool."""
+    rows = ({"team": f"Team {i}", "favorite_category": "9"} for i in range(25))
+
+    assert create_teams_bulk(rows, chunk_size=10) == {"created": 25, "skipped": 0}
+
+    team = get_team_by_id(25)
+    assert team.team == "Team 24"
+    assert team.favorite_category == 9
+    assert team.mascot == "dog.jpg"
+    assert no_dog_api.call_count == 25
+
+
+def test_create_teams_bulk_skips_existing(sqlite_db, no_dog_api):
+    """Test bulk import skips names that are already taken."""
+    create_team("Alpha", 9)
+
+    counts = create_teams_bulk([
+        {"team": "Alpha", "favorite_category": 9},
+        {"team": "Bravo", "favorite_category": 9, "mascot": "bravo.jpg"}
+    ])
+
+    assert counts == {"created": 1, "skipped": 1}
+    assert get_team_by_name("Bravo").mascot == "bravo.jpg"
+
+
+def test_create_teams_bulk_invalid_row(sqlite_db):
+    """Test an invalid row stops the import, keeping earlier chunks."""
+    rows = [{"team": "Alpha", "favorite_category": 9}, {"team": "", "favorite_category": 9}]
+
+    with pytest.raises(ValueError, match="Invalid team on row 2"):
+        create_teams_bulk(rows, chunk_size=1)
+
+    assert get_team_by_id(1).team == "Alpha"
+
+
+def test_unknown_category_is_rejected(sqlite_db, no_dog_api, monkeypatch):
+    """Test a team in an unknown category is rejected as such, before and after the table is recreated."""
+    monkeypatch.setenv("SQL_CREATE_TABLE_PATH", "sql/create_team_table.sql")
+    with pytest.raises(ValueError, match="Category with ID 999 not found"):
+        create_team("Alpha", 999)
+
+    clear_teams()
+
+    with pytest.raises(ValueError, match="Category with ID 999 not found"):
+        create_team("Bravo", 999)
+    with pytest.raises(ValueError, match="Unknown favorite_category on rows 2-2"):
+        create_teams_bulk([{"team": "Alpha", "favorite_category": 9},
+                           {"team": "Bravo", "favorite_category": 999}], chunk_size=1)
+    assert get_team_by_id(1).team == "Alpha"
+
+
+def test_export_teams(sqlite_db):
+    """Test exporting streams the teams that are not deleted."""
+    create_teams_bulk({"team": name, "favorite_category": 9} for name in ["Alpha", "Bravo", "Charlie"])
+    delete_team(2)
+
+    assert [team.team for team in export_teams(chunk_size=1)] == ["Alpha", "Charlie"]
+
+
+def test_update_team_stats_batch(sqlite_db):
+    """Test results are added up per team and written together."""
+    create_teams_bulk({"team": name, "favorite_category": 9} for name in ["Alpha", "Bravo"])
+
+    updated = update_team_stats_batch([(1, "win"), (2, "loss"), (1, "win"), (1, "loss")])
+
+    assert updated == 2
+    alpha, bravo = get_team_by_id(1), get_team_by_id(2)
+    assert (alpha.games_played, alpha.total_score) == (3, 2)
+    assert (bravo.games_played, bravo.total_score) == (1, 0)
+
+
+def test_update_team_stats_batch_all_or_nothing(sqlite_db):
+    """Test a batch naming an unknown or deleted team changes nothing."""
+    create_teams_bulk({"team": name, "favorite_category": 9} for name in ["Alpha", "Bravo"])
+    delete_team(2)
+
+    with pytest.raises(ValueError, match="Teams not found or deleted: 2, 3"):
+        update_team_stats_batch([(1, "win"), (2, "win"), (3, "loss")])
+
+    assert get_team_by_id(1).games_played == 0
+
+
+def test_update_team_stats_batch_invalid_result(sqlite_db):
+    """Test an unknown result is rejected."""
+    with pytest.raises(ValueError, match="Invalid result: draw"):
+        update_team_stats_batch([(1, "draw")])
+
+
+def test_bulk_routes(sqlite_db, client):
+    """Test importing JSON lines and CSV, then exporting the teams."""
+    response = client.post("/api/teams/bulk", data='{"team": "Alpha", "favorite_category": 9}\n\n{"team": "Bravo", "favorite_category": 9}\n')
+    assert response.status_code == 201
+    assert response.json["created"] == 2
+
+    response = client.post("/api/teams/bulk", data="team,favorite_category\nCharlie,11\nAlpha,9\n", content_type="text/csv")
+    assert response.json["created"] == 1
+    assert response.json["skipped"] == 1
+
+    response = client.get("/api/teams/bulk")
+    teams = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [team["team"] for team in teams] == ["Alpha", "Bravo", "Charlie"]
+
+
+def test_bulk_route_invalid(sqlite_db, client):
+    """Test an invalid upload is rejected."""
+    assert client.post("/api/teams/bulk", data="not json\n").status_code == 400
+    assert client.post("/api/teams/bulk", data='[1, 2]\n').status_code == 400
+
+
+def test_batch_stats_route(sqlite_db, client):
+    """Test posting a batch of results."""
+    create_teams_bulk({"team": name, "favorite_category": 9} for name in ["Alpha", "Bravo"])
+
+    response = client.post("/api/teams/stats/batch", json={"results": [
+        {"team_id": 1, "result": "win"}, {"team_id": 2, "result": "loss"}
+    ]})
+    assert response.status_code == 200
+    assert response.json["teams_updated"] == 2
+
+    assert client.post("/api/teams/stats/batch", json={"results": [{"team_id": 9, "result": "win"}]}).status_code == 400
+    assert client.post("/api/teams/stats/batch", json={"results": "nope"}).status_code == 400
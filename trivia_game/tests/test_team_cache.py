@@ -0,0 +1,156 @@
+import fakeredis
+import pytest
+
+from trivia_game.models.team_cache import TeamCache
+from trivia_game.models.team_model import (
+    clear_teams,
+    create_team,
+    delete_team,
+    get_team_by_id,
+    get_team_by_name,
+    local_team_cache,
+    update_team_stats,
+    update_team_stats_batch
+)
+from trivia_game.utils.sql_utils import get_db_connection
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeStrictRedis()
+
+
+@pytest.fixture
+def cache(redis_client, mocker):
+    """Fixture enabling the team cache against fakeredis."""
+    cache = TeamCache(redis_client)
+    mocker.patch("trivia_game.models.team_model.team_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def team(sqlite_db, cache, mocker):
+    mocker.patch("trivia_game.models.team_model.get_random_dog_image", return_value="dog.jpg")
+    create_team("Alpha", 9)
+    return get_team_by_id(1)
+
+
+def test_read_through(team, cache, mocker):
+    """Test a cached team is served without opening a connection."""
+    spy = mocker.patch("trivia_game.models.team_model.get_db_connection")
+
+    assert get_team_by_id(1) == team
+    assert get_team_by_name("Alpha") == team
+    spy.assert_not_called()
+    assert cache.stats()["hits"] == 2
+
+
+def test_cache_round_trips_none(cache):
+    """Test fields without a value come back as None."""
+    cache.set({"id": 3, "team": "Nobody", "favorite_category": None, "games_played": 0,
+               "total_score": 0, "current_score": 0, "mascot": None}, cache.generation())
+
+    cached = cache.get_by_id(3)
+    assert cached["favorite_category"] is None
+    assert cached["mascot"] is None
+
+
+def test_update_team_stats_invalidates(team):
+    """Test a stats update is visible on the next lookup."""
+    update_team_stats(1, "win")
+
+    assert get_team_by_id(1).total_score == 1
+    assert get_team_by_name("Alpha").games_played == 1
+
+
+def test_batch_update_invalidates(team):
+    """Test a batch stats update is visible on the next lookup."""
+    update_team_stats_batch([(1, "win"), (1, "win")])
+
+    assert get_team_by_id(1).total_score == 2
+
+
+def test_delete_team_invalidates(team):
+    """Test a deleted team is no longer served from the cache."""
+    delete_team(1)
+
+    with pytest.raises(ValueError, match="has been deleted"):
+        get_team_by_id(1)
+    with pytest.raises(ValueError, match="has been deleted"):
+        get_team_by_name("Alpha")
+
+
+def test_clear_teams_invalidates(team, redis_client, monkeypatch):
+    """Test clearing the teams empties the cache, so recycled IDs are not confused."""
+    monkeypatch.setenv("SQL_CREATE_TABLE_PATH", "sql/create_team_table.sql")
+    clear_teams()
+
+    assert redis_client.keys("team:*") == []
+    create_team("Bravo", 11)
+    assert get_team_by_id(1).team == "Bravo"
+    with pytest.raises(ValueError, match="not found"):
+        get_team_by_name("Alpha")
+
+
+def test_fill_racing_an_update_is_dropped(team, cache):
+    """Test a team loaded before an update is not cached after it."""
+    cache.invalidate(team_ids=[1], names=["Alpha"])
+    generation = cache.generation()
+    stale = team.to_dict()
+
+    update_team_stats(1, "win")
+    cache.set(stale, generation)
+
+    assert cache.get_by_id(1) is None
+    assert get_team_by_id(1).total_score == 1
+
+
+def test_names_expire(team, cache, redis_client):
+    """Test the name index expires along with the teams."""
+    assert 0 < redis_client.ttl(TeamCache.NAMES_KEY) <= cache.ttl
+
+
+def test_misses_counted(team, cache):
+    """Test lookups of uncached teams are counted as misses."""
+    cache.invalidate(team_ids=[1], names=["Alpha"])
+
+    get_team_by_name("Alpha")
+    get_team_by_id(1)
+
+    # One miss loading the fixture, one for the name lookup, which refills the cache for the ID
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_redis_failure_falls_back_to_sqlite(team, cache, redis_client, mocker):
+    """Test lookups still work when Redis is down."""
+    mocker.patch.object(redis_client, "hgetall", side_effect=ConnectionError("down"))
+    mocker.patch.object(redis_client, "pipeline", side_effect=ConnectionError("down"))
+
+    assert get_team_by_id(1) == team
+    assert cache.stats()["errors"] >= 1
+
+
+def test_disabled_cache_is_a_no_op():
+    """Test a cache without Redis never hits."""
+    cache = TeamCache()
+    cache.set({"id": 1, "team": "Alpha"}, cache.generation())
+
+    assert cache.get_by_id(1) is None
+    assert cache.stats()["enabled"] is False
+
+
+def test_redis_cache_skips_the_local_cache(cache, sqlite_db, mocker):
+    """Test teams are not held in process when the cache is shared through Redis."""
+    mocker.patch("trivia_game.models.team_model.get_random_dog_image", return_value="dog.jpg")
+    create_team("Alpha", 9)
+    get_team_by_id(1)
+
+    # Another worker updated the team and dropped it from Redis
+    cache.invalidate([1], ["Alpha"])
+    with get_db_connection() as conn:
+        conn.execute("UPDATE teams SET total_score = 4 WHERE id = 1")
+        conn.commit()
+
+    assert get_team_by_id(1).total_score == 4
+    assert local_team_cache.stats()["size"] == 0
@@ -39,37 +39,17 @@ def mock_cursor(mocker):
 
 
 
-# Test for successful image fetch
-@patch('requests.get')  # Mock 'requests.get'
-def test_get_random_dog_image_success(mock_get):
-    # Define the mock response data
-    mock_response = {
-        'message': 'https://dog.ceo/dog-api/images/random/dog.jpg'
-    }
-
-    # Set up the mock to return a response with a status code of 200 and the mock data
-    mock_get.return_value.status_code = 200
-    mock_get.return_value.json.return_value = mock_response
-
-    # Call the function
-    result = get_random_dog_image()
-
-    # Assert that the returned URL matches the mock response
-    assert result == mock_response['message']
-
-# Test for failure (network error or exception)
-@patch('requests.get')  # Mock 'requests.get'
-def test_get_random_dog_image_failure(mock_get):
-    # Simulate an error (e.g., network issue or bad status code)
-    mock_get.side_effect = requests.RequestException("Network error")
+def test_get_random_dog_image_from_pool(mocker):
+    """Test the mascot comes from the pool without a network request."""
+    mock_get = mocker.patch("requests.Session.get")
+    mocker.patch("trivia_game.models.team_model.mascot_pool.get", return_value="https://dog.ceo/dog-api/images/random/dog.jpg")
 
-    # Call the function (it should fallback to the default image URL)
     result = get_random_dog_image()
 
-    # Assert that the fallback image URL is returned
-    assert result == "https://images.dog.ceo/breeds/shiba/shiba-16.jpg"  # Correct fallback URL
+    assert result == "https://dog.ceo/dog-api/images/random/dog.jpg"
+    mock_get.assert_not_called()
 
-@patch("requests.get")
+@patch("requests.Session.get")
 def test_fetch_trivia_categories(mock_get):
     """Test fetching trivia categories."""
     mock_response = MagicMock()
@@ -0,0 +1,218 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+import time
+
+import fakeredis
+import pytest
+
+from trivia_game.models.team_model import Team, create_teams_bulk, get_team_by_id, update_team_stats_batch
+from trivia_game.models.tournament_model import (
+    DOUBLE_ELIMINATION,
+    ROUND_ROBIN,
+    SINGLE_ELIMINATION,
+    SWISS,
+    TOURNAMENT_FAILED,
+    TOURNAMENT_FINISHED,
+    Tournament,
+    TournamentManager,
+    create_tournament_manager
+)
+
+
+def make_teams(n):
+    return [Team(id=i, team=f"Team {i}", favorite_category=9, games_played=0, total_score=0,
+                 current_score=0, mascot="") for i in range(1, n + 1)]
+
+
+def lower_id_wins(team_a, team_b, source, seed):
+    """Match runner where the team with the lower ID always wins."""
+    return (1, 0) if team_a.id < team_b.id else (0, 1)
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+
+def play(teams, format, executor, runner=lower_id_wins):
+    tournament = Tournament(teams, format, seed="test", match_runner=runner, record_results=False)
+    tournament.run(executor)
+    assert tournament.state == TOURNAMENT_FINISHED
+    return tournament
+
+
+@pytest.mark.parametrize("n", [2, 5, 8])
+def test_round_robin(executor, n):
+    """Test every pair of teams meets exactly once."""
+    tournament = play(make_teams(n), ROUND_ROBIN, executor)
+
+    pairs = [frozenset((m.team_a, m.team_b)) for m in tournament.matches if m.team_b is not None]
+    assert sorted(pairs, key=sorted) == sorted((frozenset(p) for p in combinations(range(1, n + 1), 2)), key=sorted)
+    assert tournament.progress()["winner"] == 1
+    assert tournament.wins[1] == n - 1
+
+
+@pytest.mark.parametrize("n", [2, 7, 16])
+def test_single_elimination(executor, n):
+    """Test one team is left unbeaten after ceil(log2(n)) rounds."""
+    tournament = play(make_teams(n), SINGLE_ELIMINATION, executor)
+
+    assert tournament.round == tournament.total_rounds
+    assert [team_id for team_id, losses in tournament.losses.items() if losses == 0] == [1]
+    assert tournament.progress()["winner"] == 1
+
+
+@pytest.mark.parametrize("n", [2, 6, 8])
+def test_double_elimination(executor, n):
+    """Test every team but the winner is out after two losses."""
+    tournament = play(make_teams(n), DOUBLE_ELIMINATION, executor)
+
+    assert tournament.losses[1] == 0
+    assert all(losses == 2 for team_id, losses in tournament.losses.items() if team_id != 1)
+    assert tournament.progress()["winner"] == 1
+
+
+def test_swiss_avoids_rematches(executor):
+    """Test Swiss pairs teams without rematches and gives each bye once."""
+    tournament = play(make_teams(9), SWISS, executor)
+
+    assert tournament.round == 4
+    pairs = [frozenset((m.team_a, m.team_b)) for m in tournament.matches if m.team_b is not None]
+    assert len(pairs) == len(set(pairs))
+    byes = [m.team_a for m in tournament.matches if m.team_b is None]
+    assert len(byes) == len(set(byes)) == 4
+    assert tournament.progress()["winner"] == 1
+
+
+def test_draws_are_replayed(executor):
+    """Test a drawn match is replayed before the higher seed is given the win."""
+    results = iter([(1, 1), (0, 2)])
+    tournament = play(make_teams(2), SINGLE_ELIMINATION, executor, lambda *args: next(results))
+
+    assert tournament.matches[0].winner == 2
+
+
+def test_simulated_tournament_is_reproducible(executor):
+    """Test the default runner plays the same results for the same seed."""
+    first = Tournament(make_teams(6), SWISS, seed="replay", record_results=False)
+    second = Tournament(make_teams(6), SWISS, seed="replay", record_results=False)
+    first.run(executor)
+    second.run(executor)
+
+    assert [m.to_dict() for m in first.matches] == [m.to_dict() for m in second.matches]
+
+
+def test_invalid_tournament():
+    """Test unknown formats, duplicate teams and single teams are rejected."""
+    with pytest.raises(ValueError, match="Invalid tournament format"):
+        Tournament(make_teams(2), "ladder")
+    with pytest.raises(ValueError, match="at least two teams"):
+        Tournament(make_teams(1))
+    with pytest.raises(ValueError, match="twice"):
+        Tournament(make_teams(1) * 2)
+
+
+def test_tournament_records_stats(sqlite_db, executor, mocker):
+    """Test each round's results are written with one batched update when asked to."""
+    create_teams_bulk({"team": f"Team {i}", "favorite_category": 9, "mascot": "dog.jpg"} for i in range(4))
+    batch = mocker.patch("trivia_game.models.tournament_model.update_team_stats_batch",
+                         wraps=update_team_stats_batch)
+
+    tournament = Tournament([get_team_by_id(i) for i in range(1, 5)], ROUND_ROBIN, seed="stats",
+                            match_runner=lower_id_wins, record_results=True)
+    tournament.run(executor)
+
+    assert tournament.state == TOURNAMENT_FINISHED
+    assert batch.call_count == 3
+    assert [get_team_by_id(i).total_score for i in range(1, 5)] == [3, 2, 1, 0]
+    assert all(get_team_by_id(i).games_played == 3 for i in range(1, 5))
+
+
+def test_simulated_tournament_leaves_team_stats_alone(sqlite_db, mocker):
+    """Test the made-up results of a default tournament never reach the teams' stats."""
+    create_teams_bulk({"team": f"Team {i}", "favorite_category": 9, "mascot": "dog.jpg"} for i in range(4))
+    before = [get_team_by_id(i).to_dict() for i in range(1, 5)]
+    batch = mocker.patch("trivia_game.models.tournament_model.update_team_stats_batch")
+
+    tournament = TournamentManager(max_workers=2).create([1, 2, 3, 4], ROUND_ROBIN, seed="stats", background=False)
+
+    assert tournament.state == TOURNAMENT_FINISHED
+    assert batch.call_count == 0
+    assert [get_team_by_id(i).to_dict() for i in range(1, 5)] == before
+    with pytest.raises(ValueError, match="cannot be recorded"):
+        Tournament(make_teams(2), record_results=True)
+
+
+def test_redis_tournament_is_reported_by_every_worker(sqlite_db):
+    """Test a tournament played by one worker process can be polled through another."""
+    create_teams_bulk({"team": f"Team {i}", "favorite_category": 9, "mascot": "dog.jpg"} for i in range(3))
+    shared = fakeredis.FakeStrictRedis()
+    playing = create_tournament_manager("redis", shared, max_workers=2)
+    polling = create_tournament_manager("redis", shared)
+
+    tournament = playing.create([1, 2, 3], SINGLE_ELIMINATION, seed="shared", background=False)
+
+    assert polling.progress(tournament.id) == tournament.progress()
+    assert polling.matches(tournament.id) == [match.to_dict() for match in tournament.matches]
+    assert polling.list() == [{"tournament_id": tournament.id, "format": SINGLE_ELIMINATION,
+                               "state": TOURNAMENT_FINISHED}]
+    with pytest.raises(ValueError, match="not found"):
+        polling.progress("missing")
+
+
+def test_redis_tournament_limit_is_shared(sqlite_db):
+    """Test the oldest finished tournament of any worker makes room for a new one."""
+    create_teams_bulk({"team": f"Team {i}", "favorite_category": 9, "mascot": "dog.jpg"} for i in range(2))
+    shared = fakeredis.FakeStrictRedis()
+    first = create_tournament_manager("redis", shared, max_tournaments=1).create([1, 2], background=False)
+
+    second = create_tournament_manager("redis", shared, max_tournaments=1).create([1, 2], background=False)
+
+    listed = create_tournament_manager("redis", shared).list()
+    assert [t["tournament_id"] for t in listed] == [second.id]
+    with pytest.raises(ValueError):
+        create_tournament_manager("redis", shared).progress(first.id)
+
+
+def test_unknown_tournament_store():
+    """Test a misconfigured tournament store is rejected."""
+    with pytest.raises(ValueError, match="Unknown tournament store"):
+        create_tournament_manager("sqlite")
+    with pytest.raises(ValueError, match="needs a Redis client"):
+        create_tournament_manager("redis")
+
+
+def test_tournament_failure_is_reported(executor, mocker):
+    """Test an error while playing marks the tournament as failed."""
+    tournament = Tournament(make_teams(2), match_runner=mocker.Mock(side_effect=RuntimeError("boom")),
+                            record_results=False)
+    tournament.run(executor)
+
+    assert tournament.state == TOURNAMENT_FAILED
+    assert tournament.progress()["error"] == "boom"
+
+
+def test_tournament_routes(client, sqlite_db):
+    """Test a tournament is started and its progress polled through the API."""
+    create_teams_bulk({"team": f"Team {i}", "favorite_category": 9, "mascot": "dog.jpg"} for i in range(3))
+
+    response = client.post('/api/tournaments', json={"team_ids": [1, 2, 3], "format": "single_elimination"})
+    assert response.status_code == 202
+    tournament_id = response.get_json()["tournament_id"]
+
+    deadline = time.monotonic() + 10
+    while True:
+        progress = client.get(f'/api/tournaments/{tournament_id}').get_json()["tournament"]
+        if progress["state"] == "finished" or time.monotonic() > deadline:
+            break
+        time.sleep(0.01)
+    assert progress["state"] == "finished"
+    assert progress["format"] == "single_elimination"
+    assert progress["matches_played"] == 2
+
+    matches = client.get(f'/api/tournaments/{tournament_id}/matches').get_json()["matches"]
+    assert len(matches) == 3
+
+    assert client.post('/api/tournaments', json={"team_ids": [1, 99]}).status_code == 400
+    assert client.get('/api/tournaments/missing').status_code == 400
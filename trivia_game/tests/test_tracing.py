@@ -0,0 +1,169 @@
+import json
+import os
+
+import pytest
+
+from ..app import create_app
+from config import TestConfig
+from trivia_game.models.password_model import Users
+from trivia_game.utils import tracing
+from trivia_game.utils.sql_utils import get_db_connection
+from trivia_game.utils.tracing import JsonlExporter, Trace, end_trace, span, start_trace, traced
+
+
+@pytest.fixture(autouse=True)
+def no_trace_left_behind():
+    yield
+    end_trace()
+
+
+def test_spans_nest_under_the_current_span():
+    """Test a span opened inside another records it as its parent."""
+    trace = start_trace("test")
+    with span("outer"):
+        with span("inner", detail=1):
+            pass
+    end_trace()
+
+    outer, inner = trace.spans
+    assert outer.parent_id is None
+    assert inner.parent_id == outer.span_id
+    assert inner.attributes == {"detail": 1}
+    assert outer.duration >= inner.duration
+
+
+def test_spans_outside_a_trace_are_not_recorded():
+    """Test span() and traced() cost nothing but a lookup when no trace is running."""
+    calls = []
+
+    @traced()
+    def work():
+        calls.append(1)
+        return "done"
+
+    with span("ignored") as opened:
+        assert opened is None
+    assert work() == "done"
+    assert calls == [1]
+
+
+def test_traced_records_errors():
+    """Test a failing traced function is recorded with its exception type."""
+    @traced("failing")
+    def fail():
+        raise ValueError("boom")
+
+    trace = start_trace("test")
+    with pytest.raises(ValueError):
+        fail()
+    end_trace()
+
+    assert trace.spans[0].name == "failing"
+    assert trace.spans[0].attributes["error"] == "ValueError"
+
+
+def test_server_timing_aggregates_by_name():
+    """Test the header has a total and one entry per span name with its call count."""
+    trace = start_trace("test")
+    for _ in range(3):
+        with span("sqlite"):
+            pass
+    with span("http.opentdb.com"):
+        pass
+    end_trace()
+
+    entries = trace.server_timing().split(", ")
+    assert entries[0].startswith("total;dur=")
+    assert entries[1].startswith("sqlite;dur=") and entries[1].endswith('desc="3x"')
+    assert entries[2].startswith("http.opentdb.com;dur=")
+
+
+def test_spans_per_trace_are_bounded():
+    """Test spans beyond the limit are counted instead of kept."""
+    trace = Trace("test", max_spans=2)
+    tracing._current_trace.set(trace)
+    for _ in range(5):
+        with span("sqlite"):
+            pass
+    end_trace()
+
+    assert len(trace.spans) == 2
+    assert trace.dropped == 3
+
+
+def test_sqlite_span_lists_statements(sqlite_db):
+    """Test a traced sqlite block records the statements it ran."""
+    trace = start_trace("test")
+    with get_db_connection() as conn:
+        conn.execute("SELECT 1")
+        conn.execute("SELECT 2")
+    end_trace()
+
+    sqlite_span = trace.spans[0]
+    assert sqlite_span.name == "sqlite"
+    assert sqlite_span.attributes["statements"] == ["SELECT 1", "SELECT 2"]
+    assert sqlite_span.attributes["statement_count"] == 2
+
+
+def test_exporter_writes_json_lines(tmp_path):
+    """Test each exported trace is one JSON object per line."""
+    exporter = JsonlExporter(str(tmp_path / "traces.jsonl"))
+    for name in ("first", "second"):
+        trace = start_trace(name)
+        with span("work"):
+            pass
+        exporter.export(end_trace())
+    exporter.flush()
+
+    lines = (tmp_path / "traces.jsonl").read_text().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["first", "second"]
+    assert json.loads(lines[0])["spans"][0]["name"] == "work"
+
+
+def test_exporter_drops_traces_when_full(tmp_path):
+    """Test a full export queue drops traces instead of blocking the request."""
+    exporter = JsonlExporter(str(tmp_path / "traces.jsonl"), max_queue=1)
+    exporter._writer_pid = os.getpid()  # no writer, so the queue stays full
+    exporter.export(Trace("first"))
+    exporter.export(Trace("second"))
+
+    assert exporter.dropped == 1
+
+
+def test_server_timing_is_not_sent_to_anonymous_callers(client):
+    """Test span names are not exposed to callers without the admin token."""
+    response = client.get("/api/health")
+
+    assert response.status_code == 200
+    assert "Server-Timing" not in response.headers
+
+
+def test_login_response_has_timing_breakdown(app, client, session):
+    """Test a trusted request's response breaks its time down into model, password and query spans."""
+    app.config["ADMIN_TOKEN"] = "admin-secret"
+    Users.create_user("testuser", "password123")
+
+    response = client.post("/api/login", json={"username": "testuser", "password": "password123"},
+                           headers={"X-Request-ID": "abc123", "X-Admin-Token": "admin-secret"})
+
+    assert response.status_code == 200
+    assert response.headers["X-Trace-Id"] == "abc123"
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("total;dur=")
+    for name in ("Users.authenticate", "verify_password", "sqlalchemy"):
+        assert f"{name};dur=" in timing
+
+
+def test_traces_are_exported_from_the_app(tmp_path):
+    """Test the app appends each request's trace to the configured file."""
+    path = tmp_path / "traces.jsonl"
+
+    class ExportConfig(TestConfig):
+        TRACE_EXPORT_PATH = str(path)
+
+    app = create_app(ExportConfig)
+    app.test_client().get("/api/health")
+    app.extensions["trace_exporter"].flush()
+
+    trace = json.loads(path.read_text().splitlines()[0])
+    assert trace["name"] == "GET /api/health"
@@ -1,6 +1,12 @@
+import hashlib
+
 import pytest
+from sqlalchemy import event
+
+from trivia_game.utils.db import db
 
 from trivia_game.models.password_model import Users
+from trivia_game.utils.password_hashing import HashingPool, hash_password, needs_rehash, verify_password
 
 
 @pytest.fixture
@@ -10,6 +16,19 @@ def sample_user():
         "password": "securepassword123"
     }
 
+@pytest.fixture
+def query_count(app):
+    """Fixture counting the SELECT statements sent to the users database."""
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", count)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", count)
+
 def clear_users(session):
     """Clear all users from the database."""
     session.query(Users).delete()
@@ -31,7 +50,8 @@ def test_create_user(session, sample_user):
     assert user is not None, "User should be created in the database."
     assert user.username == sample_user["username"], "Username should match the input."
     assert len(user.salt) == 32, "Salt should be 32 characters (hex)."
-    assert len(user.password) == 64, "Password should be a 64-character SHA-256 hash."
+    assert user.password.startswith("scrypt$"), "Password should be an scrypt hash."
+    assert len(user.password.rsplit("$", 1)[1]) == 64, "Digest should be 64 characters (hex)."
 
 def test_create_duplicate_user(session, sample_user):
     """Test attempting to create a user with a duplicate username."""
@@ -53,6 +73,69 @@ def test_check_password_incorrect(session, sample_user):
     Users.create_user(**sample_user)
     assert Users.check_password(sample_user["username"], "wrongpassword") is False, "Password should not match."
 
+def test_check_password_rehashes_legacy_hash(session, sample_user):
+    """Test a legacy SHA-256 hash is replaced with scrypt on a successful login."""
+    salt = "00" * 16
+    legacy = hashlib.sha256((sample_user["password"] + salt).encode()).hexdigest()
+    session.add(Users(username=sample_user["username"], salt=salt, password=legacy))
+    session.commit()
+
+    assert Users.check_password(sample_user["username"], "wrongpassword") is False
+    assert session.query(Users).first().password == legacy, "A failed login should not rehash."
+
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+    user = session.query(Users).first()
+    assert user.password.startswith("scrypt$")
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+
+def test_check_password_rehashes_outdated_cost(session, sample_user):
+    """Test a hash made with an older scrypt cost is upgraded on login."""
+    salt = "00" * 16
+    session.add(Users(username=sample_user["username"], salt=salt, password=hash_password(sample_user["password"], salt, n=2 ** 4)))
+    session.commit()
+
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+    assert not needs_rehash(session.query(Users).first().password)
+
+def test_verify_password_malformed_hash():
+    """Test a malformed scrypt hash never matches."""
+    assert verify_password("password", "00" * 16, "scrypt$bad") is False
+
+def test_hashing_pool_rejects_when_full(mocker):
+    """Test the pool turns requests away once its queue is full."""
+    pool = HashingPool(max_workers=1, max_queue=0)
+    pool._pending = 1
+
+    with pytest.raises(RuntimeError, match="Too many login attempts"):
+        pool.run(hash_password, "password", "00" * 16)
+    assert pool.stats()["rejected"] == 1
+
+def test_hashing_pool_stats():
+    """Test the pool records completed hashes."""
+    pool = HashingPool(max_workers=2, max_queue=4)
+
+    assert pool.run(verify_password, "password", "00" * 16, hash_password("password", "00" * 16)) is True
+    stats = pool.stats()
+    assert stats["completed"] == 1
+    assert stats["queued"] == 0
+
+def test_authenticate_returns_user_with_one_query(session, sample_user, query_count):
+    """Test authenticating returns the user record from a single query."""
+    Users.create_user(**sample_user)
+    query_count.clear()
+
+    user = Users.authenticate(sample_user["username"], sample_user["password"])
+
+    assert user.username == sample_user["username"]
+    assert len(query_count) == 1
+    assert Users.get_id_by_username(sample_user["username"]) == user.id
+    assert len(query_count) == 1, "The user ID should come from the cache."
+
+def test_authenticate_wrong_password(session, sample_user):
+    """Test authenticating with the wrong password returns None."""
+    Users.create_user(**sample_user)
+    assert Users.authenticate(sample_user["username"], "wrongpassword") is None
+
 def test_check_password_user_not_found(session):
     """Test checking password for a non-existent user."""
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
@@ -111,9 +194,55 @@ def test_get_id_by_username(session, sample_user):
     assert user.id == user_id, "Retrieved ID should match the user's ID."
 
 
+def test_get_id_by_username_caches_missing_user(session, query_count):
+    """Test an unknown username is only looked up once within the negative TTL."""
+    for _ in range(3):
+        with pytest.raises(ValueError, match="User ghost not found"):
+            Users.get_id_by_username("ghost")
+
+    assert len(query_count) == 1
+
+def test_create_user_clears_missing_user(session, sample_user):
+    """Test creating a user replaces a cached 'not found'."""
+    with pytest.raises(ValueError):
+        Users.get_id_by_username(sample_user["username"])
+
+    Users.create_user(**sample_user)
+
+    assert Users.get_id_by_username(sample_user["username"]) == 1
+
+def test_delete_user_invalidates_cache(session, sample_user):
+    """Test a deleted user's cached ID is dropped."""
+    Users.create_user(**sample_user)
+    Users.get_id_by_username(sample_user["username"])
+
+    Users.delete_user(sample_user["username"])
+
+    with pytest.raises(ValueError, match="User testuser not found"):
+        Users.get_id_by_username(sample_user["username"])
+
+def test_login_uses_one_query(client, session, sample_user, query_count):
+    """Test a successful login reads the user once."""
+    Users.create_user(**sample_user)
+    query_count.clear()
+
+    response = client.post("/api/login", json=sample_user)
+
+    assert response.status_code == 200
+    assert len(query_count) == 1
+
 def test_get_id_by_username_user_not_found(session):
     """
     Test failure when retrieving a non-existent user's ID by their username.
     """
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
-        Users.get_id_by_username("nonexistentuser")
\ No newline at end of file
+        Users.get_id_by_username("nonexistentuser")
+
+def test_login_rejected_when_hashing_pool_full(client, session, sample_user, mocker):
+    """Test login answers 503 while the hashing pool is full."""
+    Users.create_user(**sample_user)
+    mocker.patch("trivia_game.models.password_model.hashing_pool.run", side_effect=RuntimeError("full"))
+
+    response = client.post("/api/login", json=sample_user)
+
+    assert response.status_code == 503
@@ -0,0 +1,271 @@
+import argparse
+from collections import deque
+import logging
+import os
+import random
+import threading
+from typing import Iterable, Optional
+
+import requests
+
+from trivia_game.clients.http_client import http_get
+from trivia_game.utils.circuit_breaker import CircuitBreaker
+from trivia_game.utils.logger import configure_logger
+from trivia_game.utils.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+DOG_API_URL = os.getenv("DOG_API_URL", "https://dog.ceo/api")
+DOG_API_TIMEOUT = float(os.getenv("DOG_API_TIMEOUT", 3))
+DOG_API_FAILURE_THRESHOLD = int(os.getenv("DOG_API_FAILURE_THRESHOLD", 3))
+DOG_API_COOLDOWN = float(os.getenv("DOG_API_COOLDOWN", 60))  # seconds the circuit stays open
+
+MASCOT_POOL_SIZE = int(os.getenv("MASCOT_POOL_SIZE", 200))
+MASCOT_BATCH_SIZE = int(os.getenv("MASCOT_BATCH_SIZE", 50))  # the most Dog CEO returns per request
+MASCOT_REFILL_INTERVAL = float(os.getenv("MASCOT_REFILL_INTERVAL", 300))  # seconds
+MASCOT_SEED_PATH = os.getenv("MASCOT_SEED_PATH", "data/mascot_seed.txt")
+MASCOT_POOL_BACKEND = os.getenv("MASCOT_POOL_BACKEND", "memory")
+
+# Served when neither the pool nor the seed file has anything
+DEFAULT_MASCOT_URL = "https://images.dog.ceo/breeds/shiba/shiba-16.jpg"
+
+
+def load_seed(path: str) -> list[str]:
+    """
+    Reads mascot URLs from a seed file, one per line; blank lines and # comments are skipped.
+
+    Args:
+        path (str): the seed file
+
+    Returns:
+        list[str]: the URLs, or an empty list if the file cannot be read
+    """
+    try:
+        with open(path, "r") as fh:
+            return [line.strip() for line in fh if line.strip() and not line.startswith("#")]
+    except OSError as e:
+        logger.warning("Could not read mascot seed file %s: %s", path, str(e))
+        return []
+
+
+def fetch_dog_images(count: int = MASCOT_BATCH_SIZE) -> list[str]:
+    """
+    Fetches a batch of random dog image URLs from the Dog CEO API.
+
+    Args:
+        count (int): the number of images, at most 50
+
+    Returns:
+        list[str]: the image URLs
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails or times out.
+        ValueError: If the response is not a list of images.
+    """
+    response = http_get(f"{DOG_API_URL}/breeds/image/random/{count}", timeout=DOG_API_TIMEOUT)
+    response.raise_for_status()
+    data = response.json()
+    urls = data.get("message")
+    if data.get("status") != "success" or not isinstance(urls, list):
+        raise ValueError("Unexpected response from the Dog CEO API")
+    return urls
+
+
+class MascotPool:
+    """
+    A bounded ring of pre-fetched mascot image URLs.
+
+    `get()` never touches the network: it hands out the next URL in the ring and
+    moves it to the back. A background worker refills the ring in batches once a
+    batch worth of URLs has been served, and fresh URLs are handed out first. While
+    the Dog CEO API is down a circuit breaker stops the refills and the ring keeps
+    cycling through what it has, starting from the seed file.
+
+    With a Redis client the ring is a Redis list shared by every worker process.
+
+    Attributes:
+        capacity (int): the maximum number of URLs kept
+        batch_size (int): URLs fetched per refill
+    """
+
+    REDIS_KEY = "mascot:pool"
+
+    def __init__(self, capacity: int = MASCOT_POOL_SIZE, batch_size: int = MASCOT_BATCH_SIZE,
+                 seed: Optional[Iterable[str]] = None, redis_client=None,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self._redis = redis_client
+        self.breaker = breaker or CircuitBreaker("dog.ceo", DOG_API_FAILURE_THRESHOLD, DOG_API_COOLDOWN)
+        self._lock = threading.Lock()
+
+        self._seed = list(seed or []) or [DEFAULT_MASCOT_URL]
+        shuffled = random.sample(self._seed, len(self._seed))
+        self._urls: deque = deque(shuffled, maxlen=capacity)
+
+        self._served_since_refill = 0
+        self._served = 0
+        self._refills = 0
+        self._refill_failures = 0
+
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def _redis_call(self, method: str, *args):
+        if self._redis is None:
+            return None
+        try:
+            return getattr(self._redis, method)(*args)
+        except Exception as e:
+            logger.warning("Redis unavailable for the mascot pool: %s", str(e))
+            return None
+
+    def get(self) -> str:
+        """
+        Returns the next mascot URL, without waiting on the network.
+
+        Returns:
+            str: an image URL
+        """
+        url = self._redis_call("rpoplpush", self.REDIS_KEY, self.REDIS_KEY)
+        if isinstance(url, bytes):
+            url = url.decode()
+
+        with self._lock:
+            if not url:
+                url = self._urls[0]
+                self._urls.rotate(-1)
+            self._served += 1
+            self._served_since_refill += 1
+            refill_due = self._served_since_refill >= self.batch_size
+
+        if refill_due:
+            self._wakeup.set()
+        return url
+
+    def add(self, urls: list[str]) -> None:
+        """
+        Puts fresh URLs at the front of the ring, pushing out the most recently served ones.
+
+        Args:
+            urls (list[str]): the URLs to add
+        """
+        if not urls:
+            return
+        with self._lock:
+            self._urls.extendleft(urls)
+            self._served_since_refill = 0
+        # rpoplpush serves from the right, so fresh URLs go right and the left end is trimmed
+        if self._redis_call("rpush", self.REDIS_KEY, *urls) is not None:
+            self._redis_call("ltrim", self.REDIS_KEY, -self.capacity, -1)
+
+    def refill(self) -> int:
+        """
+        Fetches one batch of URLs into the ring, unless the circuit breaker is open.
+
+        Returns:
+            int: the number of URLs added
+        """
+        if not self.breaker.allow():
+            logger.debug("Skipping mascot refill, the Dog CEO circuit is open")
+            return 0
+        try:
+            urls = fetch_dog_images(self.batch_size)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.breaker.record_failure()
+            with self._lock:
+                self._refill_failures += 1
+            logger.error("Error fetching dog images: %s", e)
+            return 0
+
+        self.breaker.record_success()
+        self.add(urls)
+        with self._lock:
+            self._refills += 1
+        logger.info("Added %d mascots to the pool", len(urls))
+        return len(urls)
+
+    def start_background_refill(self, interval: float = MASCOT_REFILL_INTERVAL) -> None:
+        """
+        Starts a daemon thread that refills the ring right away, whenever a batch has
+        been served and at least every `interval` seconds.
+
+        Args:
+            interval (float): the longest time between refills
+        """
+        if self._worker is not None and self._worker.is_alive():
+            return
+
+        def run():
+            while not self._stop.is_set():
+                # Cleared before the refill, so a wakeup sent while it runs triggers the next one
+                self._wakeup.clear()
+                self.refill()
+                self._wakeup.wait(interval)
+
+        self._stop.clear()
+        self._worker = threading.Thread(target=run, name="mascot-refill", daemon=True)
+        self._worker.start()
+        logger.info("Refilling the mascot pool in the background")
+
+    def stop_background_refill(self) -> None:
+        """
+        Stops the background worker, if it is running.
+        """
+        self._stop.set()
+        self._wakeup.set()
+
+    def stats(self) -> dict:
+        """
+        Returns the pool's metrics.
+
+        Returns:
+            dict: the ring size, URLs served, refills, failed refills and the circuit state
+        """
+        with self._lock:
+            return {
+                "size": len(self._urls),
+                "capacity": self.capacity,
+                "served": self._served,
+                "refills": self._refills,
+                "refill_failures": self._refill_failures,
+                "circuit": self.breaker.state
+            }
+
+
+def create_mascot_pool() -> MascotPool:
+    """
+    Creates the mascot pool shared by the process, seeded from MASCOT_SEED_PATH.
+
+    With MASCOT_POOL_BACKEND=redis the ring is shared through Redis.
+
+    Returns:
+        MascotPool: the pool
+    """
+    seed = load_seed(MASCOT_SEED_PATH)
+    if MASCOT_POOL_BACKEND == "redis":
+        from trivia_game.clients.redis_client import redis_client
+
+        return MascotPool(seed=seed, redis_client=redis_client)
+    return MascotPool(seed=seed)
+
+
+mascot_pool = create_mascot_pool()
+metrics.register_stats("mascot_pool", mascot_pool.stats)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a mascot seed file from the Dog CEO API.")
+    parser.add_argument("--write-seed", required=True, help="the seed file to write")
+    parser.add_argument("--count", type=int, default=MASCOT_BATCH_SIZE, help="the number of URLs (at most 50)")
+    args = parser.parse_args()
+
+    urls = fetch_dog_images(args.count)
+    with open(args.write_seed, "w") as fh:
+        fh.write("# Mascot image URLs served while the Dog CEO API cannot be reached.\n")
+        fh.write("\n".join(urls) + "\n")
+    print(f"Wrote {len(urls)} mascot URLs to {args.write_seed}")
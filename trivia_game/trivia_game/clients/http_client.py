@@ -0,0 +1,304 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from trivia_game.utils.logger import configure_logger
+from trivia_game.utils.metrics import metrics
+from trivia_game.utils.tracing import span
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 10))  # keep-alive connections kept per host
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", 0.5))  # seconds
+HTTP_BACKOFF_CAP = float(os.getenv("HTTP_BACKOFF_CAP", 8))  # seconds
+
+# Responses worth retrying; everything else is returned to the caller as-is
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+# Latency histogram bucket bounds, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    """
+    How requests to one host are made.
+
+    Attributes:
+        timeout (float): seconds to wait for a connection or a response
+        retries (int): extra attempts after a connection error, timeout or retryable status
+        max_concurrency (int): requests to the host in flight at once
+    """
+    timeout: float = 10
+    retries: int = 1
+    max_concurrency: int = 8
+
+
+DEFAULT_POLICY = HostPolicy()
+
+HOST_POLICIES = {
+    # OpenTDB is rate limited by opentdb_client, which retries itself so every attempt takes a token
+    "opentdb.com": HostPolicy(timeout=float(os.getenv("OPENTDB_TIMEOUT", 10)), retries=0, max_concurrency=2),
+    "dog.ceo": HostPolicy(timeout=float(os.getenv("DOG_API_TIMEOUT", 3)), retries=1, max_concurrency=4),
+    "www.random.org": HostPolicy(timeout=5, retries=1, max_concurrency=2),
+}
+
+
+class LatencyHistogram:
+    """
+    A thread-safe histogram of request latencies with fixed buckets.
+
+    Attributes:
+        buckets (tuple[float, ...]): the upper bounds of the buckets, in seconds
+    """
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.buckets) + 1)  # the last bucket is +Inf
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Records one latency.
+        """
+        with self._lock:
+            self._counts[bisect_left(self.buckets, seconds)] += 1
+            self._sum += seconds
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        """
+        Returns the histogram with cumulative bucket counts.
+
+        Returns:
+            dict: 'buckets' (upper bound -> requests at or below it), 'count' and 'sum'
+        """
+        with self._lock:
+            cumulative = {}
+            total = 0
+            for bound, count in zip(list(self.buckets) + ["+Inf"], self._counts):
+                total += count
+                cumulative[str(bound)] = total
+            return {"buckets": cumulative, "count": self._count, "sum": round(self._sum, 6)}
+
+
+class _HostState:
+    def __init__(self, policy: HostPolicy):
+        self.policy = policy
+        self.semaphore = threading.BoundedSemaphore(policy.max_concurrency)
+        self.latency = LatencyHistogram()
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.in_flight = 0
+
+
+class HttpClient:
+    """
+    The outbound HTTP layer shared by every upstream API client.
+
+    Requests go through one requests.Session, so connections to each host are
+    kept alive and reused instead of paying a TCP and TLS handshake per call. Each
+    host has its own timeout, retry budget and concurrency limit (see
+    HOST_POLICIES). Connection errors, timeouts and 502/503/504 responses are
+    retried after a jittered exponential backoff, and every attempt's latency is
+    recorded in a per-host histogram.
+    """
+
+    def __init__(self, policies: Optional[dict[str, HostPolicy]] = None,
+                 default_policy: HostPolicy = DEFAULT_POLICY, pool_size: int = HTTP_POOL_SIZE,
+                 backoff_base: float = HTTP_BACKOFF_BASE, backoff_cap: float = HTTP_BACKOFF_CAP,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.policies = dict(HOST_POLICIES if policies is None else policies)
+        self.default_policy = default_policy
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._hosts: dict[str, _HostState] = {}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _host(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            with self._lock:
+                state = self._hosts.get(host)
+                if state is None:
+                    state = _HostState(self.policies.get(host, self.default_policy))
+                    self._hosts[host] = state
+        return state
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Returns how long to wait before retry number `attempt` (full jitter).
+        """
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def get(self, url: str, params: Optional[dict[str, Any]] = None, timeout: Optional[float] = None) -> requests.Response:
+        """
+        Makes a GET request under the host's policy.
+
+        Args:
+            url (str): the URL
+            params (Optional[dict]): query parameters
+            timeout (Optional[float]): overrides the host's timeout
+
+        Returns:
+            requests.Response: the response (a retryable status is returned once retries run out)
+
+        Raises:
+            requests.exceptions.RequestException: If every attempt fails, or no request slot
+                for the host frees up within the timeout.
+        """
+        host = urlsplit(url).hostname or ""
+        with span(f"http.{host}", path=urlsplit(url).path) as traced:
+            response = self._get(host, url, params, timeout)
+            if traced is not None:
+                traced.attributes["status"] = response.status_code
+            return response
+
+    def _get(self, host: str, url: str, params: Optional[dict[str, Any]], timeout: Optional[float]) -> requests.Response:
+        state = self._host(host)
+        timeout = state.policy.timeout if timeout is None else timeout
+
+        if not state.semaphore.acquire(timeout=timeout):
+            with state.lock:
+                state.errors += 1
+            raise requests.exceptions.ConnectTimeout(f"Too many requests to {host} in flight")
+        with state.lock:
+            state.in_flight += 1
+        try:
+            for attempt in range(state.policy.retries + 1):
+                last_attempt = attempt == state.policy.retries
+                start = time.monotonic()
+                try:
+                    response = self.session.get(url, params=params, timeout=timeout)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    state.latency.observe(time.monotonic() - start)
+                    with state.lock:
+                        state.requests += 1
+                        state.errors += 1
+                    if last_attempt:
+                        raise
+                    logger.warning("Request to %s failed (%s), retrying", host, e)
+                else:
+                    state.latency.observe(time.monotonic() - start)
+                    with state.lock:
+                        state.requests += 1
+                    if last_attempt or response.status_code not in RETRY_STATUSES:
+                        return response
+                    logger.warning("Request to %s returned %s, retrying", host, response.status_code)
+                    response.close()
+
+                with state.lock:
+                    state.retries += 1
+                self._sleep(self.backoff(attempt))
+        finally:
+            with state.lock:
+                state.in_flight -= 1
+            state.semaphore.release()
+
+    def stats(self) -> dict:
+        """
+        Returns per-host request counts and latency histograms.
+
+        Returns:
+            dict: host -> requests, errors, retries, requests in flight and the latency histogram
+        """
+        with self._lock:
+            hosts = dict(self._hosts)
+        stats = {}
+        for host, state in hosts.items():
+            with state.lock:
+                stats[host] = {
+                    "requests": state.requests,
+                    "errors": state.errors,
+                    "retries": state.retries,
+                    "in_flight": state.in_flight,
+                    "max_concurrency": state.policy.max_concurrency
+                }
+            stats[host]["latency_seconds"] = state.latency.snapshot()
+        return stats
+
+    def close(self) -> None:
+        """
+        Closes every pooled connection.
+        """
+        self.session.close()
+
+
+# One client per process; a forked worker must not share its parent's sockets
+_clients: dict[int, HttpClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Returns the HTTP client of the current process, creating it on first use.
+
+    Returns:
+        HttpClient: the client
+    """
+    pid = os.getpid()
+    client = _clients.get(pid)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(pid)
+            if client is None:
+                client = HttpClient()
+                _clients[pid] = client
+    return client
+
+
+def http_get(url: str, params: Optional[dict[str, Any]] = None, timeout: Optional[float] = None) -> requests.Response:
+    """
+    Makes a GET request through the shared HTTP client. See HttpClient.get.
+    """
+    return get_http_client().get(url, params=params, timeout=timeout)
+
+
+def _collect_metrics() -> list:
+    client = _clients.get(os.getpid())
+    if client is None:
+        return []
+    requests_total, errors, retries, in_flight, latency = [], [], [], [], []
+    for host, stats in client.stats().items():
+        labels = {"host": host}
+        requests_total.append((labels, stats["requests"]))
+        errors.append((labels, stats["errors"]))
+        retries.append((labels, stats["retries"]))
+        in_flight.append((labels, stats["in_flight"]))
+        histogram = stats["latency_seconds"]
+        for bound, count in histogram["buckets"].items():
+            latency.append(({"__suffix__": "_bucket", "host": host, "le": bound}, count))
+        latency.append(({"__suffix__": "_sum", "host": host}, histogram["sum"]))
+        latency.append(({"__suffix__": "_count", "host": host}, histogram["count"]))
+    return [
+        ("http_client_requests_total", "counter", "Outbound HTTP attempts", requests_total),
+        ("http_client_errors_total", "counter", "Outbound HTTP attempts that failed to connect or timed out", errors),
+        ("http_client_retries_total", "counter", "Outbound HTTP attempts that were retried", retries),
+        ("http_client_in_flight", "gauge", "Outbound HTTP requests in flight", in_flight),
+        ("http_client_latency_seconds", "histogram", "Outbound HTTP attempt latency", latency)
+    ]
+
+
+metrics.register_collector(_collect_metrics)
@@ -12,8 +12,13 @@ configure_logger(logger)
 
 MONGO_HOST = os.environ.get('MONGO_HOST', 'localhost')
 MONGO_PORT = int(os.environ.get('MONGO_PORT', 27017))
+# How long a call waits for the server before failing, instead of pymongo's 30s default
+MONGO_TIMEOUT_MS = int(os.environ.get('MONGO_TIMEOUT_MS', 2000))
 
 logger.info("Connecting to MongoDB at %s:%d", MONGO_HOST, MONGO_PORT)
-mongo_client = MongoClient(host=MONGO_HOST, port=MONGO_PORT)
+# connect=False defers the connection (and pymongo's monitor threads) to the first operation,
+# so a pre-fork master can create the client and each worker still gets its own
+mongo_client = MongoClient(host=MONGO_HOST, port=MONGO_PORT, serverSelectionTimeoutMS=MONGO_TIMEOUT_MS,
+                           connect=False)
 db = mongo_client['trivia_game']
 sessions_collection = db['sessions']
\ No newline at end of file
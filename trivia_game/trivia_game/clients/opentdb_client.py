@@ -0,0 +1,243 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+
+import requests
+
+from trivia_game.clients.http_client import RETRY_STATUSES, http_get
+from trivia_game.utils.logger import configure_logger
+from trivia_game.utils.metrics import metrics
+from trivia_game.utils.rate_limiter import RedisTokenBucket, TokenBucket
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+OPENTDB_BASE_URL = "https://opentdb.com"
+OPENTDB_TIMEOUT = float(os.getenv("OPENTDB_TIMEOUT", 10))
+# Extra attempts after a connection error, timeout or 5xx; each one waits for the rate limiter
+OPENTDB_RETRIES = int(os.getenv("OPENTDB_RETRIES", 1))
+
+# OpenTDB allows one request every 5 seconds per IP
+OPENTDB_RATE_LIMIT_PERIOD = float(os.getenv("OPENTDB_RATE_LIMIT_PERIOD", 5))
+OPENTDB_RATE_LIMIT_BURST = float(os.getenv("OPENTDB_RATE_LIMIT_BURST", 1))
+# The longest a request waits for the rate limiter before giving up; background prefetches wait as long as needed
+OPENTDB_MAX_WAIT = float(os.getenv("OPENTDB_MAX_WAIT", 10))
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+SESSION_TOKEN_BACKEND = os.getenv("SESSION_TOKEN_BACKEND", "memory")
+
+# OpenTDB deletes a session token after 6 hours of inactivity
+SESSION_TOKEN_TTL = int(os.getenv("OPENTDB_SESSION_TOKEN_TTL", 6 * 60 * 60))
+# After a failed token request, how long to go without a token before trying again
+SESSION_TOKEN_RETRY_AFTER = int(os.getenv("OPENTDB_SESSION_TOKEN_RETRY_AFTER", 60))
+
+# OpenTDB response codes
+RESPONSE_SUCCESS = 0
+RESPONSE_TOKEN_NOT_FOUND = 3
+RESPONSE_TOKEN_EMPTY = 4
+
+
+def create_limiter() -> TokenBucket:
+    """
+    Creates the limiter shared by all OpenTDB traffic.
+
+    With RATE_LIMIT_BACKEND=redis the bucket is kept in Redis, so every worker
+    process draws from the same budget.
+
+    Returns:
+        TokenBucket: the limiter
+    """
+    rate = 1 / OPENTDB_RATE_LIMIT_PERIOD
+    if RATE_LIMIT_BACKEND == "redis":
+        from trivia_game.clients.redis_client import redis_client
+
+        logger.info("Using Redis-backed OpenTDB rate limiter")
+        return RedisTokenBucket(redis_client, "ratelimit:opentdb", rate, OPENTDB_RATE_LIMIT_BURST)
+    return TokenBucket(rate, OPENTDB_RATE_LIMIT_BURST)
+
+
+opentdb_limiter = create_limiter()
+metrics.register_stats("opentdb_rate_limit", opentdb_limiter.stats)
+
+
+def opentdb_get(path: str, params: Optional[dict[str, Any]] = None,
+                max_wait: Optional[float] = OPENTDB_MAX_WAIT) -> dict[str, Any]:
+    """
+    Makes a GET request to OpenTDB through the shared rate limiter.
+
+    Retries are made here rather than by the HTTP client, so each attempt takes its
+    own token and the limit holds even while OpenTDB is failing.
+
+    Args:
+        path (str): the API path, e.g. 'api.php' or 'api_category.php'
+        params (Optional[dict]): query parameters
+        max_wait (Optional[float]): the longest to wait for the rate limiter, or None to wait as long as needed
+
+    Returns:
+        dict: the decoded JSON response
+
+    Raises:
+        requests.exceptions.RequestException: If every attempt fails.
+        RuntimeError: If the rate limiter is busy for longer than `max_wait`.
+    """
+    for attempt in range(OPENTDB_RETRIES + 1):
+        last_attempt = attempt == OPENTDB_RETRIES
+        waited = opentdb_limiter.acquire(max_wait=max_wait)
+        if waited:
+            logger.info("Waited %.2fs for the OpenTDB rate limit", waited)
+
+        try:
+            response = http_get(f"{OPENTDB_BASE_URL}/{path}", params=params, timeout=OPENTDB_TIMEOUT)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if last_attempt:
+                raise
+            logger.warning("OpenTDB request failed (%s), retrying", e)
+            continue
+        if response.status_code in RETRY_STATUSES and not last_attempt:
+            logger.warning("OpenTDB returned %s, retrying", response.status_code)
+            response.close()
+            continue
+        response.raise_for_status()
+        return response.json()
+
+
+class SessionTokenManager:
+    """
+    Hands out the OpenTDB session token, fetching it lazily on first use.
+
+    The token is cached until it would expire upstream (each use pushes the expiry
+    back, as OpenTDB does). With a Redis client the token is shared by every worker,
+    so a deployment only ever holds one token. A failed request is not retried on
+    every call: the manager goes without a token for a short while instead.
+    """
+
+    REDIS_KEY = "opentdb:session_token"
+
+    def __init__(self, redis_client=None, ttl: int = SESSION_TOKEN_TTL,
+                 retry_after: int = SESSION_TOKEN_RETRY_AFTER):
+        """
+        Args:
+            redis_client: optional Redis client used to share the token across workers
+            ttl (int): seconds of inactivity after which the token is considered expired
+            retry_after (int): seconds to wait before retrying a failed token request
+        """
+        self._redis = redis_client
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._token = ""
+        self._expires_at = 0.0
+
+    def clear(self) -> None:
+        """
+        Forgets the cached token, so the next use requests a new one.
+        """
+        with self._lock:
+            self._token = ""
+            self._expires_at = 0.0
+        self._redis_call("delete", self.REDIS_KEY)
+
+    def _redis_call(self, method: str, *args, **kwargs):
+        if self._redis is None:
+            return None
+        try:
+            return getattr(self._redis, method)(*args, **kwargs)
+        except Exception as e:
+            logger.warning("Redis unavailable for the session token: %s", str(e))
+            return None
+
+    def _request_token(self) -> str:
+        logger.info("Getting session token")
+        try:
+            data = opentdb_get("api_token.php", {"command": "request"})
+        except (requests.exceptions.RequestException, RuntimeError) as e:
+            logger.error("Error requesting session token: %s", str(e))
+            return ""
+
+        if data.get('response_code') == RESPONSE_SUCCESS:
+            logger.info("session token created!")
+            return data['token']
+        logger.error("Failed to get session token :(")
+        return ""
+
+    def get_token(self) -> str:
+        """
+        Returns the session token, requesting one if there is no valid token yet.
+
+        Returns:
+            str: the token, or "" if OpenTDB could not provide one
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now < self._expires_at:
+                self._expires_at = now + (self.ttl if self._token else self.retry_after)
+                return self._token
+
+            shared = self._redis_call("get", self.REDIS_KEY)
+            if shared:
+                token = shared.decode() if isinstance(shared, bytes) else shared
+            else:
+                token = self._request_token()
+                # Only one worker's token wins; everyone else adopts it
+                if token and self._redis_call("set", self.REDIS_KEY, token, nx=True, ex=self.ttl) is None:
+                    shared = self._redis_call("get", self.REDIS_KEY)
+                    if shared:
+                        token = shared.decode() if isinstance(shared, bytes) else shared
+
+            self._token = token
+            self._expires_at = now + (self.ttl if token else self.retry_after)
+            return token
+
+    def handle_response_code(self, response_code: int) -> bool:
+        """
+        Repairs the token after OpenTDB rejects it.
+
+        Code 3 (token not found) drops the token so a new one is requested. Code 4
+        (every question has been served) resets the token upstream.
+
+        Args:
+            response_code (int): the response code of an OpenTDB question request
+
+        Returns:
+            bool: True if the token was repaired and the request is worth retrying
+        """
+        if response_code == RESPONSE_TOKEN_NOT_FOUND:
+            logger.info("Session token expired, requesting a new one")
+            self.clear()
+            return True
+
+        if response_code == RESPONSE_TOKEN_EMPTY:
+            token = self.get_token()
+            if not token:
+                return False
+            logger.info("Session token has run out of questions, resetting it")
+            try:
+                data = opentdb_get("api_token.php", {"command": "reset", "token": token})
+            except (requests.exceptions.RequestException, RuntimeError) as e:
+                logger.error("Error resetting session token: %s", str(e))
+                return False
+            return data.get('response_code') == RESPONSE_SUCCESS
+
+        return False
+
+
+def create_session_token_manager() -> SessionTokenManager:
+    """
+    Creates the session token manager shared by the process.
+
+    With SESSION_TOKEN_BACKEND=redis the token is shared through Redis.
+
+    Returns:
+        SessionTokenManager: the manager
+    """
+    if SESSION_TOKEN_BACKEND == "redis":
+        from trivia_game.clients.redis_client import redis_client
+
+        return SessionTokenManager(redis_client)
+    return SessionTokenManager()
+
+
+session_tokens = create_session_token_manager()
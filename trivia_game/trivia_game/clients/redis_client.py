@@ -3,7 +3,7 @@ import os
 
 import redis
 
-from utils.logger import configure_logger
+from trivia_game.utils.logger import configure_logger
 
 
 logger = logging.getLogger(__name__)
@@ -15,4 +15,5 @@ REDIS_PORT = os.environ.get('REDIS_PORT', 6379)
 REDIS_DB = os.environ.get('REDIS_DB', 0)
 
 logger.info("Connecting to Redis at %s:%s", REDIS_HOST, REDIS_PORT)
+# redis-py connects lazily and its pool reconnects after a fork, so workers never share a socket
 redis_client = redis.StrictRedis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB)
\ No newline at end of file
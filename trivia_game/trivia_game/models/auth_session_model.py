@@ -0,0 +1,110 @@
+import json
+import logging
+import os
+import secrets
+from typing import Any, Optional
+
+from itsdangerous import BadSignature, Signer
+
+from trivia_game.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+SESSION_TTL = int(os.getenv("SESSION_TTL", 60 * 60))  # seconds of inactivity before a session expires
+
+
+class SessionStore:
+    """
+    Login sessions kept in Redis, one key per session with a sliding expiry.
+
+    A session token is a random ID signed with the app's secret key. The signature
+    is checked before Redis is asked, so forged or garbled tokens cost nothing, and
+    a valid token costs a single GETEX, which also pushes the expiry back.
+
+    Attributes:
+        ttl (int): seconds of inactivity before a session expires
+    """
+
+    KEY_PREFIX = "session:"
+
+    def __init__(self, redis_client, secret_key: str, ttl: int = SESSION_TTL):
+        """
+        Args:
+            redis_client: the Redis client the sessions are stored in
+            secret_key (str): the key tokens are signed with
+            ttl (int): seconds of inactivity before a session expires
+        """
+        if not secret_key:
+            raise ValueError("A secret key is required to sign session tokens.")
+        self._redis = redis_client
+        self._signer = Signer(secret_key, salt="session-token")
+        self.ttl = ttl
+
+    def _session_id(self, token: str) -> Optional[str]:
+        try:
+            return self._signer.unsign(token).decode()
+        except (BadSignature, UnicodeError):
+            return None
+
+    def create(self, user_id: int, username: str) -> str:
+        """
+        Starts a session for a user.
+
+        Args:
+            user_id (int): the ID of the user
+            username (str): the username
+
+        Returns:
+            str: the signed session token
+
+        Raises:
+            redis.exceptions.RedisError: If Redis is unavailable.
+        """
+        session_id = secrets.token_urlsafe(32)
+        self._redis.set(self.KEY_PREFIX + session_id, json.dumps({"user_id": user_id, "username": username}), ex=self.ttl)
+        logger.info("Started session for user %s", username)
+        return self._signer.sign(session_id).decode()
+
+    def validate(self, token: str) -> Optional[dict[str, Any]]:
+        """
+        Returns the user a session token belongs to, pushing the session's expiry back.
+
+        Args:
+            token (str): the signed session token
+
+        Returns:
+            Optional[dict[str, Any]]: the session's 'user_id' and 'username', or None if
+            the token is forged, expired or revoked
+
+        Raises:
+            redis.exceptions.RedisError: If Redis is unavailable.
+        """
+        session_id = self._session_id(token)
+        if session_id is None:
+            logger.warning("Rejected a session token with a bad signature")
+            return None
+        data = self._redis.getex(self.KEY_PREFIX + session_id, ex=self.ttl)
+        if data is None:
+            return None
+        return json.loads(data)
+
+    def revoke(self, token: str) -> bool:
+        """
+        Ends a session.
+
+        Args:
+            token (str): the signed session token
+
+        Returns:
+            bool: True if the session existed
+
+        Raises:
+            redis.exceptions.RedisError: If Redis is unavailable.
+        """
+        session_id = self._session_id(token)
+        if session_id is None:
+            return False
+        return bool(self._redis.delete(self.KEY_PREFIX + session_id))
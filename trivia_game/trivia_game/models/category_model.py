@@ -0,0 +1,179 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+import requests
+
+from trivia_game.clients.opentdb_client import opentdb_get
+from trivia_game.utils.sql_utils import get_db_connection
+from trivia_game.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+CATEGORY_CACHE_TTL = float(os.getenv("CATEGORY_CACHE_TTL", 3600))
+
+
+class CategoryCatalog:
+    """
+    A read-through cache of the trivia categories stored in the categories table.
+
+    Categories are read from sqlite at most once per TTL. The table itself can be
+    kept in sync with OpenTDB by a background refresher, so requests never wait on
+    the network to find out what a category is called.
+
+    Attributes:
+        ttl (float): seconds a loaded catalog is served before it is re-read
+    """
+
+    def __init__(self, ttl: float = CATEGORY_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._categories: Optional[list[dict[str, Any]]] = None
+        self._names: dict[int, str] = {}
+        self._etag = ""
+        self._loaded_at = 0.0
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def invalidate(self) -> None:
+        """
+        Drops the cached catalog so the next read goes to the database.
+        """
+        with self._lock:
+            self._loaded_at = 0.0
+
+    def _load(self) -> None:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, name FROM categories ORDER BY id")
+            categories = [{"id": row[0], "name": row[1]} for row in cursor.fetchall()]
+
+        with self._lock:
+            self._categories = categories
+            self._names = {category["id"]: category["name"] for category in categories}
+            self._etag = hashlib.sha1(json.dumps(categories).encode()).hexdigest()
+            self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self) -> None:
+        if self._categories is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        try:
+            self._load()
+        except sqlite3.Error as e:
+            if self._categories is None:
+                raise e
+            logger.warning("Serving stale categories, database error: %s", str(e))
+
+    def get_categories(self) -> list[dict[str, Any]]:
+        """
+        Returns every trivia category.
+
+        Returns:
+            list[dict[str, Any]]: A list of categories, each with an 'id' and 'name'.
+
+        Raises:
+            sqlite3.Error: If the categories have never been loaded and the database is unavailable.
+        """
+        self._ensure_loaded()
+        return self._categories
+
+    def get_name(self, category_id: int) -> str:
+        """
+        Returns the name of a category.
+
+        Args:
+            category_id (int): The ID of the category
+
+        Returns:
+            str: The name of the category
+
+        Raises:
+            ValueError: If there is no category with the given ID.
+        """
+        self._ensure_loaded()
+        try:
+            return self._names[category_id]
+        except KeyError:
+            raise ValueError(f"Category with ID {category_id} not found")
+
+    def etag(self) -> str:
+        """
+        Returns a validator that changes whenever the catalog does.
+
+        Returns:
+            str: a hash of the current catalog
+        """
+        self._ensure_loaded()
+        return self._etag
+
+    def refresh_from_opentdb(self) -> int:
+        """
+        Pulls the category list from OpenTDB into the categories table.
+
+        Returns:
+            int: The number of categories returned by OpenTDB
+
+        Raises:
+            RuntimeError: If there is an error fetching categories from the API.
+            sqlite3.Error: If any database error occurs.
+        """
+        try:
+            categories = opentdb_get("api_category.php", max_wait=None).get("trivia_categories", [])
+        except requests.exceptions.RequestException as e:
+            logger.error("Failed to fetch trivia categories: %s", str(e))
+            raise RuntimeError(f"Failed to fetch trivia categories: {e}")
+
+        if not categories:
+            logger.warning("OpenTDB returned no categories, keeping the current catalog.")
+            return 0
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO categories (id, name) VALUES (?, ?)
+                ON CONFLICT(id) DO UPDATE SET name = excluded.name
+            """, [(category["id"], category["name"]) for category in categories])
+            conn.commit()
+
+        self.invalidate()
+        logger.info("Refreshed %d categories from OpenTDB.", len(categories))
+        return len(categories)
+
+    def start_background_refresh(self, interval: float) -> None:
+        """
+        Starts a daemon thread that refreshes the catalog from OpenTDB every `interval` seconds.
+
+        Args:
+            interval (float): seconds between refreshes
+        """
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh_from_opentdb()
+                except (RuntimeError, sqlite3.Error) as e:
+                    logger.error("Background category refresh failed: %s", str(e))
+
+        self._stop.clear()
+        self._refresher = threading.Thread(target=run, name="category-refresh", daemon=True)
+        self._refresher.start()
+        logger.info("Refreshing categories from OpenTDB every %ss", interval)
+
+    def stop_background_refresh(self) -> None:
+        """
+        Stops the background refresher, if it is running.
+        """
+        self._stop.set()
+
+
+category_catalog = CategoryCatalog()
@@ -2,252 +2,493 @@ from trivia_game.models.team_model import *
 from trivia_game.utils.logger import *
 from typing import List
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 import logging
+import os
 import sqlite3
-from typing import Any
-import requests
-import html
+from typing import Any, Callable, Optional
 import random
 import time
 
+from trivia_game.clients.opentdb_client import session_tokens
+from trivia_game.models.category_model import category_catalog
+from trivia_game.models.question_bank_model import Question, draw_question
+from trivia_game.utils import random_utils
 from trivia_game.utils.sql_utils import get_db_connection
 from trivia_game.utils.logger import configure_logger
+from trivia_game.utils.metrics import metrics
+from trivia_game.utils.tracing import traced
 
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
+# Simulated games log here, so their per-round info records are skipped at the cost of a level check
+simulated_logger = logging.getLogger(f"{__name__}.simulated")
+simulated_logger.setLevel(logging.WARNING)
+
+
+QUESTION_DRAW_SECONDS = metrics.histogram(
+    "question_draw_seconds", "Seconds spent drawing a round's question",
+    ["source"])
+ROUND_SECONDS = metrics.histogram(
+    "game_round_seconds", "Seconds from a question being asked until its round is scored", ["closed_by"])
+
+
+# Bounds the per-game memory spent remembering which questions were asked
+MAX_ASKED_QUESTIONS = int(os.getenv("MAX_ASKED_QUESTIONS", 500))
+# Seconds the teams have to answer a question before the round is scored without them
+ANSWER_TIMEOUT = float(os.getenv("ANSWER_TIMEOUT", 60))
+
+GAME_WAITING = "waiting"
+GAME_IN_PROGRESS = "in_progress"
+GAME_FINISHED = "finished"
 
 
 class GameModel:
     """
     A class to manage games between teams.
 
+    A game is a small state machine: 'waiting' for opponents, 'in_progress' while
+    a question is open for answers, and 'finished' once every round is scored.
+
     Attributes:
         opponents (List[Team]): A list of current opponents.
         rounds (int): number of rounds played in the game
         session_token (str): the session token for opentdb
+        state (str): 'waiting', 'in_progress' or 'finished'
+        current_question (Optional[Question]): the question of the round being played
+        answers (List[Optional[str]]): each opponent's answer to the current question
+        round_deadline (float): the time (epoch seconds) at which the current round closes
+        seed (Optional[str]): makes the game's questions and answer order replayable
+        question_source (Optional[Callable]): draws questions instead of the question bank (e.g. in simulations)
     """
-    def __init__(self):
+    def __init__(self, answer_timeout: float = ANSWER_TIMEOUT, seed: Optional[str] = None,
+                 question_source: Optional[Callable[..., Question]] = None, quiet: bool = False):
         """
-        Initializes the GameModel object with an empty list of combatants, rounds = 0, and creates a session token
+        Initializes the GameModel object with an empty list of combatants and rounds = 0
+
+        Args:
+            answer_timeout (float): seconds the teams have to answer each question
+            seed (Optional[str]): seed for a replayable game, or None to use the shared random provider
+            question_source (Optional[Callable]): called like question_bank_model.draw_question to draw
+                each round's question, instead of the question bank
+            quiet (bool): log only warnings and errors, e.g. for a simulated game
         """
 
         self.rounds=0
         self.opponents: List[Team] = []
-
-        logger.info("Getting session token")
-        url = "https://opentdb.com/api_token.php?command=request"
-        time.sleep(5)
-        response = requests.get(url)
-        time.sleep(5)
-        data = response.json()
-        
-        if data['response_code'] == 0: 
-            logger.info("session token created!")
-            self.session_token = data['token']
-        else:
-            logger.error("Failed to get session token :(")
-            self.session_token = ""
+        self.asked_questions: set[int] = set()
+        self.answer_timeout = answer_timeout
+        self.seed = seed
+        self.question_source = question_source
+        self._log = simulated_logger if quiet else logger
+
+        self.state = GAME_WAITING
+        self.categories: List[int] = []
+        self.current_question: Optional[Question] = None
+        self.choices: List[str] = []
+        self.answers: List[Optional[str]] = [None, None]
+        self.round_deadline = 0.0
+        self.round_results: List[dict[str, Any]] = []
+
+        # The OpenTDB session token is fetched lazily by the shared token manager,
+        # so creating a game never waits on the network.
+
+    @property
+    def session_token(self) -> str:
+        """
+        The OpenTDB session token, requested on first use and shared by all games.
+        """
+        return session_tokens.get_token()
 
 
     def display_score(self):
         """
         Displays current scores and category information
         """
+        # Everything below is logging, including a catalog lookup; skip it when nobody listens
+        if not self._log.isEnabledFor(logging.INFO):
+            return
+
         # Log current scores
-        logger.info("Current score is:")
-        logger.info(" %s: %s correct out of %s questions", self.opponents[0].team, self.opponents[0].current_score, self.rounds)
-        logger.info(" %s: %s correct out of %s questions", self.opponents[1].team, self.opponents[1].current_score, self.rounds)
+        self._log.info("Current score is:")
+        self._log.info(" %s: %s correct out of %s questions", self.opponents[0].team, self.opponents[0].current_score, self.rounds)
+        self._log.info(" %s: %s correct out of %s questions", self.opponents[1].team, self.opponents[1].current_score, self.rounds)
 
-        # Fetch trivia stats from /api/trivia/stats
+        # Log the category names from the cached catalog
         try:
-            logger.info("Fetching categories . . .")
-            time.sleep(5)
-            response = requests.get("https://opentdb.com/api_category.php")
-            time.sleep(5)
-            response.raise_for_status()  # Check for HTTP errors
-            categories = response.json().get('trivia_categories', [])
-            
+            categories = category_catalog.get_categories()
+
             # Convert stats to a string and log
             if categories:
                 stats_string = ", ".join([f"{category['name']} (ID: {category['id']})" for category in categories])
-                logger.info("Available Trivia Categories: %s", stats_string)
+                self._log.info("Available Trivia Categories: %s", stats_string)
             else:
-                logger.warning("No trivia categories available to log.")
+                self._log.warning("No trivia categories available to log.")
+
+        except sqlite3.Error as e:
+            self._log.error("Failed to load trivia categories: %s", str(e))
+
+
+    def _round_rng(self) -> random.Random:
+        """
+        Returns the generator for the current round
+
+        A seeded game derives each round's generator from the seed and the round
+        number, so a restored game still replays the same way.
+        """
+        if self.seed is None:
+            return random_utils.rng
+        return random_utils.seeded(f"{self.seed}:{self.rounds}")
+
+    def _draw_question(self, category: int, q_type: str, rng: Optional[random.Random] = None) -> Question:
+        """
+        Draws a question for a round from the local question bank
+
+        The bank is filled ahead of time (see prefetch_all), so a game never waits on
+        OpenTDB while it holds its lock.
+
+        Args:
+            category (int): the category of the round
+            q_type (str): 'boolean' or 'multiple'
+            rng (Optional[random.Random]): the generator to draw with
 
-        except requests.exceptions.RequestException as e:
-            logger.error("Failed to fetch trivia stats: %s", str(e))
+        Returns:
+            Question: a question that has not been asked in this game yet
 
-            
+        Raises:
+            RuntimeError: if the bank has no question left for the round.
+        """
+        start = time.perf_counter()
+        source = "bank"
+        if self.question_source is not None:
+            source = "custom"
+            question = self.question_source(category, q_type, exclude=self.asked_questions, rng=rng)
+        else:
+            try:
+                question = draw_question(category, q_type, exclude=self.asked_questions, rng=rng)
+            except ValueError as ve:
+                self._log.warning("Question bank is empty for category %s (%s)", category, q_type)
+                raise RuntimeError(f"No questions left for category {category} ({q_type}), "
+                                   "prefetch more questions and try again later.") from ve
+        QUESTION_DRAW_SECONDS.observe(time.perf_counter() - start, source=source)
 
+        if len(self.asked_questions) >= MAX_ASKED_QUESTIONS:
+            self.asked_questions.clear()
+        self.asked_questions.add(question.id)
+        return question
 
-    def get_result(self, opponent: Team, answer) -> bool:
+    def get_result(self, team_answer: Optional[str], answer: str) -> bool:
         """
         Determines the correctness of a team based on their answer as compared to the correct answer
 
         Args:
-		    opponent (Team): the opponent to judge
+            team_answer (Optional[str]): the answer the team submitted, None if they did not answer in time
             answer (String): the correct answer to the question
 
         Returns:
-		    boolean: True if correct, False otherwise 
+            boolean: True if correct, False otherwise 
         """
-        teamanswer = input("Please enter your answer: ")
-        result = (answer == teamanswer)
-
-        return result
+        if team_answer is None:
+            return False
+        return team_answer.strip().casefold() == answer.strip().casefold()
 
-    def game(self) -> str:
+    @traced()
+    def game(self) -> dict[str, Any]:
         """
-        Plays two rounds of trivia between two opponents
+        Starts two rounds of trivia between two opponents
 
-	    Returns:
-		    boolean: whether the game finished
+        The game does not wait for the teams: it draws the first question and returns.
+        Teams then answer through `submit_answer`, and each round is scored once both
+        answers are in or its deadline has passed.
+
+        Returns:
+            dict: the state of the game, including the first question
 
         Raises:
             ValueError: if there are less than two opponents.
-            ValueError: if category list is empty.
-            ValueError: if there are less than two opponents.
-            ValueError: if no trivia questions were found.
-            ValueError: error fetching trivia data.
+            ValueError: if an opponent's favorite category is not set.
+            ValueError: if a game is already in progress.
+            RuntimeError: if the question bank has no question for the first round.
         """
-
-        
-
         if len(self.opponents) < 2:
-            logger.error("Not enough teams to start a Game.")
+            self._log.error("Not enough teams to start a Game.")
             raise ValueError("Two teams must be in the game.")
 
+        self.check_deadline()
+        if self.state == GAME_IN_PROGRESS:
+            raise ValueError("A game is already in progress.")
+
         opponent_1 = self.opponents[0]
         opponent_2 = self.opponents[1]
 
-        
         # Ensure each opponent has a favorite category
         if not opponent_1.favorite_category:
             raise ValueError(f"{opponent_1.team}'s favorite category is not set.")
         if not opponent_2.favorite_category:
             raise ValueError(f"{opponent_2.team}'s favorite category is not set.")   
 
-        categories = [opponent_1.favorite_category, opponent_2.favorite_category]
+        # Log the start of the game
+        self._log.info("Game started between opponent 1: %s and opponent 2: %s", opponent_1.team, opponent_2.team)
+
+        self.categories = [opponent_1.favorite_category, opponent_2.favorite_category] #two rounds
+        self.rounds = 0
+        self.round_results = []
+        opponent_1.current_score = 0
+        opponent_2.current_score = 0
+        self.state = GAME_IN_PROGRESS
+        self._start_round()
+        return self.get_state()
+
+    def _start_round(self) -> None:
+        """
+        Draws the question for the next round and opens it for answers
+        """
+        category = self.categories[self.rounds]
+        self._log.info("The category for round %d is: %s", self.rounds + 1, category)
 
+        q_type = "boolean" #first round is a true or false
+        if self.rounds == 1:
+            q_type = "multiple" #second round will be multiple choice
 
-        # Log the start of the game
-        logger.info("Game started between opponent 1: %s and opponent 2: %s", opponent_1.team, opponent_2.team)
+        rng = self._round_rng()
+        try:
+            self.current_question = self._draw_question(category, q_type, rng)
+        except (ValueError, RuntimeError):
+            self.state = GAME_WAITING
+            raise
+        self.choices = self.current_question.incorrect_answers + [self.current_question.correct_answer]
+        rng.shuffle(self.choices)
+        self.answers = [None, None]
+        self.round_deadline = time.time() + self.answer_timeout
+
+    def _opponent_index(self, team_id: int) -> int:
+        for i, opponent in enumerate(self.opponents[:2]):
+            if opponent.id == team_id and self.answers[i] is None:
+                return i
+        if any(opponent.id == team_id for opponent in self.opponents[:2]):
+            raise ValueError(f"Team with ID {team_id} has already answered this round.")
+        raise ValueError(f"Team with ID {team_id} is not playing in this game.")
+
+    def submit_answer(self, team_id: int, team_answer: str) -> dict[str, Any]:
+        """
+        Records a team's answer to the current question
 
-        for i, category in enumerate(categories): #two rounds
-            logger.info("The category for round %d is: %s", i + 1, category)
-            try:
-                logger.info("Getting question %s of this round from Open Trivia", i)
-                
-                q_type="boolean" #first round is a true or false
-                if i == 1: 
-                    q_type = "multiple" #second round will be multiple choice
-                
-                if self.session_token == "":
-                    
-                    logger.info("%s question is being pulled without a session token", category)
-                    time.sleep(5)
-                    api_url =  f'https://opentdb.com/api.php?amount=1&category={category}&type={q_type}'
-                    time.sleep(5)
-                else:    
-                    logger.info("%s question is being pulled with a session token", category)
-                    
-                    api_url = f'https://opentdb.com/api.php?amount=1&category={category}&type={q_type}&token={self.session_token}'
-                    time.sleep(5)
-                
-
-                base_url = "https://opentdb.com/api.php"
-               # Parameters to append to the URL
-                amount = 1  # Number of questions
-                category = random.choice(categories)  
-                difficulty = "easy"  # Difficulty level
-                type_of_question = "multiple"  # Type of question (multiple choice)
-                session_token = self.session_token
-
-                # Construct the full URL with query parameters
-                url = f"{base_url}?amount={amount}&category={category}&difficulty={difficulty}&type={type_of_question}&token={session_token}"
-
-                # Make the GET request
-                response = requests.get(url)
-                # Fetch the data from the API
-                time.sleep(5)
-                response = requests.get("https://opentdb.com/api.php?amount=1")
-                time.sleep(5)
-                response.raise_for_status() 
-
-                # Parse the JSON response
-                data = response.json()
-
-                # Check if the response contains valid questions
-                if data['response_code'] != 0:
-                    raise ValueError("No trivia questions available for the specified category.")
-                
-                # Extract and decode the question and answer
-                question_data = data['results'][0]
-                question = html.unescape(question_data['question'])
-                answer = html.unescape(question_data['correct_answer'])
-
-                
-            
-            except requests.exceptions.RequestException as e:
-                logger.error("Error fetching trivia data")
-                raise ValueError("Error fetching trivia data")
-                
-            except ValueError as ve:
-                raise ValueError("Error fetching trivia data") from ve
-
-            
-            
-            
-            logger.info(f"TEAM 1: Question: {question}")
-            score_1 = self.get_result(opponent_1, answer)
-            logger.info("answer stored.")
-            logger.info(f"TEAM 2: Question: {question}")
-            score_2 = self.get_result(opponent_2, answer)
-            logger.info("answer stored.")
-            
-
-            # Log scores
-            logger.info("Result for %s: %.3f", opponent_1.team, score_1)
-            logger.info("Result for %s: %.3f", opponent_2.team, score_2)
-
-            logger.info("determining victory . . .")
-
-            # Determine win/tie, update stats and log
-            if score_1 and not score_2:
-                winner = opponent_1
-                loser = opponent_2
-                logger.info("The winner is: %s", winner.team)
-                winner.team_score += 1
-            elif not score_1 and score_2:
-                winner = opponent_2
-                loser = opponent_1
-                logger.info("The winner is: %s", winner.team)
-                winner.team_score += 1
+        The round is scored as soon as both teams have answered.
+
+        Args:
+            team_id (int): the ID of the answering team
+            team_answer (str): the team's answer
+
+        Returns:
+            dict: the state of the game after the answer
+
+        Raises:
+            ValueError: if no game is in progress or the round's deadline has passed.
+            ValueError: if the team is not playing or has already answered.
+        """
+        if self.check_deadline():
+            raise ValueError("The answer deadline for this round has passed.")
+        if self.state != GAME_IN_PROGRESS:
+            raise ValueError("No game is in progress.")
+
+        index = self._opponent_index(team_id)
+        self.answers[index] = team_answer
+        self._log.info("answer stored for %s.", self.opponents[index].team)
+
+        if all(answer is not None for answer in self.answers):
+            self._finish_round()
+        return self.get_state()
+
+    def check_deadline(self) -> bool:
+        """
+        Scores the current round if its deadline has passed, counting missing answers as wrong
+
+        Returns:
+            boolean: True if a round was closed by its deadline
+        """
+        if self.state == GAME_IN_PROGRESS and time.time() >= self.round_deadline:
+            self._log.info("Round %d timed out.", self.rounds + 1)
+            self._finish_round(closed_by="deadline")
+            return True
+        return False
+
+    def _finish_round(self, closed_by: str = "answers") -> None:
+        """
+        Scores the current round and moves on to the next one, or ends the game
+
+        Args:
+            closed_by (str): 'answers' if both teams answered, 'deadline' if time ran out
+        """
+        asked_at = self.round_deadline - self.answer_timeout
+        ROUND_SECONDS.observe(max(0.0, min(time.time(), self.round_deadline) - asked_at), closed_by=closed_by)
+        opponent_1 = self.opponents[0]
+        opponent_2 = self.opponents[1]
+        answer = self.current_question.correct_answer
+
+        score_1 = self.get_result(self.answers[0], answer)
+        score_2 = self.get_result(self.answers[1], answer)
+
+        # Log scores
+        self._log.info("Result for %s: %s", opponent_1.team, score_1)
+        self._log.info("Result for %s: %s", opponent_2.team, score_2)
+
+        self._log.info("determining victory . . .")
+
+        # Determine win/tie, update stats and log
+        if score_1 and not score_2:
+            self._log.info("The winner is: %s", opponent_1.team)
+            opponent_1.current_score += 1
+        elif not score_1 and score_2:
+            self._log.info("The winner is: %s", opponent_2.team)
+            opponent_2.current_score += 1
+        else:
+            if score_1:
+                result_s = "correct"
+                opponent_1.current_score += 1
+                opponent_2.current_score += 1
             else:
-                if score_1:
-                    result_s = "correct"
-                    opponent_1.current_score += 1
-                    opponent_2.current_score += 1
-                else:
-                    result_s = "incorrect" 
-                    logger.info("There was a tie between %s & %s. Both teams were %s.", opponent_1, opponent_2, result_s )
-            logger.info("updating data . . .")
-            self.rounds += 1
-            opponent_1.games_played += 1
-            opponent_2.games_played += 1
-            self.display_score()
-
-
-        return True #game successfull
+                result_s = "incorrect" 
+            self._log.info("There was a tie between %s & %s. Both teams were %s.", opponent_1.team, opponent_2.team, result_s)
+
+        self._log.info("updating data . . .")
+        self.round_results.append({
+            "round": self.rounds + 1,
+            "question": self.current_question.question,
+            "correct_answer": answer,
+            "answers": list(self.answers),
+            "correct": [score_1, score_2]
+        })
+        self.rounds += 1
+        self.current_question = None
+        self.display_score()
+
+        if self.rounds < len(self.categories):
+            try:
+                self._start_round()
+            except (ValueError, RuntimeError) as e:
+                self._log.error("Ending game early: %s", str(e))
+                self._finish_game()
+        else:
+            self._finish_game()
+
+    def _finish_game(self) -> None:
+        opponent_1 = self.opponents[0]
+        opponent_2 = self.opponents[1]
+        opponent_1.games_played += 1
+        opponent_2.games_played += 1
+        self.state = GAME_FINISHED
+        self._log.info("Game finished: %s %s - %s %s", opponent_1.team, opponent_1.current_score,
+                    opponent_2.current_score, opponent_2.team)
+
+    def get_winner(self) -> Optional[Team]:
+        """
+        Returns the winner of a finished game
+
+        Returns:
+            Optional[Team]: the team with the higher score, None for a tie or an unfinished game
+        """
+        if self.state != GAME_FINISHED:
+            return None
+        opponent_1 = self.opponents[0]
+        opponent_2 = self.opponents[1]
+        if opponent_1.current_score == opponent_2.current_score:
+            return None
+        return opponent_1 if opponent_1.current_score > opponent_2.current_score else opponent_2
+
+    def get_state(self) -> dict[str, Any]:
+        """
+        Returns the state of the game, without revealing the answer to the current question
+
+        Returns:
+            dict: the game's state, round, scores and (while in progress) the current question
+        """
+        self.check_deadline()
+        state = {
+            "state": self.state,
+            "round": self.rounds + (1 if self.state == GAME_IN_PROGRESS else 0),
+            "total_rounds": len(self.categories),
+            "scores": [{"team_id": opponent.id, "team": opponent.team, "score": opponent.current_score}
+                       for opponent in self.opponents[:2]],
+            "results": self.round_results
+        }
+        if self.state == GAME_IN_PROGRESS:
+            state["question"] = {
+                "category": self.current_question.category,
+                "type": self.current_question.type,
+                "difficulty": self.current_question.difficulty,
+                "question": self.current_question.question,
+                "choices": self.choices
+            }
+            state["answered"] = [self.opponents[i].id for i, answer in enumerate(self.answers) if answer is not None]
+            state["seconds_left"] = max(0.0, round(self.round_deadline - time.time(), 1))
+        if self.state == GAME_FINISHED:
+            winner = self.get_winner()
+            state["winner"] = winner.team if winner else None
+        return state
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns everything needed to resume the game later, as plain JSON-serializable data
+
+        The OpenTDB session token is not included: it is shared by every game in the
+        process and fetched again on demand.
+
+        Returns:
+            dict: the opponents, rounds, current question and answers of the game
+        """
+        return {
+            "state": self.state,
+            "rounds": self.rounds,
+            "categories": list(self.categories),
+            "opponents": [opponent.to_dict() for opponent in self.opponents],
+            "asked_questions": sorted(self.asked_questions),
+            "current_question": asdict(self.current_question) if self.current_question else None,
+            "choices": list(self.choices),
+            "answers": list(self.answers),
+            "round_deadline": self.round_deadline,
+            "round_results": list(self.round_results),
+            "answer_timeout": self.answer_timeout,
+            "seed": self.seed
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """
+        Replaces the game's state with one saved by `to_dict`
+
+        A round whose deadline passed while the game was saved is scored on the next
+        call that checks the deadline.
+
+        Args:
+            data (dict): the saved game
+        """
+        self.state = data.get("state", GAME_WAITING)
+        self.rounds = data.get("rounds", 0)
+        self.categories = list(data.get("categories", []))
+        self.opponents = [Team(**opponent) for opponent in data.get("opponents", [])]
+        self.asked_questions = set(data.get("asked_questions", []))
+        question = data.get("current_question")
+        self.current_question = Question(**question) if question else None
+        self.choices = list(data.get("choices", []))
+        self.answers = list(data.get("answers", [None, None]))
+        self.round_deadline = data.get("round_deadline", 0.0)
+        self.round_results = list(data.get("round_results", []))
+        self.answer_timeout = data.get("answer_timeout", self.answer_timeout)
+        self.seed = data.get("seed")
+        self._log.info("Restored game with opponents %s", [opponent.team for opponent in self.opponents])
 
     def clear_opponents(self):
         """
         Clears the list of opponents in the game object
         """
-        logger.info("Clearing the opponents list.")
+        self._log.info("Clearing the opponents list.")
         self.opponents.clear()
+        self.asked_questions.clear()
+        self.state = GAME_WAITING
+        self.current_question = None
+        self.categories = []
+        self.round_results = []
+        self.rounds = 0
 
     
 
@@ -255,7 +496,7 @@ class GameModel:
         """
         Returns list of opponents for a given game
         """
-        logger.info("Retrieving current list of opponents.")
+        self._log.info("Retrieving current list of opponents.")
         return self.opponents
 
     def prep_opponent(self, opponent: Team):
@@ -269,16 +510,20 @@ class GameModel:
             ValueError: If there are already two opponents in the opponent list
         """
 
+        if self.state == GAME_IN_PROGRESS:
+            self._log.error("Attempted to add opponent '%s' during a game", opponent.team)
+            raise ValueError("Cannot add opponents while a game is in progress.")
+
         if len(self.opponents) > 2:
-            logger.error("Attempted to add opponent '%s' but opponents list is full", opponent.team)
+            self._log.error("Attempted to add opponent '%s' but opponents list is full", opponent.team)
             raise ValueError("Opponents list is full, cannot add more opponents.")
 
         # Log the addition of the opponent
-        logger.info("Adding opponent '%s' to opponents list", opponent.team)
+        self._log.info("Adding opponent '%s' to opponents list", opponent.team)
 
         self.opponents.append(opponent)
 
         # Log the current state of opponents
-        logger.info("Current opponents list: %s", [opponent.team for opponent in self.opponents])
+        self._log.info("Current opponents list: %s", [opponent.team for opponent in self.opponents])
     
 
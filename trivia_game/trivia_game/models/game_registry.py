@@ -0,0 +1,419 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Iterator, Optional
+import uuid
+
+import redis
+
+from trivia_game.models.game_model import GameModel
+from trivia_game.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+MAX_GAMES = int(os.getenv("MAX_GAMES", 1000))
+GAME_IDLE_TIMEOUT = float(os.getenv("GAME_IDLE_TIMEOUT", 30 * 60))  # seconds
+# 'memory' keeps games in this process; 'redis' shares them between every worker process
+GAME_STORE = os.getenv("GAME_STORE", "memory")
+# Seconds a game stays locked if the worker holding it dies mid-request; live requests keep extending it
+GAME_LOCK_TIMEOUT = float(os.getenv("GAME_LOCK_TIMEOUT", 10))
+
+# The game used by the original single-game routes
+DEFAULT_GAME_ID = "default"
+
+
+@dataclass
+class _GameEntry:
+    game: GameModel
+    last_access: float
+    lock: threading.RLock = field(default_factory=threading.RLock)
+
+
+class GameRegistry:
+    """
+    Keeps every game in progress, keyed by game ID.
+
+    Each game has its own lock, so requests for different games never wait on each
+    other. Games that have not been touched for `idle_timeout` seconds are evicted,
+    and at most `max_games` games are kept at once.
+
+    Attributes:
+        max_games (int): the maximum number of games held in memory
+        idle_timeout (float): seconds after which an untouched game is evicted
+    """
+
+    def __init__(self, max_games: int = MAX_GAMES, idle_timeout: float = GAME_IDLE_TIMEOUT):
+        self.max_games = max_games
+        self.idle_timeout = idle_timeout
+        self._games: dict[str, _GameEntry] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def _evict_idle_locked(self) -> int:
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = [game_id for game_id, entry in self._games.items() if entry.last_access < cutoff]
+        for game_id in idle:
+            del self._games[game_id]
+        if idle:
+            logger.info("Evicted %d idle games", len(idle))
+        return len(idle)
+
+    def evict_idle(self) -> int:
+        """
+        Removes every game that has been idle for longer than the idle timeout.
+
+        Returns:
+            int: the number of games evicted
+        """
+        with self._lock:
+            return self._evict_idle_locked()
+
+    def _add_locked(self, game_id: str, seed: Optional[str] = None) -> GameModel:
+        if len(self._games) >= self.max_games:
+            self._evict_idle_locked()
+        if len(self._games) >= self.max_games:
+            logger.error("Cannot create game, %d games are already in progress", len(self._games))
+            raise RuntimeError("Too many games in progress, try again later.")
+        entry = _GameEntry(GameModel(seed=seed), last_access=time.monotonic())
+        self._games[game_id] = entry
+        logger.info("Created game %s", game_id)
+        return entry.game
+
+    def create_game(self, seed: Optional[str] = None) -> str:
+        """
+        Creates a new, empty game.
+
+        Args:
+            seed (Optional[str]): seed that makes the game replayable
+
+        Returns:
+            str: the ID of the new game
+
+        Raises:
+            RuntimeError: If the maximum number of games is already in progress.
+        """
+        game_id = uuid.uuid4().hex
+        with self._lock:
+            self._add_locked(game_id, seed)
+        return game_id
+
+    def _get_entry(self, game_id: str, create: bool = False) -> _GameEntry:
+        with self._lock:
+            entry = self._games.get(game_id)
+            if entry is not None and entry.last_access < time.monotonic() - self.idle_timeout:
+                del self._games[game_id]
+                entry = None
+            if entry is None:
+                if not create:
+                    logger.info("Game %s not found", game_id)
+                    raise ValueError(f"Game {game_id} not found")
+                self._add_locked(game_id)
+                entry = self._games[game_id]
+            entry.last_access = time.monotonic()
+            return entry
+
+    def get_game(self, game_id: str) -> GameModel:
+        """
+        Returns a game by its ID.
+
+        Args:
+            game_id (str): the ID of the game
+
+        Returns:
+            GameModel: the game
+
+        Raises:
+            ValueError: If there is no game with the given ID (or it was evicted).
+        """
+        return self._get_entry(game_id).game
+
+    @contextmanager
+    def game_session(self, game_id: str, create: bool = False) -> Iterator[GameModel]:
+        """
+        Yields a game while holding its lock, so concurrent requests for it are serialized.
+
+        Args:
+            game_id (str): the ID of the game
+            create (bool): create the game if it does not exist
+
+        Raises:
+            ValueError: If there is no game with the given ID and create is False.
+            RuntimeError: If the game has to be created and too many games are in progress.
+        """
+        entry = self._get_entry(game_id, create=create)
+        with entry.lock:
+            yield entry.game
+            entry.last_access = time.monotonic()
+
+    def delete_game(self, game_id: str) -> None:
+        """
+        Removes a game.
+
+        Args:
+            game_id (str): the ID of the game
+
+        Raises:
+            ValueError: If there is no game with the given ID.
+        """
+        with self._lock:
+            if self._games.pop(game_id, None) is None:
+                logger.info("Game %s not found", game_id)
+                raise ValueError(f"Game {game_id} not found")
+        logger.info("Deleted game %s", game_id)
+
+    def list_games(self) -> list[str]:
+        """
+        Returns the IDs of every game in progress.
+        """
+        with self._lock:
+            self._evict_idle_locked()
+            return list(self._games)
+
+
+class RedisGameRegistry:
+    """
+    Keeps every game in progress in Redis, so any worker process can serve any game.
+
+    Each game is stored as the JSON of GameModel.to_dict() and expires once it has
+    been idle for `idle_timeout` seconds; a sorted set indexes the games by last
+    access, to count, list and evict them. A Redis lock per game serializes requests
+    for it across processes, as the per-game lock of GameRegistry does across threads.
+    The lock expires after `lock_timeout` seconds, so a game is not stuck when its
+    worker dies, and a background thread extends the locks of requests still
+    running. A request that loses its lock anyway fails instead of saving over
+    changes made by another worker since. `max_games` is checked before a game is
+    added, so workers creating games at the same moment may overshoot it slightly.
+
+    Attributes:
+        max_games (int): the maximum number of games kept at once
+        idle_timeout (float): seconds after which an untouched game is evicted
+        lock_timeout (float): seconds a game's lock is held at most, and waited for at most
+    """
+
+    def __init__(self, redis_client: redis.Redis, max_games: int = MAX_GAMES,
+                 idle_timeout: float = GAME_IDLE_TIMEOUT, lock_timeout: float = GAME_LOCK_TIMEOUT,
+                 prefix: str = "trivia:game"):
+        self.max_games = max_games
+        self.idle_timeout = idle_timeout
+        self.lock_timeout = lock_timeout
+        self._redis = redis_client
+        self._prefix = prefix
+        self._index = f"{prefix}s"
+        self._held: set = set()  # locks of the game sessions in progress
+        self._held_lock = threading.Lock()
+        self._keeper: Optional[threading.Thread] = None
+
+    def _key(self, game_id: str) -> str:
+        return f"{self._prefix}:{game_id}"
+
+    def _hold(self, lock) -> None:
+        with self._held_lock:
+            self._held.add(lock)
+            # The keeper stops when no session is left (and does not survive a fork)
+            if self._keeper is None or not self._keeper.is_alive():
+                self._keeper = threading.Thread(target=self._keep_locks, name="game-lock-keeper", daemon=True)
+                self._keeper.start()
+
+    def _keep_locks(self) -> None:
+        """
+        Extends the lock of every game session in progress, three times per lock timeout.
+        """
+        while True:
+            time.sleep(self.lock_timeout / 3)
+            with self._held_lock:
+                held = list(self._held)
+                if not held:
+                    self._keeper = None
+                    return
+            for lock in held:
+                try:
+                    lock.reacquire()
+                except (redis.exceptions.LockError, redis.exceptions.RedisError) as e:
+                    logger.warning("Could not extend the lock %s: %s", lock.name, str(e))
+
+    def __len__(self) -> int:
+        self.evict_idle()
+        return self._redis.zcard(self._index)
+
+    def evict_idle(self) -> int:
+        """
+        Drops every game that has been idle for longer than the idle timeout from the index.
+
+        The games themselves expire in Redis on their own.
+
+        Returns:
+            int: the number of games evicted
+        """
+        evicted = self._redis.zremrangebyscore(self._index, "-inf", time.time() - self.idle_timeout)
+        if evicted:
+            logger.info("Evicted %d idle games", evicted)
+        return evicted
+
+    def _save(self, game_id: str, game: GameModel) -> None:
+        pipe = self._redis.pipeline()
+        pipe.set(self._key(game_id), json.dumps(game.to_dict()), ex=math.ceil(self.idle_timeout))
+        pipe.zadd(self._index, {game_id: time.time()})
+        pipe.execute()
+
+    def _load(self, game_id: str) -> Optional[GameModel]:
+        pipe = self._redis.pipeline()
+        pipe.get(self._key(game_id))
+        pipe.zscore(self._index, game_id)
+        data, last_access = pipe.execute()
+        if data is None or last_access is None or last_access < time.time() - self.idle_timeout:
+            return None
+        game = GameModel()
+        game.restore(json.loads(data))
+        return game
+
+    def _add(self, game_id: str, seed: Optional[str] = None) -> GameModel:
+        if len(self) >= self.max_games:
+            logger.error("Cannot create game, %d games are already in progress", self.max_games)
+            raise RuntimeError("Too many games in progress, try again later.")
+        game = GameModel(seed=seed)
+        self._save(game_id, game)
+        logger.info("Created game %s", game_id)
+        return game
+
+    def create_game(self, seed: Optional[str] = None) -> str:
+        """
+        Creates a new, empty game.
+
+        Args:
+            seed (Optional[str]): seed that makes the game replayable
+
+        Returns:
+            str: the ID of the new game
+
+        Raises:
+            RuntimeError: If the maximum number of games is already in progress.
+        """
+        game_id = uuid.uuid4().hex
+        self._add(game_id, seed)
+        return game_id
+
+    def get_game(self, game_id: str) -> GameModel:
+        """
+        Returns a copy of a game; changes to it are not saved (use game_session for that).
+
+        Args:
+            game_id (str): the ID of the game
+
+        Returns:
+            GameModel: the game
+
+        Raises:
+            ValueError: If there is no game with the given ID (or it was evicted).
+        """
+        game = self._load(game_id)
+        if game is None:
+            logger.info("Game %s not found", game_id)
+            raise ValueError(f"Game {game_id} not found")
+        return game
+
+    @contextmanager
+    def game_session(self, game_id: str, create: bool = False) -> Iterator[GameModel]:
+        """
+        Yields a game while holding its lock, and saves it afterwards.
+
+        Args:
+            game_id (str): the ID of the game
+            create (bool): create the game if it does not exist
+
+        Raises:
+            ValueError: If there is no game with the given ID and create is False.
+            RuntimeError: If the game stays locked for longer than the lock timeout, has
+                to be created and too many games are in progress, or its lock was lost
+                before the changes could be saved.
+        """
+        # Not thread-local: the keeper thread extends the lock on the request's behalf
+        lock = self._redis.lock(f"{self._key(game_id)}:lock", timeout=self.lock_timeout, sleep=0.01,
+                                blocking_timeout=self.lock_timeout, thread_local=False)
+        if not lock.acquire():
+            raise RuntimeError(f"Game {game_id} is busy, try again later.")
+        self._hold(lock)
+        try:
+            game = self._load(game_id)
+            if game is None:
+                if not create:
+                    logger.info("Game %s not found", game_id)
+                    raise ValueError(f"Game {game_id} not found")
+                game = self._add(game_id)
+            try:
+                yield game
+            finally:
+                if not lock.owned():
+                    # Another worker may have changed the game since; saving would undo that
+                    logger.error("Lock on game %s expired before the request finished; changes dropped", game_id)
+                    raise RuntimeError(f"Game {game_id} was changed by another request, try again.")
+                # Like the in-memory registry, keep whatever the request changed, even if it failed
+                self._save(game_id, game)
+        finally:
+            with self._held_lock:
+                self._held.discard(lock)
+            try:
+                lock.release()
+            except redis.exceptions.LockError:
+                pass
+
+    def delete_game(self, game_id: str) -> None:
+        """
+        Removes a game.
+
+        Args:
+            game_id (str): the ID of the game
+
+        Raises:
+            ValueError: If there is no game with the given ID.
+        """
+        pipe = self._redis.pipeline()
+        pipe.delete(self._key(game_id))
+        pipe.zrem(self._index, game_id)
+        deleted, _ = pipe.execute()
+        if not deleted:
+            logger.info("Game %s not found", game_id)
+            raise ValueError(f"Game {game_id} not found")
+        logger.info("Deleted game %s", game_id)
+
+    def list_games(self) -> list[str]:
+        """
+        Returns the IDs of every game in progress.
+        """
+        self.evict_idle()
+        return [game_id.decode() if isinstance(game_id, bytes) else game_id
+                for game_id in self._redis.zrange(self._index, 0, -1)]
+
+
+def create_game_registry(store: str = GAME_STORE, redis_client: Optional[redis.Redis] = None, **kwargs):
+    """
+    Creates the registry of games in progress.
+
+    Args:
+        store (str): 'memory' for one process, 'redis' for games shared by every worker process
+        redis_client (Optional[redis.Redis]): the client the 'redis' store uses
+        **kwargs: max_games and idle_timeout
+
+    Returns:
+        GameRegistry or RedisGameRegistry: the registry
+
+    Raises:
+        ValueError: If the store is unknown, or 'redis' is asked for without a client.
+    """
+    if store == "memory":
+        return GameRegistry(**kwargs)
+    if store == "redis":
+        if redis_client is None:
+            raise ValueError("The redis game store needs a Redis client")
+        logger.info("Keeping games in Redis")
+        return RedisGameRegistry(redis_client, **kwargs)
+    raise ValueError(f"Unknown game store: {store}")
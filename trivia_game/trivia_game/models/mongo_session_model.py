@@ -1,78 +1,259 @@
 import logging
-from typing import Any, List
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from pymongo import UpdateOne
 
 from ..clients.mongo_client import sessions_collection
+from ..models.game_model import GameModel
 from ..utils.logger import configure_logger
+from ..utils.metrics import metrics
 
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
-def login_user(user_id: int, battle_model) -> None:
+# Seconds a saved game may wait before it is written, so bursts of saves become one write
+SESSION_FLUSH_INTERVAL = float(os.getenv("SESSION_FLUSH_INTERVAL", 1.0))
+# Pending saves that force an immediate write
+SESSION_MAX_PENDING = int(os.getenv("SESSION_MAX_PENDING", 500))
+# Longest wait between retries while MongoDB keeps failing; the wait doubles from SESSION_FLUSH_INTERVAL
+SESSION_RETRY_MAX = float(os.getenv("SESSION_RETRY_MAX", 60.0))
+
+# Collections whose user_id index has already been ensured by this process
+_indexed_collections: list = []
+
+
+def ensure_indexes(collection=None) -> None:
+    """
+    Creates the unique index on user_id, once per collection and process.
+
+    Args:
+        collection: the sessions collection (the shared one by default)
+    """
+    collection = collection if collection is not None else sessions_collection
+    if any(indexed is collection for indexed in _indexed_collections):
+        return
+    collection.create_index("user_id", unique=True)
+    _indexed_collections.append(collection)
+
+
+class SessionWriter:
     """
-    Load the user's combatants from MongoDB into the BattleModel's combatants list.
+    Coalesces game saves and writes them to MongoDB in batches.
+
+    Saving only records the game's latest state in memory, so a user saved ten
+    times in a second is written once. Pending saves are written with a single
+    unordered bulk_write by a background timer, either `flush_interval` seconds
+    after the first of them or as soon as `max_pending` users are waiting. The
+    saving thread never writes itself, so requests do not wait on MongoDB. When a
+    background write fails, the saves are kept and retried after a wait that
+    doubles with each failure, up to `retry_max` seconds.
+
+    Attributes:
+        flush_interval (float): seconds a save may wait before it is written
+        max_pending (int): pending users that trigger an immediate write
+        retry_max (float): the longest wait between retries of a failed write
+    """
+
+    def __init__(self, collection=None, flush_interval: float = SESSION_FLUSH_INTERVAL,
+                 max_pending: int = SESSION_MAX_PENDING, retry_max: float = SESSION_RETRY_MAX):
+        self.collection = collection
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.retry_max = retry_max
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: dict[int, dict[str, Any]] = {}
+        self._inflight: dict[int, dict[str, Any]] = {}  # saves being written right now
+        self._timer: Optional[threading.Timer] = None
+        self._timer_due = 0.0  # monotonic time the armed timer fires at
+        self._failures = 0  # background writes failed in a row
+
+        self._saves = 0
+        self._writes = 0
+        self._flushes = 0
+
+    def _collection(self):
+        return self.collection if self.collection is not None else sessions_collection
+
+    def _schedule(self, delay: float) -> None:
+        """
+        Arms the flush timer to fire within `delay` seconds. Must be called with the lock held.
+        """
+        due = time.monotonic() + delay
+        if self._timer is not None:
+            if self._timer_due <= due:
+                return
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._flush_in_background)
+        self._timer.daemon = True
+        self._timer_due = due
+        self._timer.start()
+
+    def _flush_in_background(self) -> None:
+        """
+        Runs a timed flush; if it fails, arms the timer again with a doubled wait.
+        """
+        try:
+            self.flush()
+        except Exception:
+            with self._lock:
+                self._failures += 1
+                delay = min(self.flush_interval * 2 ** self._failures, self.retry_max)
+                self._schedule(delay)
+            logger.warning("Retrying the session write in %.1fs", delay)
+
+    def save(self, user_id: int, game: dict[str, Any]) -> None:
+        """
+        Queues a user's game to be written.
+
+        Args:
+            user_id (int): the ID of the user
+            game (dict): the game, as returned by GameModel.to_dict()
+        """
+        with self._lock:
+            self._pending[user_id] = game
+            self._saves += 1
+            if self._failures:
+                # A retry is already armed; writing sooner would only fail sooner
+                if self._timer is None:
+                    self._schedule(self.flush_interval)
+            elif len(self._pending) >= self.max_pending:
+                self._schedule(0)
+            else:
+                self._schedule(self.flush_interval)
+
+    def pending(self, user_id: int) -> Optional[dict[str, Any]]:
+        """
+        Returns a user's game if it is waiting to be written (or being written).
+        """
+        with self._lock:
+            game = self._pending.get(user_id)
+            return game if game is not None else self._inflight.get(user_id)
+
+    def flush(self) -> int:
+        """
+        Writes every pending save with one bulk_write.
+
+        Returns:
+            int: the number of users written
 
-    Checks if a session document exists for the given `user_id` in MongoDB.
-    If it exists, clears any current combatants in `battle_model` and loads
-    the stored combatants from MongoDB into `battle_model`.
+        Raises:
+            pymongo.errors.PyMongoError: If the write fails. The saves are kept and retried on the next flush.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._inflight = pending
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not pending:
+                return 0
 
-    If no session is found, it creates a new session document for the user
-    with an empty combatants list in MongoDB.
+            now = time.time()
+            operations = [
+                UpdateOne({"user_id": user_id}, {"$set": {"game": game, "updated_at": now}}, upsert=True)
+                for user_id, game in pending.items()
+            ]
+            try:
+                ensure_indexes(self._collection())
+                self._collection().bulk_write(operations, ordered=False)
+            except Exception as e:
+                logger.error("Failed to write %d game sessions: %s", len(pending), str(e))
+                with self._lock:
+                    # Keep anything saved since, it is newer than what failed
+                    pending.update(self._pending)
+                    self._pending = pending
+                    self._inflight = {}
+                raise
+
+            with self._lock:
+                self._inflight = {}
+                self._failures = 0
+                self._writes += len(pending)
+                self._flushes += 1
+            logger.info("Wrote %d game sessions to MongoDB", len(pending))
+            return len(pending)
+
+    def stats(self) -> dict:
+        """
+        Returns the writer's metrics.
+
+        Returns:
+            dict: saves requested, sessions written, bulk writes and saves still pending
+        """
+        with self._lock:
+            return {
+                "saves": self._saves,
+                "writes": self._writes,
+                "flushes": self._flushes,
+                "pending": len(self._pending)
+            }
+
+
+session_writer = SessionWriter()
+metrics.register_stats("session_writer", session_writer.stats)
+
+
+def load_game(user_id: int, collection=None) -> Optional[dict[str, Any]]:
+    """
+    Returns a user's saved game, including a save that has not been written yet.
+
+    Only the game field is read from MongoDB.
+
+    Args:
+        user_id (int): The ID of the user.
+        collection: the sessions collection (the shared one by default)
+
+    Returns:
+        Optional[dict]: the saved game, or None if the user has none
+    """
+    game = session_writer.pending(user_id)
+    if game is not None:
+        return game
+    collection = collection if collection is not None else sessions_collection
+    session = collection.find_one({"user_id": user_id}, projection={"_id": False, "game": True})
+    return session.get("game") if session else None
+
+
+def login_user(user_id: int, game_model: GameModel) -> bool:
+    """
+    Load the user's saved game from MongoDB into the GameModel.
 
     Args:
         user_id (int): The ID of the user whose session is to be loaded.
-        battle_model (BattleModel): An instance of `BattleModel` where the user's combatants
-                                    will be loaded.
+        game_model (GameModel): The game the saved state is restored into.
+
+    Returns:
+        bool: True if a saved game was restored
     """
     logger.info("Attempting to log in user with ID %d.", user_id)
-    session = sessions_collection.find_one({"user_id": user_id})
-
-    if session:
-        logger.info("Session found for user ID %d. Loading combatants into BattleModel.", user_id)
-        battle_model.clear_combatants()
-        for combatant in session.get("combatants", []):
-            logger.debug("Preparing combatant: %s", combatant)
-            battle_model.prep_combatant(combatant)
-        logger.info("Combatants successfully loaded for user ID %d.", user_id)
-    else:
-        logger.info("No session found for user ID %d. Creating a new session with empty combatants list.", user_id)
-        sessions_collection.insert_one({"user_id": user_id, "combatants": []})
-        logger.info("New session created for user ID %d.", user_id)
-
-def logout_user(user_id: int, battle_model) -> None:
-    """
-    Store the current combatants from the BattleModel back into MongoDB.
+    game = load_game(user_id)
+    if not game:
+        logger.info("No saved game for user ID %d.", user_id)
+        return False
+
+    game_model.restore(game)
+    logger.info("Game restored for user ID %d.", user_id)
+    return True
 
-    Retrieves the current combatants from `battle_model` and attempts to store them in
-    the MongoDB session document associated with the given `user_id`. If no session
-    document exists for the user, raises a `ValueError`.
 
-    After saving the combatants to MongoDB, the combatants list in `battle_model` is
-    cleared to ensure a fresh state for the next login.
+def logout_user(user_id: int, game_model: GameModel) -> None:
+    """
+    Save the user's game and clear the GameModel.
+
+    The save is written to MongoDB by the session writer within SESSION_FLUSH_INTERVAL seconds.
 
     Args:
         user_id (int): The ID of the user whose session data is to be saved.
-        battle_model (BattleModel): An instance of `BattleModel` from which the user's
-                                    current combatants are retrieved.
-
-    Raises:
-        ValueError: If no session document is found for the user in MongoDB.
+        game_model (GameModel): The game to save.
     """
     logger.info("Attempting to log out user with ID %d.", user_id)
-    combatants_data = battle_model.get_combatants()
-    logger.debug("Current combatants for user ID %d: %s", user_id, combatants_data)
-
-    result = sessions_collection.update_one(
-        {"user_id": user_id},
-        {"$set": {"combatants": combatants_data}},
-        upsert=False  # Prevents creating a new document if not found
-    )
-
-    if result.matched_count == 0:
-        logger.error("No session found for user ID %d. Logout failed.", user_id)
-        raise ValueError(f"User with ID {user_id} not found for logout.")
-
-    logger.info("Combatants successfully saved for user ID %d. Clearing BattleModel combatants.", user_id)
-    battle_model.clear_combatants()
-    logger.info("BattleModel combatants cleared for user ID %d.", user_id)
\ No newline at end of file
+    session_writer.save(user_id, game_model.to_dict())
+    game_model.clear_opponents()
+    logger.info("Game saved and cleared for user ID %d.", user_id)
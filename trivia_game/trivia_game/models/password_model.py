@@ -1,38 +1,62 @@
-import hashlib
 import logging
 import os
+from typing import Optional
 
 from sqlalchemy.exc import IntegrityError
 
 from trivia_game.utils.db import db
 from trivia_game.utils.logger import configure_logger
+from trivia_game.utils.metrics import metrics
+from trivia_game.utils.tracing import span, traced
+from trivia_game.utils.lru_cache import LRUCache
+from trivia_game.utils.password_hashing import hash_password, hashing_pool, needs_rehash, verify_password
 
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+USER_ID_CACHE_TTL = float(os.getenv("USER_ID_CACHE_TTL", 30))  # seconds a known username is cached
+USER_ID_NEGATIVE_TTL = float(os.getenv("USER_ID_NEGATIVE_TTL", 5))  # seconds an unknown username is cached
+USER_ID_CACHE_SIZE = int(os.getenv("USER_ID_CACHE_SIZE", 10000))
+
+
+# Username -> user ID, including usernames that do not exist (cached as None for a
+# shorter time, so repeated lookups of a bad username do not reach the database)
+user_id_cache = LRUCache("user_ids", max_entries=USER_ID_CACHE_SIZE, ttl=USER_ID_CACHE_TTL)
+metrics.register_stats("lru_cache", user_id_cache.stats, {"cache": "user_ids"})
+
+
+def _cache_user_id(username: str, user_id: Optional[int]) -> None:
+    user_id_cache.set(username, user_id, ttl=None if user_id is not None else USER_ID_NEGATIVE_TTL)
+
+
 class Users(db.Model):
     __tablename__ = 'users'
 
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     salt = db.Column(db.String(32), nullable=False)  # 16-byte salt in hex
-    password = db.Column(db.String(64), nullable=False)  # SHA-256 hash in hex
+    password = db.Column(db.String(255), nullable=False)  # scrypt hash, or a legacy SHA-256 hash in hex
 
     @classmethod
     def _generate_hashed_password(cls, password: str) -> tuple[str, str]:
         """
         Generates a salted, hashed password.
 
+        The scrypt hash is computed on the shared hashing pool.
+
         Args:
             password (str): The password to hash.
 
         Returns:
             tuple: A tuple containing the salt and hashed password.
+
+        Raises:
+            RuntimeError: If the hashing pool is full.
         """
         salt = os.urandom(16).hex()
-        hashed_password = hashlib.sha256((password + salt).encode()).hexdigest()
+        hashed_password = hashing_pool.run(hash_password, password, salt)
         return salt, hashed_password
 
     @classmethod
@@ -52,6 +76,7 @@ class Users(db.Model):
         try:
             db.session.add(new_user)
             db.session.commit()
+            user_id_cache.invalidate(username)
             logger.info("User successfully added to the database: %s", username)
         except IntegrityError:
             db.session.rollback()
@@ -65,26 +90,59 @@ class Users(db.Model):
             raise
 
     @classmethod
-    def check_password(cls, username: str, password: str) -> bool:
+    @traced()
+    def authenticate(cls, username: str, password: str) -> Optional["Users"]:
         """
-        Check if a given password matches the stored password for a user.
+        Look a user up by username and check their password, with a single query.
+
+        The check runs on the shared hashing pool. A correct password stored with a
+        legacy SHA-256 hash, or with an outdated scrypt cost, is rehashed on the spot.
 
         Args:
             username (str): The username of the user.
             password (str): The password to check.
 
         Returns:
-            bool: True if the password is correct, False otherwise.
+            Optional[Users]: The user if the password is correct, None otherwise.
 
         Raises:
             ValueError: If the user does not exist.
+            RuntimeError: If the hashing pool is full.
         """
         user = cls.query.filter_by(username=username).first()
+        _cache_user_id(username, user.id if user else None)
         if not user:
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
-        hashed_password = hashlib.sha256((password + user.salt).encode()).hexdigest()
-        return hashed_password == user.password
+        with span("verify_password"):
+            verified = hashing_pool.run(verify_password, password, user.salt, user.password)
+        if not verified:
+            return None
+
+        if needs_rehash(user.password):
+            user.salt, user.password = cls._generate_hashed_password(password)
+            db.session.commit()
+            logger.info("Rehashed password for user: %s", username)
+        return user
+
+    @classmethod
+    @traced()
+    def check_password(cls, username: str, password: str) -> bool:
+        """
+        Check if a given password matches the stored password for a user.
+
+        Args:
+            username (str): The username of the user.
+            password (str): The password to check.
+
+        Returns:
+            bool: True if the password is correct, False otherwise.
+
+        Raises:
+            ValueError: If the user does not exist.
+            RuntimeError: If the hashing pool is full.
+        """
+        return cls.authenticate(username, password) is not None
 
     @classmethod
     def delete_user(cls, username: str) -> None:
@@ -103,12 +161,13 @@ class Users(db.Model):
             raise ValueError(f"User {username} not found")
         db.session.delete(user)
         db.session.commit()
+        user_id_cache.invalidate(username)
         logger.info("User %s deleted successfully", username)
 
     @classmethod
     def get_id_by_username(cls, username: str) -> int:
         """
-        Retrieve the ID of a user by username.
+        Retrieve the ID of a user by username, from the user ID cache when possible.
 
         Args:
             username (str): The username of the user.
@@ -119,11 +178,15 @@ class Users(db.Model):
         Raises:
             ValueError: If the user does not exist.
         """
-        user = cls.query.filter_by(username=username).first()
-        if not user:
+        cached, user_id = user_id_cache.get(username)
+        if not cached:
+            user = cls.query.filter_by(username=username).first()
+            user_id = user.id if user else None
+            _cache_user_id(username, user_id)
+        if user_id is None:
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
-        return user.id
+        return user_id
 
     @classmethod
     def update_password(cls, username: str, new_password: str) -> None:
@@ -146,4 +209,5 @@ class Users(db.Model):
         user.salt = salt
         user.password = hashed_password
         db.session.commit()
+        user_id_cache.invalidate(username)
         logger.info("Password updated successfully for user: %s", username)
\ No newline at end of file
@@ -0,0 +1,568 @@
+from dataclasses import dataclass, field
+import html
+import json
+import logging
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Iterable, Optional
+import uuid
+
+import redis
+import requests
+
+from trivia_game.clients.opentdb_client import opentdb_get, session_tokens
+from trivia_game.utils import random_utils
+from trivia_game.utils.sql_utils import get_db_connection
+from trivia_game.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+BATCH_SIZE = 50  # the largest amount OpenTDB will return in one call
+QUESTION_TYPES = ("boolean", "multiple")
+DIFFICULTIES = ("easy", "medium", "hard")
+
+# OpenTDB requests one prefetch job may make; at one request per 5 seconds, 720 is an hour
+PREFETCH_MAX_REQUESTS = int(os.getenv("PREFETCH_MAX_REQUESTS", 720))
+# 'memory' reports prefetch jobs from the process running them; 'redis' lets every worker process report them
+PREFETCH_STORE = os.getenv("PREFETCH_STORE", "memory")
+# Seconds a job's progress is kept in Redis after its last update
+PREFETCH_JOB_TTL = float(os.getenv("PREFETCH_JOB_TTL", 24 * 60 * 60))
+# Seconds a worker keeps a bucket's question ids; questions added by another worker show up after this
+QUESTION_BUCKET_TTL = float(os.getenv("QUESTION_BUCKET_TTL", 60))
+
+PREFETCH_RUNNING = "running"
+PREFETCH_FINISHED = "finished"
+
+
+@dataclass
+class Question:
+    """
+    Represents a single trivia question stored in the local question bank.
+
+    Attributes:
+        id (int): The id of the question in the bank
+        category (int): The OpenTDB ID of the question's category
+        type (str): 'boolean' or 'multiple'
+        difficulty (str): 'easy', 'medium' or 'hard'
+        question (str): The (already unescaped) question text
+        correct_answer (str): The (already unescaped) correct answer
+        incorrect_answers (list[str]): The wrong answers offered for the question
+    """
+
+    id: int
+    category: int
+    type: str
+    difficulty: str
+    question: str
+    correct_answer: str
+    incorrect_answers: list[str] = field(default_factory=list)
+
+
+# Ids of the questions in each (category, type, difficulty) bucket, so a draw is a
+# random pick from a list plus a primary key lookup instead of an ORDER BY RANDOM() scan.
+# Each entry holds the ids and the monotonic time they expire at.
+_bucket_ids: dict[tuple[int, str, Optional[str]], tuple[list[int], float]] = {}
+_bucket_lock = threading.Lock()
+
+
+def _invalidate_buckets() -> None:
+    """
+    Drops the in-process bucket index so the next draw re-reads it from the database.
+    """
+    with _bucket_lock:
+        _bucket_ids.clear()
+
+
+def _get_bucket(category: int, q_type: str, difficulty: Optional[str]) -> list[int]:
+    """
+    Returns the list of question ids in a bucket, loading it from the database on first use.
+
+    Loaded buckets are kept for QUESTION_BUCKET_TTL seconds, since questions loaded
+    by another worker process do not invalidate this one's index. Empty buckets are
+    not kept at all, so a bucket filled elsewhere is seen on the next draw.
+
+    Args:
+        category (int): The category ID of the bucket
+        q_type (str): The question type of the bucket
+        difficulty (Optional[str]): The difficulty of the bucket, or None for any difficulty
+
+    Returns:
+        list[int]: The ids of the questions in the bucket
+    """
+    key = (category, q_type, difficulty)
+    with _bucket_lock:
+        cached = _bucket_ids.get(key)
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        if difficulty is None:
+            cursor.execute("SELECT id FROM questions WHERE category = ? AND type = ?", (category, q_type))
+        else:
+            cursor.execute("SELECT id FROM questions WHERE category = ? AND type = ? AND difficulty = ?",
+                           (category, q_type, difficulty))
+        ids = [row[0] for row in cursor.fetchall()]
+
+    if ids:
+        with _bucket_lock:
+            _bucket_ids[key] = (ids, time.monotonic() + QUESTION_BUCKET_TTL)
+    return ids
+
+
+def _resolve_category(cursor: sqlite3.Cursor, category: Any) -> Optional[int]:
+    """
+    Maps a category given either as an ID or as an OpenTDB category name to its ID.
+    """
+    if isinstance(category, int) or (isinstance(category, str) and category.isdigit()):
+        return int(category)
+    cursor.execute("SELECT id FROM categories WHERE name = ?", (html.unescape(str(category)),))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def load_questions(questions: Iterable[dict[str, Any]], category: Optional[int] = None) -> int:
+    """
+    Adds questions in the OpenTDB result format to the question bank.
+
+    Questions already in the bank are skipped, so the same dump can be loaded more than once.
+
+    Args:
+        questions (Iterable[dict]): Questions as returned in the 'results' list of the OpenTDB API
+        category (Optional[int]): The category ID of every question, if known. Otherwise the
+            'category' field of each question (an ID or an OpenTDB category name) is used.
+
+    Returns:
+        int: The number of new questions added to the bank
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            rows = []
+            for item in questions:
+                category_id = category if category is not None else _resolve_category(cursor, item.get("category"))
+                if category_id is None:
+                    logger.warning("Skipping question with unknown category: %s", item.get("category"))
+                    continue
+                rows.append((
+                    category_id,
+                    item["type"],
+                    item.get("difficulty", "easy"),
+                    html.unescape(item["question"]),
+                    html.unescape(item["correct_answer"]),
+                    json.dumps([html.unescape(answer) for answer in item.get("incorrect_answers", [])]),
+                ))
+
+            before = conn.total_changes
+            cursor.executemany("""
+                INSERT OR IGNORE INTO questions (category, type, difficulty, question, correct_answer, incorrect_answers)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+            added = conn.total_changes - before
+
+        _invalidate_buckets()
+        logger.info("Added %d new questions to the question bank.", added)
+        return added
+
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+
+def load_questions_from_file(path: str) -> int:
+    """
+    Fills the question bank from a JSON dump, with no network access.
+
+    The dump may either be a saved OpenTDB response ({"response_code": 0, "results": [...]})
+    or a plain list of questions in the same format.
+
+    Args:
+        path (str): Path to the JSON dump
+
+    Returns:
+        int: The number of new questions added to the bank
+
+    Raises:
+        ValueError: If the file does not contain a list of questions.
+    """
+    logger.info("Loading questions from %s", path)
+    with open(path, "r") as fh:
+        data = json.load(fh)
+
+    questions = data.get("results") if isinstance(data, dict) else data
+    if not isinstance(questions, list):
+        raise ValueError(f"{path} does not contain a list of trivia questions")
+    return load_questions(questions)
+
+
+def prefetch_questions(category: int, q_type: str, difficulty: Optional[str] = None,
+                       batches: int = 1) -> int:
+    """
+    Bulk-fills one bucket of the question bank from OpenTDB in batches of 50.
+
+    The shared OpenTDB session token is used so later batches do not repeat questions;
+    if OpenTDB rejects the token it is repaired and the batch is retried once.
+
+    Args:
+        category (int): The category ID to fetch
+        q_type (str): 'boolean' or 'multiple'
+        difficulty (Optional[str]): The difficulty to fetch, or None for any difficulty
+        batches (int): The number of batches of 50 questions to request
+
+    Returns:
+        int: The number of new questions added to the bank
+
+    Raises:
+        ValueError: If there is an error fetching trivia data.
+    """
+    added = 0
+    for batch in range(batches):
+        logger.info("Prefetching batch %d of %d for category %s (%s, %s)",
+                    batch + 1, batches, category, q_type, difficulty or "any")
+        for attempt in range(2):
+            params = {"amount": BATCH_SIZE, "category": category, "type": q_type}
+            if difficulty:
+                params["difficulty"] = difficulty
+            session_token = session_tokens.get_token()
+            if session_token:
+                params["token"] = session_token
+
+            try:
+                data = opentdb_get("api.php", params, max_wait=None)
+            except requests.exceptions.RequestException as e:
+                logger.error("Error fetching trivia data: %s", str(e))
+                raise ValueError("Error fetching trivia data") from e
+
+            if attempt == 0 and session_tokens.handle_response_code(data.get("response_code")):
+                continue
+            break
+
+        if data.get("response_code") != 0:
+            # Code 1 means the bucket holds fewer than 50 questions
+            logger.warning("OpenTDB returned response code %s for category %s (%s, %s)",
+                           data.get("response_code"), category, q_type, difficulty or "any")
+            break
+
+        added += load_questions(data.get("results", []), category=category)
+
+    return added
+
+
+def prefetch_all(categories: Iterable[int], q_types: Iterable[str] = QUESTION_TYPES,
+                 difficulties: Iterable[str] = DIFFICULTIES, batches: int = 1,
+                 on_bucket: Optional[Callable[[int, Optional[str]], None]] = None) -> int:
+    """
+    Bulk-fills every category/type/difficulty bucket of the question bank from OpenTDB.
+
+    Args:
+        categories (Iterable[int]): The category IDs to fetch
+        q_types (Iterable[str]): The question types to fetch
+        difficulties (Iterable[str]): The difficulties to fetch
+        batches (int): The number of batches of 50 questions to request per bucket
+        on_bucket (Optional[Callable]): Called after each bucket with the questions it added
+            and the error that stopped it, if any
+
+    Returns:
+        int: The number of new questions added to the bank
+    """
+    q_types = list(q_types)
+    difficulties = list(difficulties)
+    added = 0
+    for category in categories:
+        for q_type in q_types:
+            for difficulty in difficulties:
+                bucket_added, error = 0, None
+                try:
+                    bucket_added = prefetch_questions(category, q_type, difficulty, batches)
+                except ValueError as e:
+                    logger.error("Skipping category %s (%s, %s): %s", category, q_type, difficulty, str(e))
+                    error = str(e)
+                added += bucket_added
+                if on_bucket is not None:
+                    on_bucket(bucket_added, error)
+    return added
+
+
+class PrefetchJob:
+    """
+    A prefetch_all() run in the background, for a route that must answer within the server's timeout.
+
+    Attributes:
+        id (str): the ID of the job
+        categories (list[int]): the category IDs being fetched
+        batches (int): batches of 50 questions per bucket
+        state (str): 'running' or 'finished'
+        buckets (int): category/type/difficulty buckets to fetch
+        buckets_done (int): buckets fetched so far
+        failed (int): buckets skipped after an OpenTDB error
+        added (int): new questions added to the bank so far
+    """
+
+    def __init__(self, categories: list[int], batches: int = 1):
+        self.id = uuid.uuid4().hex
+        self.categories = list(categories)
+        self.batches = batches
+        self.state = PREFETCH_RUNNING
+        self.buckets = len(self.categories) * len(QUESTION_TYPES) * len(DIFFICULTIES)
+        self.buckets_done = 0
+        self.failed = 0
+        self.added = 0
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        # Called with the job whenever its progress changes, e.g. to publish it to other processes
+        self.on_update: Optional[Callable[["PrefetchJob"], None]] = None
+
+    def _updated(self) -> None:
+        if self.on_update is None:
+            return
+        try:
+            self.on_update(self)
+        except Exception as e:
+            logger.warning("Could not publish the progress of prefetch job %s: %s", self.id, str(e))
+
+    def _bucket_done(self, added: int, error: Optional[str]) -> None:
+        self.buckets_done += 1
+        self.added += added
+        if error is not None:
+            self.failed += 1
+        self._updated()
+
+    def run(self) -> None:
+        logger.info("Prefetch job %s started: %d buckets", self.id, self.buckets)
+        try:
+            prefetch_all(self.categories, batches=self.batches, on_bucket=self._bucket_done)
+        except Exception as e:
+            # A database error; the buckets left are counted as failed
+            logger.error("Prefetch job %s failed: %s", self.id, str(e))
+            self.failed += self.buckets - self.buckets_done
+        self.state = PREFETCH_FINISHED
+        self.finished_at = time.time()
+        self._updated()
+        logger.info("Prefetch job %s finished: %d questions added, %d buckets failed", self.id, self.added, self.failed)
+
+    def progress(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "state": self.state,
+            "categories": self.categories,
+            "batches": self.batches,
+            "buckets": self.buckets,
+            "buckets_done": self.buckets_done,
+            "failed": self.failed,
+            "added": self.added,
+            "elapsed": round((self.finished_at or time.time()) - self.started_at, 3)
+        }
+
+
+class PrefetchJobs:
+    """
+    Starts prefetch jobs and reports their progress.
+
+    A job runs in a thread of the process that started it. Without a Redis client
+    only that process can report it; with one, each update is also written to
+    Redis, so any worker process can report any job. This process runs one job at
+    a time; jobs started through other workers share OpenTDB's rate limit, so they
+    would only slow each other down.
+
+    Attributes:
+        max_requests (int): OpenTDB requests one job may make
+        ttl (float): seconds a job's progress is kept in Redis after its last update
+    """
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None, max_requests: int = PREFETCH_MAX_REQUESTS,
+                 ttl: float = PREFETCH_JOB_TTL, prefix: str = "trivia:prefetch"):
+        self.max_requests = max_requests
+        self.ttl = ttl
+        self._redis = redis_client
+        self._prefix = prefix
+        self._jobs: dict[str, PrefetchJob] = {}
+        self._lock = threading.Lock()
+
+    def _publish(self, job: PrefetchJob) -> None:
+        self._redis.set(f"{self._prefix}:{job.id}", json.dumps(job.progress()), ex=math.ceil(self.ttl))
+
+    def start(self, categories: list[int], batches: int = 1, background: bool = True) -> PrefetchJob:
+        """
+        Starts prefetching every bucket of the given categories.
+
+        Args:
+            categories (list[int]): the category IDs to fetch
+            batches (int): batches of 50 questions per bucket
+            background (bool): run in a background thread instead of before returning
+
+        Returns:
+            PrefetchJob: the job
+
+        Raises:
+            ValueError: If there are no categories, batches is not positive, or the job would make
+                more than max_requests requests.
+            RuntimeError: If this process is already running a prefetch job.
+        """
+        if not categories or batches < 1:
+            raise ValueError("Expected at least one category and a positive number of batches")
+        job = PrefetchJob(categories, batches)
+        if job.buckets * batches > self.max_requests:
+            raise ValueError(f"A prefetch may make at most {self.max_requests} OpenTDB requests; "
+                             f"this one would make {job.buckets * batches}")
+
+        with self._lock:
+            if any(running.state == PREFETCH_RUNNING for running in self._jobs.values()):
+                raise RuntimeError("A prefetch is already running, try again later.")
+            # Only the last job is kept here; Redis keeps the others until they expire
+            self._jobs = {job.id: job}
+        if self._redis is not None:
+            job.on_update = self._publish
+            self._publish(job)
+
+        if background:
+            threading.Thread(target=job.run, name=f"prefetch-{job.id}", daemon=True).start()
+        else:
+            job.run()
+        return job
+
+    def progress(self, job_id: str) -> dict[str, Any]:
+        """
+        Returns a job's progress.
+
+        Raises:
+            ValueError: If there is no job with the given ID.
+        """
+        if self._redis is not None:
+            data = self._redis.get(f"{self._prefix}:{job_id}")
+            if data is not None:
+                return json.loads(data)
+        else:
+            with self._lock:
+                job = self._jobs.get(job_id)
+            if job is not None:
+                return job.progress()
+        raise ValueError(f"Prefetch job {job_id} not found")
+
+
+def create_prefetch_jobs(store: str = PREFETCH_STORE, redis_client: Optional[redis.Redis] = None,
+                         **kwargs) -> PrefetchJobs:
+    """
+    Creates the registry of prefetch jobs.
+
+    Args:
+        store (str): 'memory' to report jobs from the process running them,
+            'redis' to report them from every worker process
+        redis_client (Optional[redis.Redis]): the client the 'redis' store uses
+        **kwargs: max_requests and ttl
+
+    Returns:
+        PrefetchJobs: the registry
+
+    Raises:
+        ValueError: If the store is unknown, or 'redis' is asked for without a client.
+    """
+    if store == "memory":
+        return PrefetchJobs(**kwargs)
+    if store == "redis":
+        if redis_client is None:
+            raise ValueError("The redis prefetch store needs a Redis client")
+        return PrefetchJobs(redis_client, **kwargs)
+    raise ValueError(f"Unknown prefetch store: {store}")
+
+
+def count_questions(category: Optional[int] = None) -> int:
+    """
+    Counts the questions in the bank.
+
+    Args:
+        category (Optional[int]): Only count questions in this category
+
+    Returns:
+        int: The number of questions
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        if category is None:
+            cursor.execute("SELECT COUNT(*) FROM questions")
+        else:
+            cursor.execute("SELECT COUNT(*) FROM questions WHERE category = ?", (category,))
+        return cursor.fetchone()[0]
+
+
+def draw_question(category: int, q_type: str, difficulty: Optional[str] = None,
+                  exclude: Optional[set[int]] = None, rng: Optional[random.Random] = None) -> Question:
+    """
+    Draws a random question from the bank without touching the network.
+
+    Args:
+        category (int): The category ID to draw from
+        q_type (str): 'boolean' or 'multiple'
+        difficulty (Optional[str]): The difficulty to draw, or None for any difficulty
+        exclude (Optional[set[int]]): Ids of questions that must not be drawn (e.g. already asked)
+        rng (Optional[random.Random]): The generator to draw with (the shared random provider by default)
+
+    Returns:
+        Question: The drawn question
+
+    Raises:
+        ValueError: If the bank has no (unused) question for the bucket.
+        sqlite3.Error: If any database error occurs.
+    """
+    try:
+        ids = _get_bucket(category, q_type, difficulty)
+        exclude = exclude or set()
+        rng = rng or random_utils.rng
+
+        # A handful of random picks is enough unless most of the bucket has been used
+        question_id = None
+        for _ in range(8):
+            if not ids:
+                break
+            candidate = rng.choice(ids)
+            if candidate not in exclude:
+                question_id = candidate
+                break
+        if question_id is None:
+            remaining = [i for i in ids if i not in exclude]
+            if not remaining:
+                logger.info("No questions left in the bank for category %s (%s)", category, q_type)
+                raise ValueError(f"No trivia questions available for category {category} ({q_type})")
+            question_id = rng.choice(remaining)
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, category, type, difficulty, question, correct_answer, incorrect_answers FROM questions WHERE id = ?", (question_id,))
+            row = cursor.fetchone()
+
+        if not row:
+            # The bank was changed behind our back; reload the index on the next draw
+            _invalidate_buckets()
+            raise ValueError(f"Question with ID {question_id} not found")
+
+        return Question(
+            id=row[0],
+            category=row[1],
+            type=row[2],
+            difficulty=row[3],
+            question=row[4],
+            correct_answer=row[5],
+            incorrect_answers=json.loads(row[6])
+        )
+
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+
+if __name__ == "__main__":
+    # Offline bootstrap, e.g. `python -m trivia_game.models.question_bank_model questions.json`
+    import sys
+
+    for dump_path in sys.argv[1:]:
+        print(f"{dump_path}: {load_questions_from_file(dump_path)} new questions")
@@ -0,0 +1,279 @@
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+import logging
+import random
+import time
+from typing import Callable, Iterable, Optional
+
+from trivia_game.models.game_model import GAME_FINISHED, GAME_IN_PROGRESS, GameModel
+from trivia_game.models.question_bank_model import Question
+from trivia_game.models.team_model import Team
+from trivia_game.utils.logger import configure_logger
+
+try:
+    import numpy as np
+except ImportError:  # the batched path falls back to pure Python
+    np = None
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# A strategy picks a team's answer to a question from the shuffled choices, or None to let the round time out
+Strategy = Callable[[Question, list, random.Random], Optional[str]]
+
+
+def always_correct(question: Question, choices: list, rng: random.Random) -> str:
+    """Strategy of a team that knows every answer."""
+    return question.correct_answer
+
+
+def random_guess(question: Question, choices: list, rng: random.Random) -> str:
+    """Strategy of a team that picks one of the choices at random."""
+    return rng.choice(choices)
+
+
+def never_answers(question: Question, choices: list, rng: random.Random) -> None:
+    """Strategy of a team that lets every round time out."""
+    return None
+
+
+def accuracy(p: float) -> Strategy:
+    """
+    Returns the strategy of a team that answers correctly with probability p and guesses otherwise.
+
+    Args:
+        p (float): the probability of a correct answer, between 0 and 1
+
+    Returns:
+        Strategy: the strategy
+    """
+    def strategy(question: Question, choices: list, rng: random.Random) -> str:
+        if rng.random() < p:
+            return question.correct_answer
+        return rng.choice(choices)
+    return strategy
+
+
+class InMemoryQuestionSource:
+    """
+    Serves questions from memory, in place of the question bank and OpenTDB.
+
+    Instances are called like question_bank_model.draw_question, so one can be
+    passed to GameModel as its question_source.
+    """
+
+    def __init__(self, questions: Iterable[Question]):
+        self._buckets: dict[tuple[int, str], list[Question]] = defaultdict(list)
+        for question in questions:
+            self._buckets[(question.category, question.type)].append(question)
+
+    @classmethod
+    def generate(cls, categories: Iterable[int] = (9,), per_bucket: int = 50) -> "InMemoryQuestionSource":
+        """
+        Creates a source of synthetic true/false and multiple choice questions.
+
+        Args:
+            categories (Iterable[int]): the categories to fill
+            per_bucket (int): the questions per category and type
+
+        Returns:
+            InMemoryQuestionSource: the source
+        """
+        questions = []
+        next_id = 1
+        for category in categories:
+            for i in range(per_bucket):
+                questions.append(Question(id=next_id, category=category, type="boolean", difficulty="easy",
+                                          question=f"Synthetic question {next_id}?", correct_answer="True",
+                                          incorrect_answers=["False"]))
+                questions.append(Question(id=next_id + 1, category=category, type="multiple", difficulty="medium",
+                                          question=f"Synthetic question {next_id + 1}?", correct_answer=f"A{i}",
+                                          incorrect_answers=[f"B{i}", f"C{i}", f"D{i}"]))
+                next_id += 2
+        return cls(questions)
+
+    def __call__(self, category: int, q_type: str, difficulty: Optional[str] = None,
+                 exclude: Optional[set[int]] = None, rng: Optional[random.Random] = None) -> Question:
+        bucket = self._buckets.get((category, q_type))
+        if not bucket:
+            raise ValueError(f"No trivia questions available for category {category} ({q_type})")
+        rng = rng or random
+        exclude = exclude or set()
+        for _ in range(8):
+            question = rng.choice(bucket)
+            if question.id not in exclude:
+                return question
+        # Every question has been asked in this game; repeats are fine for a simulation
+        return rng.choice(bucket)
+
+
+@dataclass
+class SimulationResult:
+    """
+    The outcome of a batch of simulated games.
+
+    Attributes:
+        games (int): games played
+        rounds (int): rounds played
+        wins (list[int]): games won by each team
+        ties (int): games that ended level
+        elapsed (float): seconds spent playing
+        round_latencies (list[float]): seconds spent on each round, if recorded
+    """
+    games: int = 0
+    rounds: int = 0
+    wins: list = field(default_factory=lambda: [0, 0])
+    ties: int = 0
+    elapsed: float = 0.0
+    round_latencies: list = field(default_factory=list)
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "games": self.games,
+            "rounds": self.rounds,
+            "wins": list(self.wins),
+            "ties": self.ties,
+            "elapsed": round(self.elapsed, 6),
+            "games_per_second": round(self.games_per_second, 1)
+        }
+
+
+def _play(game: GameModel, teams: list, strategies: tuple, rng: random.Random,
+          latencies: Optional[list] = None) -> int:
+    """
+    Plays a started game to the end with the teams' strategies and returns the rounds played.
+    """
+    rounds = 0
+    while game.state == GAME_IN_PROGRESS:
+        round_start = time.perf_counter()
+        played = game.rounds
+        answers = [strategy(game.current_question, game.choices, rng) for strategy in strategies]
+        for team, answer in zip(teams, answers):
+            if answer is not None:
+                game.submit_answer(team.id, answer)
+        if game.rounds == played:
+            # Close the round as if its deadline had passed
+            game.round_deadline = 0.0
+            game.check_deadline()
+        rounds += 1
+        if latencies is not None:
+            latencies.append(time.perf_counter() - round_start)
+    return rounds
+
+
+def play_match(team_a: Team, team_b: Team, strategies: tuple, source: InMemoryQuestionSource,
+               seed: Optional[str] = None) -> tuple[int, int]:
+    """
+    Plays one headless game between two teams and returns their scores.
+
+    The teams are copied, so the caller's Team objects are left untouched.
+
+    Args:
+        team_a (Team): the first team
+        team_b (Team): the second team
+        strategies (tuple): the answer strategy of each team
+        source (InMemoryQuestionSource): must hold questions for both teams' favorite categories
+        seed (Optional[str]): makes the game reproducible
+
+    Returns:
+        tuple[int, int]: the scores of team_a and team_b
+    """
+    teams = [replace(team_a, current_score=0), replace(team_b, current_score=0)]
+    game = GameModel(seed=seed, question_source=source, quiet=True)
+    for team in teams:
+        game.prep_opponent(team)
+    game.game()
+    _play(game, teams, strategies, random.Random(seed))
+    return teams[0].current_score, teams[1].current_score
+
+
+def simulate_games(n: int, strategies: tuple = (always_correct, random_guess),
+                   source: Optional[InMemoryQuestionSource] = None, seed: Optional[str] = None,
+                   record_latency: bool = False) -> SimulationResult:
+    """
+    Plays n games between two synthetic teams through GameModel, without network, database or input().
+
+    Args:
+        n (int): the number of games
+        strategies (tuple): the answer strategy of each team
+        source (Optional[InMemoryQuestionSource]): the questions (synthetic ones by default)
+        seed (Optional[str]): makes the run reproducible
+        record_latency (bool): record the time spent on each round
+
+    Returns:
+        SimulationResult: the tally of the games
+    """
+    source = source or InMemoryQuestionSource.generate(categories=(9, 11))
+    teams = [
+        Team(id=1, team="Simulated A", favorite_category=9, games_played=0, total_score=0,
+             current_score=0, mascot=""),
+        Team(id=2, team="Simulated B", favorite_category=11, games_played=0, total_score=0,
+             current_score=0, mascot="")
+    ]
+    rng = random.Random(seed)
+    result = SimulationResult()
+    latencies = result.round_latencies if record_latency else None
+
+    start = time.perf_counter()
+    for i in range(n):
+        game = GameModel(seed=None if seed is None else f"{seed}:{i}", question_source=source, quiet=True)
+        for team in teams:
+            game.prep_opponent(team)
+        game.game()
+        result.rounds += _play(game, teams, strategies, rng, latencies)
+
+        if game.state == GAME_FINISHED:
+            winner = game.get_winner()
+            if winner is None:
+                result.ties += 1
+            else:
+                result.wins[teams.index(winner)] += 1
+        result.games += 1
+    result.elapsed = time.perf_counter() - start
+
+    logger.info("Simulated %d games in %.3fs (%.0f games/s)", result.games, result.elapsed, result.games_per_second)
+    return result
+
+
+def simulate_rounds_batch(games: int, accuracies: tuple = (0.9, 0.5), rounds: int = 2,
+                          seed: Optional[int] = None) -> SimulationResult:
+    """
+    Scores many simulated games at once, with GameModel's scoring rules but without GameModel.
+
+    A team scores a point for every round it answers correctly, so each game is
+    decided by comparing the teams' correct answers. With NumPy installed, all
+    rounds are drawn and scored as arrays; otherwise the same draws are made in
+    pure Python.
+
+    Args:
+        games (int): the number of games
+        accuracies (tuple): each team's probability of answering a round correctly
+        rounds (int): rounds per game
+        seed (Optional[int]): makes the run reproducible
+
+    Returns:
+        SimulationResult: the tally of the games
+    """
+    start = time.perf_counter()
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        correct = rng.random((games, rounds, len(accuracies))) < np.asarray(accuracies)
+        scores = correct.sum(axis=1)
+        wins = [int((scores[:, 0] > scores[:, 1]).sum()), int((scores[:, 1] > scores[:, 0]).sum())]
+    else:
+        rng = random.Random(seed)
+        wins = [0, 0]
+        for _ in range(games):
+            score_1 = sum(rng.random() < accuracies[0] for _ in range(rounds))
+            score_2 = sum(rng.random() < accuracies[1] for _ in range(rounds))
+            if score_1 != score_2:
+                wins[0 if score_1 > score_2 else 1] += 1
+
+    return SimulationResult(games=games, rounds=games * rounds, wins=wins, ties=games - sum(wins),
+                            elapsed=time.perf_counter() - start)
@@ -0,0 +1,253 @@
+import logging
+import os
+import threading
+from typing import Any, Iterable, Optional
+
+from trivia_game.utils.logger import configure_logger
+from trivia_game.utils.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+TEAM_CACHE_BACKEND = os.getenv("TEAM_CACHE_BACKEND", "none")  # 'redis' to enable
+TEAM_CACHE_TTL = int(os.getenv("TEAM_CACHE_TTL", 10 * 60))  # seconds
+
+_INT_FIELDS = ("id", "games_played", "total_score", "current_score")
+
+# Fill a team only if no team was invalidated since the caller read the generation
+_FILL_SCRIPT = """
+if (tonumber(redis.call('GET', KEYS[1])) or 0) ~= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('HSET', KEYS[2], unpack(ARGV, 5))
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+redis.call('HSET', KEYS[3], ARGV[3], ARGV[4])
+redis.call('EXPIRE', KEYS[3], ARGV[2])
+return 1
+"""
+
+
+class TeamCache:
+    """
+    A read-through cache of teams in Redis.
+
+    Each team is a hash at team:<id>, and the hash team:names maps team names to
+    IDs. Lookups that miss are filled from sqlite by the caller, and every write to
+    a team drops its cache entry and bumps a generation counter. A caller reads the
+    generation before going to sqlite, and its fill is dropped if a write happened
+    in between, so a lookup racing an update cannot put the old team back. If Redis
+    fails, the cache behaves as if it were empty and lookups go to sqlite.
+
+    Without a Redis client the cache is disabled and every call is a no-op.
+
+    Attributes:
+        ttl (int): seconds a cached team is kept
+    """
+
+    KEY_PREFIX = "team:"
+    NAMES_KEY = "team:names"
+    GENERATION_KEY = "team_cache:generation"
+
+    def __init__(self, redis_client=None, ttl: int = TEAM_CACHE_TTL):
+        self._redis = redis_client
+        self.ttl = ttl
+        self._fill = redis_client.register_script(_FILL_SCRIPT) if redis_client is not None else None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._redis is not None
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def _failed(self, e: Exception) -> None:
+        with self._lock:
+            self._errors += 1
+        logger.warning("Team cache unavailable: %s", str(e))
+
+    @staticmethod
+    def _encode(team: dict[str, Any]) -> dict[str, str]:
+        # Redis hashes cannot hold None, so it is stored as an empty string
+        return {field: "" if value is None else str(value) for field, value in team.items()}
+
+    @staticmethod
+    def _decode(data: dict) -> dict[str, Any]:
+        team = {
+            (field.decode() if isinstance(field, bytes) else field): (value.decode() if isinstance(value, bytes) else value)
+            for field, value in data.items()
+        }
+        for field in _INT_FIELDS:
+            team[field] = int(team[field])
+        team["favorite_category"] = int(team["favorite_category"]) if team.get("favorite_category") else None
+        team["mascot"] = team.get("mascot") or None
+        return team
+
+    def get_by_id(self, team_id: int) -> Optional[dict[str, Any]]:
+        """
+        Returns a cached team by ID.
+
+        Args:
+            team_id (int): the ID of the team
+
+        Returns:
+            Optional[dict[str, Any]]: the team's fields, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        try:
+            data = self._redis.hgetall(f"{self.KEY_PREFIX}{team_id}")
+            team = self._decode(data) if data else None
+        except Exception as e:
+            self._failed(e)
+            return None
+        self._count(team is not None)
+        return team
+
+    def get_by_name(self, name: str) -> Optional[dict[str, Any]]:
+        """
+        Returns a cached team by name.
+
+        Args:
+            name (str): the name of the team
+
+        Returns:
+            Optional[dict[str, Any]]: the team's fields, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        try:
+            team_id = self._redis.hget(self.NAMES_KEY, name)
+        except Exception as e:
+            self._failed(e)
+            return None
+        if team_id is None:
+            self._count(False)
+            return None
+        team = self.get_by_id(int(team_id))
+        return team if team is not None and team["team"] == name else None
+
+    def generation(self) -> Optional[int]:
+        """
+        Returns the current generation, to be read before loading a team to cache.
+
+        Returns:
+            Optional[int]: the generation, or None if the cache is disabled or unavailable
+        """
+        if not self.enabled:
+            return None
+        try:
+            return int(self._redis.get(self.GENERATION_KEY) or 0)
+        except Exception as e:
+            self._failed(e)
+            return None
+
+    def set(self, team: dict[str, Any], generation: Optional[int]) -> None:
+        """
+        Caches a team, unless a team was invalidated since `generation` was read.
+
+        Args:
+            team (dict[str, Any]): the team's fields, including 'id' and 'team'
+            generation (Optional[int]): the generation read before the team was loaded
+        """
+        if not self.enabled or generation is None:
+            return
+        fields = [item for field in self._encode(team).items() for item in field]
+        try:
+            self._fill(
+                keys=[self.GENERATION_KEY, f"{self.KEY_PREFIX}{team['id']}", self.NAMES_KEY],
+                args=[generation, self.ttl, team["team"], team["id"], *fields]
+            )
+        except Exception as e:
+            self._failed(e)
+
+    def invalidate(self, team_ids: Iterable[int] = (), names: Iterable[str] = ()) -> None:
+        """
+        Drops teams from the cache.
+
+        Args:
+            team_ids (Iterable[int]): the IDs of the teams
+            names (Iterable[str]): the names of the teams
+        """
+        if not self.enabled:
+            return
+        keys = [f"{self.KEY_PREFIX}{team_id}" for team_id in team_ids]
+        names = list(names)
+        if not keys and not names:
+            return
+        try:
+            pipe = self._redis.pipeline()
+            pipe.incr(self.GENERATION_KEY)
+            if keys:
+                pipe.delete(*keys)
+            if names:
+                pipe.hdel(self.NAMES_KEY, *names)
+            pipe.execute()
+        except Exception as e:
+            self._failed(e)
+
+    def clear(self) -> None:
+        """
+        Drops every cached team.
+        """
+        if not self.enabled:
+            return
+        try:
+            self._redis.incr(self.GENERATION_KEY)
+            batch = []
+            for key in self._redis.scan_iter(match=f"{self.KEY_PREFIX}*", count=1000):
+                batch.append(key)
+                if len(batch) >= 1000:
+                    self._redis.delete(*batch)
+                    batch = []
+            if batch:
+                self._redis.delete(*batch)
+        except Exception as e:
+            self._failed(e)
+
+    def stats(self) -> dict:
+        """
+        Returns the cache's metrics.
+
+        Returns:
+            dict: hits, misses, the hit rate and Redis errors
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "errors": self._errors
+            }
+
+
+def create_team_cache() -> TeamCache:
+    """
+    Creates the team cache shared by the process.
+
+    The cache is only enabled with TEAM_CACHE_BACKEND=redis.
+
+    Returns:
+        TeamCache: the cache
+    """
+    if TEAM_CACHE_BACKEND == "redis":
+        from trivia_game.clients.redis_client import redis_client
+
+        logger.info("Caching teams in Redis")
+        return TeamCache(redis_client)
+    return TeamCache()
+
+
+team_cache = create_team_cache()
+metrics.register_stats("team_cache", team_cache.stats)
@@ -1,18 +1,38 @@
-from dataclasses import dataclass
+import base64
+from dataclasses import asdict, dataclass, replace
+from itertools import islice
+import json
 import logging
 import os
 import sqlite3
-from typing import Any
+from typing import Any, Iterable, Iterator, Optional
 import requests
 
+from trivia_game.clients.dog_client import mascot_pool
+from trivia_game.clients.opentdb_client import opentdb_get
+from trivia_game.models.category_model import category_catalog
+from trivia_game.models.team_cache import team_cache
+from trivia_game.utils.lru_cache import LRUCache
 from trivia_game.utils.sql_utils import get_db_connection
 from trivia_game.utils.logger import configure_logger
+from trivia_game.utils.metrics import metrics
+from trivia_game.utils.tracing import traced
 
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+# Rows written per transaction by the bulk team endpoints
+TEAM_BULK_CHUNK_SIZE = int(os.getenv("TEAM_BULK_CHUNK_SIZE", 1000))
+
+# In-process team cache in front of sqlite, for a single worker process without the Redis team cache.
+# Other processes' changes would only be seen once entries expire, so gunicorn turns it off for several workers.
+TEAM_LOCAL_CACHE = os.getenv("TEAM_LOCAL_CACHE", "true").lower() in ("1", "true", "yes")
+TEAM_LOCAL_CACHE_SIZE = int(os.getenv("TEAM_LOCAL_CACHE_SIZE", 1024))
+TEAM_LOCAL_CACHE_TTL = float(os.getenv("TEAM_LOCAL_CACHE_TTL", 60))  # seconds
+
+
 @dataclass
 class Team:
     """
@@ -38,28 +58,72 @@ class Team:
     current_score: int
     mascot: str
 
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns the team as a JSON-serializable dictionary.
+        """
+        return asdict(self)
+
 
 
-def get_random_dog_image() -> str:
+# ("id", team_id) -> Team and ("name", team) -> team_id
+local_team_cache = LRUCache("teams", max_entries=TEAM_LOCAL_CACHE_SIZE, ttl=TEAM_LOCAL_CACHE_TTL)
+metrics.register_stats("lru_cache", local_team_cache.stats, {"cache": "teams"})
+
+
+def _local_cache_enabled() -> bool:
+    # With the Redis team cache, teams are shared by several processes (or hosts)
+    return TEAM_LOCAL_CACHE and not team_cache.enabled
+
+
+def _remember_team(team: Team) -> Team:
     """
-        Fetch a random dog image URL from the Dog CEO API.
-        
-        Raises: 
-            RequestException: if there is an error fetching the dog image
+    Caches a team in process and returns a copy for the caller, so games updating
+    their opponents' scores never change the cached team.
     """
-        
+    if not _local_cache_enabled():
+        return replace(team)
+    local_team_cache.set(("id", team.id), team)
+    local_team_cache.set(("name", team.team), team.id)
+    return replace(team)
 
-    try:
-            # Fetch that dog! ( fetch random dog image from api )
-        response = requests.get("https://dog.ceo/api/breeds/image/random")
-        response.raise_for_status()  # Raise an exception for HTTP errors
-        data = response.json()
-        return data['message']  # Return the URL of the dog image
-        
 
-    except Exception as e:
-        logger.error("Error fetching dog image: %s", e)
-        return "https://images.dog.ceo/breeds/shiba/shiba-16.jpg"  # Fallback in case of error
+def _recall_team(team_id: Optional[int] = None, name: Optional[str] = None) -> Optional[Team]:
+    """
+    Returns a copy of a team cached in process, by ID or by name.
+    """
+    if not _local_cache_enabled():
+        return None
+    if name is not None:
+        found, team_id = local_team_cache.get(("name", name))
+        if not found:
+            return None
+    found, team = local_team_cache.get(("id", team_id))
+    if not found or (name is not None and team.team != name):
+        return None
+    return replace(team)
+
+
+def _invalidate_teams(team_ids: Iterable[int] = (), names: Iterable[str] = ()) -> None:
+    """
+    Drops teams from the in-process and Redis caches after they change.
+    """
+    team_ids, names = list(team_ids), list(names)
+    local_team_cache.invalidate(*[("id", team_id) for team_id in team_ids], *[("name", name) for name in names])
+    team_cache.invalidate(team_ids=team_ids, names=names)
+
+
+def get_random_dog_image() -> str:
+    """
+        Get a random dog image URL from the mascot pool.
+
+        The pool is refilled from the Dog CEO API in the background, so this never
+        waits on the network.
+
+        Returns:
+            str: the URL of the dog image
+    """
+    return mascot_pool.get()
 
 
 def fetch_trivia_categories() -> list[dict[str, Any]]:
@@ -74,9 +138,7 @@ def fetch_trivia_categories() -> list[dict[str, Any]]:
     """
     try:
         logger.info("Fetching trivia categories from the OpenTDB API.")
-        response = requests.get("https://opentdb.com/api_category.php")
-        response.raise_for_status()
-        data = response.json()
+        data = opentdb_get("api_category.php")
         logger.info("Successfully fetched trivia categories.")
         return data.get("trivia_categories", [])
     except requests.exceptions.RequestException as e:
@@ -89,7 +151,7 @@ def update_favorite_category(Team) -> None:
         Updates the `favorite_category` attribute.
         """
         try:
-            categories = fetch_trivia_categories()
+            categories = category_catalog.get_categories()
             if not categories:
                 logger.warning("No categories available to choose from.")
                 print("No categories available.")
@@ -120,10 +182,11 @@ def update_favorite_category(Team) -> None:
                     print("Invalid input. Please enter a valid category ID.")
                     logger.warning("User entered an invalid input (non-integer).")
 
-        except RuntimeError as e:
+        except sqlite3.Error as e:
             print("Error fetching trivia categories.")
             logger.error("Error in fetching categories: %s", str(e))
 
+@traced()
 def create_team(team: str, favorite_category: int) -> None:
     """
     Adds a new team with specified details to the database.
@@ -133,7 +196,7 @@ def create_team(team: str, favorite_category: int) -> None:
     favorite_category (int): The ID of the team's favorite category.
 
     Raises:
-        ValueError: If another team with this name already exists.
+        ValueError: If another team with this name already exists or the category does not exist.
         sqlite3.Error: If any database error occurs.
     """
     try:
@@ -147,9 +210,13 @@ def create_team(team: str, favorite_category: int) -> None:
                 VALUES (?, ?, ?)
             """, (team, favorite_category, mascot_image_url))
             conn.commit()
+            _invalidate_teams(names=[team])
             logger.info("Team successfully added to the database: %s", team)
 
-    except sqlite3.IntegrityError:
+    except sqlite3.IntegrityError as e:
+        if "FOREIGN KEY" in str(e):
+            logger.error("Unknown category %s for team: %s", favorite_category, team)
+            raise ValueError(f"Category with ID {favorite_category} not found")
         logger.error("Duplicate team: %s", team)
         raise ValueError(f"Team with name '{team}' already exists")
 
@@ -173,6 +240,8 @@ def clear_teams() -> None:
             cursor = conn.cursor()
             cursor.executescript(create_table_script)
             conn.commit()
+            local_team_cache.clear()
+            team_cache.clear()
 
             logger.info("Teams cleared successfully.")
 
@@ -208,6 +277,7 @@ def delete_team(id: int) -> None:
 
                 cursor.execute("UPDATE teams SET deleted = TRUE WHERE id = ?", (id,))
                 conn.commit()
+                _invalidate_teams(team_ids=[id])
 
                 logger.info("Team with ID %s marked as deleted.", id)
 
@@ -231,6 +301,13 @@ def get_team_by_id(team_id: int):
             sqlite3.Error: If any database error occurs.
 
         """
+        local = _recall_team(team_id=team_id)
+        if local is not None:
+            return local
+        cached = team_cache.get_by_id(team_id)
+        if cached is not None:
+            return _remember_team(Team(**cached))
+        generation = team_cache.generation()
 
         try:
             with get_db_connection() as conn:
@@ -242,7 +319,7 @@ def get_team_by_id(team_id: int):
                     if row[4]:
                         logger.info("Team with id %s has been deleted", id)
                         raise ValueError(f"Team with id {team_id} has been deleted")
-                    return Team(
+                    result = Team(
                     id=row[0], 
                     team=row[1], 
                     favorite_category=row[2], 
@@ -251,6 +328,8 @@ def get_team_by_id(team_id: int):
                     games_played=row[6], 
                     total_score=row[7]
                 )
+                    team_cache.set(result.to_dict(), generation)
+                    return _remember_team(result)
                 else:
                     logger.info("Team with ID %s not found", team_id)
                     raise ValueError(f"Team with ID {team_id} not found")
@@ -275,6 +354,13 @@ def get_team_by_name(team: str):
             sqlite3.Error: If any database error occurs.
 
         """
+        local = _recall_team(name=team)
+        if local is not None:
+            return local
+        cached = team_cache.get_by_name(team)
+        if cached is not None:
+            return _remember_team(Team(**cached))
+        generation = team_cache.generation()
 
         try:
             with get_db_connection() as conn:
@@ -286,7 +372,7 @@ def get_team_by_name(team: str):
                     if row[4]:
                         logger.info("Team with name %s has been deleted", team)
                         raise ValueError(f"Team with name {team} has been deleted")
-                    return Team(
+                    result = Team(
                     id=row[0], 
                     team=row[1], 
                     favorite_category=row[2], 
@@ -295,6 +381,8 @@ def get_team_by_name(team: str):
                     games_played=row[6], 
                     total_score=row[7]
                 )
+                    team_cache.set(result.to_dict(), generation)
+                    return _remember_team(result)
                 else:
                     logger.info("Team with name %s not found", team)
                     raise ValueError(f"Team with name {team} not found")
@@ -342,7 +430,321 @@ def update_team_stats(team_id: int, result: str) -> None:
                     raise ValueError(f"Invalid result: {result}. Expected 'win' or 'loss'.")
 
                 conn.commit()
+                _invalidate_teams(team_ids=[team_id])
+
+        except sqlite3.Error as e:
+            logger.error("Database error: %s", str(e))
+            raise e
+
+
+def leaderboard_cursor(entry: dict[str, Any]) -> str:
+    """
+    Returns the cursor of the leaderboard page that follows a team
+
+    Args:
+        entry (dict[str, Any]): The last team of a page, as returned by get_leaderboard
+
+    Returns:
+        str: An opaque cursor for get_leaderboard's 'after' argument
+    """
+    key = [entry["total_score"], entry["games_played"], entry["team"]]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+def _parse_leaderboard_cursor(cursor: str) -> tuple[int, int, str]:
+    try:
+        total_score, games_played, team = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid leaderboard cursor: {cursor}")
+    if not isinstance(total_score, int) or not isinstance(games_played, int) or not isinstance(team, str):
+        raise ValueError(f"Invalid leaderboard cursor: {cursor}")
+    return total_score, games_played, team
+
+
+def _teams_ranked_above(cursor: sqlite3.Cursor, total_score: int, games_played: int, team: str) -> int:
+    # Whole (total_score, games_played) groups come from leaderboard_counts; only the
+    # teams tied on both are counted in the index
+    cursor.execute("""
+        SELECT
+            (SELECT COALESCE(SUM(teams), 0) FROM leaderboard_counts WHERE total_score > ?)
+          + (SELECT COALESCE(SUM(teams), 0) FROM leaderboard_counts WHERE total_score = ? AND games_played < ?)
+          + (SELECT COUNT(*) FROM teams WHERE deleted = FALSE AND total_score = ? AND games_played = ? AND team < ?)
+    """, (total_score, total_score, games_played, total_score, games_played, team))
+    return cursor.fetchone()[0]
+
+
+def get_leaderboard(limit: int = 10, after: Optional[str] = None) -> list[dict[str, Any]]:
+        """
+        Retrieves a page of the leaderboard
+
+        Teams are ranked by total score, then by fewest games played, then by name.
+        Pages are read by keyset: each page starts right after the team named by the
+        cursor, with at most three range scans of the idx_teams_leaderboard index,
+        so a page deep in the ranking costs the same as the first one.
+
+        Args:
+            limit (int): The number of teams to return
+            after (Optional[str]): The cursor of the previous page's last team (see leaderboard_cursor),
+                or None for the first page
+
+        Returns:
+            list[dict[str, Any]]: The teams on the page, each with its rank, id, team, total_score and games_played
+
+        Raises:
+            ValueError: If the cursor is invalid.
+            sqlite3.Error: If any database error occurs.
+        """
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                if after is None:
+                    cursor.execute("""
+                        SELECT id, team, total_score, games_played FROM teams
+                        WHERE deleted = FALSE
+                        ORDER BY total_score DESC, games_played, team
+                        LIMIT ?
+                    """, (limit,))
+                    rows = cursor.fetchall()
+                else:
+                    total_score, games_played, team = _parse_leaderboard_cursor(after)
+                    # The rest of the team's tie, the rest of its score, then every lower score
+                    ranges = [
+                        ("total_score = ? AND games_played = ? AND team > ?", (total_score, games_played, team)),
+                        ("total_score = ? AND games_played > ?", (total_score, games_played)),
+                        ("total_score < ?", (total_score,))
+                    ]
+                    rows = []
+                    for condition, params in ranges:
+                        if len(rows) >= limit:
+                            break
+                        cursor.execute(f"""
+                            SELECT id, team, total_score, games_played FROM teams
+                            WHERE deleted = FALSE AND {condition}
+                            ORDER BY total_score DESC, games_played, team
+                            LIMIT ?
+                        """, params + (limit - len(rows),))
+                        rows.extend(cursor.fetchall())
+
+                if not rows:
+                    return []
+                first = 1 if after is None else _teams_ranked_above(cursor, rows[0][2], rows[0][3], rows[0][1]) + 1
+                return [
+                    {"rank": first + i, "id": row[0], "team": row[1], "total_score": row[2], "games_played": row[3]}
+                    for i, row in enumerate(rows)
+                ]
+
+        except sqlite3.Error as e:
+            logger.error("Database error: %s", str(e))
+            raise e
+
+
+def get_team_rank(team_id: int) -> dict[str, Any]:
+        """
+        Retrieves a team's position on the leaderboard
+
+        The rank is one plus the number of teams ranked above it: the teams with a
+        higher score, or the same score in fewer games, are summed from the per-group
+        counts in leaderboard_counts, and only the teams tied on both are counted
+        in the leaderboard index.
+
+        Args:
+            team_id (int): The unique id of the team
+
+        Returns:
+            dict[str, Any]: The team's rank, id, team, total_score and games_played
+
+        Raises:
+            ValueError: If the team is marked as deleted or no team exists with the given 'team_id'
+            sqlite3.Error: If any database error occurs.
+        """
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT team, total_score, games_played, deleted FROM teams WHERE id = ?", (team_id,))
+                row = cursor.fetchone()
+                if not row:
+                    logger.info("Team with ID %s not found", team_id)
+                    raise ValueError(f"Team with ID {team_id} not found")
+                team, total_score, games_played, deleted = row
+                if deleted:
+                    logger.info("Team with ID %s has been deleted", team_id)
+                    raise ValueError(f"Team with ID {team_id} has been deleted")
+
+                above = _teams_ranked_above(cursor, total_score, games_played, team)
+                return {"rank": above + 1, "id": team_id, "team": team, "total_score": total_score, "games_played": games_played}
 
         except sqlite3.Error as e:
             logger.error("Database error: %s", str(e))
             raise e
+
+
+def _chunks(rows: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _bulk_team_row(row: dict[str, Any], line: int) -> tuple[str, int, str]:
+    team = str(row.get("team") or "").strip()
+    try:
+        favorite_category = int(row.get("favorite_category"))
+    except (TypeError, ValueError):
+        favorite_category = None
+    if not team or favorite_category is None:
+        raise ValueError(f"Invalid team on row {line}: a team name and an integer favorite_category are required")
+    return team, favorite_category, row.get("mascot") or get_random_dog_image()
+
+
+def create_teams_bulk(teams: Iterable[dict[str, Any]], chunk_size: int = TEAM_BULK_CHUNK_SIZE) -> dict[str, int]:
+    """
+    Adds many teams to the database at once.
+
+    Rows are written with executemany, one transaction per chunk, and teams without a
+    mascot are given one from the mascot pool. Teams whose name is already taken are
+    skipped. The rows are consumed lazily, so an upload can be
+    streamed straight in.
+
+    Args:
+        teams (Iterable[dict[str, Any]]): rows with a 'team', a 'favorite_category' and optionally a 'mascot'
+        chunk_size (int): the number of rows written per transaction
+
+    Returns:
+        dict[str, int]: the number of teams 'created' and 'skipped'
+
+    Raises:
+        ValueError: If a row is invalid or names a category that does not exist. Chunks
+            before the invalid row stay committed.
+        sqlite3.Error: If any database error occurs.
+    """
+    created = 0
+    skipped = 0
+    rows = (_bulk_team_row(row, line) for line, row in enumerate(teams, start=1))
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            for chunk in _chunks(rows, chunk_size):
+                try:
+                    cursor.executemany("""
+                        INSERT OR IGNORE INTO teams (team, favorite_category, mascot)
+                        VALUES (?, ?, ?)
+                    """, chunk)
+                except sqlite3.IntegrityError as e:
+                    # OR IGNORE only covers duplicate names; an unknown category still fails the chunk
+                    first = created + skipped + 1
+                    raise ValueError(f"Unknown favorite_category on rows {first}-{first + len(chunk) - 1}") from e
+                # Unlike total_changes, rowcount leaves out the rows written by triggers
+                inserted = cursor.rowcount
+                conn.commit()
+                created += inserted
+                skipped += len(chunk) - inserted
+
+        logger.info("Bulk import added %d teams, skipped %d existing", created, skipped)
+        return {"created": created, "skipped": skipped}
+
+    except ValueError:
+        logger.error("Bulk import stopped after %d teams: invalid row", created)
+        raise
+
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+
+def export_teams(chunk_size: int = TEAM_BULK_CHUNK_SIZE) -> Iterator[Team]:
+    """
+    Yields every team that has not been deleted, in ID order.
+
+    Teams are read chunk_size rows at a time, so the whole table is never held in memory.
+
+    Args:
+        chunk_size (int): the number of rows fetched at a time
+
+    Yields:
+        Team: each team
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, team, favorite_category, games_played, total_score, current_score, mascot
+                FROM teams WHERE deleted = FALSE ORDER BY id
+            """)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    return
+                for row in rows:
+                    yield Team(
+                        id=row[0], team=row[1], favorite_category=row[2], games_played=row[3],
+                        total_score=row[4], current_score=row[5], mascot=row[6]
+                    )
+
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+
+def update_team_stats_batch(results: Iterable[tuple[int, str]]) -> int:
+    """
+    Applies many game results in one transaction
+
+    Results are added up per team first, so a team that played a hundred games is
+    written once. Either every result is applied or none is.
+
+    Args:
+        results (Iterable[tuple[int, str]]): (team_id, result) pairs, where result is 'win' or 'loss'
+
+    Returns:
+        int: The number of teams updated
+
+    Raises:
+        ValueError: If a result is not 'win' or 'loss', or a team is deleted or does not exist
+        sqlite3.Error: If any database error occurs.
+    """
+    # team_id -> [games played, wins]
+    totals: dict[int, list[int]] = {}
+    for team_id, result in results:
+        if result not in ('win', 'loss'):
+            raise ValueError(f"Invalid result: {result}. Expected 'win' or 'loss'.")
+        team_totals = totals.setdefault(team_id, [0, 0])
+        team_totals[0] += 1
+        if result == 'win':
+            team_totals[1] += 1
+
+    if not totals:
+        return 0
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            found = set()
+            # Stay under sqlite's limit on bound parameters
+            for chunk in _chunks(totals, 500):
+                placeholders = ", ".join("?" * len(chunk))
+                cursor.execute(f"SELECT id FROM teams WHERE deleted = FALSE AND id IN ({placeholders})", chunk)
+                found.update(row[0] for row in cursor.fetchall())
+
+            missing = sorted(set(totals) - found)
+            if missing:
+                logger.info("Teams not found or deleted: %s", missing)
+                raise ValueError(f"Teams not found or deleted: {', '.join(map(str, missing))}")
+
+            cursor.executemany(
+                "UPDATE teams SET games_played = games_played + ?, total_score = total_score + ? WHERE id = ?",
+                [(games, wins, team_id) for team_id, (games, wins) in totals.items()]
+            )
+            conn.commit()
+        _invalidate_teams(team_ids=totals)
+
+        logger.info("Updated stats for %d teams", len(totals))
+        return len(totals)
+
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
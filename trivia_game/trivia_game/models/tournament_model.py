@@ -0,0 +1,583 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+import uuid
+
+import redis
+
+from trivia_game.models.simulation import InMemoryQuestionSource, accuracy, play_match
+from trivia_game.models.team_model import Team, get_team_by_id, update_team_stats_batch
+from trivia_game.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+TOURNAMENT_WORKERS = int(os.getenv("TOURNAMENT_WORKERS", 4))
+MAX_TOURNAMENTS = int(os.getenv("MAX_TOURNAMENTS", 100))
+# Replays of a drawn match before the higher seed is given the win
+MATCH_TIEBREAK_REPLAYS = int(os.getenv("MATCH_TIEBREAK_REPLAYS", 3))
+# 'memory' reports tournaments from the process playing them; 'redis' lets every worker process report them
+TOURNAMENT_STORE = os.getenv("TOURNAMENT_STORE", "memory")
+# Seconds a tournament's progress is kept in Redis after its last update
+TOURNAMENT_TTL = float(os.getenv("TOURNAMENT_TTL", 24 * 60 * 60))
+
+ROUND_ROBIN = "round_robin"
+SINGLE_ELIMINATION = "single_elimination"
+DOUBLE_ELIMINATION = "double_elimination"
+SWISS = "swiss"
+FORMATS = (ROUND_ROBIN, SINGLE_ELIMINATION, DOUBLE_ELIMINATION, SWISS)
+
+TOURNAMENT_PENDING = "pending"
+TOURNAMENT_RUNNING = "running"
+TOURNAMENT_FINISHED = "finished"
+TOURNAMENT_FAILED = "failed"
+
+
+@dataclass
+class Match:
+    """
+    One game of a tournament.
+
+    Attributes:
+        round (int): the round the match is played in, starting at 1
+        team_a (int): the ID of the first team
+        team_b (Optional[int]): the ID of the second team, None for a bye
+        scores (Optional[tuple[int, int]]): the teams' scores once played
+        winner (Optional[int]): the ID of the winning team once played
+    """
+    round: int
+    team_a: int
+    team_b: Optional[int]
+    scores: Optional[tuple] = None
+    winner: Optional[int] = None
+
+    @property
+    def loser(self) -> Optional[int]:
+        if self.winner is None or self.team_b is None:
+            return None
+        return self.team_b if self.winner == self.team_a else self.team_a
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "round": self.round,
+            "team_a": self.team_a,
+            "team_b": self.team_b,
+            "scores": list(self.scores) if self.scores else None,
+            "winner": self.winner
+        }
+
+
+def team_strategy(team: Team):
+    """
+    Returns the answer strategy a team plays with in a simulated match.
+
+    A team answers correctly as often as it has won before, smoothed so that new
+    teams start at even odds.
+    """
+    return accuracy((team.total_score + 1) / (team.games_played + 2))
+
+
+def play_simulated_match(team_a: Team, team_b: Team, source: InMemoryQuestionSource, seed: str) -> tuple[int, int]:
+    """
+    The default match runner: a headless game with each team's strategy.
+    """
+    return play_match(team_a, team_b, (team_strategy(team_a), team_strategy(team_b)), source, seed)
+
+
+class Tournament:
+    """
+    Schedules and plays the matches of a tournament between many teams.
+
+    Rounds are scheduled one at a time, so knockout and Swiss pairings can depend on
+    earlier results. The matches of a round are independent and are handed to the
+    executor together. With record_results, the results of each round are written
+    back to the teams with one batched update. The default runner makes up its
+    matches, so its results are never recorded: they would put invented scores on
+    the leaderboard.
+
+    The default match runner is pure Python, so under the GIL the executor's
+    threads take turns rather than playing matches at the same time: a 32-team
+    round robin takes about as long on one thread as on four. The pool only pays
+    off for runners that wait on I/O; to play more simulated matches at once, add
+    worker processes (see gunicorn.conf.py) rather than threads.
+
+    Formats:
+        round_robin: every team plays every other team once
+        single_elimination: losers are out; the higher seed gets a bye when the field is odd
+        double_elimination: teams are out after two losses; unbeaten and once-beaten
+            teams are paired separately until one team is left
+        swiss: ceil(log2(n)) rounds of teams with equal records paired against each
+            other, without rematches where possible
+
+    Attributes:
+        id (str): the ID of the tournament
+        format (str): one of FORMATS
+        teams (dict[int, Team]): the teams, by ID, in seed order
+        state (str): 'pending', 'running', 'finished' or 'failed'
+        matches (list[Match]): every match scheduled so far
+    """
+
+    def __init__(self, teams: list[Team], format: str = ROUND_ROBIN, seed: Optional[str] = None,
+                 match_runner: Callable[[Team, Team, InMemoryQuestionSource, str], tuple] = play_simulated_match,
+                 record_results: bool = False):
+        if format not in FORMATS:
+            raise ValueError(f"Invalid tournament format: {format}. Expected one of {', '.join(FORMATS)}.")
+        if len(teams) < 2:
+            raise ValueError("A tournament needs at least two teams.")
+        if len({team.id for team in teams}) != len(teams):
+            raise ValueError("A team cannot enter a tournament twice.")
+        if record_results and match_runner is play_simulated_match:
+            raise ValueError("Simulated matches cannot be recorded in the teams' stats.")
+
+        self.id = uuid.uuid4().hex
+        self.format = format
+        self.teams = {team.id: team for team in teams}
+        self.seed = seed if seed is not None else self.id
+        self.match_runner = match_runner
+        self.record_results = record_results
+        self.source = InMemoryQuestionSource.generate({team.favorite_category for team in teams}, per_bucket=20)
+
+        self.state = TOURNAMENT_PENDING
+        self.error: Optional[str] = None
+        self.matches: list[Match] = []
+        self.round = 0
+        self.wins = {team_id: 0 for team_id in self.teams}
+        self.losses = {team_id: 0 for team_id in self.teams}
+        self.byes: set[int] = set()
+        self._opponents = {team_id: set() for team_id in self.teams}
+        self._round_robin = self._round_robin_rounds() if format == ROUND_ROBIN else []
+        self._lock = threading.Lock()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # Called with the tournament whenever its progress changes, e.g. to publish it to other processes
+        self.on_update: Optional[Callable[["Tournament"], None]] = None
+
+    @property
+    def total_rounds(self) -> Optional[int]:
+        """
+        The number of rounds, or None if it depends on the results (double elimination).
+        """
+        n = len(self.teams)
+        if self.format == ROUND_ROBIN:
+            return len(self._round_robin)
+        if self.format in (SINGLE_ELIMINATION, SWISS):
+            return math.ceil(math.log2(n))
+        return None
+
+    def _round_robin_rounds(self) -> list[list[tuple[int, Optional[int]]]]:
+        # The circle method: fix the first team and rotate the rest one step per round
+        ids: list[Optional[int]] = list(self.teams)
+        seeds = {team_id: i for i, team_id in enumerate(ids)}
+        if len(ids) % 2:
+            ids.append(None)
+        rounds = []
+        for _ in range(len(ids) - 1):
+            half = len(ids) // 2
+            pairs = list(zip(ids[:half], reversed(ids[half:])))
+            # The higher seed comes first, so it is the one given a drawn match
+            rounds.append([(b, None) if a is None else (a, b) if b is None or seeds[a] < seeds[b] else (b, a)
+                           for a, b in pairs])
+            ids = [ids[0], ids[-1]] + ids[1:-1]
+        return rounds
+
+    def _knockout_pairs(self, alive: list[int]) -> list[tuple[int, Optional[int]]]:
+        # Highest seed against lowest seed; the top seed sits out when the field is odd
+        pairs: list[tuple[int, Optional[int]]] = []
+        if len(alive) % 2:
+            pairs.append((alive[0], None))
+            alive = alive[1:]
+        half = len(alive) // 2
+        pairs.extend(zip(alive[:half], reversed(alive[half:])))
+        return pairs
+
+    def _swiss_pairs(self) -> list[tuple[int, Optional[int]]]:
+        seeds = list(self.teams)
+        ranked = sorted(self.teams, key=lambda team_id: (-self.wins[team_id], seeds.index(team_id)))
+        pairs: list[tuple[int, Optional[int]]] = []
+        if len(ranked) % 2:
+            # The bye goes to the lowest-ranked team that has not had one
+            bye = next((team_id for team_id in reversed(ranked) if team_id not in self.byes), ranked[-1])
+            ranked.remove(bye)
+            pairs.append((bye, None))
+        while ranked:
+            team_id = ranked.pop(0)
+            opponent = next((other for other in ranked if other not in self._opponents[team_id]), ranked[0])
+            ranked.remove(opponent)
+            pairs.append((team_id, opponent))
+        return pairs
+
+    def schedule_round(self) -> list[Match]:
+        """
+        Schedules the next round from the results so far.
+
+        Returns:
+            list[Match]: the matches of the round, empty once the tournament is over
+        """
+        next_round = self.round + 1
+        if self.format == ROUND_ROBIN:
+            pairs = self._round_robin[self.round] if self.round < len(self._round_robin) else []
+        elif self.format == SINGLE_ELIMINATION:
+            alive = [team_id for team_id in self.teams if self.losses[team_id] == 0]
+            pairs = self._knockout_pairs(alive) if len(alive) > 1 else []
+        elif self.format == DOUBLE_ELIMINATION:
+            unbeaten = [team_id for team_id in self.teams if self.losses[team_id] == 0]
+            beaten_once = [team_id for team_id in self.teams if self.losses[team_id] == 1]
+            if len(unbeaten) + len(beaten_once) <= 1:
+                pairs = []
+            elif len(unbeaten) <= 1 and len(beaten_once) <= 1:
+                pairs = [(unbeaten[0], beaten_once[0])]  # the grand final
+            else:
+                pairs = []
+                for bracket in (unbeaten, beaten_once):
+                    if len(bracket) > 1:
+                        pairs.extend(self._knockout_pairs(bracket))
+                    elif bracket:
+                        pairs.append((bracket[0], None))
+        else:
+            pairs = self._swiss_pairs() if self.round < self.total_rounds else []
+
+        matches = [Match(next_round, team_a, team_b) for team_a, team_b in pairs]
+        if matches:
+            self.round = next_round
+        return matches
+
+    def _play(self, match: Match, index: int) -> Match:
+        if match.team_b is None:
+            match.winner = match.team_a
+            return match
+
+        team_a, team_b = self.teams[match.team_a], self.teams[match.team_b]
+        for replay in range(MATCH_TIEBREAK_REPLAYS + 1):
+            scores = self.match_runner(team_a, team_b, self.source, f"{self.seed}:{match.round}:{index}:{replay}")
+            if scores[0] != scores[1]:
+                break
+        match.scores = tuple(scores)
+        # Team stats only know wins and losses, so a draw that survives the replays
+        # goes to team_a, which is always the higher seed (or, in Swiss, the higher ranked)
+        match.winner = match.team_a if scores[0] >= scores[1] else match.team_b
+        return match
+
+    def _record(self, matches: list[Match]) -> None:
+        results = []
+        with self._lock:
+            for match in matches:
+                self.matches.append(match)
+                if match.team_b is None:
+                    self.byes.add(match.team_a)
+                    if self.format == SWISS:
+                        self.wins[match.team_a] += 1
+                    continue
+                self._opponents[match.team_a].add(match.team_b)
+                self._opponents[match.team_b].add(match.team_a)
+                self.wins[match.winner] += 1
+                self.losses[match.loser] += 1
+                results.append((match.winner, 'win'))
+                results.append((match.loser, 'loss'))
+        if self.record_results and results:
+            update_team_stats_batch(results)
+
+    def _updated(self) -> None:
+        if self.on_update is None:
+            return
+        try:
+            self.on_update(self)
+        except Exception as e:
+            # Reporting must not stop the tournament; readers see the next update instead
+            logger.warning("Could not publish the progress of tournament %s: %s", self.id, str(e))
+
+    def run(self, executor: ThreadPoolExecutor) -> None:
+        """
+        Plays every round, each round's matches in parallel on the executor.
+
+        Failures are recorded in the tournament's state rather than raised, since the
+        tournament runs in the background.
+
+        Args:
+            executor (ThreadPoolExecutor): the pool matches are played on
+        """
+        self.state = TOURNAMENT_RUNNING
+        self.started_at = time.time()
+        logger.info("Tournament %s (%s) started with %d teams", self.id, self.format, len(self.teams))
+        self._updated()
+        try:
+            while True:
+                matches = self.schedule_round()
+                if not matches:
+                    break
+                played = list(executor.map(self._play, matches, range(len(matches))))
+                self._record(played)
+                self._updated()
+                logger.info("Tournament %s finished round %d (%d matches)", self.id, self.round, len(played))
+        except Exception as e:
+            logger.error("Tournament %s failed in round %d: %s", self.id, self.round, str(e))
+            self.state = TOURNAMENT_FAILED
+            self.error = str(e)
+        else:
+            self.state = TOURNAMENT_FINISHED
+            logger.info("Tournament %s finished", self.id)
+        self.finished_at = time.time()
+        self._updated()
+
+    def standings(self) -> list[dict[str, Any]]:
+        """
+        Returns the teams ordered by wins, then losses, then seed (by losses first in knockout formats).
+        """
+        seeds = list(self.teams)
+        knockout = self.format in (SINGLE_ELIMINATION, DOUBLE_ELIMINATION)
+        with self._lock:
+            def rank(team_id: int) -> tuple:
+                record = (self.losses[team_id], -self.wins[team_id]) if knockout else (-self.wins[team_id], self.losses[team_id])
+                return record + (seeds.index(team_id),)
+            ranked = sorted(self.teams, key=rank)
+            return [{"team_id": team_id, "team": self.teams[team_id].team, "wins": self.wins[team_id],
+                     "losses": self.losses[team_id]} for team_id in ranked]
+
+    def progress(self) -> dict[str, Any]:
+        """
+        Returns the tournament's progress.
+
+        Returns:
+            dict: state, rounds played, matches played and the current standings
+        """
+        standings = self.standings()
+        with self._lock:
+            played = sum(1 for match in self.matches if match.team_b is not None)
+        progress = {
+            "tournament_id": self.id,
+            "format": self.format,
+            "state": self.state,
+            "teams": len(self.teams),
+            "round": self.round,
+            "total_rounds": self.total_rounds,
+            "matches_played": played,
+            "standings": standings
+        }
+        if self.format == ROUND_ROBIN:
+            progress["total_matches"] = len(self.teams) * (len(self.teams) - 1) // 2
+        if self.state == TOURNAMENT_FINISHED:
+            progress["winner"] = standings[0]["team_id"]
+        if self.error:
+            progress["error"] = self.error
+        if self.started_at:
+            progress["elapsed"] = round((self.finished_at or time.time()) - self.started_at, 3)
+        return progress
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the tournament's progress and every match played so far, as stored in Redis.
+        """
+        with self._lock:
+            matches = [match.to_dict() for match in self.matches]
+        return {"progress": self.progress(), "matches": matches}
+
+
+class TournamentManager:
+    """
+    Plays tournaments on a worker pool and reports their progress.
+
+    A tournament is played by the process that created it. Without a Redis client
+    only that process can report it. With one, each update is also written to
+    Redis as the JSON of Tournament.snapshot(), so any worker process can report
+    any tournament; `max_tournaments` is then checked across every worker, and
+    workers creating tournaments at the same moment may overshoot it slightly.
+    A tournament whose worker died stays 'running' until its progress expires,
+    `ttl` seconds after its last update.
+
+    Attributes:
+        max_workers (int): threads matches are handed to, across every tournament of this
+            process (see Tournament on why more threads do not play simulated matches faster)
+        max_tournaments (int): tournaments kept; the oldest finished ones are dropped
+        ttl (float): seconds a tournament's progress is kept in Redis after its last update
+    """
+
+    def __init__(self, max_workers: int = TOURNAMENT_WORKERS, max_tournaments: int = MAX_TOURNAMENTS,
+                 redis_client: Optional[redis.Redis] = None, ttl: float = TOURNAMENT_TTL,
+                 prefix: str = "trivia:tournament"):
+        self.max_workers = max_workers
+        self.max_tournaments = max_tournaments
+        self.ttl = ttl
+        self._redis = redis_client
+        self._prefix = prefix
+        self._index = f"{prefix}s"
+        self._tournaments: dict[str, Tournament] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _key(self, tournament_id: str) -> str:
+        return f"{self._prefix}:{tournament_id}"
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tournament")
+            return self._executor
+
+    def _publish(self, tournament: Tournament) -> None:
+        pipe = self._redis.pipeline()
+        pipe.set(self._key(tournament.id), json.dumps(tournament.snapshot()), ex=math.ceil(self.ttl))
+        pipe.zadd(self._index, {tournament.id: time.time()}, nx=True)
+        pipe.execute()
+
+    def _load(self, tournament_id: str) -> dict[str, Any]:
+        data = self._redis.get(self._key(tournament_id))
+        if data is None:
+            raise ValueError(f"Tournament {tournament_id} not found")
+        return json.loads(data)
+
+    def _make_room(self, summaries: list[dict[str, Any]]) -> Optional[str]:
+        # Returns the oldest finished tournament to drop when the limit is reached
+        if len(summaries) < self.max_tournaments:
+            return None
+        done = [t["tournament_id"] for t in summaries if t["state"] in (TOURNAMENT_FINISHED, TOURNAMENT_FAILED)]
+        if not done:
+            raise RuntimeError("Too many tournaments in progress, try again later.")
+        return done[0]
+
+    def create(self, team_ids: list[int], format: str = ROUND_ROBIN, seed: Optional[str] = None,
+               background: bool = True) -> Tournament:
+        """
+        Creates a tournament between existing teams and starts playing it.
+
+        Args:
+            team_ids (list[int]): the IDs of the teams, in seed order
+            format (str): one of FORMATS
+            seed (Optional[str]): makes the matches reproducible
+            background (bool): play in a background thread instead of before returning
+
+        Returns:
+            Tournament: the tournament
+
+        Raises:
+            ValueError: If the format is invalid, a team does not exist, or there are fewer than two teams.
+            RuntimeError: If too many tournaments are still running.
+        """
+        teams = [get_team_by_id(team_id) for team_id in team_ids]
+        tournament = Tournament(teams, format, seed)
+
+        if self._redis is not None:
+            dropped = self._make_room(self.list())
+            if dropped is not None:
+                pipe = self._redis.pipeline()
+                pipe.delete(self._key(dropped))
+                pipe.zrem(self._index, dropped)
+                pipe.execute()
+            tournament.on_update = self._publish
+            self._publish(tournament)
+
+        with self._lock:
+            if self._redis is not None:
+                # This process only holds the tournaments it is still playing
+                for done in [t.id for t in self._tournaments.values()
+                             if t.state in (TOURNAMENT_FINISHED, TOURNAMENT_FAILED)]:
+                    del self._tournaments[done]
+            else:
+                dropped = self._make_room([{"tournament_id": t.id, "state": t.state}
+                                           for t in self._tournaments.values()])
+                if dropped is not None:
+                    del self._tournaments[dropped]
+            self._tournaments[tournament.id] = tournament
+
+        executor = self._get_executor()
+        if background:
+            threading.Thread(target=tournament.run, args=(executor,), name=f"tournament-{tournament.id}",
+                             daemon=True).start()
+        else:
+            tournament.run(executor)
+        return tournament
+
+    def get(self, tournament_id: str) -> Tournament:
+        """
+        Returns a tournament played by this process, by its ID.
+
+        Raises:
+            ValueError: If this process has no tournament with the given ID.
+        """
+        with self._lock:
+            tournament = self._tournaments.get(tournament_id)
+        if tournament is None:
+            raise ValueError(f"Tournament {tournament_id} not found")
+        return tournament
+
+    def progress(self, tournament_id: str) -> dict[str, Any]:
+        """
+        Returns a tournament's progress, as reported by Tournament.progress().
+
+        Raises:
+            ValueError: If there is no tournament with the given ID.
+        """
+        if self._redis is not None:
+            return self._load(tournament_id)["progress"]
+        return self.get(tournament_id).progress()
+
+    def matches(self, tournament_id: str) -> list[dict[str, Any]]:
+        """
+        Returns every match of a tournament played so far.
+
+        Raises:
+            ValueError: If there is no tournament with the given ID.
+        """
+        if self._redis is not None:
+            return self._load(tournament_id)["matches"]
+        tournament = self.get(tournament_id)
+        with tournament._lock:
+            return [match.to_dict() for match in tournament.matches]
+
+    def list(self) -> list[dict[str, Any]]:
+        """
+        Returns the ID, format and state of every tournament, oldest first.
+        """
+        if self._redis is None:
+            with self._lock:
+                tournaments = list(self._tournaments.values())
+            return [{"tournament_id": t.id, "format": t.format, "state": t.state} for t in tournaments]
+
+        ids = [tournament_id.decode() if isinstance(tournament_id, bytes) else tournament_id
+               for tournament_id in self._redis.zrange(self._index, 0, -1)]
+        if not ids:
+            return []
+        summaries, expired = [], []
+        for tournament_id, data in zip(ids, self._redis.mget([self._key(i) for i in ids])):
+            if data is None:
+                expired.append(tournament_id)
+                continue
+            progress = json.loads(data)["progress"]
+            summaries.append({"tournament_id": tournament_id, "format": progress["format"],
+                              "state": progress["state"]})
+        if expired:
+            self._redis.zrem(self._index, *expired)
+        return summaries
+
+
+def create_tournament_manager(store: str = TOURNAMENT_STORE, redis_client: Optional[redis.Redis] = None,
+                              **kwargs) -> TournamentManager:
+    """
+    Creates the manager that plays and reports tournaments.
+
+    Args:
+        store (str): 'memory' to report tournaments from the process playing them,
+            'redis' to report them from every worker process
+        redis_client (Optional[redis.Redis]): the client the 'redis' store uses
+        **kwargs: max_workers, max_tournaments and ttl
+
+    Returns:
+        TournamentManager: the manager
+
+    Raises:
+        ValueError: If the store is unknown, or 'redis' is asked for without a client.
+    """
+    if store == "memory":
+        return TournamentManager(**kwargs)
+    if store == "redis":
+        if redis_client is None:
+            raise ValueError("The redis tournament store needs a Redis client")
+        logger.info("Keeping tournament progress in Redis")
+        return TournamentManager(redis_client=redis_client, **kwargs)
+    raise ValueError(f"Unknown tournament store: {store}")
@@ -0,0 +1,85 @@
+import logging
+import threading
+import time
+from typing import Callable
+
+from trivia_game.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class CircuitBreaker:
+    """
+    Stops calling an upstream service after repeated failures.
+
+    After `failure_threshold` consecutive failures the breaker opens and `allow()`
+    refuses calls for `cooldown` seconds. After that a single trial call is let
+    through (half-open): success closes the breaker, failure opens it again.
+
+    Attributes:
+        name (str): the upstream service, used in log messages
+        failure_threshold (int): consecutive failures that open the breaker
+        cooldown (float): seconds the breaker stays open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown: float = 60,
+                 clock: Callable[[], float] = time.monotonic):
+        if failure_threshold < 1 or cooldown < 0:
+            raise ValueError("failure_threshold must be at least 1 and cooldown must not be negative.")
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Returns whether a call may be made now.
+
+        Returns:
+            bool: False while the breaker is open (or a half-open trial call is in flight)
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.cooldown:
+                self._state = self.HALF_OPEN
+                logger.info("Circuit for %s is half-open, trying one call", self.name)
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """
+        Records a successful call, closing the breaker.
+        """
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Circuit for %s closed", self.name)
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        """
+        Records a failed call, opening the breaker once the threshold is reached.
+        """
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning("Circuit for %s opened after %d failures", self.name, self._failures)
+                self._state = self.OPEN
+                self._opened_at = self._clock()
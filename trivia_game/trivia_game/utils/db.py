@@ -1,3 +1,28 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
-db = SQLAlchemy()
\ No newline at end of file
+from trivia_game.utils.tracing import finish_span, start_span
+
+db = SQLAlchemy()
+
+
+# Within a traced request, every SQLAlchemy statement is recorded as a span
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_span(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("trace_spans", []).append(start_span("sqlalchemy", statement=statement[:200]))
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _finish_query_span(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans:
+        finish_span(spans.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _fail_query_span(exception_context):
+    conn = exception_context.connection
+    spans = conn.info.get("trace_spans") if conn is not None else None
+    if spans:
+        finish_span(spans.pop(), error=type(exception_context.original_exception).__name__)
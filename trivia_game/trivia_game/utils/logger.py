@@ -1,26 +1,243 @@
+import atexit
+from datetime import datetime, timezone
+import json
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import os
+import queue
 import sys
+import threading
+import time
+from typing import Callable, Optional
 
-from flask import current_app, has_request_context
 
+__all__ = [
+    "JsonFormatter", "RateLimitFilter", "configure_logger", "hold_listener", "level_for", "set_log_format",
+    "set_log_levels", "start_listener", "stop_listener"
+]
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG")
+# Per-module levels, e.g. "trivia_game.utils.sql_utils=WARNING,trivia_game.models=INFO"
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # 'text' or 'json'
+# Records per second each distinct DEBUG/INFO message may log before it is throttled; 0 disables
+LOG_RATE_LIMIT = float(os.getenv("LOG_RATE_LIMIT", 10))
+LOG_RATE_BURST = float(os.getenv("LOG_RATE_BURST", 20))
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats each record as one JSON object per line.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Throttles log lines that repeat too often, such as a log call on a hot path.
+
+    Each distinct message (logger and format string) gets its own token bucket, so
+    a rare message is never drowned out by a frequent one. Warnings and errors are
+    always let through. The next line of a throttled message reports how many were
+    dropped.
+
+    Attributes:
+        rate (float): records per second allowed for each message
+        burst (float): records allowed at once before throttling starts
+    """
+
+    def __init__(self, rate: float = LOG_RATE_LIMIT, burst: float = LOG_RATE_BURST,
+                 clock: Callable[[], float] = time.monotonic):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (logger, format string) -> [tokens, last update, records dropped]
+        self._buckets: dict[tuple[str, str], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate <= 0:
+            return True
+        key = (record.name, str(record.msg))
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            dropped, bucket[2] = bucket[2], 0
+        if dropped:
+            record.msg = f"{record.msg} ({dropped} similar messages suppressed)"
+        return True
+
+
+class _QueueHandler(QueueHandler):
+    """
+    Hands records to the background writer with their message already rendered.
+
+    The exception traceback is kept apart from the message, so the JSON formatter
+    can still put it in its own field. The writer is started by the first record a
+    process logs; while it is held back, records are written in the calling thread.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if _listener_pid != os.getpid():
+            if _inline:
+                _stream_handler.handle(record)
+                return
+            start_listener()
+        super().emit(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _parse_levels(spec: str) -> dict[str, int]:
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = logging.getLevelName(level.strip().upper())
+    return levels
 
-def configure_logger(logger):
-    logger.setLevel(logging.DEBUG)  # Set the desired logging level here
 
-    # Create a console handler that logs to stderr
-    handler = logging.StreamHandler(sys.stderr)
-    handler.setLevel(logging.DEBUG)
+_lock = threading.Lock()
+_default_level = logging.getLevelName(LOG_LEVEL.upper())
+_module_levels = _parse_levels(LOG_LEVELS)
+_configured: list[logging.Logger] = []
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_queue_handler = _QueueHandler(_queue)
+_queue_handler.addFilter(RateLimitFilter())
+_stream_handler = logging.StreamHandler(sys.stderr)
+_listener: Optional[QueueListener] = None
+_listener_pid: Optional[int] = None
+# Write records in the calling thread instead of starting the writer
+_inline = False
 
-    # Create a formatter with a timestamp
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-    # Add the formatter to the handler
-    handler.setFormatter(formatter)
+def set_log_format(log_format: str) -> None:
+    """
+    Switches the output between 'text' and 'json' lines.
+    """
+    _stream_handler.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+
+
+def level_for(name: str) -> int:
+    """
+    Returns the level configured for a logger: that of its closest configured package, or LOG_LEVEL.
+    """
+    while name:
+        if name in _module_levels:
+            return _module_levels[name]
+        name = name.rpartition(".")[0]
+    return _default_level
+
+
+def set_log_levels(default: Optional[str] = None, levels: Optional[str] = None) -> None:
+    """
+    Changes the default and per-module levels of every configured logger.
+
+    Args:
+        default (Optional[str]): the default level, e.g. 'INFO'
+        levels (Optional[str]): per-module levels, e.g. 'trivia_game.utils.sql_utils=WARNING'
+    """
+    global _default_level, _module_levels
+    with _lock:
+        if default:
+            _default_level = logging.getLevelName(default.upper())
+        if levels is not None:
+            _module_levels = _parse_levels(levels)
+        for logger in _configured:
+            logger.setLevel(level_for(logger.name))
+
+
+def hold_listener() -> None:
+    """
+    Keeps this process from starting the background writer until start_listener() is called.
+
+    Called in a pre-fork master, which must not hold threads when it forks the workers;
+    its records are written in the calling thread instead.
+    """
+    global _inline
+    _inline = True
+
+
+def start_listener() -> None:
+    """
+    Starts the background thread that writes queued records, once per process.
+
+    A forked worker inherits the queue but not the thread, so it starts its own.
+    """
+    global _listener, _listener_pid, _inline
+    with _lock:
+        if _listener is not None and _listener_pid == os.getpid():
+            return
+        _listener = QueueListener(_queue, _stream_handler, respect_handler_level=True)
+        _listener.start()
+        _listener_pid = os.getpid()
+        _inline = False
+
+
+def stop_listener() -> None:
+    """
+    Writes every queued record and stops the background writer.
+
+    Records logged afterwards, e.g. while the interpreter shuts down, are written in the calling thread.
+    """
+    global _listener, _listener_pid, _inline
+    with _lock:
+        listener, _listener = _listener, None
+        pid, _listener_pid = _listener_pid, None
+        _inline = True
+    if listener is not None and pid == os.getpid():
+        listener.stop()
+
+
+atexit.register(stop_listener)
+set_log_format(LOG_FORMAT)
+
+
+def configure_logger(logger):
+    """
+    Routes a logger through the shared, non-blocking logging pipeline.
 
-    # Add the handler to the logger
-    logger.addHandler(handler)
+    The logger gets its configured level and the shared queue handler; the record
+    is formatted and written by a background thread, so a log call only costs an
+    enqueue. Calling this again for the same logger changes nothing. No thread is
+    started here: modules call this at import, possibly in a pre-fork master.
 
-    if has_request_context():
-        app_logger = current_app.logger
-        for handler in app_logger.handlers:
-            logger.addHandler(handler)
\ No newline at end of file
+    Args:
+        logger (logging.Logger): the logger to configure
+    """
+    with _lock:
+        logger.setLevel(level_for(logger.name))
+        if _queue_handler not in logger.handlers:
+            logger.addHandler(_queue_handler)
+        if logger not in _configured:
+            _configured.append(logger)
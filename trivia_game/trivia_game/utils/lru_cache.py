@@ -0,0 +1,122 @@
+from collections import OrderedDict
+import logging
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+from trivia_game.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class LRUCache:
+    """
+    A thread-safe, in-process cache with a maximum size and a time-to-live.
+
+    When the cache is full the least recently used entry is evicted. Expired
+    entries are dropped when they are next looked up. The cache is local to the
+    process, so with several worker processes a change made through one of them is
+    seen by the others once their entry expires.
+
+    Attributes:
+        name (str): the cache's name, used in stats and log messages
+        max_entries (int): the maximum number of entries kept
+        ttl (float): seconds an entry is kept, unless set with its own TTL
+    """
+
+    def __init__(self, name: str, max_entries: int = 1024, ttl: float = 60,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_entries < 1 or ttl <= 0:
+            raise ValueError("max_entries and ttl must be positive.")
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """
+        Looks a key up.
+
+        Args:
+            key (Hashable): the key
+
+        Returns:
+            tuple[bool, Any]: whether the key was found, and its value (which may be None)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() >= entry[1]:
+                del self._entries[key]
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return True, entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Stores a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (Hashable): the key
+            value (Any): the value, which may be None
+            ttl (Optional[float]): seconds to keep this entry, instead of the cache's TTL
+        """
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """
+        Drops keys from the cache.
+        """
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drops every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+        logger.debug("Cleared the %s cache", self.name)
+
+    def stats(self) -> dict:
+        """
+        Returns the cache's metrics.
+
+        Returns:
+            dict: size, hits, misses, the hit rate, evictions and expirations
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations
+            }
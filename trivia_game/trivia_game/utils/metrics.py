@@ -0,0 +1,365 @@
+from bisect import bisect_left
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from trivia_game.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# A pre-fork server sets this to a directory every worker writes its metrics to, so a
+# scrape of any worker reports all of them (see WorkerMetrics); empty for one process
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_EXPORT_INTERVAL = float(os.getenv("METRICS_EXPORT_INTERVAL", 5))  # seconds between a worker's writes
+
+# Latency bucket bounds, in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# A collector returns (name, type, help, [(labels, value), ...]) families, rendered at scrape time.
+# A sample whose labels hold "__suffix__" is named after the family plus that suffix (e.g. "_bucket").
+Sample = tuple[dict, float]
+Family = tuple[str, str, str, list]
+# Collected families hold (sample name, labels, value) samples, the sample name including any suffix
+CollectedFamily = tuple[str, str, str, list[tuple[str, dict, float]]]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class Counter:
+    """
+    A monotonically increasing count, optionally split by labels.
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        with self._lock:
+            values = list(self._values.items())
+        return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in values]
+
+
+class Histogram:
+    """
+    Counts observations (usually seconds) into cumulative buckets, optionally split by labels.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # labels -> [bucket counts (the last is +Inf), sum, count]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            series = self._values.get(key)
+            return series[2] if series else 0
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        with self._lock:
+            values = [(key, list(series[0]), series[1], series[2]) for key, series in self._values.items()]
+        samples = []
+        for key, counts, total, count in values:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    The process's metrics, rendered in the Prometheus text format.
+
+    Counters and histograms are updated on the hot path with one short lock. State
+    that components already track (pool sizes, cache hits, ...) is not copied into
+    the registry: collectors read it only when the metrics are scraped.
+    """
+
+    def __init__(self, namespace: str = "trivia"):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._metrics: dict[str, object] = {}
+        self._collectors: list[Callable[[], Iterable[Family]]] = []
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        """
+        Returns the counter with the given name, creating it on first use.
+        """
+        return self._register(Counter(f"{self.namespace}_{name}", help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        """
+        Returns the histogram with the given name, creating it on first use.
+        """
+        return self._register(Histogram(f"{self.namespace}_{name}", help, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        """
+        Adds a function called at scrape time that returns metric families.
+
+        Args:
+            collector (Callable): returns (name, type, help, [(labels, value), ...]) tuples;
+                names are prefixed with the namespace
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def register_stats(self, component: str, stats: Callable[[], dict], labels: Optional[dict] = None) -> None:
+        """
+        Exposes every numeric field of a component's stats() as a gauge.
+
+        Args:
+            component (str): the metric name prefix, e.g. 'team_cache'
+            stats (Callable): returns the component's stats dictionary
+            labels (Optional[dict]): labels added to every sample
+        """
+        def collect() -> list[Family]:
+            families = []
+            for key, value in stats().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                families.append((f"{component}_{key}", "gauge", f"{component} {key.replace('_', ' ')}",
+                                 [(dict(labels or {}), value)]))
+            return families
+        self.register_collector(collect)
+
+    def collect(self, extra_collectors: Iterable[Callable[[], Iterable[Family]]] = ()) -> list[CollectedFamily]:
+        """
+        Reads every metric and runs every collector.
+
+        Args:
+            extra_collectors (Iterable[Callable]): collectors used for this scrape only,
+                e.g. for state owned by one app instance
+
+        Returns:
+            list: (name, type, help, [(sample name, labels, value), ...]) per family
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = self._collectors + list(extra_collectors)
+
+        families: dict[str, tuple[str, str, list]] = {}
+        for metric in metrics:
+            families[metric.name] = (metric.type, metric.help, metric.samples())
+
+        # Collectors may report the same family (e.g. one per host); they are merged into one
+        for collector in collectors:
+            try:
+                collected = list(collector())
+            except Exception as e:
+                logger.warning("Metrics collector failed: %s", str(e))
+                continue
+            for name, metric_type, help, samples in collected:
+                name = f"{self.namespace}_{name}"
+                family = families.setdefault(name, (metric_type, help, []))
+                for labels, value in samples:
+                    labels = dict(labels)
+                    suffix = labels.pop("__suffix__", "")
+                    family[2].append((f"{name}{suffix}", labels, value))
+        return [(name, metric_type, help, samples) for name, (metric_type, help, samples) in families.items()]
+
+    def render(self, extra_collectors: Iterable[Callable[[], Iterable[Family]]] = ()) -> str:
+        """
+        Returns every metric in the Prometheus text exposition format.
+
+        Args:
+            extra_collectors (Iterable[Callable]): collectors used for this scrape only,
+                e.g. for state owned by one app instance
+        """
+        return format_families(self.collect(extra_collectors))
+
+
+def format_families(families: Iterable[CollectedFamily]) -> str:
+    """
+    Returns collected families in the Prometheus text exposition format.
+    """
+    lines = []
+    for name, metric_type, help, samples in families:
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for sample_name, labels, value in samples:
+            lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class WorkerMetrics:
+    """
+    Reports the metrics of every worker of a pre-fork server, whichever worker is scraped.
+
+    Each worker writes its metrics to `<directory>/<pid>.json` every `interval`
+    seconds and once more when it exits. A scrape merges the scraped worker's live
+    metrics with the other workers' files. Counters and histograms are summed, and
+    keep the counts of workers that have exited, so they never go backwards.
+    Gauges describe one process, so they get a `pid` label and are only reported
+    for workers still running (a file not rewritten for three intervals counts as
+    a dead worker). Other workers' values are up to `interval` seconds old.
+
+    Attributes:
+        registry (MetricsRegistry): the metrics of this process
+        directory (str): where the workers' files are kept
+        interval (float): seconds between a worker's writes
+    """
+
+    def __init__(self, registry: MetricsRegistry, directory: str, interval: float = METRICS_EXPORT_INTERVAL,
+                 extra_collectors: Iterable[Callable[[], Iterable[Family]]] = ()):
+        self.registry = registry
+        self.directory = directory
+        self.interval = interval
+        self.extra_collectors = list(extra_collectors)
+        self._stop = threading.Event()
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"{pid}.json")
+
+    def write(self, alive: bool = True) -> None:
+        """
+        Writes this worker's metrics to its file, replacing it atomically.
+        """
+        path = self._path(os.getpid())
+        data = {"alive": alive, "families": self.registry.collect(self.extra_collectors)}
+        with open(f"{path}.tmp", "w", encoding="utf-8") as fh:
+            json.dump(data, fh)
+        os.replace(f"{path}.tmp", path)
+
+    def start(self) -> None:
+        """
+        Writes this worker's metrics now and then every interval, from a background thread.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self._stop = threading.Event()
+        self.write()
+        threading.Thread(target=self._write_forever, args=(self._stop,), name="metrics-writer", daemon=True).start()
+
+    def stop(self) -> None:
+        """
+        Stops the writes and marks this worker as exited.
+        """
+        self._stop.set()
+        self.write(alive=False)
+
+    def _write_forever(self, stop: threading.Event) -> None:
+        while not stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                logger.warning("Could not write worker metrics: %s", str(e))
+
+    def _read_workers(self) -> list[tuple[int, bool, list]]:
+        workers = []
+        stale = time.time() - 3 * self.interval
+        try:
+            names = sorted(os.listdir(self.directory))
+        except FileNotFoundError:
+            return workers
+        for name in names:
+            pid, ext = os.path.splitext(name)
+            if ext != ".json" or not pid.isdigit() or int(pid) == os.getpid():
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    data = json.load(fh)
+                alive = data["alive"] and os.path.getmtime(path) > stale
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("Could not read the metrics of worker %s: %s", pid, str(e))
+                continue
+            workers.append((int(pid), alive, data["families"]))
+        return workers
+
+    def render(self) -> str:
+        """
+        Returns the metrics of every worker in the Prometheus text exposition format.
+        """
+        workers = [(os.getpid(), True, self.registry.collect(self.extra_collectors))] + self._read_workers()
+        merged: dict[str, tuple[str, str, dict]] = {}
+        for pid, alive, families in workers:
+            for name, metric_type, help, samples in families:
+                per_worker = metric_type not in ("counter", "histogram")
+                if per_worker and not alive:
+                    continue
+                family = merged.setdefault(name, (metric_type, help, {}))
+                for sample_name, labels, value in samples:
+                    if per_worker:
+                        labels = {**labels, "pid": str(pid)}
+                    key = (sample_name, tuple(sorted(labels.items())))
+                    entry = family[2].get(key)
+                    if entry is None:
+                        family[2][key] = [labels, value]
+                    else:
+                        entry[1] += value
+        return format_families(
+            (name, metric_type, help, [(key[0], labels, value) for key, (labels, value) in samples.items()])
+            for name, (metric_type, help, samples) in merged.items()
+        )
+
+
+metrics = MetricsRegistry()
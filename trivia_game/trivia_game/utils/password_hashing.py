@@ -0,0 +1,196 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import hmac
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from trivia_game.utils.logger import configure_logger
+from trivia_game.utils.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# scrypt work factor: memory use is 128 * N * r bytes (16 MiB with the defaults)
+PASSWORD_SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", 2 ** 14))
+PASSWORD_SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", 8))
+PASSWORD_SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", 1))
+PASSWORD_HASH_LENGTH = 32  # bytes
+
+# hashlib.scrypt releases the GIL, so hashing threads run in parallel
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+# Hashes allowed to wait for a worker before new ones are turned away
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", 32))
+PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", 10))  # seconds
+
+SCRYPT_PREFIX = "scrypt"
+
+
+def hash_password(password: str, salt: str, n: int = PASSWORD_SCRYPT_N,
+                  r: int = PASSWORD_SCRYPT_R, p: int = PASSWORD_SCRYPT_P) -> str:
+    """
+    Hashes a password with scrypt.
+
+    The parameters are stored with the hash, so the cost can be raised later without
+    breaking existing passwords.
+
+    Args:
+        password (str): the password
+        salt (str): the salt, in hex
+        n (int): the CPU/memory cost, a power of 2
+        r (int): the block size
+        p (int): the parallelization factor
+
+    Returns:
+        str: the hash, formatted as 'scrypt$n$r$p$<hex digest>'
+    """
+    digest = hashlib.scrypt(
+        password.encode(), salt=bytes.fromhex(salt), n=n, r=r, p=p,
+        maxmem=256 * n * r * p, dklen=PASSWORD_HASH_LENGTH
+    )
+    return f"{SCRYPT_PREFIX}${n}${r}${p}${digest.hex()}"
+
+
+def _legacy_hash(password: str, salt: str) -> str:
+    return hashlib.sha256((password + salt).encode()).hexdigest()
+
+
+def verify_password(password: str, salt: str, stored: str) -> bool:
+    """
+    Checks a password against a stored scrypt hash or a legacy salted SHA-256 hash.
+
+    Args:
+        password (str): the password to check
+        salt (str): the salt, in hex
+        stored (str): the stored hash
+
+    Returns:
+        bool: True if the password matches
+    """
+    if stored.startswith(SCRYPT_PREFIX + "$"):
+        try:
+            _, n, r, p, _digest = stored.split("$")
+            candidate = hash_password(password, salt, int(n), int(r), int(p))
+        except ValueError:
+            logger.error("Malformed password hash")
+            return False
+    else:
+        candidate = _legacy_hash(password, salt)
+    return hmac.compare_digest(candidate, stored)
+
+
+def needs_rehash(stored: str) -> bool:
+    """
+    Returns whether a stored hash is legacy SHA-256 or uses an outdated scrypt cost.
+
+    Args:
+        stored (str): the stored hash
+
+    Returns:
+        bool: True if the hash should be replaced the next time the password is known
+    """
+    return not stored.startswith(f"{SCRYPT_PREFIX}${PASSWORD_SCRYPT_N}${PASSWORD_SCRYPT_R}${PASSWORD_SCRYPT_P}$")
+
+
+class HashingPool:
+    """
+    A bounded thread pool for password hashing.
+
+    At most `max_workers` hashes run at once and at most `max_queue` wait behind
+    them. Further requests are rejected straight away, so a credential-stuffing
+    burst is turned away cheaply instead of queueing up CPU work without limit.
+
+    Attributes:
+        max_workers (int): hashes computed at once
+        max_queue (int): hashes allowed to wait for a worker
+    """
+
+    def __init__(self, max_workers: int = PASSWORD_HASH_WORKERS, max_queue: int = PASSWORD_HASH_QUEUE_LIMIT):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+
+        self._completed = 0
+        self._rejected = 0
+        self._max_queue_depth = 0
+        self._queue_seconds = 0.0
+        self._hash_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created lazily so a forked worker process gets its own threads
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    def run(self, fn: Callable[..., Any], *args, timeout: float = PASSWORD_HASH_TIMEOUT) -> Any:
+        """
+        Runs a hashing function on the pool and waits for its result.
+
+        Args:
+            fn (Callable): the function, e.g. hash_password or verify_password
+            *args: its arguments
+            timeout (float): seconds to wait for the result
+
+        Returns:
+            Any: the function's result
+
+        Raises:
+            RuntimeError: If the queue is full.
+            concurrent.futures.TimeoutError: If the result is not ready within the timeout.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                logger.warning("Password hashing queue is full, rejecting request")
+                raise RuntimeError("Too many login attempts in progress, try again later.")
+            self._pending += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._pending - self.max_workers)
+            executor = self._get_executor()
+        submitted = time.monotonic()
+
+        def task():
+            started = time.monotonic()
+            with self._lock:
+                self._running += 1
+                self._queue_seconds += started - submitted
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+                    self._completed += 1
+                    self._hash_seconds += time.monotonic() - started
+
+        return executor.submit(task).result(timeout=timeout)
+
+    def stats(self) -> dict:
+        """
+        Returns the pool's metrics.
+
+        Returns:
+            dict: running and queued hashes, the deepest queue seen, rejections and average times
+        """
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "max_queue": self.max_queue,
+                "max_queue_depth": self._max_queue_depth,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_queue_seconds": round(self._queue_seconds / self._completed, 4) if self._completed else 0.0,
+                "avg_hash_seconds": round(self._hash_seconds / self._completed, 4) if self._completed else 0.0
+            }
+
+
+hashing_pool = HashingPool()
+metrics.register_stats("password_hashing", hashing_pool.stats)
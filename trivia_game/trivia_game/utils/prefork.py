@@ -0,0 +1,85 @@
+import logging
+from typing import Callable
+
+from trivia_game.utils.logger import configure_logger, hold_listener, start_listener, stop_listener
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# A pre-fork server (see gunicorn.conf.py) builds the app once in its master process
+# and forks the workers from it. Threads do not survive a fork and inherited sockets
+# must not be shared, so anything of that kind is set up again in each worker:
+#   - per-process registries (sqlite pools, HTTP clients) and redis-py's connection
+#     pool notice the new pid on their own;
+#   - MongoClient connects lazily, on its first operation in the worker;
+#   - everything else registers a hook here.
+_after_fork_hooks: list[Callable[[], None]] = []
+_worker_start_hooks: list[Callable[[], None]] = []
+_worker_exit_hooks: list[Callable[[], None]] = []
+_deferred = False
+
+
+def defer_worker_start() -> None:
+    """
+    Holds background work back until start_worker() is called in each forked worker.
+
+    Called by the server's config before the app is loaded, so the master process
+    starts no threads (not even the log writer) and makes no network calls.
+    """
+    global _deferred
+    _deferred = True
+    hold_listener()
+
+
+def after_fork(hook: Callable[[], None]) -> None:
+    """
+    Registers a hook that resets inherited state (e.g. pooled connections) in each forked worker.
+    """
+    _after_fork_hooks.append(hook)
+
+
+def on_worker_start(hook: Callable[[], None]) -> None:
+    """
+    Registers a hook that starts background work, such as a refresh thread.
+
+    The hook runs right away in a process that serves requests itself, or in each
+    worker once it has been forked if defer_worker_start() was called.
+    """
+    _worker_start_hooks.append(hook)
+    if not _deferred:
+        hook()
+
+
+def on_worker_exit(hook: Callable[[], None]) -> None:
+    """
+    Registers a hook that runs when a worker shuts down, e.g. to flush buffered writes.
+    """
+    _worker_exit_hooks.append(hook)
+
+
+def _run(hooks: list[Callable[[], None]], stage: str) -> None:
+    for hook in list(hooks):
+        try:
+            hook()
+        except Exception:
+            logger.exception("Worker %s hook %s failed", stage, getattr(hook, "__qualname__", hook))
+
+
+def start_worker() -> None:
+    """
+    Sets a freshly forked worker up: its own log writer, then the after-fork and worker-start hooks.
+    """
+    start_listener()
+    _run(_after_fork_hooks, "after-fork")
+    _run(_worker_start_hooks, "start")
+    logger.info("Worker started")
+
+
+def stop_worker() -> None:
+    """
+    Runs the worker-exit hooks and writes the last log lines.
+    """
+    _run(_worker_exit_hooks, "exit")
+    stop_listener()
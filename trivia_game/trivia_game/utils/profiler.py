@@ -0,0 +1,204 @@
+from collections import Counter
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from types import CodeType, FrameType
+from typing import Optional
+
+from trivia_game.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# The profiler is opt-in: /api/admin/profile answers 404 unless this is set
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "false").lower() in ("1", "true", "yes")
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", 60))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", 0.005))  # seconds between samples (200 Hz)
+PROFILE_TRACEMALLOC_FRAMES = int(os.getenv("PROFILE_TRACEMALLOC_FRAMES", 10))
+
+# Leaf frames of a thread parked on a lock, queue or socket accept; such samples are idle time, not work
+_IDLE_MODULES = {"threading", "queue", "selectors", "socket", "socketserver", "concurrent.futures.thread"}
+_IDLE_FUNCTIONS = {"wait", "get", "select", "poll", "accept", "_wait_for_tstate_lock"}
+
+# Only one profile runs at a time; a second one would sample the first
+_profile_lock = threading.Lock()
+
+
+class SamplingProfiler:
+    """
+    Samples every thread's Python stack at a fixed interval, from a background thread.
+
+    Stacks are read with sys._current_frames(), so request threads are sampled
+    too (a signal-based profiler only sees the main thread), and nothing runs in
+    the profiled threads themselves. While no profiler is started there is no
+    thread and no hook, so the cost is nil.
+
+    Attributes:
+        interval (float): seconds between samples
+        include_idle (bool): also count threads parked on a lock, queue or socket
+        stacks (Counter): samples per collapsed stack
+        samples (int): sampling passes taken
+        idle_samples (int): thread stacks skipped as idle
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self._labels: dict[CodeType, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise RuntimeError("Profiler already started")
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(skip=own)
+
+    def _label(self, frame: FrameType) -> str:
+        code = frame.f_code
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)
+            label = self._labels[code] = f"{frame.f_globals.get('__name__', '?')}:{name}"
+        return label
+
+    def _is_idle(self, frame: FrameType) -> bool:
+        return frame.f_globals.get("__name__") in _IDLE_MODULES and frame.f_code.co_name in _IDLE_FUNCTIONS
+
+    def sample(self, skip: Optional[int] = None) -> None:
+        """
+        Records the current stack of every thread but the one given.
+        """
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == skip:
+                continue
+            if not self.include_idle and self._is_idle(frame):
+                self.idle_samples += 1
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._label(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, str(ident)))
+            stack.reverse()
+            self.stacks[";".join(stack)] += 1
+        self.samples += 1
+
+    def collapsed(self) -> str:
+        """
+        Returns the samples in the collapsed-stack format read by flamegraph.pl, speedscope and friends.
+
+        Returns:
+            str: one 'thread;outer frame;...;leaf frame count' line per distinct stack
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+
+def _check_duration(seconds: float) -> float:
+    if not 0 < seconds <= PROFILE_MAX_SECONDS:
+        raise ValueError(f"Profile duration must be between 0 and {PROFILE_MAX_SECONDS:g} seconds")
+    return seconds
+
+
+def profile_cpu(seconds: float, interval: float = PROFILE_INTERVAL, include_idle: bool = False) -> SamplingProfiler:
+    """
+    Samples every thread's stack for the given number of seconds.
+
+    Args:
+        seconds (float): how long to sample
+        interval (float): seconds between samples
+        include_idle (bool): also count threads parked on a lock, queue or socket
+
+    Returns:
+        SamplingProfiler: the stopped profiler, holding the samples
+
+    Raises:
+        ValueError: If the duration or interval is out of range.
+        RuntimeError: If another profile is already running.
+    """
+    _check_duration(seconds)
+    if not 0 < interval <= seconds:
+        raise ValueError("Sampling interval must be positive and shorter than the profile")
+    if not _profile_lock.acquire(blocking=False):
+        raise RuntimeError("A profile is already running")
+    try:
+        logger.info("Sampling stacks for %.1fs every %.3fs", seconds, interval)
+        profiler = SamplingProfiler(interval, include_idle)
+        profiler.start()
+        try:
+            time.sleep(seconds)
+        finally:
+            profiler.stop()
+        logger.info("Took %d samples (%d distinct stacks)", profiler.samples, len(profiler.stacks))
+        return profiler
+    finally:
+        _profile_lock.release()
+
+
+def profile_memory(seconds: float, top: int = 25) -> list[dict]:
+    """
+    Compares two tracemalloc snapshots taken the given number of seconds apart.
+
+    Memory still held at the second snapshot, grouped by allocation traceback, shows
+    what grew in the meantime, e.g. GameModel state or caches that are never trimmed.
+    Tracing is started for the window only, unless it was already on.
+
+    Args:
+        seconds (float): the time between snapshots
+        top (int): how many of the largest growths to return
+
+    Returns:
+        list[dict]: size and count differences with the allocating traceback, largest first
+
+    Raises:
+        ValueError: If the duration is out of range.
+        RuntimeError: If another profile is already running.
+    """
+    _check_duration(seconds)
+    if not _profile_lock.acquire(blocking=False):
+        raise RuntimeError("A profile is already running")
+    started = not tracemalloc.is_tracing()
+    try:
+        if started:
+            tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+        logger.info("Diffing tracemalloc snapshots %.1fs apart", seconds)
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__),
+                  tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+        before = tracemalloc.take_snapshot().filter_traces(ignore)
+        time.sleep(seconds)
+        after = tracemalloc.take_snapshot().filter_traces(ignore)
+    finally:
+        if started:
+            tracemalloc.stop()
+        _profile_lock.release()
+
+    growth = [stat for stat in after.compare_to(before, "traceback") if stat.size_diff > 0]
+    return [
+        {
+            "size_diff": stat.size_diff,
+            "count_diff": stat.count_diff,
+            "size": stat.size,
+            "count": stat.count,
+            "traceback": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback]
+        }
+        for stat in growth[:top]
+    ]
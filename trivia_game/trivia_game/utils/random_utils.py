@@ -1,33 +1,62 @@
+from collections import deque
 import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Optional
+
 import requests
 
-from utils.logger import configure_logger
+from trivia_game.clients.http_client import http_get
+from trivia_game.utils.logger import configure_logger
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
-def get_random() -> float:
-    url = "https://www.random.org/decimal-fractions/?num=1&dec=2&col=1&format=plain&rnd=new"
+# 'system' (the OS's CSPRNG), 'seeded' (deterministic, for replays) or 'random.org'
+RANDOM_PROVIDER = os.getenv("RANDOM_PROVIDER", "system")
+RANDOM_SEED = os.getenv("RANDOM_SEED", "0")
+
+RANDOM_ORG_URL = "https://www.random.org/decimal-fractions/"
+RANDOM_ORG_BATCH_SIZE = int(os.getenv("RANDOM_ORG_BATCH_SIZE", 1000))  # the most random.org serves per request
+RANDOM_ORG_LOW_WATER = int(os.getenv("RANDOM_ORG_LOW_WATER", 200))  # refill once the buffer falls below this
+# After a failed refill (random.org down or out of quota), how long to draw locally before trying again
+RANDOM_ORG_RETRY_AFTER = float(os.getenv("RANDOM_ORG_RETRY_AFTER", 60))
+
+
+def fetch_random_org(num: int = RANDOM_ORG_BATCH_SIZE) -> list[float]:
+    """
+    Fetches a batch of random fractions from random.org.
 
+    Args:
+        num (int): how many numbers to fetch (at most 10,000)
+
+    Returns:
+        list[float]: numbers in [0, 1)
+
+    Raises:
+        RuntimeError: If the request fails or times out.
+        ValueError: If random.org answers with something that is not a list of numbers.
+    """
+    params = {"num": num, "dec": 10, "col": 1, "format": "plain", "rnd": "new"}
     try:
         # Log the request to random.org
-        logger.info("Fetching random number from %s", url)
+        logger.info("Fetching %d random numbers from random.org", num)
 
-        response = requests.get(url, timeout=5)
+        response = http_get(RANDOM_ORG_URL, params=params, timeout=5)
 
         # Check if the request was successful
         response.raise_for_status()
 
-        random_number_str = response.text.strip()
-
         try:
-            random_number = float(random_number_str)
+            numbers = [float(line) for line in response.text.split()]
         except ValueError:
-            raise ValueError("Invalid response from random.org: %s" % random_number_str)
+            raise ValueError("Invalid response from random.org: %s" % response.text[:100])
 
-        logger.info("Received random number: %.3f", random_number)
-        return random_number
+        logger.info("Received %d random numbers", len(numbers))
+        return numbers
 
     except requests.exceptions.Timeout:
         logger.error("Request to random.org timed out.")
@@ -35,4 +64,156 @@ def get_random() -> float:
 
     except requests.exceptions.RequestException as e:
         logger.error("Request to random.org failed: %s", e)
-        raise RuntimeError("Request to random.org failed: %s" % e)
\ No newline at end of file
+        raise RuntimeError("Request to random.org failed: %s" % e)
+
+
+class RandomOrgRandom(random.Random):
+    """
+    A random.Random whose numbers come from a buffer of random.org draws.
+
+    The buffer is filled in bulk by a background thread whenever it runs low, so a
+    draw never waits on the network: while the buffer is empty, numbers come from
+    the OS's CSPRNG instead. choice(), shuffle() and friends all build on random().
+    After a failed refill, no other is tried for `retry_after` seconds.
+    """
+
+    def __init__(self, batch_size: int = RANDOM_ORG_BATCH_SIZE, low_water: int = RANDOM_ORG_LOW_WATER,
+                 background: bool = True, retry_after: float = RANDOM_ORG_RETRY_AFTER,
+                 clock: Callable[[], float] = time.monotonic):
+        self.batch_size = batch_size
+        self.low_water = low_water
+        self.background = background
+        self.retry_after = retry_after
+        self._clock = clock
+        self._retry_at = 0.0
+        self._buffer: deque = deque()
+        self._fallback = random.SystemRandom()
+        self._lock = threading.Lock()
+        self._refilling = False
+
+        self._from_buffer = 0
+        self._fallbacks = 0
+        self._refills = 0
+        self._refill_failures = 0
+        super().__init__()
+
+    def seed(self, *args, **kwargs) -> None:
+        # Draws are not reproducible, so seeding is a no-op (as for SystemRandom)
+        return None
+
+    def random(self) -> float:
+        try:
+            value = self._buffer.popleft()
+            self._from_buffer += 1
+        except IndexError:
+            value = self._fallback.random()
+            self._fallbacks += 1
+        if len(self._buffer) < self.low_water:
+            self._schedule_refill()
+        return value
+
+    def _schedule_refill(self) -> None:
+        with self._lock:
+            if self._refilling or self._clock() < self._retry_at:
+                return
+            self._refilling = True
+        if self.background:
+            threading.Thread(target=self.refill, name="random-org-refill", daemon=True).start()
+        else:
+            self.refill()
+
+    def refill(self) -> int:
+        """
+        Tops the buffer up with one batch from random.org.
+
+        Returns:
+            int: the number of values added (0 if the request failed)
+        """
+        try:
+            numbers = fetch_random_org(self.batch_size)
+        except (RuntimeError, ValueError) as e:
+            logger.warning("Could not refill the random.org buffer, retrying in %ss: %s", self.retry_after, str(e))
+            with self._lock:
+                self._refill_failures += 1
+                self._retry_at = self._clock() + self.retry_after
+                self._refilling = False
+            return 0
+        # Only once the numbers are in can a draw below the low water mark schedule another refill
+        self._buffer.extend(numbers)
+        with self._lock:
+            self._refills += 1
+            self._refilling = False
+        return len(numbers)
+
+    def getstate(self):
+        raise NotImplementedError("random.org draws have no state to save")
+
+    def setstate(self, state) -> None:
+        raise NotImplementedError("random.org draws have no state to restore")
+
+    def stats(self) -> dict:
+        """
+        Returns the buffer's metrics.
+
+        Returns:
+            dict: buffered values, draws served from the buffer or the fallback, and refills
+        """
+        with self._lock:
+            return {
+                "buffered": len(self._buffer),
+                "from_buffer": self._from_buffer,
+                "fallbacks": self._fallbacks,
+                "refills": self._refills,
+                "refill_failures": self._refill_failures
+            }
+
+
+def seeded(seed: Any) -> random.Random:
+    """
+    Returns a deterministic generator, so a game drawn with the same seed can be replayed.
+
+    Args:
+        seed: any str, int or bytes seed
+
+    Returns:
+        random.Random: the generator
+    """
+    return random.Random(seed)
+
+
+def create_random_provider(name: Optional[str] = None) -> random.Random:
+    """
+    Creates the process's source of randomness.
+
+    Args:
+        name (Optional[str]): 'system', 'seeded' or 'random.org' (RANDOM_PROVIDER by default)
+
+    Returns:
+        random.Random: the provider
+
+    Raises:
+        ValueError: If the provider name is unknown.
+    """
+    name = name or RANDOM_PROVIDER
+    if name == "system":
+        return random.SystemRandom()
+    if name == "seeded":
+        logger.info("Using seeded randomness (seed %s)", RANDOM_SEED)
+        return seeded(RANDOM_SEED)
+    if name == "random.org":
+        logger.info("Using buffered random.org randomness")
+        return RandomOrgRandom()
+    raise ValueError(f"Unknown random provider: {name}")
+
+
+rng = create_random_provider()
+
+
+def get_random() -> float:
+    """
+    Returns a random number in [0, 1) from the configured provider, without a network round trip.
+
+    Returns:
+        float: the number
+    """
+    return rng.random()
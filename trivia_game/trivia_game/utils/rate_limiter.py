@@ -0,0 +1,182 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from trivia_game.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket limiting how often an upstream API is called.
+
+    Callers reserve a token with `acquire()`. When the bucket is empty the caller's
+    token is reserved from the future and the caller sleeps until it is due, so
+    concurrent callers queue up fairly instead of all retrying at once. A caller may
+    give up instead of queueing longer than `max_wait`; it then takes no token.
+
+    Attributes:
+        rate (float): tokens added per second
+        capacity (float): the maximum number of tokens (the allowed burst)
+    """
+
+    def __init__(self, rate: float, capacity: float = 1,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initializes a full bucket.
+
+        Args:
+            rate (float): tokens added per second, e.g. 0.2 for one call every 5 seconds
+            capacity (float): the maximum number of tokens
+            clock (Callable): monotonic clock, injectable for tests
+            sleep (Callable): sleep function, injectable for tests
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("Rate and capacity must be positive.")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._last = clock()
+
+        self._acquired = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._max_wait = 0.0
+        self._rejected = 0
+
+    def _reserve(self, tokens: float, max_wait: Optional[float]) -> tuple[float, bool]:
+        """
+        Takes tokens out of the bucket unless the caller would have to wait longer than `max_wait`.
+
+        Returns:
+            tuple[float, bool]: how long the caller has to wait, and whether the tokens were taken
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            left = self._tokens - tokens
+            wait = 0.0 if left >= 0 else -left / self.rate
+            if max_wait is not None and wait > max_wait:
+                return wait, False
+            self._tokens = left
+            return wait, True
+
+    def _record(self, wait: float, reserved: bool) -> None:
+        with self._lock:
+            if not reserved:
+                self._rejected += 1
+                return
+            self._acquired += 1
+            if wait > 0:
+                self._waits += 1
+                self._wait_seconds += wait
+                self._max_wait = max(self._max_wait, wait)
+
+    def acquire(self, tokens: float = 1, max_wait: Optional[float] = None) -> float:
+        """
+        Takes tokens from the bucket, sleeping only if the budget is used up.
+
+        Args:
+            tokens (float): the number of tokens to take
+            max_wait (Optional[float]): the longest the caller will sleep, or None to wait as long as needed
+
+        Returns:
+            float: the number of seconds the caller slept
+
+        Raises:
+            RuntimeError: If the tokens would not be due within `max_wait`; no token is taken.
+        """
+        wait, reserved = self._reserve(tokens, max_wait)
+        self._record(wait, reserved)
+        if not reserved:
+            logger.warning("Rate limit busy for the next %.2fs, giving up", wait)
+            raise RuntimeError(f"Rate limit busy, retry in {wait:.0f}s.")
+        if wait > 0:
+            logger.debug("Rate limit reached, waiting %.2fs", wait)
+            self._sleep(wait)
+        return wait
+
+    def stats(self) -> dict:
+        """
+        Returns the limiter's wait-time metrics.
+
+        Returns:
+            dict: acquisitions, how many of them had to wait, total/max seconds waited,
+                and how many callers gave up instead of waiting
+        """
+        with self._lock:
+            return {
+                "acquired": self._acquired,
+                "rejected": self._rejected,
+                "waits": self._waits,
+                "wait_seconds_total": round(self._wait_seconds, 3),
+                "wait_seconds_max": round(self._max_wait, 3)
+            }
+
+
+# Refill and reserve in one atomic step. Redis' clock is used so every worker
+# and host sharing the bucket agrees on the time. A negative max_wait waits as long as needed.
+_REDIS_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local max_wait = tonumber(ARGV[4])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate) - requested
+local wait = 0
+if tokens < 0 then
+    wait = -tokens / rate
+end
+if max_wait >= 0 and wait > max_wait then
+    return {0, tostring(wait)}
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 60)
+return {1, tostring(wait)}
+"""
+
+
+class RedisTokenBucket(TokenBucket):
+    """
+    A token bucket whose state lives in Redis, so the limit holds across all workers.
+
+    If Redis cannot be reached the bucket falls back to limiting the local process.
+    """
+
+    def __init__(self, redis_client, key: str, rate: float, capacity: float = 1,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            redis_client: the Redis client holding the bucket
+            key (str): the Redis key of the bucket
+            rate (float): tokens added per second
+            capacity (float): the maximum number of tokens
+        """
+        super().__init__(rate, capacity, clock, sleep)
+        self.key = key
+        self._redis = redis_client
+        self._script = redis_client.register_script(_REDIS_TOKEN_BUCKET_SCRIPT)
+
+    def _reserve(self, tokens: float, max_wait: Optional[float]) -> tuple[float, bool]:
+        try:
+            reserved, wait = self._script(keys=[self.key], args=[
+                self.rate, self.capacity, tokens, -1 if max_wait is None else max_wait
+            ])
+            return float(wait), bool(reserved)
+        except Exception as e:
+            logger.warning("Redis rate limiter unavailable, limiting locally: %s", str(e))
+            return super()._reserve(tokens, max_wait)
@@ -1,9 +1,14 @@
 from contextlib import contextmanager
 import logging
 import os
+import queue
 import sqlite3
+import threading
+import time
 
 from trivia_game.utils.logger import configure_logger
+from trivia_game.utils.metrics import metrics
+from trivia_game.utils.tracing import finish_span, start_span
 
 
 logger = logging.getLogger(__name__)
@@ -13,14 +18,211 @@ configure_logger(logger)
 # load the db path from the environment with a default value
 DB_PATH = os.getenv("DB_PATH", "/app/db/trivia_game.db")
 
+# Connection pool and pragma tuning
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 8))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))  # seconds to wait for a free connection
+DB_BUSY_TIMEOUT = float(os.getenv("DB_BUSY_TIMEOUT", 5))  # seconds sqlite waits on a locked database
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 256))  # prepared statements kept per connection
+DB_CACHE_SIZE_KIB = int(os.getenv("DB_CACHE_SIZE_KIB", 20000))
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", 256 * 1024 * 1024))
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")  # NORMAL is safe in WAL mode
+
+
+class ConnectionPool:
+    """
+    A bounded pool of sqlite connections to one database file.
+
+    Connections are opened in WAL mode, so readers no longer block the writer, and
+    are kept open between requests, so each one keeps its prepared statement cache.
+    When every connection is checked out, callers wait for one to be returned.
+
+    Attributes:
+        db_path (str): the database file
+        max_size (int): the maximum number of open connections
+        timeout (float): seconds to wait for a free connection
+    """
+
+    def __init__(self, db_path: str, max_size: int = DB_POOL_SIZE, timeout: float = DB_POOL_TIMEOUT):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+
+        self._checkouts = 0
+        self._hits = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._timeouts = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=DB_BUSY_TIMEOUT,
+            check_same_thread=False,  # the pool hands each connection to one thread at a time
+            cached_statements=DB_STATEMENT_CACHE_SIZE
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={DB_SYNCHRONOUS}")
+        conn.execute(f"PRAGMA cache_size=-{DB_CACHE_SIZE_KIB}")
+        conn.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # Set on every connection: a pragma run by a script (e.g. the schema's) would
+        # otherwise stay on whichever pooled connection ran it
+        conn.execute("PRAGMA foreign_keys=ON")
+        logger.debug("Opened pooled connection to %s", self.db_path)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Checks a connection out of the pool, opening a new one if the pool is not full.
+
+        Returns:
+            sqlite3.Connection: the connection
+
+        Raises:
+            sqlite3.OperationalError: If no connection becomes free within the timeout.
+        """
+        with self._lock:
+            self._checkouts += 1
+        try:
+            conn = self._idle.get_nowait()
+            with self._lock:
+                self._hits += 1
+            return conn
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            create = self._created < self.max_size
+            if create:
+                self._created += 1
+        if create:
+            try:
+                return self._connect()
+            except sqlite3.Error:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        start = time.monotonic()
+        try:
+            conn = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            with self._lock:
+                self._timeouts += 1
+            raise sqlite3.OperationalError(f"Timed out after {self.timeout}s waiting for a database connection")
+        with self._lock:
+            self._waits += 1
+            self._wait_seconds += time.monotonic() - start
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """
+        Returns a connection to the pool, rolling back anything left uncommitted.
+
+        Args:
+            conn (sqlite3.Connection): the connection to return
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error as e:
+            logger.warning("Discarding broken database connection: %s", str(e))
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._created -= 1
+
+    def close(self) -> None:
+        """
+        Closes every idle connection in the pool.
+        """
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+        logger.debug("Closed connection pool for %s", self.db_path)
+
+    def stats(self) -> dict:
+        """
+        Returns the pool's metrics.
+
+        Returns:
+            dict: open/idle connections, checkouts, waits and the hit rate of idle connections
+        """
+        with self._lock:
+            return {
+                "db_path": self.db_path,
+                "size": self._created,
+                "idle": self._idle.qsize(),
+                "checkouts": self._checkouts,
+                "hits": self._hits,
+                "hit_rate": round(self._hits / self._checkouts, 3) if self._checkouts else 0.0,
+                "waits": self._waits,
+                "wait_seconds_total": round(self._wait_seconds, 3),
+                "timeouts": self._timeouts
+            }
+
+
+DB_CONNECTION_SECONDS = metrics.histogram(
+    "db_connection_seconds", "Seconds a pooled sqlite connection is held by one get_db_connection block")
+DB_ERRORS = metrics.counter("db_errors_total", "sqlite errors raised inside get_db_connection")
+
+
+# One pool per database file and process; a forked worker must not reuse its parent's connections
+_pools: dict[tuple[str, int], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+metrics.register_stats("db_pool", lambda: get_pool().stats())
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Returns the connection pool for the current DB_PATH, creating it on first use.
+
+    Returns:
+        ConnectionPool: the pool
+    """
+    key = (DB_PATH, os.getpid())
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(DB_PATH)
+                _pools[key] = pool
+    return pool
+
+
+def close_pools() -> None:
+    """
+    Closes every connection pool of this process.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
 
 def check_database_connection():
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        # This ensures the connection is actually active
-        cursor.execute("SELECT 1;")
-        conn.close()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            # This ensures the connection is actually active
+            cursor.execute("SELECT 1;")
     except sqlite3.Error as e:
         error_message = f"Database connection error: {e}"
         logger.error(error_message)
@@ -28,10 +230,9 @@ def check_database_connection():
 
 def check_table_exists(tablename: str):
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT 1 FROM {tablename} LIMIT 1;")
-        conn.close()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT 1 FROM {tablename} LIMIT 1;")
     except sqlite3.Error as e:
         error_message = f"Table check error: {e}"
         logger.error(error_message)
@@ -43,16 +244,40 @@ def check_table_exists(tablename: str):
 # What is the type of the yielded value?
 #
 ###################################################
+# Statements kept on a traced connection's span; the rest are only counted
+TRACED_STATEMENTS = 20
+
+
+def _statement_recorder(span):
+    statements = span.attributes["statements"] = []
+
+    def record(statement: str) -> None:
+        span.attributes["statement_count"] = span.attributes.get("statement_count", 0) + 1
+        if len(statements) < TRACED_STATEMENTS:
+            statements.append(statement[:200])
+    return record
+
+
 @contextmanager
 def get_db_connection():
+    pool = get_pool()
     conn = None
+    start = time.perf_counter()
+    # Within a traced request the block is one span, listing the statements it ran
+    traced = start_span("sqlite")
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = pool.acquire()
+        if traced is not None:
+            conn.set_trace_callback(_statement_recorder(traced))
         yield conn
     except sqlite3.Error as e:
+        DB_ERRORS.inc()
         logger.error("Database connection error: %s", str(e))
         raise e
     finally:
         if conn:
-            conn.close()
-            logger.info("Database connection closed.")
\ No newline at end of file
+            if traced is not None:
+                conn.set_trace_callback(None)
+            pool.release(conn)
+        finish_span(traced)
+        DB_CONNECTION_SECONDS.observe(time.perf_counter() - start)
@@ -0,0 +1,313 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+import itertools
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+import uuid
+
+from trivia_game.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() in ("1", "true", "yes")
+# Each finished trace is appended here as one JSON line; empty disables the export
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+# Bounds the memory one request can spend on spans (e.g. a bulk import running thousands of statements)
+TRACE_MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", 500))
+# Traces waiting to be written; beyond this, new ones are dropped rather than slowing requests down
+TRACE_EXPORT_QUEUE = int(os.getenv("TRACE_EXPORT_QUEUE", 1000))
+# Send the Server-Timing header to every caller; otherwise only to callers presenting the admin token
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() in ("1", "true", "yes")
+
+# Server-Timing metric names must be HTTP tokens
+_NON_TOKEN = re.compile(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]")
+
+
+@dataclass
+class Span:
+    """
+    One timed operation within a trace.
+
+    Attributes:
+        name (str): what was timed, e.g. 'sqlite' or 'create_team'
+        span_id (int): the span's number within its trace
+        parent_id (Optional[int]): the enclosing span, None for a top-level span
+        start (float): perf_counter() when the span started
+        end (Optional[float]): perf_counter() when it finished, None while open
+        attributes (dict): details such as the host or statement
+    """
+    name: str
+    span_id: int
+    parent_id: Optional[int]
+    start: float
+    end: Optional[float] = None
+    attributes: dict = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+
+class Trace:
+    """
+    The spans recorded while serving one request.
+
+    Attributes:
+        trace_id (str): identifies the request in logs and exported traces
+        name (str): what was traced, e.g. 'GET /api/games/<string:game_id>'
+    """
+
+    def __init__(self, name: str = "", trace_id: Optional[str] = None, max_spans: int = TRACE_MAX_SPANS):
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.name = name
+        self.max_spans = max_spans
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.spans: list[Span] = []
+        self.dropped = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def _new_span(self, name: str, parent: Optional[Span], attributes: dict) -> Optional[Span]:
+        with self._lock:
+            if len(self.spans) >= self.max_spans:
+                self.dropped += 1
+                return None
+            span = Span(name, next(self._ids), parent.span_id if parent else None, time.perf_counter(),
+                        attributes=attributes)
+            self.spans.append(span)
+            return span
+
+    def finish(self) -> None:
+        if self.end is None:
+            self.end = time.perf_counter()
+
+    def breakdown(self) -> dict[str, tuple[int, float]]:
+        """
+        Returns the spans' count and total seconds per name, in the order the names first appeared.
+        """
+        totals: dict[str, list] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            entry = totals.setdefault(span.name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += span.duration
+        return {name: (count, seconds) for name, (count, seconds) in totals.items()}
+
+    def server_timing(self) -> str:
+        """
+        Returns the breakdown as a Server-Timing header value, with 'total' for the whole request.
+
+        Nested spans are reported in full, so a model function's time includes the
+        SQL it ran.
+        """
+        metrics = [f"total;dur={self.duration * 1000:.2f}"]
+        for name, (count, seconds) in self.breakdown().items():
+            metrics.append(f'{_NON_TOKEN.sub("_", name)};dur={seconds * 1000:.2f};desc="{count}x"')
+        return ", ".join(metrics)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3),
+            "dropped_spans": self.dropped,
+            "spans": [
+                {
+                    "name": span.name,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "offset_ms": round((span.start - self.start) * 1000, 3),
+                    "duration_ms": round(span.duration * 1000, 3),
+                    "attributes": span.attributes
+                }
+                for span in spans
+            ]
+        }
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("trivia_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("trivia_span", default=None)
+
+
+def start_trace(name: str = "", trace_id: Optional[str] = None) -> Trace:
+    """
+    Starts recording spans for the current request (thread or task).
+
+    Args:
+        name (str): what is traced
+        trace_id (Optional[str]): reuses a caller's ID, e.g. from an X-Request-ID header
+
+    Returns:
+        Trace: the new trace
+    """
+    trace = Trace(name, trace_id)
+    _current_trace.set(trace)
+    _current_span.set(None)
+    return trace
+
+
+def end_trace() -> Optional[Trace]:
+    """
+    Stops recording spans and returns the finished trace, if one was started.
+    """
+    trace = _current_trace.get()
+    _current_trace.set(None)
+    _current_span.set(None)
+    if trace is not None:
+        trace.finish()
+    return trace
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def start_span(name: str, **attributes: Any) -> Optional[Span]:
+    """
+    Opens a span under the current one. Does nothing (and returns None) outside a trace.
+
+    Prefer span() or traced(); this is for hooks that start and finish in separate
+    callbacks, such as SQLAlchemy's cursor events.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    span = trace._new_span(name, _current_span.get(), attributes)
+    if span is not None:
+        span._token = _current_span.set(span)
+    return span
+
+
+def finish_span(span: Optional[Span], **attributes: Any) -> None:
+    """
+    Closes a span opened by start_span() and makes its parent current again.
+    """
+    if span is None:
+        return
+    span.end = time.perf_counter()
+    span.attributes.update(attributes)
+    try:
+        _current_span.reset(span._token)
+    except ValueError:
+        # Finished in another context than it was started in
+        pass
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Times the enclosed block as a span of the current trace.
+
+    Args:
+        name (str): what is timed
+        attributes: details stored with the span
+
+    Yields:
+        Optional[Span]: the span, so attributes can be added; None outside a trace
+    """
+    opened = start_span(name, **attributes)
+    try:
+        yield opened
+    except BaseException as e:
+        if opened is not None:
+            opened.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        finish_span(opened)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Decorates a function so each call is recorded as a span of the current trace.
+
+    Outside a trace the function is called directly, at the cost of one context lookup.
+
+    Args:
+        name (Optional[str]): the span's name (the function's qualified name by default)
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class JsonlExporter:
+    """
+    Appends finished traces to a local file, one JSON object per line.
+
+    Requests only enqueue their trace; a background thread serializes and writes
+    it, as the logging pipeline does for log records. The thread is started on the
+    first export in each process, so forked workers get their own. When the queue
+    is full, traces are dropped and counted instead of blocking requests.
+
+    Attributes:
+        path (str): the file traces are appended to
+        dropped (int): traces dropped because the queue was full
+    """
+
+    def __init__(self, path: str, max_queue: int = TRACE_EXPORT_QUEUE):
+        self.path = path
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._writer_pid: Optional[int] = None
+
+    def _ensure_writer(self) -> None:
+        if self._writer_pid == os.getpid():
+            return
+        with self._lock:
+            if self._writer_pid != os.getpid():
+                threading.Thread(target=self._write_forever, name="trace-exporter", daemon=True).start()
+                self._writer_pid = os.getpid()
+
+    def export(self, trace: Trace) -> None:
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """
+        Waits until every queued trace has been written.
+        """
+        self._queue.join()
+
+    def _write_forever(self) -> None:
+        while True:
+            trace = self._queue.get()
+            try:
+                with open(self.path, "a", encoding="utf-8") as fh:
+                    fh.write(json.dumps(trace.to_dict(), default=str) + "\n")
+            except OSError as e:
+                logger.warning("Could not export trace %s: %s", trace.trace_id, str(e))
+            finally:
+                self._queue.task_done()
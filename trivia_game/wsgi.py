@@ -0,0 +1,6 @@
+"""
+The WSGI entry point for multi-worker serving: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+from app import create_app
+
+app = create_app()